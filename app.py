@@ -1,7 +1,6 @@
 import html
 import json
 import os
-import re
 from datetime import datetime
 from typing import Dict, List, Optional
 
@@ -10,19 +9,20 @@ from dotenv import load_dotenv
 
 from cache_manager import (
     get_cached_summary,
-    save_cached_summary,
     get_cached_script,
-    save_cached_script,
 )
 from card_parser import parse_card_script
-from daily_recommendations import (
-    load_daily_recommendations,
-    get_daily_recommendations_date,
+from daily_recommendations import get_recommendations_store
+from generation_manager import (
+    get_or_create_script,
+    get_or_create_summaries,
+    get_or_create_summary,
+    get_reuse_source,
 )
-from gemini_api import summarize_with_gemini, generate_cardnews_with_gemini
-from history_manager import add_crawl_history, get_crawl_history
-from image_prep import prepare_card_images, create_images_zip
+from history_manager import get_crawl_history, get_daily_rollups, get_keyword_totals, get_last_crawl_time
+from image_prep import prepare_deck_images, create_images_zip
 from naver_api import search_naver_news
+from recommendations_view import RECENT_DAYS, SORT_OPTIONS, build_article_rows
 from setup_checker import check_environment
 from logger import logger
 
@@ -39,25 +39,58 @@ def load_env() -> None:
         logger.warning(".env 파일을 찾을 수 없습니다.")
 
 
-def clean_html_tags(text: str) -> str:
-    """HTML 태그를 제거합니다."""
-    if not text:
-        return ""
-    # <b>, </b>, <strong>, </strong> 등 제거
-    text = re.sub(r"<[^>]+>", "", text)
-    return text.strip()
+@st.cache_data(show_spinner=False, max_entries=16)
+def _daily_article_rows(version: Optional[str], signature: tuple, sort_by: str, today: str, _articles: List[Dict]) -> List[Dict]:
+    """
+    추천 기사 목록 화면의 행을 만들어 캐시합니다.
+    
+    추천 파일 버전/시그니처, 정렬 기준, 날짜가 같으면 다시 계산하지 않습니다.
+    _articles는 키 계산에서 제외됩니다 (파일 시그니처가 내용을 대신함).
+    
+    Args:
+        version: 추천 파일 버전
+        signature: 추천 파일 (inode, 수정 시각, 크기)
+        sort_by: 정렬 기준
+        today: 기준 날짜 (YYYY-MM-DD)
+        _articles: 추천 기사 리스트
+        
+    Returns:
+        build_article_rows() 결과
+    """
+    return build_article_rows(_articles, sort_by, datetime.strptime(today, "%Y-%m-%d").date())
 
 
-def clean_title_suffix(text: str) -> str:
-    """제목에서 불필요한 접미사(예: '< 문화 < 충남 < 전국 < 기사본문')를 제거합니다."""
-    if not text:
-        return ""
-    # "< 문화 < 충남 < 전국 < 기사본문" 같은 패턴 제거
-    text = re.sub(r"\s*<\s*[^<]*<\s*[^<]*<\s*[^<]*<\s*기사본문.*$", "", text)
-    text = re.sub(r"\s*<\s*[^<]*<\s*[^<]*<\s*[^<]*$", "", text)  # "< 문화 < 충남 < 전국" 같은 패턴
-    text = re.sub(r"\s*<\s*[^<]*<\s*[^<]*$", "", text)  # "< 대전·충청 < 지역" 같은 패턴
-    text = re.sub(r"\s*<\s*[^<]*$", "", text)  # "< 문화" 같은 패턴
-    return text.strip()
+def _stream_card_script(article_id: str, content: str, title: str, force: bool = False) -> Optional[str]:
+    """
+    카드뉴스 문구를 스트리밍으로 생성하면서, 완성된 카드를 바로 미리보기로 표시합니다.
+    
+    Args:
+        article_id: 기사 ID 또는 URL
+        content: 기사 본문
+        title: 기사 제목
+        force: True면 캐시를 무시하고 새로 생성
+        
+    Returns:
+        전체 카드뉴스 문구. 실패 시 None.
+    """
+    preview = st.empty()
+    streamed_cards: List[Dict[str, str]] = []
+    
+    def on_card(card: Dict[str, str]) -> None:
+        streamed_cards.append(card)
+        lines = []
+        for card_idx, streamed in enumerate(streamed_cards, 1):
+            card_type = streamed.get("type", "")
+            line = f"**카드 {card_idx}{f' ({card_type})' if card_type else ''}** {streamed.get('head', '')}"
+            if streamed.get("body"):
+                line += f"  \n{streamed['body']}"
+            lines.append(line)
+        preview.markdown("\n\n".join(lines))
+    
+    script = get_or_create_script(article_id, content, title, on_card=on_card, force=force)
+    # 생성이 끝나면 아래 카드 그리드가 전체 문구를 표시하므로 미리보기는 지움
+    preview.empty()
+    return script
 
 
 def _render_article_details(article: Dict, title: str, description: str, link: str, pub_date: str, score: float, idx: int) -> None:
@@ -203,11 +236,10 @@ def _render_article_details(article: Dict, title: str, description: str, link: s
         if cached:
             st.session_state[summary_key] = cached
         else:
-            # 자동 생성
+            # 자동 생성 (카드뉴스 문구도 없으면 한 번의 호출로 함께 생성)
             with st.spinner("원문 요약을 생성 중입니다..."):
-                summary = summarize_with_gemini(content, title)
+                summary = get_or_create_summary(article_id, content, title)
                 if summary:
-                    save_cached_summary(article_id, summary)
                     st.session_state[summary_key] = summary
     
     # 요약 표시 (접기 가능)
@@ -221,6 +253,8 @@ def _render_article_details(article: Dict, title: str, description: str, link: s
         
         with st.expander(f"📄 원문 요약 ({preview[:50]}...)", expanded=False):
             st.markdown(summary_text)
+            if get_reuse_source(article_id):
+                st.caption("♻️ 거의 같은 내용의 다른 기사 요약을 재사용했습니다.")
     
     # 카드뉴스 문구 생성 버튼 (그룹화 및 컴팩트화)
     btn_col1, btn_col2, btn_col3 = st.columns([2, 2, 1])
@@ -232,9 +266,9 @@ def _render_article_details(article: Dict, title: str, description: str, link: s
                 st.session_state[f"card_script_{article_id}"] = cached_script
                 st.success("✅ 캐시된 문구를 불러왔습니다.")
             else:
-                with st.spinner("생성 중... (약 30초 소요)"):
+                with st.spinner("생성 중... 완성된 카드부터 바로 표시됩니다."):
                     try:
-                        script = generate_cardnews_with_gemini(content, title)
+                        script = _stream_card_script(article_id, content, title)
                         if script:
                             # 파싱 테스트
                             cards = parse_card_script(script)
@@ -242,7 +276,6 @@ def _render_article_details(article: Dict, title: str, description: str, link: s
                                 st.warning("⚠️ 생성된 문구를 파싱할 수 없습니다. 형식을 확인해주세요.")
                                 st.code(script[:500] + "..." if len(script) > 500 else script, language="text")
                             else:
-                                save_cached_script(article_id, script)
                                 st.session_state[f"card_script_{article_id}"] = script
                                 st.success(f"✅ 생성 완료! ({len(cards)}개 카드)")
                         else:
@@ -255,9 +288,9 @@ def _render_article_details(article: Dict, title: str, description: str, link: s
     
     with btn_col2:
         if st.button("🔄 새로 생성", key=f"daily_cardnews_new_{idx}", use_container_width=True, help="캐시 무시하고 새로 생성"):
-            with st.spinner("생성 중... (약 30초 소요)"):
+            with st.spinner("생성 중... 완성된 카드부터 바로 표시됩니다."):
                 try:
-                    script = generate_cardnews_with_gemini(content, title)
+                    script = _stream_card_script(article_id, content, title, force=True)
                     if script:
                         # 파싱 테스트
                         cards = parse_card_script(script)
@@ -265,7 +298,6 @@ def _render_article_details(article: Dict, title: str, description: str, link: s
                             st.warning("⚠️ 생성된 문구를 파싱할 수 없습니다. 형식을 확인해주세요.")
                             st.code(script[:500] + "..." if len(script) > 500 else script, language="text")
                         else:
-                            save_cached_script(article_id, script)
                             st.session_state[f"card_script_{article_id}"] = script
                             st.success(f"✅ 새로 생성 완료! ({len(cards)}개 카드)")
                     else:
@@ -494,14 +526,17 @@ def _render_article_details(article: Dict, title: str, description: str, link: s
                 all_iconify_downloaded = []
                 all_material_downloaded = []
                 
-                for card_idx, card in enumerate(cards, 1):
+                # 모든 카드의 아이콘 검색/다운로드를 한꺼번에 동시 실행
+                with st.spinner("아이콘 검색 및 다운로드 중..."):
+                    deck_images = prepare_deck_images(cards)
+                
+                for card_idx, (card, img_data) in enumerate(zip(cards, deck_images), 1):
                     with st.expander(f"📋 카드 {card_idx}: {card.get('head', '')[:30]}..."):
                         st.write(f"**타입**: {card.get('type', '')}")
                         st.write(f"**제목**: {card.get('head', '')}")
                         if card.get('body'):
                             st.write(f"**본문**: {card.get('body', '')}")
                         
-                        img_data = prepare_card_images(card)
                         
                         st.text_area(
                             "AI 이미지 생성 프롬프트",
@@ -575,51 +610,77 @@ def get_crawl_time_display() -> Optional[str]:
     Returns:
         "25.12.26.(금) 11:05" 형식의 문자열. 없으면 None.
     """
-    import os
-    from history_manager import get_crawl_history
+    dt = None
     
-    # 1. history.json에서 최근 크롤링 시간 확인
-    history = get_crawl_history(limit=1)
-    if history:
-        timestamp_str = history[0].get("timestamp", "")
-        if timestamp_str:
-            try:
-                # ISO 형식 파싱 (예: "2025-12-24T00:22:14" 또는 "2025-12-24T00:22:14+09:00")
-                if "T" in timestamp_str:
-                    dt_str = timestamp_str.split("+")[0].split("Z")[0]  # 타임존 제거
-                    if len(dt_str) == 19:  # "2025-12-24T00:22:14"
-                        dt = datetime.strptime(dt_str, "%Y-%m-%dT%H:%M:%S")
-                    else:
-                        dt = datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
-                else:
-                    dt = datetime.fromisoformat(timestamp_str)
-                
-                # 한국어 요일
-                weekdays = ["월", "화", "수", "목", "금", "토", "일"]
-                weekday = weekdays[dt.weekday()]
-                
-                # "25.12.26.(금) 11:05" 형식
-                return f"{dt.strftime('%y.%m.%d')}.({weekday}) {dt.strftime('%H:%M')}"
-            except Exception:
-                pass
+    # 1. 날짜별 크롤링 합계에 기록된 마지막 크롤링 시각 (기록 파일을 읽지 않음)
+    timestamp_str = get_last_crawl_time()
+    if timestamp_str:
+        try:
+            # ISO 형식 (예: "2025-12-24T00:22:14" 또는 "2025-12-24T00:22:14+09:00")은 현지 시각 그대로 표시
+            dt = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00")).replace(tzinfo=None)
+        except ValueError:
+            dt = None
     
     # 2. daily_recommendations.json 파일의 수정 시간 사용
-    data_file = os.path.join("data", "daily_recommendations.json")
-    if os.path.exists(data_file):
-        try:
-            mtime = os.path.getmtime(data_file)
-            dt = datetime.fromtimestamp(mtime)
-            
-            # 한국어 요일
-            weekdays = ["월", "화", "수", "목", "금", "토", "일"]
-            weekday = weekdays[dt.weekday()]
-            
-            # "25.12.26.(금) 11:05" 형식
-            return f"{dt.strftime('%y.%m.%d')}.({weekday}) {dt.strftime('%H:%M')}"
-        except Exception:
-            pass
+    if dt is None:
+        data_file = os.path.join("data", "daily_recommendations.json")
+        if not os.path.exists(data_file):
+            return None
+        dt = datetime.fromtimestamp(os.path.getmtime(data_file))
+    
+    # 한국어 요일, "25.12.26.(금) 11:05" 형식
+    weekdays = ["월", "화", "수", "목", "금", "토", "일"]
+    return f"{dt.strftime('%y.%m.%d')}.({weekdays[dt.weekday()]}) {dt.strftime('%H:%M')}"
+
+
+def render_crawl_trends() -> None:
+    """
+    날짜별 크롤링 합계로 기사 수, 단계별 소요 시간, 키워드별 API 효율 추세를 표시합니다.
+    """
+    period = st.selectbox("기간", [30, 90, 180, 365], index=1, format_func=lambda d: f"최근 {d}일", key="crawl_trend_period")
+    rollups = get_daily_rollups(period)
+    if not any(day.get("raw") for day in rollups):
+        st.caption("아직 크롤링 지표가 없습니다. 다음 일일 크롤링부터 기록됩니다.")
+        return
+    
+    dates = [day["date"] for day in rollups]
+    st.markdown("**기사 수 (검색 결과 / 중복 제거 후 / 추천)**")
+    st.line_chart({
+        "date": dates,
+        "검색 결과": [day.get("raw", 0) for day in rollups],
+        "중복 제거 후": [day.get("unique", 0) for day in rollups],
+        "추천": [day.get("selected", 0) for day in rollups],
+    }, x="date")
+    
+    stage_names = sorted({name for day in rollups for name in (day.get("stages") or {})})
+    st.markdown("**단계별 소요 시간 (초)**")
+    st.bar_chart({
+        "date": dates,
+        **{name: [(day.get("stages") or {}).get(name, 0) for day in rollups] for name in stage_names},
+    }, x="date")
     
-    return None
+    api_names = sorted({name for day in rollups for name in (day.get("api_calls") or {})})
+    st.markdown("**API 요청 수**")
+    st.bar_chart({
+        "date": dates,
+        **{name: [(day.get("api_calls") or {}).get(name, 0) for day in rollups] for name in api_names},
+    }, x="date")
+    
+    st.markdown("**키워드별 효율** (API 요청 하나당 추천 기사 수)")
+    st.dataframe(
+        [
+            {
+                "키워드": row["keyword"],
+                "API 요청": row["calls"],
+                "검색 결과": row["raw"],
+                "중복 제거 후": row["unique"],
+                "추천": row["selected"],
+                "요청당 추천": row["selected_per_call"],
+            }
+            for row in get_keyword_totals(period)
+        ],
+        use_container_width=True,
+    )
 
 
 def render_setup_warnings() -> None:
@@ -972,17 +1033,16 @@ def main() -> None:
     with tabs[0]:
         st.subheader("오늘의 자동 추천 기사")
         
-        # daily_recommendations.json 로드
-        articles = load_daily_recommendations()
-        date_str = get_daily_recommendations_date()
+        # daily_recommendations.json 로드 (파일이 바뀐 경우에만 다시 읽음)
+        store = get_recommendations_store()
+        articles = store.articles()
+        date_str = store.date()
         
         # URL 파라미터로 기사 자동 선택 (슬랙에서 온 경우)
         article_url = st.query_params.get("article_url")
-        auto_expand_idx = None
         if article_url and articles:
-            for idx, article in enumerate(articles):
+            for article in articles:
                 if article.get("link") == article_url:
-                    auto_expand_idx = idx
                     st.info(f"📌 슬랙에서 선택한 기사: {article.get('title', '')[:50]}...")
                     break
         
@@ -1119,7 +1179,7 @@ def main() -> None:
             with col1:
                 sort_by = st.selectbox(
                     "정렬 기준",
-                    options=["관련도 점수 (내림차순)", "날짜 (최신순)", "날짜 (오래된순)"],
+                    options=SORT_OPTIONS,
                     key="daily_sort_by",
                 )
             with col2:
@@ -1131,212 +1191,40 @@ def main() -> None:
                     if crawl_time_str:
                         st.caption(f"🕐 크롤링 시간: {crawl_time_str}")
             
-            # 정렬 적용
-            sorted_articles = articles.copy()
-            if sort_by == "관련도 점수 (내림차순)":
-                sorted_articles.sort(key=lambda x: x.get("relevance_score", 0), reverse=True)
-            elif sort_by == "날짜 (최신순)":
-                sorted_articles.sort(key=lambda x: x.get("pubDate", ""), reverse=True)
-            elif sort_by == "날짜 (오래된순)":
-                sorted_articles.sort(key=lambda x: x.get("pubDate", ""))
+            # 정렬/필터링/점수 재계산 결과는 파일이 바뀌거나 날짜가 바뀔 때만 다시 계산
+            article_rows = _daily_article_rows(
+                store.version(), store.signature(), sort_by, datetime.now().date().isoformat(), articles
+            )
             
-            # 크롤링 날짜 기준 4일 내의 기사만 필터링 및 점수 재계산
-            from datetime import datetime
-            today = datetime.now()
-            filtered_articles = []
+            st.write(f"총 {len(article_rows)}개의 추천 기사가 있습니다. (크롤링 날짜 기준 {RECENT_DAYS}일 내)")
             
-            # 검색 키워드 목록 (점수 재계산용)
-            search_keywords = [
-                "충남콘텐츠진흥원",
-                "충콘진",
-                "천안그린스타트업타운",
-                "김곡미",
-                "충남콘텐츠코리아랩",
-                "충남콘텐츠기업지원센터",
-                "충남글로벌게임센터",
-                "충남음악창작소",
-                "충남 e스포츠",
-            ]
-            
-            # 점수 재계산 함수 (10점 만점) - 순환 import 방지를 위해 직접 구현
-            def recalculate_score(article):
-                score = 0.0
-                title = article.get("title", "").lower()
-                description = article.get("description", "").lower()
-                
-                # 주요 키워드와 기타 키워드 구분
-                main_keywords = ["충남콘텐츠진흥원", "충콘진"]
-                other_keywords = [k for k in search_keywords if k not in main_keywords]
-                
-                # 제목 매칭 (최대 5점)
-                title_score = 0.0
-                for keyword in main_keywords:
-                    if keyword.lower() in title:
-                        title_score += 2.5
-                for keyword in other_keywords:
-                    if keyword.lower() in title:
-                        title_score += 0.3
-                title_score = min(title_score, 5.0)
-                score += title_score
-                
-                # 설명 매칭 (최대 3점)
-                desc_score = 0.0
-                for keyword in main_keywords:
-                    if keyword.lower() in description:
-                        desc_score += 1.5
-                for keyword in other_keywords:
-                    if keyword.lower() in description:
-                        desc_score += 0.2
-                desc_score = min(desc_score, 3.0)
-                score += desc_score
-                
-                # 최근 기사 보너스 (최대 2점)
-                pub_date = article.get("pubDate", "")
-                if pub_date:
-                    try:
-                        if "T" in pub_date:
-                            date_str = pub_date.split("T")[0]
-                            article_date = datetime.strptime(date_str, "%Y-%m-%d")
-                        else:
-                            # 다른 형식 처리
-                            import re
-                            if re.match(r"^[A-Za-z]{3},\s*\d{1,2}\s+[A-Za-z]{2,3}", pub_date):
-                                month_map = {"Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
-                                            "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
-                                            "No": 11, "De": 12}
-                                parts = pub_date.split()
-                                if len(parts) >= 3:
-                                    day = int(parts[1].rstrip(","))
-                                    month_name = parts[2]
-                                    month = month_map.get(month_name, 11)
-                                    year = int(parts[3]) if len(parts) >= 4 else datetime.now().year
-                                    article_date = datetime(year, month, day)
-                                else:
-                                    return min(score, 10.0)
-                            elif re.match(r"^\d{4}-\d{2}-\d{2}", pub_date):
-                                article_date = datetime.strptime(pub_date[:10], "%Y-%m-%d")
-                            else:
-                                return min(score, 10.0)
-                        
-                        days_diff = (today - article_date).days
-                        if days_diff <= 4:
-                            bonus = 2.0 - (days_diff * 0.375)
-                            score += bonus
-                    except:
-                        pass
-                
-                return min(score, 10.0)
-            
-            for article in sorted_articles:
-                pub_date = article.get("pubDate", "")
-                if pub_date:
-                    try:
-                        # 날짜 파싱
-                        if "T" in pub_date:
-                            date_str = pub_date.split("T")[0]
-                            article_date = datetime.strptime(date_str, "%Y-%m-%d")
-                        else:
-                            # 다른 형식 처리
-                            import re
-                            if re.match(r"^[A-Za-z]{3},\s*\d{1,2}\s+[A-Za-z]{2,3}", pub_date):
-                                month_map = {"Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
-                                            "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
-                                            "No": 11, "De": 12}
-                                parts = pub_date.split()
-                                if len(parts) >= 3:
-                                    day = int(parts[1].rstrip(","))
-                                    month_name = parts[2]
-                                    month = month_map.get(month_name, 11)
-                                    year = int(parts[3]) if len(parts) >= 4 else datetime.now().year
-                                    article_date = datetime(year, month, day)
-                                else:
-                                    continue
-                            elif re.match(r"^\d{4}-\d{2}-\d{2}", pub_date):
-                                article_date = datetime.strptime(pub_date[:10], "%Y-%m-%d")
-                            else:
-                                continue
-                        
-                        days_diff = (today - article_date).days
-                        if days_diff <= 4:
-                            # 점수 재계산 (10점 만점으로)
-                            article["relevance_score"] = recalculate_score(article)
-                            filtered_articles.append(article)
-                    except:
-                        # 날짜 파싱 실패 시 제외
-                        continue
-            
-            sorted_articles = filtered_articles
-            
-            st.write(f"총 {len(sorted_articles)}개의 추천 기사가 있습니다. (크롤링 날짜 기준 4일 내)")
+            # 요약이 없는 기사는 목록 렌더링 전에 일괄 생성 (기사별 개별 호출 방지)
+            pending_summaries = []
+            for row in article_rows:
+                article_id = row["article_id"]
+                if f"daily_summary_{article_id}" in st.session_state or get_cached_summary(article_id):
+                    continue
+                pending_summaries.append({
+                    "id": article_id,
+                    "title": row["title"],
+                    "content": row["description"] or row["article"].get("article_overview", ""),
+                })
+            if pending_summaries:
+                with st.spinner(f"원문 요약 {len(pending_summaries)}건을 일괄 생성 중입니다..."):
+                    batch_summaries = get_or_create_summaries(pending_summaries)
+                for batch_article_id, batch_summary in batch_summaries.items():
+                    st.session_state[f"daily_summary_{batch_article_id}"] = batch_summary
             
             # 기사 목록을 테이블 형식으로 표시 (각 열 왼쪽 정렬)
-            for idx, article in enumerate(sorted_articles):
-                # 전체 제목이 있으면 사용, 없으면 기존 제목 사용
-                title = clean_html_tags(article.get("full_title") or article.get("title", ""))
-                # 제목에서 불필요한 접미사 제거
-                title = clean_title_suffix(title)
-                description = clean_html_tags(article.get("description", ""))
-                link = article.get("link", "")
-                pub_date = article.get("pubDate", "")
-                score = article.get("relevance_score", 0)
-                
-                # 기존 데이터가 이전 점수 체계(100점 만점)로 저장되어 있을 수 있으므로 10점으로 제한
-                if score > 10.0:
-                    score = 10.0
-                
-                # 날짜 포맷팅 (예: 25.12.24.(수))
-                date_display = ""
-                if pub_date:
-                    try:
-                        # 여러 날짜 형식 처리
-                        from datetime import datetime
-                        dt = None
-                        
-                        # ISO 형식 (예: "2024-12-24T09:00:00+09:00")
-                        if "T" in pub_date:
-                            date_part = pub_date.split("T")[0]
-                            year, month, day = date_part.split("-")
-                            dt = datetime(int(year), int(month), int(day))
-                        # "Thu, 27 No" 또는 "Sun, 30 Nov 2024" 같은 형식 처리
-                        elif re.match(r"^[A-Za-z]{3},\s*\d{1,2}\s+[A-Za-z]{2,3}", pub_date):
-                            # 월 이름 매핑
-                            month_map = {
-                                "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
-                                "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
-                                "No": 11, "De": 12  # 잘린 형식도 처리
-                            }
-                            
-                            # "Thu, 27 No" 또는 "Sun, 30 Nov 2024" 파싱
-                            parts = pub_date.split()
-                            if len(parts) >= 3:
-                                day = int(parts[1].rstrip(","))
-                                month_name = parts[2]
-                                month = month_map.get(month_name, 11)
-                                
-                                # 년도가 있으면 사용, 없으면 현재 년도
-                                if len(parts) >= 4:
-                                    year = int(parts[3])
-                                else:
-                                    year = datetime.now().year
-                                
-                                dt = datetime(year, month, day)
-                        # "2024-12-24" 형식
-                        elif re.match(r"^\d{4}-\d{2}-\d{2}", pub_date):
-                            dt = datetime.strptime(pub_date[:10], "%Y-%m-%d")
-                        
-                        if dt:
-                            weekdays = ["월", "화", "수", "목", "금", "토", "일"]
-                            weekday = weekdays[dt.weekday()]
-                            year_str = str(dt.year)[2:]  # 2자리 년도
-                            month_str = f"{dt.month:02d}"  # 2자리 월
-                            day_str = f"{dt.day:02d}"  # 2자리 일
-                            date_display = f"{year_str}.{month_str}.{day_str}.({weekday})"
-                    except Exception as e:
-                        # 파싱 실패 시 빈 문자열 (영어 날짜는 표시하지 않음)
-                        date_display = ""
-                
-                date_text = date_display if date_display else "-"
-                score_display = f"{score:.1f}/10점" if score > 0 else "-"
+            for idx, row in enumerate(article_rows):
+                article = row["article"]
+                title = row["title"]
+                description = row["description"]
+                link = row["link"]
+                pub_date = row["pub_date"]
+                score = row["score"]
+                date_text = row["date_display"] or "-"
+                score_display = row["score_display"]
                 
                 # 3열 레이아웃으로 표시 (각 열 왼쪽 정렬, 고정 너비)
                 # 제목 공간 최대화, 날짜와 관련도는 최소 공간만 사용하고 5mm 간격 유지
@@ -1348,7 +1236,7 @@ def main() -> None:
                     # 제목을 expander 헤더로 사용 (제목 클릭 시 확장)
                     expander_key = f"article_expander_{idx}"
                     # URL 파라미터로 온 기사는 자동으로 확장
-                    is_expanded = (auto_expand_idx == idx) if auto_expand_idx is not None else False
+                    is_expanded = bool(article_url) and link == article_url
                     with st.expander(title, expanded=is_expanded):
                         # 상세 정보는 expander 내부에 표시 (전체 너비 사용)
                         _render_article_details(article, title, description, link, pub_date, score, idx)
@@ -1367,7 +1255,11 @@ def main() -> None:
         if not history:
             st.info("아직 크롤링 기록이 없습니다.")
         else:
-            st.table(history)
+            # 지표는 아래 추세에서 날짜별 합계로 표시
+            st.table([{key: value for key, value in record.items() if key != "metrics"} for record in history])
+            
+            st.subheader("크롤링 추세")
+            render_crawl_trends()
 
 
 if __name__ == "__main__":
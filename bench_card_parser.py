@@ -0,0 +1,120 @@
+"""card_parser 벤치마크 - 기존 딕셔너리 파서와 Card 파서 비교
+
+사용 예:
+    python bench_card_parser.py --cards 10 --number 2000
+
+기존 구현(매 줄 re.match/re.sub, 딕셔너리 카드)을 그대로 옮겨 두고,
+같은 텍스트/JSON 문구를 parse_card_script와 CardParser(조각 단위 입력)로 파싱하는 시간을 비교합니다.
+"""
+import argparse
+import json
+import re
+import timeit
+from typing import Dict, List, Optional
+
+from card_parser import CardParser, parse_card_script
+
+
+def _legacy_card_from_json(item: Dict) -> Optional[Dict[str, str]]:
+    if not isinstance(item, dict):
+        return None
+    card = {
+        "type": item.get("type", ""),
+        "head": item.get("headline", ""),
+        "body": item.get("description", ""),
+        "image_key": item.get("image_keyword", ""),
+    }
+    return card if card["head"] else None
+
+
+def _legacy_card_from_line(line: str) -> Optional[Dict[str, str]]:
+    line = line.strip()
+    if not line or not re.match(r"^\d+\.", line):
+        return None
+    line = re.sub(r"^\d+\.\s*", "", line)
+    card = {"type": "", "head": "", "body": "", "image_key": ""}
+    for part in [p.strip() for p in line.split("|")]:
+        if part.startswith("TYPE="):
+            card["type"] = part.replace("TYPE=", "").strip()
+        elif part.startswith("HEAD="):
+            card["head"] = part.replace("HEAD=", "").strip()
+        elif part.startswith("BODY="):
+            card["body"] = part.replace("BODY=", "").strip()
+        elif part.startswith("IMAGE_KEY="):
+            card["image_key"] = part.replace("IMAGE_KEY=", "").strip()
+    return card if card["type"] and card["head"] else None
+
+
+def legacy_parse_card_script(script: str) -> List[Dict[str, str]]:
+    """변경 전 parse_card_script 구현 (비교용)"""
+    script = script.strip()
+    if script.startswith("[") or script.startswith("{"):
+        try:
+            json_data = json.loads(script)
+            if isinstance(json_data, list):
+                return [card for card in map(_legacy_card_from_json, json_data) if card]
+        except json.JSONDecodeError:
+            pass
+    return [card for card in map(_legacy_card_from_line, script.split("\n")) if card]
+
+
+def _make_scripts(num_cards: int) -> Dict[str, str]:
+    """벤치마크용 텍스트/JSON 문구를 만듭니다."""
+    lines = []
+    items = []
+    for i in range(1, num_cards + 1):
+        card_type = "cover" if i == 1 else "program"
+        head = f"{i}번째 카드 제목 - 충청남도 신규 지원 사업 안내"
+        body = "도민 누구나 신청할 수 있으며, 자세한 내용은 시군 누리집에서 확인할 수 있습니다. " * 2
+        image_key = "support program citizen"
+        lines.append(f"{i}. TYPE={card_type} | HEAD={head} | BODY={body.strip()} | IMAGE_KEY={image_key}")
+        items.append({
+            "slide_number": i,
+            "type": card_type,
+            "headline": head,
+            "description": body.strip(),
+            "image_keyword": image_key,
+        })
+    return {
+        "text": "\n".join(lines),
+        "json": json.dumps(items, ensure_ascii=False),
+    }
+
+
+def _stream_parse(script: str, chunk_size: int) -> List:
+    parser = CardParser()
+    cards = []
+    for start in range(0, len(script), chunk_size):
+        cards.extend(parser.feed(script[start:start + chunk_size]))
+    cards.extend(parser.close())
+    return cards
+
+
+def main() -> None:
+    """명령행 인자를 읽어 벤치마크를 실행합니다."""
+    parser = argparse.ArgumentParser(description="card_parser 벤치마크")
+    parser.add_argument("--cards", type=int, default=10, help="문구 하나의 카드 수")
+    parser.add_argument("--number", type=int, default=2000, help="측정 반복 횟수")
+    parser.add_argument("--chunk-size", type=int, default=40, help="스트리밍 조각 크기(문자)")
+    args = parser.parse_args()
+
+    for fmt, script in _make_scripts(args.cards).items():
+        expected = legacy_parse_card_script(script)
+        assert [card.to_dict() for card in parse_card_script(script)] == expected
+        assert [card.to_dict() for card in _stream_parse(script, args.chunk_size)] == expected
+
+        candidates = {
+            "기존 parse_card_script": lambda: legacy_parse_card_script(script),
+            "parse_card_script": lambda: parse_card_script(script),
+            f"CardParser ({args.chunk_size}자 조각)": lambda: _stream_parse(script, args.chunk_size),
+        }
+        print(f"\n[{fmt}] 카드 {args.cards}장, {len(script)}자, {args.number}회")
+        baseline = None
+        for name, func in candidates.items():
+            per_call = min(timeit.repeat(func, number=args.number, repeat=3)) / args.number
+            baseline = baseline or per_call
+            print(f"  {name:<28} {per_call * 1e6:8.1f}µs  (x{baseline / per_call:.2f})")
+
+
+if __name__ == "__main__":
+    main()
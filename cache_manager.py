@@ -5,7 +5,7 @@ from typing import Optional
 
 
 BASE_DIR = os.path.dirname(__file__)
-CACHE_DIR = os.path.join(BASE_DIR, "cache")
+CACHE_DIR = os.getenv("CARDNEWS_CACHE_DIR", os.path.join(BASE_DIR, "cache"))
 
 os.makedirs(CACHE_DIR, exist_ok=True)
 
@@ -101,3 +101,14 @@ def save_cached_script(article_id: str, script: str) -> None:
         print(f"[캐시 저장 오류] {path}: {e}")
 
 
+def save_cached_generation(article_id: str, summary: str, script: str) -> None:
+    """
+    한 번의 호출로 생성된 요약과 카드뉴스 문구를 함께 캐시에 저장합니다.
+    
+    Args:
+        article_id: 기사 ID 또는 URL
+        summary: 저장할 요약 텍스트
+        script: 저장할 카드뉴스 문구 텍스트
+    """
+    save_cached_summary(article_id, summary)
+    save_cached_script(article_id, script)
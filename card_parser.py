@@ -1,86 +1,276 @@
 """카드뉴스 문구 파싱 모듈 - JSON 형식 지원"""
-from typing import Dict, List
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
 import json
 import re
 
 
-def parse_card_script(script: str) -> List[Dict[str, str]]:
+_LINE_NUMBER_RE = re.compile(r"^\d+\.\s*")
+_CODE_FENCE_RE = re.compile(r"^```[\w-]*\s*\n?(.*?)\n?```\s*$", re.DOTALL)
+_JSON_TOKEN_RE = re.compile(r'["\[\]{}]')  # 문자열 밖에서 의미 있는 문자
+_JSON_STRING_END_RE = re.compile(r'["\\]')  # 문자열 안에서 의미 있는 문자
+
+# 텍스트 형식의 필드 이름 → Card 속성 이름
+_LINE_FIELDS = {
+    "TYPE": "type",
+    "HEAD": "head",
+    "BODY": "body",
+    "IMAGE_KEY": "image_key",
+}
+_CARD_FIELDS = frozenset(_LINE_FIELDS.values())
+
+
+@dataclass(slots=True)
+class Card:
+    """
+    카드 한 장입니다.
+    
+    기존 카드 딕셔너리를 쓰던 코드가 그대로 동작하도록 card["head"], card.get("body", "")
+    형태의 읽기 접근을 지원합니다.
+    """
+    type: str = ""
+    head: str = ""
+    body: str = ""
+    image_key: str = ""
+    
+    def __getitem__(self, key: str) -> str:
+        if key not in _CARD_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        if key not in _CARD_FIELDS:
+            return default
+        return getattr(self, key)
+    
+    def to_dict(self) -> Dict[str, str]:
+        """{"type", "head", "body", "image_key"} 딕셔너리로 변환합니다."""
+        return asdict(self)
+
+
+def _card_from_json(item: Dict) -> Optional[Card]:
+    """
+    JSON 카드 항목을 Card로 변환합니다.
+    
+    Args:
+        item: {"slide_number", "type", "headline", "description", "image_keyword"} 형식의 항목
+    
+    Returns:
+        Card. headline이 없으면 None.
+    """
+    if not isinstance(item, dict):
+        return None
+    head = item.get("headline", "")
+    if not head:  # headline이 있으면 유효한 카드로 간주
+        return None
+    return Card(
+        type=item.get("type", ""),  # type이 없으면 빈 문자열
+        head=head,
+        body=item.get("description", ""),
+        image_key=item.get("image_keyword", ""),
+    )
+
+
+def _card_from_line(line: str) -> Optional[Card]:
+    """
+    "1. TYPE=... | HEAD=... | BODY=... | IMAGE_KEY=..." 한 줄을 Card로 변환합니다.
+    
+    Args:
+        line: 카드 한 줄
+    
+    Returns:
+        Card. 형식이 맞지 않으면 None.
+    """
+    line = line.strip()
+    # 번호 제거 (예: "1. " 제거)
+    match = _LINE_NUMBER_RE.match(line)
+    if not match:
+        return None
+    
+    # 파이프(|)로 구분된 부분들에서 TYPE, HEAD, BODY, IMAGE_KEY 추출
+    card = Card()
+    for part in line[match.end():].split("|"):
+        name, sep, value = part.strip().partition("=")
+        if sep and name in _LINE_FIELDS:
+            setattr(card, _LINE_FIELDS[name], value.strip())
+    
+    # 최소한 type과 head는 있어야 유효한 카드로 간주
+    if card.type and card.head:
+        return card
+    return None
+
+
+def _strip_code_fence(script: str) -> str:
+    """```json ... ``` 코드 블록으로 감싼 문구에서 본문만 꺼냅니다."""
+    fence = _CODE_FENCE_RE.match(script)
+    return fence.group(1).strip() if fence else script
+
+
+def parse_card_script(script: str) -> List[Card]:
     """
     카드뉴스 문구를 파싱하여 카드 리스트로 변환합니다.
     
     지원 형식:
-    1. JSON 배열 형식 (새 형식):
-       [{"slide_number": 1, "headline": "...", "description": "...", "image_keyword": "..."}]
+    1. JSON 배열 형식 (새 형식, 마크다운 코드 블록으로 감싸도 됨):
+       [{"slide_number": 1, "type": "cover", "headline": "...", "description": "...", "image_keyword": "..."}]
+       (type는 선택 항목)
     
     2. 기존 텍스트 형식 (하위 호환):
        1. TYPE=cover | HEAD=제목 | IMAGE_KEY=keyword1 keyword2 keyword3
     
     Args:
         script: 카드뉴스 문구 텍스트 (JSON 또는 텍스트 형식)
-        
+    
     Returns:
-        카드 리스트. 각 카드는 {"type", "head", "body", "image_key"} 키를 가집니다.
-        (JSON 형식의 경우 slide_number, headline, description, image_keyword를 변환)
+        Card 리스트. 각 카드는 type, head, body, image_key 속성을 가집니다.
+        (JSON 형식의 경우 headline, description, image_keyword를 변환)
     """
-    script = script.strip()
+    script = _strip_code_fence(script.strip())
     
     # JSON 형식인지 확인
     if script.startswith("[") or script.startswith("{"):
         try:
-            # JSON 파싱 시도
             json_data = json.loads(script)
             if isinstance(json_data, list):
-                cards = []
-                for item in json_data:
-                    card: Dict[str, str] = {
-                        "type": "",  # JSON 형식에는 type이 없으므로 빈 문자열
-                        "head": item.get("headline", ""),
-                        "body": item.get("description", ""),
-                        "image_key": item.get("image_keyword", ""),
-                    }
-                    if card["head"]:  # headline이 있으면 유효한 카드로 간주
-                        cards.append(card)
-                return cards
+                return [card for card in map(_card_from_json, json_data) if card]
         except json.JSONDecodeError:
             # JSON 파싱 실패 시 기존 텍스트 형식으로 처리
             pass
     
     # 기존 텍스트 형식 파싱 (하위 호환)
-    cards = []
-    lines = script.split("\n")
+    return [card for card in map(_card_from_line, script.split("\n")) if card]
+
+
+class CardParser:
+    """
+    스트리밍 응답 조각을 받아 완성된 카드부터 순서대로 돌려주는 파서입니다.
     
-    for line in lines:
-        line = line.strip()
-        if not line or not re.match(r"^\d+\.", line):
-            continue
-        
-        # 번호 제거 (예: "1. " 제거)
-        line = re.sub(r"^\d+\.\s*", "", line)
+    텍스트 형식은 줄이 끝날 때마다, JSON 배열 형식은 카드 객체의 닫는 중괄호가
+    들어올 때마다 Card를 만듭니다. 응답이 마크다운 코드 블록(```json)으로 시작해도 됩니다.
+    결과는 parse_card_script와 같습니다.
+    
+    사용 예:
+        parser = CardParser()
+        for chunk in chunks:
+            for card in parser.feed(chunk):
+                ...
+        for card in parser.close():
+            ...
+    """
+    
+    def __init__(self):
+        self._buffer = ""
+        self._mode: Optional[str] = None  # None(판단 전) / "json" / "text"
+        self._emitted = 0
+        # JSON 모드 상태
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._object_start = -1
+    
+    def feed(self, chunk: str) -> List[Card]:
+        """
+        응답 조각을 추가하고 새로 완성된 카드를 반환합니다.
         
-        # TYPE, HEAD, BODY, IMAGE_KEY 추출
-        card: Dict[str, str] = {
-            "type": "",
-            "head": "",
-            "body": "",
-            "image_key": "",
-        }
+        Args:
+            chunk: 응답 텍스트 조각
         
-        # 파이프(|)로 구분된 부분들 파싱
-        parts = [p.strip() for p in line.split("|")]
+        Returns:
+            이번 조각으로 완성된 카드 리스트
+        """
+        self._buffer += chunk
+        if self._mode is None and not self._detect_mode():
+            return []
         
-        for part in parts:
-            if part.startswith("TYPE="):
-                card["type"] = part.replace("TYPE=", "").strip()
-            elif part.startswith("HEAD="):
-                card["head"] = part.replace("HEAD=", "").strip()
-            elif part.startswith("BODY="):
-                card["body"] = part.replace("BODY=", "").strip()
-            elif part.startswith("IMAGE_KEY="):
-                card["image_key"] = part.replace("IMAGE_KEY=", "").strip()
+        if self._mode == "json":
+            cards = self._feed_json()
+        else:
+            cards = self._feed_text(final=False)
+        self._emitted += len(cards)
+        return cards
+    
+    def close(self) -> List[Card]:
+        """
+        스트림이 끝났을 때 남은 내용을 처리합니다.
         
-        # 최소한 type과 head는 있어야 유효한 카드로 간주
-        if card["type"] and card["head"]:
-            cards.append(card)
+        Returns:
+            마지막으로 완성된 카드 리스트
+        """
+        if self._mode is None:
+            # 코드 블록 여는 줄만 받고 끝난 경우 등
+            self._mode = "text"
+        if self._mode == "text":
+            return self._feed_text(final=True)
+        if self._emitted == 0:
+            # JSON처럼 시작했지만 카드 객체가 없으면 텍스트 형식으로 다시 시도 (parse_card_script와 동일)
+            return parse_card_script(self._buffer)
+        return []
     
-    return cards
-
+    def _detect_mode(self) -> bool:
+        """첫 의미 있는 문자로 형식을 판단합니다. 판단할 수 없으면 False."""
+        stripped = self._buffer.lstrip()
+        if stripped and "```".startswith(stripped):
+            # 코드 블록 표시(```)가 조각으로 나뉘어 도착하는 중
+            return False
+        if stripped.startswith("```"):
+            # 코드 블록 여는 줄("```json")이 끝나야 본문 형식을 알 수 있음
+            newline = stripped.find("\n")
+            if newline == -1:
+                return False
+            stripped = stripped[newline + 1:].lstrip()
+            self._buffer = stripped
+        if not stripped:
+            return False
+        self._mode = "json" if stripped[0] in "[{" else "text"
+        return True
+    
+    def _feed_text(self, final: bool) -> List[Card]:
+        lines = self._buffer.split("\n")
+        # 마지막 줄은 아직 끝나지 않았을 수 있으므로 보관
+        self._buffer = "" if final else lines.pop()
+        return [card for card in map(_card_from_line, lines) if card]
+    
+    def _feed_json(self) -> List[Card]:
+        cards = []
+        text = self._buffer
+        while True:
+            if self._in_string:
+                match = _JSON_STRING_END_RE.search(text, self._pos)
+                if not match:
+                    self._pos = len(text)
+                    break
+                if match.group() == "\\":
+                    if match.end() >= len(text):
+                        # 이스케이프 대상 문자가 아직 도착하지 않음
+                        self._pos = match.start()
+                        break
+                    self._pos = match.end() + 1
+                    continue
+                self._in_string = False
+                self._pos = match.end()
+                continue
+            
+            match = _JSON_TOKEN_RE.search(text, self._pos)
+            if not match:
+                self._pos = len(text)
+                break
+            ch = match.group()
+            self._pos = match.end()
+            if ch == '"':
+                self._in_string = True
+            elif ch in "[{":
+                # 배열 안의 카드 객체는 깊이 1에서 시작
+                if ch == "{" and self._depth == 1:
+                    self._object_start = match.start()
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if ch == "}" and self._depth == 1 and self._object_start >= 0:
+                    try:
+                        card = _card_from_json(json.loads(text[self._object_start:self._pos]))
+                    except json.JSONDecodeError:
+                        card = None
+                    if card:
+                        cards.append(card)
+                    self._object_start = -1
+        return cards
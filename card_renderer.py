@@ -0,0 +1,341 @@
+"""카드 PNG 렌더링 모듈 - 파싱한 카드뉴스를 브랜드 템플릿의 1:1 PNG 카드로 그림
+
+사용 예:
+    # 오늘의 추천 기사 중 카드뉴스 문구가 있는 기사를 모두 렌더링
+    python card_renderer.py -o rendered_cards --workers 4
+
+Pillow가 필요합니다. 아이콘 SVG를 그리려면 CairoSVG(선택)가 있어야 하며, 없으면 아이콘 없이 그립니다.
+한글 글꼴은 CARD_FONT_PATH(본문), CARD_FONT_BOLD_PATH(제목) 환경 변수로 지정하고,
+없으면 시스템에 설치된 나눔고딕/Noto Sans CJK/Apple SD 고딕/맑은 고딕 순으로 찾습니다.
+
+글꼴, 글자 폭 측정, 줄바꿈 결과, 타입별 배경 템플릿, 아이콘 이미지는 프로세스 안에서
+캐시하므로 같은 프로세스가 그리는 카드와 카드뉴스끼리 공유됩니다.
+"""
+import argparse
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from image_prep import BRAND_PRIMARY, BRAND_SECONDARY
+
+
+CARD_SIZE = 1080
+MARGIN = 96
+ICON_SIZE = 220
+HEAD_SIZES = {"cover": 88}  # 카드 타입별 제목 글자 크기 (기본 68)
+DEFAULT_HEAD_SIZE = 68
+BODY_SIZE = 40
+LINE_SPACING = 1.4
+MAX_HEAD_LINES = 4
+MAX_BODY_LINES = 9
+BRAND_LABEL = "충남콘텐츠진흥원"
+
+# build_card_image_prompt의 타입별 배경 가이드에 맞춘 색: (배경, 제목, 본문, 보조)
+TYPE_THEMES = {
+    "cover": (BRAND_PRIMARY, "#FFFFFF", "#EADDFF", "#D0BCFF"),
+    "program": ("#F7F5FA", BRAND_PRIMARY, "#1C1B1F", BRAND_SECONDARY),
+    "impact": ("#F7F5FA", BRAND_PRIMARY, "#1C1B1F", BRAND_SECONDARY),
+    "result": ("#F7F5FA", BRAND_PRIMARY, "#1C1B1F", BRAND_SECONDARY),
+    "closing": ("#E3F1F4", BRAND_PRIMARY, "#1C1B1F", BRAND_SECONDARY),
+}
+DEFAULT_THEME = TYPE_THEMES["program"]
+
+FONT_CANDIDATES = [
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "C:/Windows/Fonts/malgun.ttf",
+]
+BOLD_FONT_CANDIDATES = [
+    "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Bold.ttc",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "C:/Windows/Fonts/malgunbd.ttf",
+]
+
+
+def _pil():
+    """Pillow 모듈을 지연 로드합니다. (Pillow 없이도 나머지 기능은 동작)"""
+    try:
+        from PIL import Image, ImageDraw, ImageFont
+    except ImportError as e:
+        raise RuntimeError("카드 PNG 렌더링에는 Pillow가 필요합니다. (pip install pillow)") from e
+    return Image, ImageDraw, ImageFont
+
+
+def is_available() -> bool:
+    """Pillow가 설치되어 있어 렌더링할 수 있는지 반환합니다."""
+    try:
+        _pil()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _find_font(env_name: str, candidates: Sequence[str]) -> Optional[str]:
+    path = os.getenv(env_name)
+    if path and os.path.exists(path):
+        return path
+    return next((candidate for candidate in candidates if os.path.exists(candidate)), None)
+
+
+@lru_cache(maxsize=32)
+def _font(bold: bool, size: int):
+    """글꼴을 크기별로 한 번만 읽습니다."""
+    _, _, ImageFont = _pil()
+    path = _find_font("CARD_FONT_BOLD_PATH", BOLD_FONT_CANDIDATES) if bold else None
+    path = path or _find_font("CARD_FONT_PATH", FONT_CANDIDATES)
+    if path:
+        return ImageFont.truetype(path, size)
+    print("[카드 렌더링] 한글 글꼴을 찾지 못해 기본 글꼴을 사용합니다. (CARD_FONT_PATH 설정 필요)")
+    return ImageFont.load_default(size)
+
+
+@lru_cache(maxsize=8192)
+def _text_width(bold: bool, size: int, text: str) -> float:
+    """글자열 폭을 측정합니다. 같은 글꼴/문자열은 다시 측정하지 않습니다."""
+    return _font(bold, size).getlength(text)
+
+
+def wrap_text(text: str, max_width: float, measure: Callable[[str], float], max_lines: int) -> List[str]:
+    """
+    글자열을 max_width 안에 들어가도록 줄바꿈합니다.
+
+    단어(공백) 단위로 먼저 나누고, 한 단어가 너무 길면 글자 단위로 나눕니다.
+    max_lines를 넘으면 마지막 줄을 "…"로 줄입니다.
+
+    Args:
+        text: 줄바꿈할 글자열
+        max_width: 한 줄 최대 폭 (픽셀)
+        measure: 글자열 폭을 재는 함수
+        max_lines: 최대 줄 수
+
+    Returns:
+        줄 리스트
+    """
+    lines: List[str] = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split():
+            candidate = f"{line} {word}" if line else word
+            if measure(candidate) <= max_width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+                line = ""
+            while measure(word) > max_width:
+                # 글자 단위로 들어가는 만큼 자름
+                cut = 1
+                while cut < len(word) and measure(word[:cut + 1]) <= max_width:
+                    cut += 1
+                lines.append(word[:cut])
+                word = word[cut:]
+            line = word
+        if line:
+            lines.append(line)
+
+    if len(lines) > max_lines:
+        last = lines[max_lines - 1]
+        while last and measure(last + "…") > max_width:
+            last = last[:-1]
+        lines = lines[:max_lines - 1] + [last.rstrip() + "…"]
+    return lines
+
+
+@lru_cache(maxsize=4096)
+def _layout(bold: bool, size: int, text: str, max_width: int, max_lines: int) -> Tuple[str, ...]:
+    """줄바꿈 결과를 캐시합니다."""
+    return tuple(wrap_text(text, max_width, lambda s: _text_width(bold, size, s), max_lines))
+
+
+@lru_cache(maxsize=8)
+def _background(card_type: str):
+    """타입별 배경 템플릿(배경색, 브랜드 장식)을 한 번만 그립니다."""
+    Image, ImageDraw, _ = _pil()
+    background, title_color, _, accent = TYPE_THEMES.get(card_type, DEFAULT_THEME)
+    image = Image.new("RGB", (CARD_SIZE, CARD_SIZE), background)
+    draw = ImageDraw.Draw(image)
+    if card_type == "cover":
+        # 오른쪽 위 장식 원
+        draw.ellipse((CARD_SIZE - 420, -180, CARD_SIZE + 180, 420), fill=BRAND_SECONDARY)
+    else:
+        # 왼쪽 브랜드 막대와 아래쪽 구분선
+        draw.rectangle((0, 0, 16, CARD_SIZE), fill=title_color)
+        draw.rectangle((MARGIN, CARD_SIZE - MARGIN + 24, CARD_SIZE - MARGIN, CARD_SIZE - MARGIN + 28), fill=accent)
+    draw.text((MARGIN, MARGIN - 24), BRAND_LABEL, font=_font(True, 30), fill=accent)
+    return image
+
+
+@lru_cache(maxsize=256)
+def _icon_image(svg: bytes, size: int):
+    """SVG 아이콘을 PNG 이미지로 변환합니다. CairoSVG가 없으면 None."""
+    try:
+        import cairosvg
+    except ImportError:
+        return None
+    Image, _, _ = _pil()
+    try:
+        png = cairosvg.svg2png(bytestring=svg, output_width=size, output_height=size)
+        return Image.open(io.BytesIO(png)).convert("RGBA")
+    except Exception as e:
+        print(f"[아이콘 렌더링 오류] {e}")
+        return None
+
+
+def _tint(icon, color: str):
+    """currentColor 아이콘(검은색)을 브랜드 색으로 칠합니다."""
+    Image, _, _ = _pil()
+    solid = Image.new("RGBA", icon.size, color)
+    solid.putalpha(icon.getchannel("A"))
+    return solid
+
+
+def render_card(card: Dict[str, str], icons: Sequence[bytes] = (), index: int = 1, total: int = 1) -> bytes:
+    """
+    카드 한 장을 PNG로 그립니다.
+
+    Args:
+        card: 카드 정보 (type, head, body)
+        icons: 카드에 그릴 SVG 아이콘 데이터 (첫 번째 아이콘을 사용)
+        index: 카드 번호 (1부터)
+        total: 전체 카드 수
+
+    Returns:
+        PNG 바이너리 데이터
+    """
+    _, ImageDraw, _ = _pil()
+    card_type = (card.get("type") or "").lower()
+    _, title_color, body_color, accent = TYPE_THEMES.get(card_type, DEFAULT_THEME)
+    image = _background(card_type).copy()
+    draw = ImageDraw.Draw(image)
+    text_width = CARD_SIZE - MARGIN * 2
+
+    page = f"{index} / {total}"
+    draw.text((CARD_SIZE - MARGIN - _text_width(False, 30, page), MARGIN - 24), page, font=_font(False, 30), fill=accent)
+
+    head_size = HEAD_SIZES.get(card_type, DEFAULT_HEAD_SIZE)
+    y = MARGIN + (220 if card_type == "cover" else 90)
+    for line in _layout(True, head_size, card.get("head", ""), text_width, MAX_HEAD_LINES):
+        draw.text((MARGIN, y), line, font=_font(True, head_size), fill=title_color)
+        y += int(head_size * 1.25)
+
+    body = card.get("body", "")
+    if body:
+        y += 40
+        body_lines = _layout(False, BODY_SIZE, body, text_width, MAX_BODY_LINES)
+        for line in body_lines:
+            draw.text((MARGIN, y), line, font=_font(False, BODY_SIZE), fill=body_color)
+            y += int(BODY_SIZE * LINE_SPACING)
+
+    for svg in icons[:1]:
+        icon = _icon_image(svg, ICON_SIZE)
+        if icon is not None:
+            icon = _tint(icon, "#FFFFFF" if card_type == "cover" else BRAND_PRIMARY)
+            position = (CARD_SIZE - MARGIN - ICON_SIZE, CARD_SIZE - MARGIN - ICON_SIZE - 20)
+            image.paste(icon, position, icon)
+
+    output = io.BytesIO()
+    image.save(output, format="PNG", optimize=False, compress_level=6)
+    return output.getvalue()
+
+
+def render_deck(cards: Sequence[Dict[str, str]], deck_images: Optional[Sequence[Dict]] = None) -> List[bytes]:
+    """
+    카드뉴스 한 벌을 PNG 리스트로 그립니다.
+
+    Args:
+        cards: 카드 리스트
+        deck_images: prepare_deck_images 결과 (있으면 카드별 아이콘을 그림)
+
+    Returns:
+        카드 순서대로 PNG 바이너리 데이터 리스트
+    """
+    pngs = []
+    for idx, card in enumerate(cards):
+        icons: List[bytes] = []
+        if deck_images and idx < len(deck_images):
+            images = deck_images[idx]
+            icons = [icon["data"] for icon in images.get("material_downloaded", []) + images.get("iconify_downloaded", [])]
+        pngs.append(render_card(card, icons, idx + 1, len(cards)))
+    return pngs
+
+
+def _render_deck_job(job: Tuple[List[Dict[str, str]], Optional[List[Dict]]]) -> List[bytes]:
+    cards, deck_images = job
+    return render_deck(cards, deck_images)
+
+
+def render_decks(
+    decks: Sequence[Tuple[Sequence[Dict[str, str]], Optional[Sequence[Dict]]]],
+    max_workers: Optional[int] = None,
+) -> List[List[bytes]]:
+    """
+    여러 카드뉴스를 프로세스 풀에서 나눠 그립니다.
+
+    작업 프로세스는 글꼴/배경/줄바꿈 캐시를 유지한 채 여러 카드뉴스를 처리합니다.
+
+    Args:
+        decks: (카드 리스트, prepare_deck_images 결과 또는 None) 튜플 리스트
+        max_workers: 프로세스 수 (기본값: 환경 변수 CARD_RENDER_WORKERS 또는 CPU 수). 1이면 현재 프로세스에서 처리.
+
+    Returns:
+        카드뉴스 순서대로 PNG 리스트의 리스트
+    """
+    if max_workers is None:
+        max_workers = int(os.getenv("CARD_RENDER_WORKERS", os.cpu_count() or 1))
+    jobs = [
+        ([card.to_dict() if hasattr(card, "to_dict") else dict(card) for card in cards], list(images) if images else None)
+        for cards, images in decks
+    ]
+    if max_workers <= 1 or len(jobs) <= 1:
+        return [_render_deck_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+        return list(executor.map(_render_deck_job, jobs))
+
+
+def main():
+    """메인 실행 함수"""
+    from cache_manager import get_cached_script
+    from card_parser import parse_card_script
+    from daily_recommendations import load_daily_recommendations
+    from image_prep import prepare_deck_images
+
+    parser = argparse.ArgumentParser(description="카드뉴스 PNG 렌더링")
+    parser.add_argument("-o", "--output", default="rendered_cards", help="PNG를 저장할 디렉터리")
+    parser.add_argument("--workers", type=int, help="렌더링 프로세스 수")
+    parser.add_argument("--no-icons", action="store_true", help="아이콘 없이 렌더링")
+    args = parser.parse_args()
+
+    decks = []
+    titles = []
+    for article in load_daily_recommendations():
+        script = get_cached_script(article.get("link", "") or article.get("title", ""))
+        cards = parse_card_script(script) if script else []
+        if cards:
+            decks.append((cards, None if args.no_icons else prepare_deck_images(cards)))
+            titles.append(article.get("title", ""))
+    if not decks:
+        print("[카드 렌더링] 카드뉴스 문구가 있는 추천 기사가 없습니다.")
+        return
+
+    started = time.monotonic()
+    rendered = render_decks(decks, args.workers)
+    elapsed = time.monotonic() - started
+    for deck_idx, pngs in enumerate(rendered, 1):
+        deck_dir = os.path.join(args.output, f"{deck_idx:02d}")
+        os.makedirs(deck_dir, exist_ok=True)
+        for card_idx, png in enumerate(pngs, 1):
+            with open(os.path.join(deck_dir, f"card_{card_idx:02d}.png"), "wb") as f:
+                f.write(png)
+    total = sum(len(pngs) for pngs in rendered)
+    print(f"[카드 렌더링] 카드뉴스 {len(rendered)}개, 카드 {total}장 / {elapsed:.2f}초 → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""크롤링 지표 수집 모듈 - 키워드별 기사 수, 중복 제거 수, 단계별 소요 시간, API 호출 수"""
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List
+
+
+class CrawlMetrics:
+    """
+    크롤링 한 번의 지표를 모읍니다. to_dict() 결과를 크롤링 기록과 함께 저장합니다.
+
+    키워드별로 검색 결과 수(raw), 중복 제거 후 남은 수(unique), 최종 추천에 들어간 수(selected),
+    API 요청 수(calls)를 셉니다. 같은 기사를 여러 키워드가 찾았으면 먼저 찾은 키워드에 셉니다.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.api_calls: Dict[str, int] = {}
+        self.keywords: Dict[str, Dict[str, int]] = {}
+        self.raw_count = 0
+        self.unique_count = 0
+        self.selected_count = 0
+        self._sources: Dict[int, str] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """with 블록의 소요 시간을 name 단계에 더합니다."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+
+    def add_api_calls(self, api: str, count: int) -> None:
+        """
+        API 요청 수를 더합니다.
+
+        Args:
+            api: API 이름 ("naver", "gemini", "title", "slack" 등)
+            count: 요청 수
+        """
+        if count:
+            self.api_calls[api] = self.api_calls.get(api, 0) + count
+
+    def _keyword(self, keyword: str) -> Dict[str, int]:
+        return self.keywords.setdefault(keyword, {"raw": 0, "unique": 0, "selected": 0, "calls": 0})
+
+    def record_search(self, keyword: str, articles: List[Dict], calls: int) -> None:
+        """
+        키워드 검색 결과를 기록합니다.
+
+        Args:
+            keyword: 검색 키워드
+            articles: 검색된 기사 리스트 (이후 단계에서 같은 객체를 넘겨야 키워드별로 셀 수 있음)
+            calls: 이 검색에 쓴 네이버 API 요청 수
+        """
+        stats = self._keyword(keyword)
+        stats["raw"] += len(articles)
+        stats["calls"] += calls
+        self.raw_count += len(articles)
+        self.add_api_calls("naver", calls)
+        for article in articles:
+            self._sources.setdefault(id(article), keyword)
+
+    def _count(self, articles: Iterable[Dict], field: str) -> int:
+        total = 0
+        for article in articles:
+            keyword = self._sources.get(id(article))
+            if keyword is not None:
+                self._keyword(keyword)[field] += 1
+            total += 1
+        return total
+
+    def record_unique(self, articles: List[Dict]) -> None:
+        """중복 제거 후 남은 기사를 기록합니다."""
+        self.unique_count = self._count(articles, "unique")
+
+    def record_selected(self, articles: List[Dict]) -> None:
+        """최종 추천 기사를 기록합니다."""
+        self.selected_count = self._count(articles, "selected")
+
+    def to_dict(self) -> Dict:
+        """
+        저장할 지표를 반환합니다.
+
+        Returns:
+            {"raw", "unique", "dedup_dropped", "selected", "stages"(초), "api_calls", "keywords"} 딕셔너리
+        """
+        return {
+            "raw": self.raw_count,
+            "unique": self.unique_count,
+            "dedup_dropped": self.raw_count - self.unique_count,
+            "selected": self.selected_count,
+            "stages": {name: round(seconds, 3) for name, seconds in self.stages.items()},
+            "api_calls": dict(self.api_calls),
+            "keywords": {keyword: dict(stats) for keyword, stats in self.keywords.items()},
+        }
@@ -4,15 +4,21 @@ import sys
 import time
 from datetime import datetime
 from difflib import SequenceMatcher
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-import requests
 from dotenv import load_dotenv
 
+from cache_manager import get_cached_summary
+from crawl_metrics import CrawlMetrics
 from daily_recommendations import load_daily_recommendations, save_daily_recommendations
+from gemini_api import GEMINI_API_BASE
+from gemini_client import get_gemini_client
+from generation_manager import get_or_create_summaries
 from history_manager import add_crawl_history
 from logger import logger
-from naver_api import search_naver_news
+from naver_api import get_request_count, search_naver_news
+from slack_blocks import DIGEST_SIZE, clean_html_tags, digest_blocks, render_article_blocks
+from slack_dispatcher import get_slack_dispatcher
 from title_extractor import extract_full_title_from_url
 
 
@@ -209,52 +215,63 @@ def calculate_relevance_score(article: Dict, keywords: List[str]) -> float:
     return min(score, 10.0)
 
 
-def fetch_daily_recommendations() -> List[Dict]:
+def fetch_daily_recommendations(metrics: Optional[CrawlMetrics] = None) -> List[Dict]:
     """
     여러 키워드로 뉴스를 검색하고, 중복 제거 및 관련도 점수 계산 후 추천 기사를 반환합니다.
     
+    Args:
+        metrics: 키워드별 기사 수, 단계별 소요 시간, API 요청 수를 기록할 지표 (선택)
+        
     Returns:
         추천 기사 리스트 (관련도 점수 내림차순 정렬)
     """
+    metrics = metrics or CrawlMetrics()
     all_articles = []
     
     logger.info(f"크롤링 시작: {len(SEARCH_KEYWORDS)}개 키워드로 검색")
     
     # 관련도순과 날짜순 모두 검색하여 더 많은 기사 수집
-    for keyword in SEARCH_KEYWORDS:
-        logger.info(f"키워드 검색 중: {keyword}")
-        # 날짜순 검색 (최신 기사)
-        articles_date = search_naver_news(keyword, display=100, sort="date")
-        all_articles.extend(articles_date)
-        logger.info(f"키워드 '{keyword}' (날짜순): {len(articles_date)}개 기사 발견")
-        
-        # 관련도순 검색 (관련도 높은 기사) - 중복이지만 다른 기사도 포함될 수 있음
-        articles_sim = search_naver_news(keyword, display=100, sort="sim")
-        all_articles.extend(articles_sim)
-        logger.info(f"키워드 '{keyword}' (관련도순): {len(articles_sim)}개 기사 발견")
-        
-        # API 호출 제한을 고려하여 짧은 대기
-        time.sleep(0.1)
+    with metrics.stage("search"):
+        for keyword in SEARCH_KEYWORDS:
+            logger.info(f"키워드 검색 중: {keyword}")
+            calls_before = get_request_count()
+            # 날짜순 검색 (최신 기사)
+            articles_date = search_naver_news(keyword, display=100, sort="date")
+            all_articles.extend(articles_date)
+            logger.info(f"키워드 '{keyword}' (날짜순): {len(articles_date)}개 기사 발견")
+            
+            # 관련도순 검색 (관련도 높은 기사) - 중복이지만 다른 기사도 포함될 수 있음
+            articles_sim = search_naver_news(keyword, display=100, sort="sim")
+            all_articles.extend(articles_sim)
+            logger.info(f"키워드 '{keyword}' (관련도순): {len(articles_sim)}개 기사 발견")
+            metrics.record_search(keyword, articles_date + articles_sim, get_request_count() - calls_before)
+            
+            # API 호출 제한을 고려하여 짧은 대기
+            time.sleep(0.1)
     
     logger.info(f"중복 제거 전: {len(all_articles)}개 기사")
-    unique_articles = remove_duplicate_articles(all_articles)
+    with metrics.stage("dedupe"):
+        unique_articles = remove_duplicate_articles(all_articles)
+    metrics.record_unique(unique_articles)
     logger.info(f"중복 제거 후: {len(unique_articles)}개 기사 (제거: {len(all_articles) - len(unique_articles)}개)")
     
     # 관련도 점수 계산 (전체 제목 추출 전에 먼저 점수 계산)
     logger.info("관련도 점수 계산 중...")
-    scored_articles = []
-    for idx, article in enumerate(unique_articles, 1):
-        score = calculate_relevance_score(article, SEARCH_KEYWORDS)
-        # 10점 만점으로 제한 (혹시 모를 오버플로우 방지)
-        score = min(score, 10.0)
-        article["relevance_score"] = score
-        scored_articles.append(article)
-    
-    # 관련도 점수 내림차순 정렬
-    scored_articles.sort(key=lambda x: x.get("relevance_score", 0), reverse=True)
+    with metrics.stage("score"):
+        scored_articles = []
+        for idx, article in enumerate(unique_articles, 1):
+            score = calculate_relevance_score(article, SEARCH_KEYWORDS)
+            # 10점 만점으로 제한 (혹시 모를 오버플로우 방지)
+            score = min(score, 10.0)
+            article["relevance_score"] = score
+            scored_articles.append(article)
+        
+        # 관련도 점수 내림차순 정렬
+        scored_articles.sort(key=lambda x: x.get("relevance_score", 0), reverse=True)
     
     # 상위 기사만 선정 (최대 50개)
     top_articles = scored_articles[:50]
+    metrics.record_selected(top_articles)
     
     # 상위 기사에만 전체 제목 추출 (크롤링 시간 단축)
     # 상위 20개만 전체 제목 추출 (나머지는 기존 제목 사용)
@@ -263,7 +280,9 @@ def fetch_daily_recommendations() -> List[Dict]:
         original_link = article.get("originallink") or article.get("link", "")
         if original_link:
             logger.info(f"[{idx}/{min(20, len(top_articles))}] 전체 제목 추출 중: {original_link[:50]}...")
-            full_title = extract_full_title_from_url(original_link)
+            metrics.add_api_calls("title", 1)
+            with metrics.stage("titles"):
+                full_title = extract_full_title_from_url(original_link)
             if full_title:
                 article["full_title"] = full_title.strip()
                 logger.info(f"  → 전체 제목 추출 성공: {full_title[:50]}...")
@@ -275,40 +294,46 @@ def fetch_daily_recommendations() -> List[Dict]:
     return top_articles
 
 
-def _clean_html_tags(text: str) -> str:
-    """HTML 태그를 제거하고 텍스트만 반환합니다."""
-    import re
-    if not text:
-        return ""
-    # HTML 태그 제거
-    text = re.sub(r'<[^>]+>', '', text)
-    # HTML 엔티티 디코딩
-    text = text.replace('&quot;', '"').replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
-    text = text.replace('&nbsp;', ' ').replace('&#39;', "'").replace('&apos;', "'")
-    # 연속된 공백 정리
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
+def warm_summary_cache(articles: List[Dict]) -> int:
+    """
+    요약 캐시가 없는 추천 기사를 일괄 요약하여 캐시에 저장합니다.
+    
+    Args:
+        articles: 기사 리스트 (관련도 순)
+        
+    Returns:
+        새로 저장한 요약 개수
+    """
+    if not os.getenv("GEMINI_API_KEY"):
+        logger.warning("GEMINI_API_KEY가 설정되지 않아 요약 미리 생성을 건너뜁니다.")
+        return 0
+    
+    pending = []
+    for article in articles:
+        title = clean_html_tags(article.get("title", ""))
+        article_id = article.get("link", "") or title
+        if not article_id or get_cached_summary(article_id):
+            continue
+        pending.append({
+            "id": article_id,
+            "title": clean_html_tags(article.get("full_title") or article.get("title", "")),
+            "content": clean_html_tags(article.get("description", "")),
+        })
+    
+    if not pending:
+        logger.info("요약 미리 생성: 모든 기사의 요약이 이미 캐시에 있습니다.")
+        return 0
+    
+    logger.info(f"요약 미리 생성 중: {len(pending)}개 기사")
+    # 거의 같은 기사(같은 보도자료 재게재)는 한 번만 요약
+    summaries = get_or_create_summaries(pending)
+    logger.info(f"요약 미리 생성 완료: {len(summaries)}/{len(pending)}개 기사")
+    return len(summaries)
 
 
-def _format_date(pub_date: str) -> str:
-    """날짜를 한국어 형식으로 변환합니다."""
-    if not pub_date:
-        return "날짜 정보 없음"
-    
-    try:
-        # ISO 형식 파싱 (예: "2025-12-30T10:30:00+09:00")
-        if 'T' in pub_date:
-            date_str = pub_date.split('T')[0]
-            dt = datetime.strptime(date_str, "%Y-%m-%d")
-        else:
-            dt = datetime.strptime(pub_date, "%Y-%m-%d")
-        
-        # 한국어 형식: "2025.12.30 (화)"
-        weekdays = ["월", "화", "수", "목", "금", "토", "일"]
-        weekday = weekdays[dt.weekday()]
-        return f"{dt.strftime('%Y.%m.%d')} ({weekday})"
-    except Exception:
-        return pub_date
+def _gemini_requests() -> int:
+    """지금까지 보낸 Gemini API 요청 수 (재시도 포함)"""
+    return get_gemini_client(GEMINI_API_BASE).requests_sent
 
 
 def send_slack_notification(articles: List[Dict]) -> bool:
@@ -316,7 +341,7 @@ def send_slack_notification(articles: List[Dict]) -> bool:
     Slack으로 일일 추천 기사를 전송합니다.
     
     Args:
-        articles: 기사 리스트 (상위 5개만 전송)
+        articles: 기사 리스트 (상위 DIGEST_SIZE개만 전송)
         
     Returns:
         전송 성공 여부
@@ -326,156 +351,17 @@ def send_slack_notification(articles: List[Dict]) -> bool:
         logger.warning("SLACK_WEBHOOK_URL이 설정되지 않아 Slack 알림을 건너뜁니다.")
         return False
     
-    # 상위 5개만 전송
-    top_5 = articles[:5]
-    
-    # Block Kit 형식으로 메시지 구성
-    blocks = [
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "📰 오늘의 추천 기사",
-            },
-        },
-        {
-            "type": "divider",
-        },
-    ]
-    
-    for idx, article in enumerate(top_5, 1):
-        # 기사 정보 추출 및 HTML 태그 제거
-        title = _clean_html_tags(article.get("title", ""))
-        description = _clean_html_tags(article.get("description", ""))
-        link = article.get("link", "")
-        score = article.get("relevance_score", 0)
-        pub_date = article.get("pubDate", "")
-        
-        # 날짜 포맷팅
-        formatted_date = _format_date(pub_date)
-        
-        # 요약 정보 가져오기 (캐시에서)
-        article_id = link or title
-        try:
-            from cache_manager import get_cached_summary
-            summary = get_cached_summary(article_id)
-        except Exception:
-            summary = None
-        
-        # 기사 제목 (제목만 강조)
-        blocks.append({
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"*{idx}. {title}*",
-            },
-        })
-        
-        # 메타 정보 (날짜, 관련도 점수)
-        blocks.append({
-            "type": "context",
-            "elements": [
-                {
-                    "type": "mrkdwn",
-                    "text": f"📅 {formatted_date}  |  📊 관련도: {score:.1f}/10점",
-                },
-            ],
-        })
-        
-        # 기사 설명 (간략)
-        if description:
-            desc_short = description[:150] + "..." if len(description) > 150 else description
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": desc_short,
-                },
-            })
-        
-        # 요약이 있으면 표시
-        if summary:
-            # 요약 요약 (너무 길면 잘라내기)
-            summary_short = summary[:200] + "..." if len(summary) > 200 else summary
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*📄 요약:*\n{summary_short}",
-                },
-            })
-        
-        # 버튼들
-        buttons = []
-        if link:
-            buttons.append({
-                "type": "button",
-                "text": {
-                    "type": "plain_text",
-                    "text": "🔗 기사 보기",
-                },
-                "url": link,
-                "action_id": f"view_article_{idx}",
-            })
-        
-        # 카드뉴스 생성 버튼
-        slack_app_url = os.getenv("SLACK_APP_URL")
-        if slack_app_url:
-            # Interactive 버튼 (Slack App 서버로 요청)
-            buttons.append({
-                "type": "button",
-                "text": {
-                    "type": "plain_text",
-                    "text": "📄 요약 보기",
-                },
-                "action_id": f"view_summary_{idx}",
-                "value": str(idx),
-            })
-            
-            buttons.append({
-                "type": "button",
-                "text": {
-                    "type": "plain_text",
-                    "text": "📝 카드뉴스 생성",
-                },
-                "action_id": f"create_cardnews_{idx}",
-                "value": str(idx),
-            })
-        else:
-            # 일반 URL 버튼 (Streamlit 앱 링크)
-            streamlit_base_url = os.getenv("STREAMLIT_APP_URL", "https://cardnews1-hd646zyxsbzawjaibtjgar.streamlit.app")
-            import urllib.parse
-            streamlit_url = f"{streamlit_base_url}?article_url={urllib.parse.quote(link)}" if link else streamlit_base_url
-            buttons.append({
-                "type": "button",
-                "text": {
-                    "type": "plain_text",
-                    "text": "📝 카드뉴스 생성",
-                },
-                "url": streamlit_url,
-                "action_id": f"create_cardnews_{idx}",
-            })
-        
-        if buttons:
-            blocks.append({
-                "type": "actions",
-                "elements": buttons,
-            })
-        
-        # 구분선
-        if idx < len(top_5):
-            blocks.append({"type": "divider"})
+    # 크롤링할 때 저장해 둔 기사 블록을 그대로 사용 (값이 바뀐 기사만 다시 만듦)
+    blocks = digest_blocks(articles, summary_lookup=get_cached_summary)
     
     payload = {"blocks": blocks}
     
-    try:
-        resp = requests.post(webhook_url, json=payload, timeout=10)
-        resp.raise_for_status()
-        logger.info(f"Slack 알림 전송 완료: {len(top_5)}개 기사")
+    # 429(Retry-After)/5xx는 전송기가 다시 시도
+    if get_slack_dispatcher().post_url(webhook_url, payload):
+        logger.info(f"Slack 알림 전송 완료: {len(articles[:DIGEST_SIZE])}개 기사")
         return True
-    except Exception as e:
-        logger.error(f"Slack 알림 전송 실패: {e}")
-        return False
+    logger.error("Slack 알림 전송 실패")
+    return False
 
 
 def main():
@@ -519,18 +405,33 @@ def main():
         log_and_print("일일 자동 크롤링 시작")
         log_and_print("=" * 60)
         
-        articles = fetch_daily_recommendations()
+        metrics = CrawlMetrics()
+        articles = fetch_daily_recommendations(metrics)
         
         if articles:
             # daily_recommendations.json에 저장
-            save_daily_recommendations(articles)
+            with metrics.stage("save"):
+                save_daily_recommendations(articles)
             log_and_print(f"저장 완료: {len(articles)}개 기사를 daily_recommendations.json에 저장")
             
-            # 크롤링 기록 저장
-            add_crawl_history("일일 자동 크롤링", len(articles))
+            # 요약 미리 생성 (Slack 알림과 앱에서 캐시된 요약 사용)
+            gemini_before = _gemini_requests()
+            with metrics.stage("summaries"):
+                warm_summary_cache(articles)
+            metrics.add_api_calls("gemini", _gemini_requests() - gemini_before)
+            
+            # Slack 블록을 미리 만들어 추천 기사와 함께 저장 (알림/목록은 저장된 블록을 그대로 보냄)
+            with metrics.stage("blocks"):
+                render_article_blocks(articles, summary_lookup=get_cached_summary)
+                save_daily_recommendations(articles)
             
             # Slack 알림 전송
-            send_slack_notification(articles)
+            with metrics.stage("notify"):
+                if send_slack_notification(articles):
+                    metrics.add_api_calls("slack", 1)
+            
+            # 크롤링 기록 저장 (키워드별 기사 수, 단계별 소요 시간, API 요청 수 포함)
+            add_crawl_history("일일 자동 크롤링", len(articles), metrics=metrics.to_dict())
         else:
             log_and_print("추천 기사를 찾을 수 없습니다.", "warning")
     
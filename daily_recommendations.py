@@ -1,16 +1,162 @@
 """일일 추천 기사 관리 모듈"""
+import hashlib
 import json
 import os
+import threading
+import time
 from datetime import datetime
 from typing import Dict, List, Optional
 
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
-DAILY_RECOMMENDATIONS_FILE = os.path.join(DATA_DIR, "daily_recommendations.json")
+DAILY_RECOMMENDATIONS_FILE = os.getenv("DAILY_RECOMMENDATIONS_FILE", os.path.join(DATA_DIR, "daily_recommendations.json"))
+
+DEFAULT_CHECK_INTERVAL = 1.0  # 파일 변경 확인 최소 간격 (초)
+BUTTON_VALUE_PREFIX = "id:"  # Slack 버튼 value에 고정 ID를 담을 때 붙이는 접두사 (예전 버튼은 순번)
 
 os.makedirs(DATA_DIR, exist_ok=True)
 
 
+def article_stable_id(article: Dict) -> str:
+    """
+    기사의 고정 ID를 반환합니다. 링크(없으면 제목)의 해시라서 다시 크롤링해도 같은 기사는 같은 ID입니다.
+    
+    Args:
+        article: 기사 정보 (id가 이미 있으면 그대로 사용)
+        
+    Returns:
+        12자리 16진수 ID
+    """
+    if article.get("id"):
+        return article["id"]
+    key = article.get("link") or article.get("title", "")
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+
+
+def _assign_ids(articles: List[Dict]) -> List[Dict]:
+    for article in articles:
+        article["id"] = article_stable_id(article)
+    return articles
+
+
+class RecommendationsStore:
+    """
+    추천 기사를 메모리에 두고 ID로 바로 찾는 저장소입니다.
+    
+    파일의 수정 시각/크기가 바뀐 경우에만 다시 읽으며, 변경 확인도 check_interval초에
+    한 번만 합니다. 예전 파일처럼 id가 없는 기사는 읽을 때 고정 ID를 붙입니다.
+    """
+    
+    def __init__(self, path: str = DAILY_RECOMMENDATIONS_FILE, check_interval: float = DEFAULT_CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._signature = None
+        self._checked_at = 0.0
+        self._articles: List[Dict] = []
+        self._by_id: Dict[str, Dict] = {}
+        self._date: Optional[str] = None
+        self._version: Optional[str] = None
+    
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval and self._signature is not None:
+            return
+        self._checked_at = now
+        try:
+            stat = os.stat(self.path)
+            signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = ()
+        if signature == self._signature:
+            return
+        
+        data = {}
+        if signature:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception as e:
+                # 저장 도중이면 다음 확인에서 다시 읽음
+                print(f"[daily_recommendations 로드 오류] {e}")
+                return
+        articles = _assign_ids(data.get("articles", []))
+        by_id: Dict[str, Dict] = {}
+        for article in articles:
+            by_id.setdefault(article["id"], article)
+        self._articles = articles
+        self._by_id = by_id
+        self._date = data.get("date")
+        self._version = data.get("version")
+        self._signature = signature
+    
+    def articles(self) -> List[Dict]:
+        """
+        현재 추천 기사 목록을 반환합니다.
+        
+        Returns:
+            기사 리스트 (읽기 전용으로 사용)
+        """
+        with self._lock:
+            self._refresh()
+            return self._articles
+    
+    def get(self, article_id: str) -> Optional[Dict]:
+        """
+        고정 ID로 기사를 찾습니다.
+        
+        Args:
+            article_id: article_stable_id()로 만든 ID
+            
+        Returns:
+            기사 정보. 없으면 None (다시 크롤링되어 목록에서 빠진 경우 등).
+        """
+        with self._lock:
+            self._refresh()
+            return self._by_id.get(article_id)
+    
+    def date(self) -> Optional[str]:
+        """추천 기사 날짜 (YYYY-MM-DD)"""
+        with self._lock:
+            self._refresh()
+            return self._date
+    
+    def version(self) -> Optional[str]:
+        """추천 기사 파일 버전 (저장할 때마다 바뀜)"""
+        with self._lock:
+            self._refresh()
+            return self._version
+    
+    def signature(self) -> tuple:
+        """
+        현재 읽어 둔 파일의 (inode, 수정 시각, 크기)를 반환합니다.
+        
+        Returns:
+            파일이 바뀌면 달라지는 튜플. 파일이 없으면 빈 튜플.
+        """
+        with self._lock:
+            self._refresh()
+            return self._signature or ()
+
+
+_store: Optional[RecommendationsStore] = None
+_store_lock = threading.Lock()
+
+
+def get_recommendations_store() -> RecommendationsStore:
+    """
+    프로세스 전체에서 공유하는 RecommendationsStore 인스턴스를 반환합니다.
+    
+    Returns:
+        공유 RecommendationsStore 인스턴스
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = RecommendationsStore()
+        return _store
+
+
 def load_daily_recommendations() -> List[Dict]:
     """
     daily_recommendations.json 파일에서 기사 목록을 로드합니다.
@@ -24,7 +170,7 @@ def load_daily_recommendations() -> List[Dict]:
     try:
         with open(DAILY_RECOMMENDATIONS_FILE, "r", encoding="utf-8") as f:
             data = json.load(f)
-            return data.get("articles", [])
+            return _assign_ids(data.get("articles", []))
     except (json.JSONDecodeError, KeyError, Exception) as e:
         print(f"[daily_recommendations 로드 오류] {e}")
         return []
@@ -34,17 +180,24 @@ def save_daily_recommendations(articles: List[Dict]) -> None:
     """
     daily_recommendations.json 파일에 기사 목록을 저장합니다.
     
+    각 기사에 고정 ID(id)를 붙이고, 읽는 쪽이 쓰다 만 파일을 보지 않도록
+    임시 파일에 쓴 뒤 교체합니다.
+    
     Args:
-        articles: 기사 리스트
+        articles: 기사 리스트 (id가 추가됨)
     """
+    now = datetime.now()
     data = {
-        "date": datetime.now().strftime("%Y-%m-%d"),
-        "articles": articles,
+        "date": now.strftime("%Y-%m-%d"),
+        "version": now.strftime("%Y%m%d%H%M%S%f"),
+        "articles": _assign_ids(articles),
     }
     
+    tmp_path = f"{DAILY_RECOMMENDATIONS_FILE}.{os.getpid()}.tmp"
     try:
-        with open(DAILY_RECOMMENDATIONS_FILE, "w", encoding="utf-8") as f:
+        with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, DAILY_RECOMMENDATIONS_FILE)
     except Exception as e:
         print(f"[daily_recommendations 저장 오류] {e}")
 
@@ -1,14 +1,41 @@
 """Google Gemini API 모듈 - 요약 및 카드뉴스 문구 생성"""
+import json
 import os
-import time
-from typing import Optional, List
+import re
+import threading
+from typing import Callable, Dict, List, Optional
 
 import requests
 
+from card_parser import CardParser
+from gemini_client import get_gemini_client
+from model_router import get_model_router
+from prompt_builder import (
+    BATCH_ARTICLE_TOKENS,
+    BATCH_PROMPT_TOKENS,
+    CARDNEWS_PROMPT_TOKENS,
+    COMBINED_PROMPT_TOKENS,
+    SUMMARY_PROMPT_TOKENS,
+    build_batch_prompt,
+    build_cardnews_prompt,
+    build_combined_prompt,
+    build_summary_prompt,
+    estimate_article_tokens,
+)
 
-GEMINI_API_BASE = "https://generativelanguage.googleapis.com/v1"
-MAX_RETRIES = 2
-RETRY_DELAY = 2  # 초
+
+GEMINI_API_BASE = os.getenv("GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1")
+SUMMARY_OUTPUT_TOKENS = 600  # 요약 350~450자 기준 예상 출력 토큰
+CARDNEWS_OUTPUT_TOKENS = 1200  # 카드 6~10장 기준 예상 출력 토큰
+
+# 일괄 요약 설정 (환경 변수로 덮어쓰기 가능)
+DEFAULT_BATCH_TOKEN_BUDGET = 6000
+DEFAULT_BATCH_MAX_ARTICLES = 8
+BATCH_OUTPUT_TOKENS_PER_ARTICLE = 500  # 요약 350~450자 + JSON 구조
+
+# 호출 종류별 누적 토큰 사용량 (프로세스 단위)
+_token_usage: Dict[str, Dict[str, int]] = {}
+_token_usage_lock = threading.Lock()
 
 
 def _get_available_models() -> List[str]:
@@ -45,55 +72,27 @@ def _get_available_models() -> List[str]:
         return []
 
 
-def _find_working_model() -> Optional[str]:
-    """사용 가능한 모델 중 하나를 찾아 반환합니다."""
-    available = _get_available_models()
-    if not available:
-        print("[경고] 사용 가능한 모델을 찾을 수 없습니다.")
-        return None
-    
-    # 우선순위: flash 계열 > pro 계열 > 기타
-    for model in available:
-        if "flash" in model.lower():
-            print(f"[모델 선택] {model}")
-            return model
+def _get_model_chain(kind: str = "generate") -> List[str]:
+    """
+    폴백 순서대로 정렬된 모델 목록을 반환합니다. (flash 계열 > pro 계열 > 기타)
     
-    for model in available:
-        if "pro" in model.lower():
-            print(f"[모델 선택] {model}")
-            return model
+    모델 목록은 라우터에 캐시되어 매 요청마다 다시 조회하지 않습니다.
     
-    # 첫 번째 모델 사용
-    print(f"[모델 선택] {available[0]}")
-    return available[0]
-
-
-def summarize_with_gemini(news_content: str, news_title: str) -> Optional[str]:
-    """기사 내용을 350~450자 한글 요약으로 생성합니다. (직접 REST 호출, v1 엔드포인트 사용)"""
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        print("GEMINI_API_KEY 환경 변수가 설정되지 않았습니다.")
-        return None
-
-    # 사용 가능한 모델 찾기
-    model_name = _find_working_model()
-    if not model_name:
-        print("[오류] 사용 가능한 Gemini 모델을 찾을 수 없습니다.")
-        return None
-
-    api_url = f"{GEMINI_API_BASE}/{model_name}:generateContent"
+    Args:
+        kind: 호출 종류 ("generate" / "stream", 오류율 집계 기준)
+        
+    Returns:
+        모델 이름 리스트. 사용 가능한 모델이 없으면 빈 리스트.
+    """
+    chain = get_model_router().chain(_get_available_models, kind=kind)
+    if not chain:
+        print("[경고] 사용 가능한 모델을 찾을 수 없습니다.")
+    return chain
 
-    prompt = (
-        "다음 뉴스 기사를 한국어로 자연스럽게 350~450자 사이로 요약해 주세요.\n\n"
-        "요약 형식:\n"
-        "1. 핵심 키워드(충남콘텐츠진흥원, 충콘진, 충남콘텐츠코리아랩, 충남콘텐츠기업지원센터, 충남글로벌게임센터, 충남음악창작소, 김곡미 등)를 **굵게** 표시하세요.\n"
-        "2. 핵심 키워드와 관련된 내용을 중심으로 요약하세요.\n"
-        "3. 마지막에 '충남콘텐츠진흥원의 관여도' 섹션을 별도로 추가하여, 진흥원이 이 기사에서 어떤 역할을 했는지, 어떤 사업/프로그램과 관련이 있는지 명확히 설명하세요.\n"
-        "4. 중복 표현은 줄이고, 핵심 내용 위주로 정리하세요.\n\n"
-        f"[제목]\n{news_title}\n\n[본문]\n{news_content}"
-    )
 
-    payload = {
+def _build_payload(prompt: str) -> Dict:
+    """프롬프트를 generateContent 요청 본문으로 변환합니다."""
+    return {
         "contents": [
             {
                 "parts": [
@@ -105,163 +104,432 @@ def summarize_with_gemini(news_content: str, news_title: str) -> Optional[str]:
         ]
     }
 
-    # 재시도 로직
-    for attempt in range(MAX_RETRIES):
-        try:
-            resp = requests.post(
-                api_url,
-                params={"key": api_key},
-                json=payload,
-                timeout=30,
-            )
-            if resp.status_code == 429:  # Rate limit
-                if attempt < MAX_RETRIES - 1:
-                    wait_time = RETRY_DELAY * (attempt + 1)
-                    print(f"[Gemini Rate Limit] {wait_time}초 대기 후 재시도...")
-                    time.sleep(wait_time)
-                    continue
-            if resp.status_code != 200:
-                print(f"[Gemini HTTP 오류] {resp.status_code} {resp.text}")
-                return None
-
-            data = resp.json()
-            candidates = data.get("candidates", [])
-            if not candidates:
-                print("[Gemini 응답 경고] candidates가 비어 있습니다.")
-                return None
-
-            parts = candidates[0].get("content", {}).get("parts", [])
-            if not parts:
-                print("[Gemini 응답 경고] parts가 비어 있습니다.")
-                return None
-
-            return parts[0].get("text", "")
-        except requests.exceptions.Timeout:
-            print(f"[Gemini 타임아웃] (시도 {attempt + 1}/{MAX_RETRIES})")
-            if attempt < MAX_RETRIES - 1:
-                time.sleep(RETRY_DELAY * (attempt + 1))
-        except Exception as e:
-            print(f"[Gemini 호출 오류] {e}")
-            if attempt < MAX_RETRIES - 1:
-                time.sleep(RETRY_DELAY * (attempt + 1))
+
+def _record_token_usage(label: str, estimated_tokens: int, usage: Optional[Dict]) -> None:
+    """
+    호출 1건의 입력/출력 토큰 수를 기록하고 로그로 남깁니다.
+    
+    Args:
+        label: 호출 종류 (예: "summary", "cardnews")
+        estimated_tokens: 로컬에서 추정한 입력 토큰 수
+        usage: 응답의 usageMetadata (없으면 None)
+    """
+    usage = usage or {}
+    prompt_tokens = int(usage.get("promptTokenCount", 0))
+    output_tokens = int(usage.get("candidatesTokenCount", 0))
+    
+    with _token_usage_lock:
+        stats = _token_usage.setdefault(
+            label,
+            {"calls": 0, "estimated_tokens": 0, "prompt_tokens": 0, "output_tokens": 0},
+        )
+        stats["calls"] += 1
+        stats["estimated_tokens"] += estimated_tokens
+        stats["prompt_tokens"] += prompt_tokens
+        stats["output_tokens"] += output_tokens
+    
+    print(
+        f"[Gemini 토큰] {label}: 입력 {prompt_tokens or '?'} (추정 {estimated_tokens}), 출력 {output_tokens or '?'}",
+        flush=True,
+    )
+
+
+def get_token_usage() -> Dict[str, Dict[str, int]]:
+    """
+    호출 종류별 누적 토큰 사용량을 반환합니다.
+    
+    Returns:
+        {호출 종류: {"calls", "estimated_tokens", "prompt_tokens", "output_tokens"}} 딕셔너리
+    """
+    with _token_usage_lock:
+        return {label: dict(stats) for label, stats in _token_usage.items()}
+
+
+def _extract_response_text(data: Optional[Dict]) -> Optional[str]:
+    """
+    generateContent 응답 JSON에서 첫 번째 후보의 텍스트를 꺼냅니다.
+    
+    Args:
+        data: 응답 JSON (요청 실패 시 None)
+        
+    Returns:
+        생성된 텍스트. 비어 있으면 None.
+    """
+    if data is None:
+        return None
+
+    candidates = data.get("candidates", [])
+    if not candidates:
+        print("[Gemini 응답 경고] candidates가 비어 있습니다.", flush=True)
+        print(f"[Gemini 응답] 전체 응답: {str(data)[:500]}", flush=True)
+        return None
+
+    parts = candidates[0].get("content", {}).get("parts", [])
+    if not parts:
+        print("[Gemini 응답 경고] parts가 비어 있습니다.", flush=True)
+        print(f"[Gemini 응답] candidates[0]: {str(candidates[0])[:500]}", flush=True)
+        return None
+
+    result_text = parts[0].get("text", "")
+    if not result_text:
+        print("[Gemini 응답 경고] text가 비어 있습니다.", flush=True)
+        return None
+    
+    print(f"[Gemini 성공] {len(result_text)}자 생성됨", flush=True)
+    return result_text
+
+
+def _generate_contents(
+    prompts: List[str],
+    input_tokens: List[int],
+    timeout: int = 30,
+    output_tokens: int = 0,
+    label: str = "generate",
+) -> List[Optional[str]]:
+    """
+    여러 프롬프트를 공유 클라이언트로 병렬 호출합니다. (동시성/속도 제한 적용)
+    
+    Args:
+        prompts: 전송할 프롬프트 리스트
+        input_tokens: 프롬프트별 추정 입력 토큰 수 (고정 템플릿 토큰 + 기사 토큰)
+        timeout: 요청 타임아웃 (초)
+        output_tokens: 요청당 예상 출력 토큰 수 (분당 토큰 제한 계산용)
+        label: 토큰 사용량 기록용 호출 종류
+        
+    Returns:
+        프롬프트 순서대로 정렬된 생성 텍스트 리스트 (실패한 항목은 None)
+    """
+    if not prompts:
+        return []
+
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        print("GEMINI_API_KEY 환경 변수가 설정되지 않았습니다.")
+        return [None] * len(prompts)
+
+    # 사용 가능한 모델 찾기 (첫 모델이 느리거나 실패하면 다음 모델 사용)
+    models = _get_model_chain()
+    if not models:
+        print("[오류] 사용 가능한 Gemini 모델을 찾을 수 없습니다.")
+        return [None] * len(prompts)
+
+    client = get_gemini_client(GEMINI_API_BASE)
+    responses = client.generate_many_sync(
+        models,
+        [_build_payload(prompt) for prompt in prompts],
+        timeout=timeout,
+        estimated_tokens=[tokens + output_tokens for tokens in input_tokens],
+    )
+    for tokens, data in zip(input_tokens, responses):
+        if data is not None:
+            _record_token_usage(label, tokens, data.get("usageMetadata"))
+    return [_extract_response_text(data) for data in responses]
+
+
+def _generate_content(
+    prompt: str,
+    input_tokens: int,
+    timeout: int = 30,
+    output_tokens: int = 0,
+    label: str = "generate",
+) -> Optional[str]:
+    """
+    generateContent 엔드포인트를 호출하고 첫 번째 후보의 텍스트를 반환합니다.
+    
+    Args:
+        prompt: 전송할 프롬프트
+        input_tokens: 추정 입력 토큰 수 (고정 템플릿 토큰 + 기사 토큰)
+        timeout: 요청 타임아웃 (초)
+        output_tokens: 예상 출력 토큰 수 (분당 토큰 제한 계산용)
+        label: 토큰 사용량 기록용 호출 종류
+        
+    Returns:
+        생성된 텍스트. 실패 시 None.
+    """
+    return _generate_contents([prompt], [input_tokens], timeout=timeout, output_tokens=output_tokens, label=label)[0]
+
+
+def _extract_json_text(text: str) -> str:
+    """
+    응답 텍스트에서 JSON 본문만 추출합니다. (```json 코드 블록 제거)
     
-    return None
+    Args:
+        text: Gemini 응답 텍스트
+        
+    Returns:
+        JSON 문자열 (추출 실패 시 원본을 정리해서 반환)
+    """
+    text = text.strip()
+    fence = re.match(r"^```(?:json)?\s*(.*?)\s*```$", text, re.DOTALL)
+    if fence:
+        text = fence.group(1).strip()
+    
+    # 앞뒤 설명 문장이 붙은 경우 첫 '{' ~ 마지막 '}' 구간만 사용
+    start = text.find("{")
+    end = text.rfind("}")
+    if start != -1 and end > start:
+        return text[start:end + 1]
+    return text
+
+
+def summarize_with_gemini(news_content: str, news_title: str) -> Optional[str]:
+    """기사 내용을 350~450자 한글 요약으로 생성합니다. (직접 REST 호출, v1 엔드포인트 사용)"""
+    prompt = build_summary_prompt(news_content, news_title)
+    input_tokens = SUMMARY_PROMPT_TOKENS + estimate_article_tokens(news_content, news_title)
+    return _generate_content(prompt, input_tokens, timeout=30, output_tokens=SUMMARY_OUTPUT_TOKENS, label="summary")
 
 
 def generate_cardnews_with_gemini(news_content: str, news_title: str) -> Optional[str]:
     """기사 내용을 바탕으로 8장 카드뉴스 문구를 생성합니다."""
+    prompt = build_cardnews_prompt(news_content, news_title)
+    # 카드뉴스 생성은 시간이 더 걸릴 수 있음
+    input_tokens = CARDNEWS_PROMPT_TOKENS + estimate_article_tokens(news_content, news_title)
+    return _generate_content(prompt, input_tokens, timeout=60, output_tokens=CARDNEWS_OUTPUT_TOKENS, label="cardnews")
+
+
+def stream_cardnews_with_gemini(
+    news_content: str,
+    news_title: str,
+    on_card: Optional[Callable[[Dict[str, str]], None]] = None,
+) -> Optional[str]:
+    """
+    streamGenerateContent로 카드뉴스 문구를 생성하면서, 카드가 완성될 때마다 on_card를 호출합니다.
+    
+    전체 생성 시간은 generate_cardnews_with_gemini와 같지만, 첫 카드는 수 초 안에 받을 수 있습니다.
+    
+    Args:
+        news_content: 기사 본문
+        news_title: 기사 제목
+        on_card: 완성된 Card를 받는 콜백 (parse_card_script와 같은 형식)
+        
+    Returns:
+        전체 카드뉴스 문구 텍스트. 실패 시 None.
+    """
     api_key = os.getenv("GEMINI_API_KEY")
     if not api_key:
         print("GEMINI_API_KEY 환경 변수가 설정되지 않았습니다.")
         return None
 
-    # 사용 가능한 모델 찾기
-    model_name = _find_working_model()
-    if not model_name:
+    # 사용 가능한 모델 찾기 (첫 조각이 늦거나 실패하면 다음 모델 사용)
+    models = _get_model_chain(kind="stream")
+    if not models:
         print("[오류] 사용 가능한 Gemini 모델을 찾을 수 없습니다.")
         return None
 
-    api_url = f"{GEMINI_API_BASE}/{model_name}:generateContent"
-
-    prompt = (
-        "당신은 충남콘텐츠진흥원의 젊고 센스 있는 SNS 홍보 담당자입니다. 아래 뉴스 기사를 읽고, 진흥원의 역할과 성과를 사실에 기반해 카드뉴스 형식으로 정리해 주세요. 독자가 끝까지 읽을 수 있도록 흥미로운 후크와 친근한 말투를 사용하는 것이 핵심입니다.\n\n"
-        "⚠️ 절대 규칙:\n"
-        "- 반드시 **이 기사 내용만** 사용하세요. 기사에 없는 예산, 인원수, 성과, 기관명 등은 절대 만들어내지 마세요.\n"
-        "- '주도했다' 대신 **'지원했다', '참여했다', '협력했다', '추진했다'** 등 사실 기반 동사만 사용하세요.\n"
-        "- **불필요한 설명 제거:** (이하 진흥원), 원장 이름, 기사 출처 등은 제외하고 핵심만 전달하세요.\n\n"
-        "🎯 톤 & 타겟:\n"
-        "- 타겟: 충남콘텐츠진흥원이 무엇을 하는 곳인지 잘 모르는 일반 시민.\n"
-        "- 말투: **친구에게 카톡 하듯 매우 친근하고 캐주얼한 구어체.** (\"~했어요!\", \"~이랍니다.\", \"~는요?\", \"~할 거예요.\")\n"
-        "- 후크(Hook): 초반 카드(1~3번)에 궁금증을 유발하는 질문이나 감탄사를 넣어 시선을 사로잡으세요.\n\n"
-        "--- 1단계) 카드 분할 전략 (분량 엄수)\n"
-        "- 기사의 흐름과 맥락에 따라 **최소 6장, 표준 8장, 최대 10장**으로 구성하세요.\n"
-        "- 기사 내용이 짧더라도 내용을 세밀하게 쪼개어 가독성을 높이고, 정보를 충분히 풀어서 설명하세요.\n"
-        "- **절대로 5장 이하로 끝내지 마세요.**\n\n"
-        "- 구성 가이드:\n"
-        "  - 1번(Cover): 가장 강력한 후크와 핵심 주제\n"
-        "  - 2번(Intro): 기사 배경이나 궁금증 유발 질문\n"
-        "  - 중간(Program/Impact/Result): 사업 내용, 지원 과정, 구체적 변화, 성과의 의미를 단계별로 상세히 나열\n"
-        "  - 마지막(Closing): 홈페이지 방문 유도 및 친절한 마무리\n\n"
-        "--- 2단계) 카드별 문구 작성 규칙\n"
-        "- TYPE: cover / program / impact / result / closing 중 선택\n"
-        "- HEAD: 12~20자 내외. **질문형, 감탄사 등 후크를 반드시 활용하세요.**\n"
-        "- BODY (TYPE=cover 제외):\n"
-        "  - **20~40자 내외의 완결된 문장.** (너무 짧거나 길지 않게 유지)\n"
-        "  - **절대 \"...\"(줄임표)를 사용하지 마세요.** 문장을 명확하게 끝맺으세요.\n"
-        "  - HEAD와 내용이 겹치지 않게 정보를 나누어 담으세요.\n"
-        "- IMAGE_KEY: 영어 키워드 2~4단어. (예: \"business meeting\", \"award ceremony\")\n\n"
-        "--- 3단계) 형식\n"
-        f"기사 원문:\n[제목]\n{news_title}\n\n[본문]\n{news_content}\n\n"
-        "위 내용을 바탕으로 아래 형식에 맞춰 한 줄씩 출력하세요. (번호는 1번부터 시작)\n\n"
-        "출력 형식:\n"
-        "1. TYPE=cover | HEAD=... | IMAGE_KEY=...\n"
-        "2. TYPE=program | HEAD=... | BODY=... | IMAGE_KEY=...\n"
-        "...\n"
-        "N. TYPE=closing | HEAD=더 자세한 내용이 궁금하다면? | BODY=진흥원 홈페이지(https://ccon.kr/)에서 더 많은 정보를 확인해보세요! | IMAGE_KEY=website visit\n\n"
-        "**중요:** 반드시 최소 6장 이상 생성하고, 마지막 카드는 항상 closing 타입으로 홈페이지를 유도하세요."
+    prompt = build_cardnews_prompt(news_content, news_title)
+    input_tokens = CARDNEWS_PROMPT_TOKENS + estimate_article_tokens(news_content, news_title)
+    client = get_gemini_client(GEMINI_API_BASE)
+    parser = CardParser()
+    chunks: List[str] = []
+
+    for chunk in client.stream_sync(
+        models,
+        _build_payload(prompt),
+        timeout=60,
+        estimated_tokens=input_tokens + CARDNEWS_OUTPUT_TOKENS,
+        on_usage=lambda usage: _record_token_usage("cardnews_stream", input_tokens, usage),
+    ):
+        chunks.append(chunk)
+        for card in parser.feed(chunk):
+            if on_card:
+                on_card(card)
+    for card in parser.close():
+        if on_card:
+            on_card(card)
+
+    result_text = "".join(chunks)
+    if not result_text:
+        print("[Gemini 스트림 경고] 생성된 텍스트가 없습니다.", flush=True)
+        return None
+
+    print(f"[Gemini 스트림 성공] {len(result_text)}자 생성됨", flush=True)
+    return result_text
+
+
+def generate_summary_and_cardnews_with_gemini(news_content: str, news_title: str) -> Optional[Dict[str, str]]:
+    """
+    한 번의 호출로 요약과 카드뉴스 문구를 함께 생성합니다.
+    
+    기사 본문과 지침을 한 번만 전송하고, 요약과 카드 배열을 담은 JSON 응답을 받습니다.
+    카드 배열은 card_parser.parse_card_script가 읽을 수 있는 JSON 문자열로 반환합니다.
+    
+    Args:
+        news_content: 기사 본문
+        news_title: 기사 제목
+        
+    Returns:
+        {"summary": 요약 텍스트, "script": 카드뉴스 문구(JSON 배열 문자열)}. 실패 시 None.
+    """
+    prompt = build_combined_prompt(news_content, news_title)
+
+    result_text = _generate_content(
+        prompt,
+        COMBINED_PROMPT_TOKENS + estimate_article_tokens(news_content, news_title),
+        timeout=60,
+        output_tokens=SUMMARY_OUTPUT_TOKENS + CARDNEWS_OUTPUT_TOKENS,
+        label="summary_and_cardnews",
     )
+    if not result_text:
+        return None
 
-    payload = {
-        "contents": [
-            {
-                "parts": [
-                    {
-                        "text": prompt,
-                    }
-                ]
-            }
-        ]
+    try:
+        data = json.loads(_extract_json_text(result_text))
+    except json.JSONDecodeError as e:
+        print(f"[Gemini 응답 경고] JSON 파싱 실패: {e}", flush=True)
+        return None
+
+    if not isinstance(data, dict):
+        print("[Gemini 응답 경고] JSON 객체가 아닙니다.", flush=True)
+        return None
+
+    summary = data.get("summary", "")
+    cards = data.get("cards", [])
+    if not isinstance(summary, str) or not summary.strip():
+        print("[Gemini 응답 경고] summary가 비어 있습니다.", flush=True)
+        return None
+    if not isinstance(cards, list) or not cards:
+        print("[Gemini 응답 경고] cards가 비어 있습니다.", flush=True)
+        return None
+
+    return {
+        "summary": summary.strip(),
+        "script": json.dumps(cards, ensure_ascii=False, indent=2),
     }
 
-    # 재시도 로직
-    for attempt in range(MAX_RETRIES):
-        try:
-            resp = requests.post(
-                api_url,
-                params={"key": api_key},
-                json=payload,
-                timeout=60,  # 카드뉴스 생성은 시간이 더 걸릴 수 있음
-            )
-            if resp.status_code == 429:  # Rate limit
-                if attempt < MAX_RETRIES - 1:
-                    wait_time = RETRY_DELAY * (attempt + 1)
-                    print(f"[Gemini Rate Limit] {wait_time}초 대기 후 재시도...", flush=True)
-                    time.sleep(wait_time)
-                    continue
-            if resp.status_code != 200:
-                error_text = resp.text[:500] if len(resp.text) > 500 else resp.text
-                print(f"[Gemini HTTP 오류] {resp.status_code} {error_text}", flush=True)
-                return None
-
-            data = resp.json()
-            candidates = data.get("candidates", [])
-            if not candidates:
-                print("[Gemini 응답 경고] candidates가 비어 있습니다.", flush=True)
-                print(f"[Gemini 응답] 전체 응답: {str(data)[:500]}", flush=True)
-                return None
-
-            parts = candidates[0].get("content", {}).get("parts", [])
-            if not parts:
-                print("[Gemini 응답 경고] parts가 비어 있습니다.", flush=True)
-                print(f"[Gemini 응답] candidates[0]: {str(candidates[0])[:500]}", flush=True)
-                return None
-
-            result_text = parts[0].get("text", "")
-            if not result_text:
-                print("[Gemini 응답 경고] text가 비어 있습니다.", flush=True)
-                return None
-            
-            print(f"[Gemini 성공] {len(result_text)}자 생성됨", flush=True)
-            return result_text
-        except requests.exceptions.Timeout:
-            print(f"[Gemini 타임아웃] (시도 {attempt + 1}/{MAX_RETRIES})", flush=True)
-            if attempt < MAX_RETRIES - 1:
-                time.sleep(RETRY_DELAY * (attempt + 1))
-        except Exception as e:
-            print(f"[Gemini 호출 오류] {e}", flush=True)
-            if attempt < MAX_RETRIES - 1:
-                time.sleep(RETRY_DELAY * (attempt + 1))
+
+def _pack_batches(articles: List[Dict[str, str]], token_budget: int, max_articles: int) -> List[List[Dict[str, str]]]:
+    """
+    기사 목록을 토큰 예산 안에 들어가는 묶음으로 나눕니다.
     
-    return None
+    Args:
+        articles: {"id", "title", "content"} 키를 가진 기사 리스트
+        token_budget: 한 요청당 토큰 예산 (지침 + 기사 본문 + 예상 출력)
+        max_articles: 한 요청당 최대 기사 수
+        
+    Returns:
+        기사 묶음 리스트 (입력 순서 유지)
+    """
+    base_tokens = BATCH_PROMPT_TOKENS
+    batches: List[List[Dict[str, str]]] = []
+    current: List[Dict[str, str]] = []
+    current_tokens = base_tokens
+
+    for article in articles:
+        # 본문은 프롬프트 조립 시 입력 토큰 예산으로 축약되므로 비용도 예산으로 제한
+        cost = (
+            BATCH_ARTICLE_TOKENS
+            + estimate_article_tokens(article.get("content", ""), article.get("title", ""))
+            + BATCH_OUTPUT_TOKENS_PER_ARTICLE
+        )
+        if current and (current_tokens + cost > token_budget or len(current) >= max_articles):
+            batches.append(current)
+            current = []
+            current_tokens = base_tokens
+        current.append(article)
+        current_tokens += cost
+
+    if current:
+        batches.append(current)
+    return batches
 
 
+def _parse_batch_response(result_text: Optional[str], key_to_id: Dict[str, str]) -> Dict[str, str]:
+    """
+    일괄 요약 응답(JSON)을 {기사 ID: 요약} 딕셔너리로 변환합니다.
+    
+    Args:
+        result_text: Gemini 응답 텍스트 (실패 시 None)
+        key_to_id: {요청용 짧은 키: 기사 ID}
+        
+    Returns:
+        {기사 ID: 요약} 딕셔너리. 응답에 없거나 비어 있는 ID는 포함되지 않습니다.
+    """
+    if not result_text:
+        return {}
+
+    try:
+        data = json.loads(_extract_json_text(result_text))
+    except json.JSONDecodeError as e:
+        print(f"[Gemini 일괄 요약 경고] JSON 파싱 실패: {e}", flush=True)
+        return {}
+    if not isinstance(data, dict):
+        print("[Gemini 일괄 요약 경고] JSON 객체가 아닙니다.", flush=True)
+        return {}
+
+    summaries: Dict[str, str] = {}
+    for key, article_id in key_to_id.items():
+        summary = data.get(key)
+        if isinstance(summary, str) and summary.strip():
+            summaries[article_id] = summary.strip()
+    return summaries
+
+
+def summarize_batch_with_gemini(
+    articles: List[Dict[str, str]],
+    token_budget: Optional[int] = None,
+    max_articles: Optional[int] = None,
+) -> Dict[str, str]:
+    """
+    여러 기사를 토큰 예산 단위로 묶어 요약합니다.
+    
+    요약 지침은 요청마다 한 번만 보내고, 응답은 기사 ID를 키로 하는 JSON으로 받습니다.
+    묶음 요청은 공유 클라이언트의 동시성/속도 제한 안에서 병렬로 실행되며,
+    응답에서 빠진 기사는 개별 요약 요청으로 보완합니다.
+    
+    Args:
+        articles: {"id", "title", "content"} 키를 가진 기사 리스트
+        token_budget: 한 요청당 토큰 예산 (기본값: GEMINI_BATCH_TOKEN_BUDGET 환경 변수 또는 6000)
+        max_articles: 한 요청당 최대 기사 수 (기본값: GEMINI_BATCH_MAX_ARTICLES 환경 변수 또는 8)
+        
+    Returns:
+        {기사 ID: 요약} 딕셔너리. 끝내 요약하지 못한 기사는 포함되지 않습니다.
+    """
+    if not articles:
+        return {}
+    if token_budget is None:
+        token_budget = int(os.getenv("GEMINI_BATCH_TOKEN_BUDGET", DEFAULT_BATCH_TOKEN_BUDGET))
+    if max_articles is None:
+        max_articles = int(os.getenv("GEMINI_BATCH_MAX_ARTICLES", DEFAULT_BATCH_MAX_ARTICLES))
+
+    # 한 건짜리 묶음은 일반 요약 호출이 더 안정적이므로 개별 요약으로 넘김
+    batches = [batch for batch in _pack_batches(articles, token_budget, max_articles) if len(batch) > 1]
+    print(f"[Gemini 일괄 요약] {len(articles)}개 기사 → {len(batches)}개 묶음 요청", flush=True)
+
+    summaries: Dict[str, str] = {}
+    prompts_and_keys = [build_batch_prompt(batch) for batch in batches]
+    results = _generate_contents(
+        [prompt for prompt, _ in prompts_and_keys],
+        [
+            BATCH_PROMPT_TOKENS
+            + sum(
+                BATCH_ARTICLE_TOKENS + estimate_article_tokens(article.get("content", ""), article.get("title", ""))
+                for article in batch
+            )
+            for batch in batches
+        ],
+        timeout=90,
+        output_tokens=BATCH_OUTPUT_TOKENS_PER_ARTICLE * max_articles,
+        label="summary_batch",
+    )
+    for (_, key_to_id), result_text in zip(prompts_and_keys, results):
+        summaries.update(_parse_batch_response(result_text, key_to_id))
+
+    # 누락된 기사는 개별 호출로 보완
+    missing = [article for article in articles if article["id"] not in summaries]
+    if missing:
+        print(f"[Gemini 일괄 요약] 누락 {len(missing)}개 기사 개별 요약", flush=True)
+        results = _generate_contents(
+            [build_summary_prompt(article.get("content", ""), article.get("title", "")) for article in missing],
+            [
+                SUMMARY_PROMPT_TOKENS + estimate_article_tokens(article.get("content", ""), article.get("title", ""))
+                for article in missing
+            ],
+            timeout=30,
+            output_tokens=SUMMARY_OUTPUT_TOKENS,
+            label="summary",
+        )
+        for article, summary in zip(missing, results):
+            if summary:
+                summaries[article["id"]] = summary
+
+    return summaries
@@ -0,0 +1,653 @@
+"""Gemini 비동기 클라이언트 모듈 - 동시성 제한 및 공유 속도 제한"""
+import asyncio
+import functools
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+import requests
+
+from model_router import ModelRouter, get_model_router
+
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_REQUESTS_PER_MINUTE = 15  # 무료 등급 flash 모델 기준
+DEFAULT_TOKENS_PER_MINUTE = 1_000_000
+DEFAULT_MAX_RETRIES = 3
+BACKOFF_BASE = 2  # 초
+BACKOFF_MAX = 60  # 초
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    분당 허용량을 기준으로 연속 충전되는 토큰 버킷입니다.
+
+    reserve()는 토큰을 먼저 차감(음수 허용)하고 대기 시간을 돌려주므로,
+    먼저 요청한 호출부터 순서대로 허용량이 배분됩니다.
+    """
+
+    def __init__(self, per_minute: int, burst: Optional[int] = None):
+        self.capacity = float(max(burst or per_minute, 1))
+        self.fill_rate = max(per_minute, 1) / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+        self.updated = now
+
+    def reserve(self, amount: float) -> float:
+        """
+        토큰을 예약하고 사용 가능해질 때까지의 대기 시간(초)을 반환합니다.
+
+        Args:
+            amount: 예약할 토큰 수 (버킷 용량을 넘으면 용량으로 제한)
+
+        Returns:
+            대기 시간 (초). 즉시 사용 가능하면 0.
+        """
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.fill_rate
+
+    def adjust(self, delta: float) -> None:
+        """
+        예약량과 실제 사용량의 차이를 반영합니다. (양수: 추가 차감, 음수: 환급)
+
+        Args:
+            delta: 실제 사용량 - 예약량
+        """
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class RateLimiter:
+    """분당 요청 수와 분당 토큰 수를 함께 제한하는 속도 제한기입니다."""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.paused_until = 0.0
+
+    async def acquire(self, estimated_tokens: int) -> None:
+        """
+        요청 1건과 예상 토큰만큼 허용량을 확보할 때까지 대기합니다.
+
+        Args:
+            estimated_tokens: 요청의 예상 토큰 수 (입력 + 출력)
+        """
+        wait = max(
+            self.requests.reserve(1),
+            self.tokens.reserve(estimated_tokens),
+            self.paused_until - time.monotonic(),
+        )
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """
+        429 응답 등으로 모든 요청을 일정 시간 멈춥니다.
+
+        Args:
+            seconds: 멈출 시간 (초)
+        """
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+def _parse_retry_after(resp: requests.Response) -> Optional[float]:
+    """
+    Retry-After 헤더 또는 Gemini 오류 본문의 retryDelay에서 대기 시간을 읽습니다.
+
+    Args:
+        resp: HTTP 응답
+
+    Returns:
+        대기 시간 (초). 정보가 없으면 None.
+    """
+    header = resp.headers.get("Retry-After")
+    if header:
+        header = header.strip()
+        if header.isdigit():
+            return float(header)
+        try:
+            retry_at = parsedate_to_datetime(header)
+            return max(0.0, retry_at.timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+
+    # 예: {"error": {"details": [{"@type": "...RetryInfo", "retryDelay": "17s"}]}}
+    match = re.search(r'"retryDelay"\s*:\s*"(\d+(?:\.\d+)?)s"', resp.text or "")
+    if match:
+        return float(match.group(1))
+    return None
+
+
+def _as_chain(models: Union[str, Sequence[str]]) -> List[str]:
+    """모델 이름 하나 또는 폴백 순서 리스트를 리스트로 통일합니다."""
+    if isinstance(models, str):
+        return [models]
+    return list(models)
+
+
+def _backoff_delay(attempt: int) -> float:
+    """
+    지수 백오프에 전체 지터(full jitter)를 적용한 대기 시간을 계산합니다.
+
+    Args:
+        attempt: 0부터 시작하는 시도 번호
+
+    Returns:
+        대기 시간 (초)
+    """
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+class AsyncGeminiClient:
+    """
+    Gemini generateContent 비동기 클라이언트입니다.
+
+    모든 요청은 클라이언트 전용 이벤트 루프 스레드에서 실행되므로,
+    여러 스레드(Streamlit 세션, Flask 요청)와 이벤트 루프에서 호출해도
+    같은 동시성 제한과 속도 제한을 공유합니다.
+
+    모델을 폴백 순서 리스트로 넘기면, 첫 모델이 최근 p95 지연 시간 안에 응답하지 않을 때
+    다음 모델로 헤지 요청을 한 번 보내 먼저 끝난 응답을 사용하고,
+    실패하면 다음 모델로 넘어갑니다.
+    """
+
+    def __init__(
+        self,
+        api_base: str,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = DEFAULT_TOKENS_PER_MINUTE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        router: Optional[ModelRouter] = None,
+    ):
+        self.api_base = api_base
+        self.router = router or ModelRouter()
+        self.max_concurrency = max(max_concurrency, 1)
+        self.max_retries = max(max_retries, 1)
+        self.limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self._session = requests.Session()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="gemini-http")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self.requests_sent = 0  # 재시도를 포함한 HTTP 요청 수 (API 사용량 집계용)
+
+    def _count_request(self) -> None:
+        with self._lock:
+            self.requests_sent += 1
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """클라이언트 전용 이벤트 루프 스레드를 (필요 시) 시작하고 반환합니다."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="gemini-client", daemon=True)
+                thread.start()
+                self._loop = loop
+            return self._loop
+
+    async def _post(self, url: str, api_key: str, payload: Dict, timeout: int) -> requests.Response:
+        loop = asyncio.get_running_loop()
+        self._count_request()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(self._session.post, url, params={"key": api_key}, json=payload, timeout=timeout),
+        )
+
+    async def _generate(self, model_name: str, payload: Dict, timeout: int, estimated_tokens: int) -> Optional[Dict]:
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            print("GEMINI_API_KEY 환경 변수가 설정되지 않았습니다.")
+            return None
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        api_url = f"{self.api_base}/{model_name}:generateContent"
+
+        for attempt in range(self.max_retries):
+            await self.limiter.acquire(estimated_tokens)
+            latency = 0.0
+            try:
+                async with self._semaphore:
+                    # 라우터에는 HTTP 요청 한 번의 시간만 기록 (속도 제한/슬롯/재시도 대기 제외)
+                    started = time.monotonic()
+                    try:
+                        resp = await self._post(api_url, api_key, payload, timeout)
+                    finally:
+                        latency = time.monotonic() - started
+            except requests.exceptions.Timeout:
+                self.router.record(model_name, latency, False)
+                print(f"[Gemini 타임아웃] (시도 {attempt + 1}/{self.max_retries})", flush=True)
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(_backoff_delay(attempt))
+                continue
+            except Exception as e:
+                self.router.record(model_name, latency, False)
+                print(f"[Gemini 호출 오류] {e}", flush=True)
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(_backoff_delay(attempt))
+                continue
+
+            if resp.status_code != 200:
+                # 429와 재시도되는 오류도 실패로 기록 (지연 시간 표본에는 넣지 않음)
+                self.router.record(model_name, latency, False)
+
+            if resp.status_code in RETRYABLE_STATUS_CODES and attempt < self.max_retries - 1:
+                retry_after = _parse_retry_after(resp)
+                wait_time = retry_after if retry_after is not None else _backoff_delay(attempt)
+                if resp.status_code == 429:
+                    # 쿼터 초과는 모든 호출이 함께 물러나야 429가 연쇄되지 않음
+                    self.limiter.pause(wait_time)
+                    print(f"[Gemini Rate Limit] {wait_time:.1f}초 대기 후 재시도...", flush=True)
+                else:
+                    print(f"[Gemini HTTP {resp.status_code}] {wait_time:.1f}초 대기 후 재시도...", flush=True)
+                await asyncio.sleep(wait_time)
+                continue
+
+            if resp.status_code != 200:
+                error_text = resp.text[:500] if len(resp.text) > 500 else resp.text
+                print(f"[Gemini HTTP 오류] {resp.status_code} {error_text}", flush=True)
+                return None
+
+            try:
+                data = resp.json()
+            except ValueError as e:
+                # 프록시 오류 페이지나 잘린 본문 등 JSON이 아닌 200 응답
+                self.router.record(model_name, latency, False)
+                print(f"[Gemini 응답 파싱 오류] {e} (시도 {attempt + 1}/{self.max_retries})", flush=True)
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(_backoff_delay(attempt))
+                continue
+            self.router.record(model_name, latency, True)
+            usage = data.get("usageMetadata", {})
+            if usage.get("totalTokenCount"):
+                self.limiter.tokens.adjust(usage["totalTokenCount"] - estimated_tokens)
+            return data
+
+        return None
+
+    async def _generate_routed(
+        self,
+        models: Sequence[str],
+        payload: Dict,
+        timeout: int,
+        estimated_tokens: int,
+    ) -> Optional[Dict]:
+        """
+        폴백 순서대로 요청하면서, 느린 요청에는 다음 모델로 헤지 요청을 한 번 보냅니다.
+
+        Args:
+            models: 폴백 순서대로 정렬된 모델 이름 리스트
+            payload: generateContent 요청 본문
+            timeout: 요청 타임아웃 (초)
+            estimated_tokens: 예상 토큰 수
+
+        Returns:
+            먼저 성공한 응답 JSON. 모든 모델이 실패하면 None.
+        """
+        chain = list(models)
+        if not chain:
+            return None
+
+        self.router.note_request()
+        primary = chain.pop(0)
+        pending = {asyncio.ensure_future(self._generate(primary, payload, timeout, estimated_tokens))}
+        hedge_timeout: Optional[float] = self.router.hedge_delay(primary) if chain else None
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=hedge_timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # 현재 모델이 p95를 넘김: 헤지 요청은 한 번만
+                    hedge_timeout = None
+                    if self.router.try_hedge():
+                        model_name = chain.pop(0)
+                        print(f"[Gemini 헤지] {primary} 응답 지연 → {model_name} 동시 요청", flush=True)
+                        pending.add(asyncio.ensure_future(
+                            self._generate(model_name, payload, timeout, estimated_tokens)
+                        ))
+                    continue
+
+                for task in done:
+                    data = task.result()
+                    if data is not None:
+                        return data
+
+                if not pending and chain:
+                    model_name = chain.pop(0)
+                    print(f"[Gemini 폴백] {model_name} 모델로 재요청", flush=True)
+                    pending.add(asyncio.ensure_future(
+                        self._generate(model_name, payload, timeout, estimated_tokens)
+                    ))
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _acquire_slot(self, estimated_tokens: int) -> None:
+        """속도 제한과 동시성 슬롯을 확보합니다. (스트리밍 호출용)"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        await self.limiter.acquire(estimated_tokens)
+        await self._semaphore.acquire()
+
+    def _stream_model(
+        self,
+        model_name: str,
+        payload: Dict,
+        timeout: int,
+        estimated_tokens: int,
+        on_usage: Optional[Callable[[Dict], None]] = None,
+    ) -> Iterator[str]:
+        """
+        모델 하나로 streamGenerateContent(SSE)를 호출하고 텍스트 조각을 순서대로 돌려줍니다.
+
+        첫 조각을 받기 전의 오류만 재시도하며, 조각을 돌려준 뒤 끊기면 그대로 종료합니다.
+        """
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            print("GEMINI_API_KEY 환경 변수가 설정되지 않았습니다.")
+            return
+
+        loop = self._ensure_loop()
+        api_url = f"{self.api_base}/{model_name}:streamGenerateContent"
+
+        for attempt in range(self.max_retries):
+            asyncio.run_coroutine_threadsafe(self._acquire_slot(estimated_tokens), loop).result()
+            wait_time = None
+            yielded = False
+            try:
+                self._count_request()
+                resp = self._session.post(
+                    api_url,
+                    params={"key": api_key, "alt": "sse"},
+                    json=payload,
+                    timeout=timeout,
+                    stream=True,
+                )
+                with resp:
+                    if resp.status_code in RETRYABLE_STATUS_CODES and attempt < self.max_retries - 1:
+                        retry_after = _parse_retry_after(resp)
+                        wait_time = retry_after if retry_after is not None else _backoff_delay(attempt)
+                        if resp.status_code == 429:
+                            # 속도 제한기는 이벤트 루프 스레드에서만 변경 (토큰 예약과 경쟁하지 않도록)
+                            loop.call_soon_threadsafe(self.limiter.pause, wait_time)
+                        print(f"[Gemini 스트림 HTTP {resp.status_code}] {wait_time:.1f}초 대기 후 재시도...", flush=True)
+                    elif resp.status_code != 200:
+                        error_text = resp.text[:500] if len(resp.text) > 500 else resp.text
+                        print(f"[Gemini 스트림 HTTP 오류] {resp.status_code} {error_text}", flush=True)
+                        return
+                    else:
+                        resp.encoding = "utf-8"
+                        for line in resp.iter_lines(decode_unicode=True):
+                            # SSE 형식: "data: {...}" 줄마다 GenerateContentResponse 하나
+                            if not line or not line.startswith("data:"):
+                                continue
+                            data = json.loads(line[5:].strip())
+                            usage = data.get("usageMetadata", {})
+                            if usage.get("totalTokenCount") and data.get("candidates", [{}])[0].get("finishReason"):
+                                loop.call_soon_threadsafe(
+                                    self.limiter.tokens.adjust, usage["totalTokenCount"] - estimated_tokens
+                                )
+                                if on_usage:
+                                    on_usage(usage)
+                            for candidate in data.get("candidates", [])[:1]:
+                                for part in candidate.get("content", {}).get("parts", []):
+                                    text = part.get("text", "")
+                                    if text:
+                                        yielded = True
+                                        yield text
+                        return
+            except requests.exceptions.Timeout:
+                print(f"[Gemini 스트림 타임아웃] (시도 {attempt + 1}/{self.max_retries})", flush=True)
+                if yielded:
+                    return
+                wait_time = _backoff_delay(attempt)
+            except Exception as e:
+                print(f"[Gemini 스트림 오류] {e}", flush=True)
+                if yielded:
+                    return
+                wait_time = _backoff_delay(attempt)
+            finally:
+                loop.call_soon_threadsafe(self._semaphore.release)
+
+            if attempt < self.max_retries - 1 and wait_time is not None:
+                time.sleep(wait_time)
+
+    def stream_sync(
+        self,
+        models: Union[str, Sequence[str]],
+        payload: Dict,
+        timeout: int = 60,
+        estimated_tokens: int = 0,
+        on_usage: Optional[Callable[[Dict], None]] = None,
+    ) -> Iterator[str]:
+        """
+        streamGenerateContent(SSE)를 호출하고 생성되는 텍스트 조각을 순서대로 돌려줍니다.
+
+        동시성 슬롯과 속도 제한은 generate()와 공유합니다. 첫 조각이 현재 모델의
+        최근 p95(첫 조각까지의 시간) 안에 오지 않으면 다음 모델로 헤지 스트림을 열고,
+        먼저 조각을 보낸 스트림을 끝까지 사용합니다. 첫 조각 전에 실패하면 다음 모델로 넘어갑니다.
+
+        Args:
+            models: "models/..." 형식의 모델 이름 또는 폴백 순서 리스트
+            payload: generateContent 요청 본문
+            timeout: 연결/읽기 타임아웃 (초)
+            estimated_tokens: 예상 토큰 수 (분당 토큰 제한에 사용)
+            on_usage: 마지막 조각의 usageMetadata를 받는 콜백 (토큰 사용량 기록용)
+
+        Yields:
+            생성된 텍스트 조각
+        """
+        chain = _as_chain(models)
+        if not chain:
+            return
+
+        events: "queue.Queue" = queue.Queue()
+        streams: Dict[int, Dict] = {}  # 스트림 번호 -> {"model", "stop", "started"}
+        state = {"winner": None}
+
+        def start(model_name: str) -> None:
+            stream_id = len(streams)
+            stop = threading.Event()
+            streams[stream_id] = {"model": model_name, "stop": stop, "started": time.monotonic()}
+
+            def forward_usage(usage: Dict) -> None:
+                if on_usage and state["winner"] == stream_id:
+                    on_usage(usage)
+
+            def run() -> None:
+                try:
+                    for chunk in self._stream_model(model_name, payload, timeout, estimated_tokens, forward_usage):
+                        if stop.is_set():
+                            break
+                        events.put((stream_id, "chunk", chunk))
+                finally:
+                    events.put((stream_id, "end", None))
+
+            threading.Thread(target=run, name="gemini-stream", daemon=True).start()
+
+        self.router.note_request()
+        start(chain.pop(0))
+        hedge_deadline: Optional[float] = None
+        if chain:
+            hedge_deadline = time.monotonic() + self.router.hedge_delay(streams[0]["model"], kind="stream")
+        active = {0}
+
+        try:
+            while active:
+                wait = None
+                if state["winner"] is None and hedge_deadline is not None:
+                    wait = max(0.0, hedge_deadline - time.monotonic())
+                try:
+                    stream_id, kind, value = events.get(timeout=wait)
+                except queue.Empty:
+                    # 첫 조각이 p95를 넘김: 헤지 스트림은 한 번만
+                    hedge_deadline = None
+                    if self.router.try_hedge():
+                        model_name = chain.pop(0)
+                        print(f"[Gemini 헤지] {streams[0]['model']} 첫 응답 지연 → {model_name} 동시 요청", flush=True)
+                        start(model_name)
+                        active.add(len(streams) - 1)
+                    continue
+
+                if stream_id not in active:
+                    continue
+                stream = streams[stream_id]
+
+                if kind == "chunk":
+                    if state["winner"] is None:
+                        state["winner"] = stream_id
+                        self.router.record(stream["model"], time.monotonic() - stream["started"], True, kind="stream")
+                        for other_id in active - {stream_id}:
+                            streams[other_id]["stop"].set()
+                        active = {stream_id}
+                    yield value
+                    continue
+
+                # kind == "end"
+                active.discard(stream_id)
+                if state["winner"] == stream_id:
+                    return
+                self.router.record(stream["model"], time.monotonic() - stream["started"], False, kind="stream")
+                if not active and chain:
+                    hedge_deadline = None
+                    model_name = chain.pop(0)
+                    print(f"[Gemini 폴백] {model_name} 모델로 스트림 재요청", flush=True)
+                    start(model_name)
+                    active.add(len(streams) - 1)
+        finally:
+            # 호출부가 중간에 읽기를 멈춘 경우 포함, 남은 스트림 정리
+            for stream in streams.values():
+                stream["stop"].set()
+
+    async def generate(
+        self,
+        models: Union[str, Sequence[str]],
+        payload: Dict,
+        timeout: int = 30,
+        estimated_tokens: int = 0,
+    ) -> Optional[Dict]:
+        """
+        generateContent를 호출하고 응답 JSON을 반환합니다.
+
+        Args:
+            models: "models/..." 형식의 모델 이름 또는 폴백 순서 리스트
+            payload: generateContent 요청 본문
+            timeout: 요청 타임아웃 (초)
+            estimated_tokens: 예상 토큰 수 (분당 토큰 제한에 사용)
+
+        Returns:
+            응답 JSON 딕셔너리. 실패 시 None.
+        """
+        loop = self._ensure_loop()
+        coro = self._generate_routed(_as_chain(models), payload, timeout, estimated_tokens)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    async def generate_many(
+        self,
+        models: Union[str, Sequence[str]],
+        payloads: Sequence[Dict],
+        timeout: int = 30,
+        estimated_tokens: Optional[Sequence[int]] = None,
+    ) -> List[Optional[Dict]]:
+        """
+        여러 요청을 동시성/속도 제한 안에서 병렬로 실행합니다.
+
+        Args:
+            models: "models/..." 형식의 모델 이름 또는 폴백 순서 리스트
+            payloads: generateContent 요청 본문 리스트
+            timeout: 요청 타임아웃 (초)
+            estimated_tokens: 요청별 예상 토큰 수
+
+        Returns:
+            요청 순서대로 정렬된 응답 JSON 리스트 (실패한 요청은 None)
+        """
+        estimates = list(estimated_tokens) if estimated_tokens is not None else [0] * len(payloads)
+        return list(await asyncio.gather(*[
+            self.generate(models, payload, timeout, estimate)
+            for payload, estimate in zip(payloads, estimates)
+        ]))
+
+    def generate_sync(
+        self,
+        models: Union[str, Sequence[str]],
+        payload: Dict,
+        timeout: int = 30,
+        estimated_tokens: int = 0,
+    ) -> Optional[Dict]:
+        """generate()의 동기 버전입니다."""
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(
+            self._generate_routed(_as_chain(models), payload, timeout, estimated_tokens), loop
+        )
+        return future.result()
+
+    def generate_many_sync(
+        self,
+        models: Union[str, Sequence[str]],
+        payloads: Sequence[Dict],
+        timeout: int = 30,
+        estimated_tokens: Optional[Sequence[int]] = None,
+    ) -> List[Optional[Dict]]:
+        """generate_many()의 동기 버전입니다."""
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(
+            self.generate_many(models, payloads, timeout, estimated_tokens), loop
+        )
+        return future.result()
+
+
+_client: Optional[AsyncGeminiClient] = None
+_client_lock = threading.Lock()
+
+
+def get_gemini_client(api_base: str) -> AsyncGeminiClient:
+    """
+    프로세스 전체에서 공유하는 Gemini 클라이언트를 반환합니다.
+
+    동시성/속도 제한은 환경 변수 GEMINI_MAX_CONCURRENCY, GEMINI_REQUESTS_PER_MINUTE,
+    GEMINI_TOKENS_PER_MINUTE, GEMINI_MAX_RETRIES로 설정합니다.
+
+    Args:
+        api_base: Gemini API 기본 URL
+
+    Returns:
+        공유 AsyncGeminiClient 인스턴스
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = AsyncGeminiClient(
+                api_base,
+                max_concurrency=int(os.getenv("GEMINI_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)),
+                requests_per_minute=int(os.getenv("GEMINI_REQUESTS_PER_MINUTE", DEFAULT_REQUESTS_PER_MINUTE)),
+                tokens_per_minute=int(os.getenv("GEMINI_TOKENS_PER_MINUTE", DEFAULT_TOKENS_PER_MINUTE)),
+                max_retries=int(os.getenv("GEMINI_MAX_RETRIES", DEFAULT_MAX_RETRIES)),
+                router=get_model_router(),
+            )
+        return _client
@@ -0,0 +1,274 @@
+"""생성 관리 모듈 - 캐시 확인, 유사 기사 재사용, 동시 요청 병합, Gemini 생성, 캐시 저장"""
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+from cache_manager import (
+    get_cached_summary,
+    get_cached_script,
+    save_cached_summary,
+    save_cached_script,
+    save_cached_generation,
+)
+from card_parser import parse_card_script
+from gemini_api import (
+    generate_summary_and_cardnews_with_gemini,
+    stream_cardnews_with_gemini,
+    summarize_batch_with_gemini,
+    summarize_with_gemini,
+)
+from similarity_cache import compute_signature, estimate_similarity, get_similarity_index
+from single_flight import get_single_flight
+
+
+def _find_reusable(
+    article_id: str,
+    content: str,
+    title: str,
+    load_cached: Callable[[str], Optional[str]],
+    signature: Optional[List[int]] = None,
+) -> Optional[Tuple[str, str, float]]:
+    """
+    거의 같은 기사 중 결과가 캐시에 있는 기사를 찾습니다.
+
+    Args:
+        article_id: 기사 ID 또는 URL
+        content: 기사 본문
+        title: 기사 제목
+        load_cached: 기사 ID로 캐시된 결과를 읽는 함수
+        signature: 미리 계산한 MinHash 서명
+
+    Returns:
+        (원본 기사 ID, 캐시된 결과, 추정 유사도). 없으면 None.
+    """
+    index = get_similarity_index()
+    for source_id, similarity in index.find_similar(title, content, exclude_id=article_id, signature=signature):
+        cached = load_cached(source_id)
+        if cached:
+            return source_id, cached, similarity
+    return None
+
+
+def _reuse_summary(
+    article_id: str,
+    content: str,
+    title: str,
+    signature: Optional[List[int]] = None,
+) -> Optional[str]:
+    """
+    거의 같은 기사의 요약(과 카드뉴스 문구)을 이 기사의 캐시로 복사합니다.
+
+    Returns:
+        재사용한 요약. 재사용할 기사가 없으면 None.
+    """
+    reusable = _find_reusable(article_id, content, title, get_cached_summary, signature)
+    if not reusable:
+        return None
+
+    source_id, summary, similarity = reusable
+    save_cached_summary(article_id, summary)
+    source_script = get_cached_script(source_id)
+    if source_script and not get_cached_script(article_id):
+        save_cached_script(article_id, source_script)
+    get_similarity_index().record_reuse(article_id, source_id, similarity)
+    print(f"[유사 기사 재사용] {article_id} ← {source_id} (유사도 {similarity:.2f})")
+    return summary
+
+
+def get_reuse_source(article_id: str) -> Optional[str]:
+    """
+    기사가 다른 기사의 요약/문구를 재사용했다면 원본 기사 ID를 반환합니다.
+
+    SIMILARITY_MARK_REUSED=0이면 재사용 표시를 하지 않도록 항상 None을 반환합니다.
+
+    Args:
+        article_id: 기사 ID 또는 URL
+
+    Returns:
+        원본 기사 ID. 재사용하지 않았거나 표시를 끈 경우 None.
+    """
+    if os.getenv("SIMILARITY_MARK_REUSED", "1") == "0":
+        return None
+    reuse = get_similarity_index().get_reuse_source(article_id)
+    return reuse[0] if reuse else None
+
+
+def get_or_create_summary(article_id: str, content: str, title: str) -> Optional[str]:
+    """
+    기사 요약을 캐시에서 가져오거나 새로 생성합니다.
+
+    거의 같은 기사(다른 매체에 실린 같은 보도자료 등)의 요약이 있으면 재사용하고,
+    카드뉴스 문구도 캐시에 없으면 요약과 문구를 한 번의 호출로 함께 생성합니다.
+    같은 기사에 대한 동시 요청(다른 세션/프로세스 포함)은 한 번의 생성으로 병합됩니다.
+
+    Args:
+        article_id: 기사 ID 또는 URL
+        content: 기사 본문
+        title: 기사 제목
+
+    Returns:
+        요약 텍스트. 실패 시 None.
+    """
+    cached = get_cached_summary(article_id)
+    if cached:
+        return cached
+
+    def generate() -> Optional[str]:
+        # 대기하는 동안 다른 호출자가 저장했을 수 있음
+        cached = get_cached_summary(article_id)
+        if cached:
+            return cached
+
+        reused = _reuse_summary(article_id, content, title)
+        if reused:
+            return reused
+
+        if not get_cached_script(article_id):
+            generated = generate_summary_and_cardnews_with_gemini(content, title)
+            if generated and parse_card_script(generated["script"]):
+                save_cached_generation(article_id, generated["summary"], generated["script"])
+                get_similarity_index().add(article_id, title, content)
+                return generated["summary"]
+
+        summary = summarize_with_gemini(content, title)
+        if summary:
+            save_cached_summary(article_id, summary)
+            get_similarity_index().add(article_id, title, content)
+        return summary
+
+    return get_single_flight().do(
+        f"summary:{article_id}",
+        generate,
+        load_cached=lambda: get_cached_summary(article_id),
+    )
+
+
+def get_or_create_script(
+    article_id: str,
+    content: str,
+    title: str,
+    on_card: Optional[Callable[[Dict[str, str]], None]] = None,
+    force: bool = False,
+) -> Optional[str]:
+    """
+    카드뉴스 문구를 캐시에서 가져오거나 스트리밍으로 새로 생성합니다.
+
+    거의 같은 기사의 문구가 있으면 재사용합니다. (force=True면 재사용하지 않음)
+    같은 기사에 대한 동시 요청은 한 번의 생성으로 병합됩니다. 이때 on_card는
+    실제로 생성을 수행하는 호출자에게만 전달됩니다.
+
+    Args:
+        article_id: 기사 ID 또는 URL
+        content: 기사 본문
+        title: 기사 제목
+        on_card: 카드가 완성될 때마다 호출되는 콜백
+        force: True면 캐시를 무시하고 새로 생성
+
+    Returns:
+        카드뉴스 문구. 실패 시 None. (파싱할 수 없는 문구는 캐시에 저장하지 않고 그대로 반환)
+    """
+    if not force:
+        cached = get_cached_script(article_id)
+        if cached:
+            return cached
+
+    def generate() -> Optional[str]:
+        if not force:
+            cached = get_cached_script(article_id)
+            if cached:
+                return cached
+
+            reusable = _find_reusable(article_id, content, title, get_cached_script)
+            if reusable:
+                source_id, script, similarity = reusable
+                save_cached_script(article_id, script)
+                get_similarity_index().record_reuse(article_id, source_id, similarity)
+                print(f"[유사 기사 재사용] {article_id} ← {source_id} (유사도 {similarity:.2f})")
+                if on_card:
+                    for card in parse_card_script(script):
+                        on_card(card)
+                return script
+
+        script = stream_cardnews_with_gemini(content, title, on_card=on_card)
+        if script and parse_card_script(script):
+            save_cached_script(article_id, script)
+            get_similarity_index().add(article_id, title, content)
+        return script
+
+    # 새로 생성(force)은 진행 중인 일반 생성(캐시/유사 기사 재사용 결과)에 합류하지 않도록 키를 분리
+    return get_single_flight().do(
+        f"script:force:{article_id}" if force else f"script:{article_id}",
+        generate,
+        load_cached=None if force else (lambda: get_cached_script(article_id)),
+    )
+
+
+def get_or_create_summaries(articles: List[Dict[str, str]]) -> Dict[str, str]:
+    """
+    여러 기사의 요약을 캐시, 유사 기사 재사용, 일괄 생성 순으로 채웁니다.
+
+    같은 목록 안에서 거의 같은 기사끼리는 하나만 생성하고 나머지는 그 결과를 재사용합니다.
+
+    Args:
+        articles: {"id", "title", "content"} 키를 가진 기사 리스트
+
+    Returns:
+        {기사 ID: 요약} 딕셔너리. 끝내 요약하지 못한 기사는 포함되지 않습니다.
+    """
+    index = get_similarity_index()
+    summaries: Dict[str, str] = {}
+    pending: List[Dict[str, str]] = []
+    signatures: Dict[str, Optional[List[int]]] = {}
+    duplicates: Dict[str, Tuple[str, float]] = {}  # 기사 ID -> (대표 기사 ID, 유사도)
+
+    for article in articles:
+        article_id = article["id"]
+        title = article.get("title", "")
+        content = article.get("content", "")
+
+        cached = get_cached_summary(article_id)
+        if cached:
+            summaries[article_id] = cached
+            continue
+
+        signature = compute_signature(title, content)
+        reused = _reuse_summary(article_id, content, title, signature=signature)
+        if reused:
+            summaries[article_id] = reused
+            continue
+
+        representative = None
+        if signature:
+            for other in pending:
+                other_signature = signatures.get(other["id"])
+                similarity = estimate_similarity(signature, other_signature) if other_signature else 0.0
+                if similarity >= index.threshold:
+                    representative = (other["id"], similarity)
+                    break
+        if representative:
+            duplicates[article_id] = representative
+            continue
+
+        signatures[article_id] = signature
+        pending.append(article)
+
+    if duplicates:
+        print(f"[유사 기사 재사용] 목록 내 중복 {len(duplicates)}건은 대표 기사 요약을 사용합니다.")
+
+    generated = summarize_batch_with_gemini(pending) if pending else {}
+    for article in pending:
+        summary = generated.get(article["id"])
+        if not summary:
+            continue
+        save_cached_summary(article["id"], summary)
+        index.add(article["id"], article.get("title", ""), article.get("content", ""), signatures[article["id"]])
+        summaries[article["id"]] = summary
+
+    for article_id, (source_id, similarity) in duplicates.items():
+        summary = generated.get(source_id)
+        if not summary:
+            continue
+        save_cached_summary(article_id, summary)
+        index.record_reuse(article_id, source_id, similarity)
+        summaries[article_id] = summary
+
+    return summaries
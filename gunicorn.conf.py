@@ -0,0 +1,43 @@
+"""gunicorn 설정 - Slack App 서버 (wsgi.py)
+
+환경 변수:
+    PORT: 수신 포트 (기본값 5000)
+    WEB_CONCURRENCY: 작업 프로세스 수 (기본값 2)
+    WEB_THREADS: 프로세스당 요청 처리 스레드 수 (기본값 8)
+    WEB_TIMEOUT: 요청 하나의 최대 처리 시간 (초, 기본값 30)
+    JOB_DRAIN_TIMEOUT: 종료할 때 실행 중인 작업을 기다리는 시간 (초, 기본값 25)
+"""
+import os
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", 2))
+threads = int(os.getenv("WEB_THREADS", 8))
+worker_class = "gthread"
+timeout = int(os.getenv("WEB_TIMEOUT", 30))
+keepalive = 5
+graceful_timeout = int(os.getenv("JOB_DRAIN_TIMEOUT", 25)) + 5
+preload_app = True
+accesslog = "-"
+errorlog = "-"
+
+
+def on_starting(server):
+    """fork 전 (마스터 프로세스): 공유 상태를 미리 채움"""
+    from wsgi import warm_shared_state
+
+    warm_shared_state()
+
+
+def post_fork(server, worker):
+    """fork 후 (작업 프로세스): 작업 큐 스레드와 HTTP 연결 준비"""
+    from wsgi import warm_worker
+
+    warm_worker()
+
+
+def worker_exit(server, worker):
+    """작업 프로세스 종료: 실행 중인 작업을 마무리"""
+    from wsgi import drain_jobs
+
+    drain_jobs(float(os.getenv("JOB_DRAIN_TIMEOUT", 25)))
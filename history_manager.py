@@ -1,67 +1,386 @@
-"""크롤링 기록 관리 모듈"""
+"""크롤링 기록 관리 모듈
+
+기록은 data/history.jsonl에 한 줄에 하나씩(JSON Lines) 덧붙여 저장합니다.
+
+- 쓰기: 파일 전체를 다시 쓰지 않고 한 줄만 추가하며, HISTORY_FSYNC 정책에 따라 디스크에 반영합니다.
+- 읽기: 파일 끝에서부터 거꾸로 읽어 필요한 최근 기록 개수만큼만 읽습니다.
+- 압축: 파일이 HISTORY_MAX_BYTES를 넘으면 종류별 최근 기록만 남기고, 나머지는
+  history.jsonl.1, .2, ... (최대 HISTORY_BACKUPS개)로 옮깁니다. 읽을 수 없는 줄도 이때 버립니다.
+
+기록 종류("type")는 예전 history.json의 "crawls", "deployments"와 같으며(crawl, deployment),
+예전 파일이 있으면 처음 사용할 때 새 형식으로 옮깁니다.
+
+크롤링 기록의 지표(crawl_metrics.CrawlMetrics)는 기록할 때 날짜별로 합산해 data/crawl_rollups.json에
+저장하므로, 추세 화면과 마지막 크롤링 시각 조회는 기록 파일을 읽지 않습니다.
+"""
 import json
 import os
-from datetime import datetime
-from typing import Any, Dict, List
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import fcntl  # 여러 프로세스(Streamlit 앱, 일일 크롤링)가 함께 쓸 때 파일 잠금
+except ImportError:  # Windows
+    fcntl = None
 
 
 BASE_DIR = os.path.dirname(__file__)
 DATA_DIR = os.path.join(BASE_DIR, "data")
-HISTORY_FILE = os.path.join(DATA_DIR, "history.json")
+HISTORY_LOG = os.path.join(DATA_DIR, "history.jsonl")
+HISTORY_FILE = os.path.join(DATA_DIR, "history.json")  # 예전 형식 (처음 사용할 때 옮김)
+ROLLUP_FILE = os.path.join(DATA_DIR, "crawl_rollups.json")  # 날짜별 크롤링 지표 합계
+
+FSYNC_POLICY = os.getenv("HISTORY_FSYNC", "always")  # always | interval | never
+FSYNC_INTERVAL = float(os.getenv("HISTORY_FSYNC_INTERVAL", 1.0))  # interval 정책의 fsync 최소 간격 (초)
+MAX_BYTES = int(os.getenv("HISTORY_MAX_BYTES", 256 * 1024))  # 이 크기를 넘으면 압축
+KEEP_PER_TYPE = int(os.getenv("HISTORY_KEEP", 500))  # 압축 후 현재 파일에 남길 종류별 기록 수
+BACKUPS = int(os.getenv("HISTORY_BACKUPS", 3))  # 보관할 이전 파일 수
+TAIL_BLOCK_SIZE = 8192
+ROLLUP_DAYS = int(os.getenv("HISTORY_ROLLUP_DAYS", 730))  # 날짜별 합계 보관 일수
+
+LEGACY_TYPES = {"crawls": "crawl", "deployments": "deployment"}
+
+_thread_lock = threading.Lock()
+_last_fsync = 0.0
+_rollup_memo: tuple = (None, None)  # (파일 서명, 내용)
 
 os.makedirs(DATA_DIR, exist_ok=True)
 
 
-def _load_history() -> Dict[str, Any]:
-    """
-    크롤링 기록 파일을 로드합니다.
-    
-    Returns:
-        크롤링 기록 딕셔너리. 파일이 없으면 빈 구조 반환.
-    """
+@contextmanager
+def _locked() -> Iterator[None]:
+    """같은 프로세스의 스레드와 다른 프로세스의 쓰기/압축을 막습니다."""
+    with _thread_lock:
+        with open(f"{HISTORY_LOG}.lock", "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _sync(f, force: bool = False) -> None:
+    global _last_fsync
+    f.flush()
+    if FSYNC_POLICY == "never" and not force:
+        return
+    now = time.monotonic()
+    if force or FSYNC_POLICY != "interval" or now - _last_fsync >= FSYNC_INTERVAL:
+        os.fsync(f.fileno())
+        _last_fsync = now
+
+
+def _encode(record: Dict[str, Any]) -> bytes:
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _write_file(path: str, lines: List[bytes]) -> None:
+    """임시 파일에 쓰고 디스크에 반영한 뒤 교체합니다. (읽는 쪽은 이전 파일 또는 새 파일만 봄)"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.writelines(lines)
+        _sync(f, force=True)
+    os.replace(tmp_path, path)
+
+
+def _segments() -> List[str]:
+    """현재 파일과 이전 파일 경로 (최신순)"""
+    return [HISTORY_LOG] + [f"{HISTORY_LOG}.{n}" for n in range(1, BACKUPS + 1)]
+
+
+def _migrate_legacy() -> None:
+    """예전 history.json이 있으면 기록을 시간순으로 history.jsonl 앞쪽에 옮깁니다. (잠금 안에서 호출)"""
     if not os.path.exists(HISTORY_FILE):
-        return {"crawls": [], "deployments": []}
+        return
     try:
         with open(HISTORY_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+            data = json.load(f)
     except Exception as e:
         print(f"[기록 로드 오류] {e}")
-        return {"crawls": [], "deployments": []}
+        return
+    records = [
+        dict(entry, type=record_type)
+        for key, record_type in LEGACY_TYPES.items()
+        for entry in data.get(key, [])
+    ]
+    records.sort(key=lambda r: r.get("timestamp", ""))
+    existing: List[bytes] = []
+    if os.path.exists(HISTORY_LOG):
+        with open(HISTORY_LOG, "rb") as f:
+            existing = [line + b"\n" for line in f.read().splitlines() if line.strip()]
+    # 저장소에서 예전 파일이 다시 받아져도 이미 옮긴 기록은 중복으로 넣지 않음
+    seen = set(existing)
+    lines = [line for line in map(_encode, records) if line not in seen] + existing
+    try:
+        _write_file(HISTORY_LOG, lines)
+        os.replace(HISTORY_FILE, f"{HISTORY_FILE}.migrated")
+    except OSError as e:
+        print(f"[기록 저장 오류] {e}")
+
+
+def _append(record: Dict[str, Any]) -> None:
+    """기록 한 줄을 파일 끝에 추가합니다."""
+    try:
+        with _locked():
+            _migrate_legacy()
+            with open(HISTORY_LOG, "ab+") as f:
+                f.seek(0, os.SEEK_END)
+                data = _encode(record)
+                if f.tell():
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        # 이전 쓰기가 중간에 끊겼으면 새 기록이 그 줄에 붙지 않도록 줄을 바꿈
+                        data = b"\n" + data
+                f.write(data)
+                _sync(f)
+                size = f.tell()
+            if record.get("type") == "crawl":
+                _update_rollups(record)
+            if size > MAX_BYTES:
+                _compact()
+    except OSError as e:
+        print(f"[기록 저장 오류] {e}")
+
+
+def _add_counts(target: Dict[str, Any], source: Dict[str, Any]) -> None:
+    for key, value in source.items():
+        if isinstance(value, dict):
+            _add_counts(target.setdefault(key, {}), value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            target[key] = round(target.get(key, 0) + value, 3)
+
+
+def _merge_crawl(rollups: Dict[str, Any], record: Dict[str, Any]) -> None:
+    """크롤링 기록 하나를 그 날짜의 합계에 더합니다."""
+    day = rollups["days"].setdefault(record.get("date", ""), {"crawls": 0, "articles": 0})
+    day["crawls"] += 1
+    day["articles"] += record.get("article_count", 0)
+    _add_counts(day, record.get("metrics") or {})
+    timestamp = record.get("timestamp", "")
+    if timestamp > day.get("last_crawl", ""):
+        day["last_crawl"] = timestamp
+    if timestamp > (rollups.get("last_crawl") or ""):
+        rollups["last_crawl"] = timestamp
+
+
+def _rebuild_rollups() -> Dict[str, Any]:
+    """기록 파일 전체(이전 파일 포함)에서 날짜별 합계를 다시 만듭니다. (합계 파일이 없을 때 한 번)"""
+    rollups: Dict[str, Any] = {"last_crawl": None, "days": {}}
+    for path in reversed(_segments()):
+        try:
+            with open(path, "rb") as f:
+                for line in f:
+                    record = _parse(line)
+                    if record and record.get("type") == "crawl":
+                        _merge_crawl(rollups, record)
+        except FileNotFoundError:
+            continue
+    return rollups
+
+
+def _read_rollups() -> Optional[Dict[str, Any]]:
+    """합계 파일을 읽습니다. 파일이 바뀌지 않았으면 이전에 읽은 내용을 그대로 씁니다."""
+    global _rollup_memo
+    try:
+        stat = os.stat(ROLLUP_FILE)
+    except FileNotFoundError:
+        return None
+    signature = (ROLLUP_FILE, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    if _rollup_memo[0] == signature:
+        return _rollup_memo[1]
+    try:
+        with open(ROLLUP_FILE, "r", encoding="utf-8") as f:
+            rollups = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[기록 로드 오류] {e}")
+        return None
+    _rollup_memo = (signature, rollups)
+    return rollups
+
+
+def _write_rollups(rollups: Dict[str, Any]) -> None:
+    days = rollups["days"]
+    for date in sorted(days)[:max(len(days) - ROLLUP_DAYS, 0)]:
+        del days[date]
+    _write_file(ROLLUP_FILE, [json.dumps(rollups, ensure_ascii=False, sort_keys=True).encode("utf-8")])
+
+
+def _update_rollups(record: Dict[str, Any]) -> None:
+    """크롤링 기록을 날짜별 합계에 반영합니다. (잠금 안에서, 기록 파일에 쓴 뒤 호출)"""
+    rollups = _read_rollups()
+    if rollups is None:
+        # 합계 파일이 없으면 방금 쓴 기록까지 포함해 기록 파일에서 다시 만듦
+        rollups = _rebuild_rollups()
+    else:
+        rollups = json.loads(json.dumps(rollups))  # 기억해 둔 내용은 고치지 않음
+        _merge_crawl(rollups, record)
+    _write_rollups(rollups)
+
+
+def _rollups() -> Dict[str, Any]:
+    rollups = _read_rollups()
+    if rollups is not None:
+        return rollups
+    try:
+        with _locked():
+            _migrate_legacy()
+            rollups = _read_rollups()
+            if rollups is None:
+                rollups = _rebuild_rollups()
+                if rollups["days"]:
+                    _write_rollups(rollups)
+    except OSError as e:
+        print(f"[기록 저장 오류] {e}")
+        rollups = {"last_crawl": None, "days": {}}
+    return rollups
+
+
+def _reverse_lines(path: str) -> Iterator[bytes]:
+    """파일 끝에서부터 TAIL_BLOCK_SIZE씩 읽어 줄을 최신순으로 돌려줍니다."""
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b""
+        while position > 0:
+            size = min(TAIL_BLOCK_SIZE, position)
+            position -= size
+            f.seek(position)
+            lines = (f.read(size) + remainder).split(b"\n")
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line
+        if remainder.strip():
+            yield remainder
+
+
+def _parse(line: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None  # 쓰다 끊긴 줄
+    return record if isinstance(record, dict) else None
 
 
-def _save_history(data: Dict[str, Any]) -> None:
+def _tail(record_type: str, limit: int) -> List[Dict[str, Any]]:
+    """record_type 기록을 최신순으로 최대 limit개 읽습니다. 현재 파일에 모자라면 이전 파일까지 읽습니다."""
+    if os.path.exists(HISTORY_FILE):
+        with _locked():
+            _migrate_legacy()
+    results: List[Dict[str, Any]] = []
+    if limit <= 0:
+        return results
+    for path in _segments():
+        try:
+            for line in _reverse_lines(path):
+                record = _parse(line)
+                if record and record.get("type") == record_type:
+                    record.pop("type")
+                    results.append(record)
+                    if len(results) >= limit:
+                        return results
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            print(f"[기록 로드 오류] {path}: {e}")
+    return results
+
+
+def _compact() -> int:
     """
-    크롤링 기록을 파일에 저장합니다.
+    현재 파일을 종류별 최근 KEEP_PER_TYPE개(최대 MAX_BYTES의 절반)만 남기고 다시 씁니다.
+    남기지 않은 기록은 이전 파일(.1)로 옮기고, 읽을 수 없는 줄은 버립니다. (잠금 안에서 호출)
+    """
+    try:
+        with open(HISTORY_LOG, "rb") as f:
+            lines = [line for line in f.read().splitlines() if line.strip()]
+    except FileNotFoundError:
+        return 0
+
+    kept: List[bytes] = []
+    archived: List[bytes] = []
+    counts: Dict[str, int] = {}
+    kept_bytes = 0
+    for line in reversed(lines):
+        record = _parse(line)
+        if record is None:
+            continue
+        record_type = record.get("type", "")
+        line += b"\n"
+        if counts.get(record_type, 0) < KEEP_PER_TYPE and kept_bytes + len(line) <= MAX_BYTES // 2:
+            counts[record_type] = counts.get(record_type, 0) + 1
+            kept_bytes += len(line)
+            kept.append(line)
+        else:
+            archived.append(line)
+
+    if archived and BACKUPS > 0:
+        segments = _segments()
+        # 가장 오래된 파일은 버리고 나머지를 한 칸씩 밀기
+        for older, newer in zip(reversed(segments[1:]), reversed(segments[1:-1])):
+            if os.path.exists(newer):
+                os.replace(newer, older)
+        _write_file(segments[1], list(reversed(archived)))
+    _write_file(HISTORY_LOG, list(reversed(kept)))
+    return len(archived)
+
+
+def compact_history() -> int:
+    """
+    기록 파일을 압축합니다. (파일이 HISTORY_MAX_BYTES를 넘으면 기록을 추가할 때 자동으로 실행됨)
     
-    Args:
-        data: 저장할 기록 딕셔너리
+    Returns:
+        이전 파일로 옮긴 기록 개수
     """
     try:
-        with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-    except Exception as e:
+        with _locked():
+            _migrate_legacy()
+            return _compact()
+    except OSError as e:
         print(f"[기록 저장 오류] {e}")
+        return 0
 
 
-def add_crawl_history(keyword: str, article_count: int) -> None:
+def add_crawl_history(keyword: str, article_count: int, metrics: Optional[Dict[str, Any]] = None) -> None:
     """
-    크롤링 기록을 추가합니다.
+    크롤링 기록을 추가하고 날짜별 합계에 반영합니다.
     
     Args:
         keyword: 검색 키워드
         article_count: 발견된 기사 개수
+        metrics: 크롤링 지표 (CrawlMetrics.to_dict() 결과)
+    """
+    record = {
+        "type": "crawl",
+        "date": datetime.now().strftime("%Y-%m-%d"),
+        "keyword": keyword,
+        "article_count": article_count,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+    }
+    if metrics:
+        record["metrics"] = metrics
+    _append(record)
+
+
+def add_deployment_history(article_title: str) -> None:
     """
-    data = _load_history()
-    data.setdefault("crawls", [])
-    data["crawls"].append(
+    카드뉴스 배포 기록을 추가합니다.
+    
+    Args:
+        article_title: 기사 제목
+    """
+    _append(
         {
+            "type": "deployment",
             "date": datetime.now().strftime("%Y-%m-%d"),
-            "keyword": keyword,
-            "article_count": article_count,
+            "article_title": article_title,
             "timestamp": datetime.now().isoformat(timespec="seconds"),
         }
     )
-    _save_history(data)
 
 
 def get_crawl_history(limit: int = 50) -> List[Dict[str, Any]]:
@@ -70,11 +389,82 @@ def get_crawl_history(limit: int = 50) -> List[Dict[str, Any]]:
     
     Args:
         limit: 최대 반환 개수 (기본 50)
-        
+    
     Returns:
         크롤링 기록 리스트 (최신순)
     """
-    data = _load_history()
-    return list(reversed(data.get("crawls", [])))[:limit]
+    return _tail("crawl", limit)
 
 
+def get_deployment_history(limit: int = 50) -> List[Dict[str, Any]]:
+    """
+    배포 기록을 조회합니다.
+    
+    Args:
+        limit: 최대 반환 개수 (기본 50)
+    
+    Returns:
+        배포 기록 리스트 (최신순)
+    """
+    return _tail("deployment", limit)
+
+
+def get_last_crawl_time() -> Optional[str]:
+    """
+    마지막 크롤링 시각을 반환합니다. (날짜별 합계 파일에서 읽음)
+    
+    Returns:
+        ISO 형식 시각 문자열. 기록이 없으면 None.
+    """
+    return _rollups().get("last_crawl")
+
+
+def get_daily_rollups(days: int = 90) -> List[Dict[str, Any]]:
+    """
+    최근 days일의 날짜별 크롤링 지표 합계를 반환합니다. (기록 수와 관계없이 날짜 수만큼만 읽음)
+    
+    Args:
+        days: 조회할 일수 (오늘 포함)
+        
+    Returns:
+        {"date", "crawls", "articles", "raw", "unique", "dedup_dropped", "selected",
+        "stages", "api_calls", "keywords", "last_crawl"} 딕셔너리 리스트 (날짜순, 크롤링이 없던 날은 빠짐)
+    """
+    stored = _rollups()["days"]
+    today = datetime.now().date()
+    results = []
+    for offset in range(days - 1, -1, -1):
+        date = (today - timedelta(days=offset)).isoformat()
+        if date in stored:
+            results.append(dict(stored[date], date=date))
+    return results
+
+
+def get_keyword_totals(days: int = 90) -> List[Dict[str, Any]]:
+    """
+    최근 days일 동안 키워드별 API 요청 수와 기사 수를 합산합니다.
+    
+    Args:
+        days: 조회할 일수 (오늘 포함)
+        
+    Returns:
+        {"keyword", "calls", "raw", "unique", "selected", "selected_per_call"} 딕셔너리 리스트
+        (API 요청 하나당 추천 기사 수가 많은 순)
+    """
+    totals: Dict[str, Dict[str, Any]] = {}
+    for day in get_daily_rollups(days):
+        for keyword, stats in (day.get("keywords") or {}).items():
+            _add_counts(totals.setdefault(keyword, {}), stats)
+    results = []
+    for keyword, stats in totals.items():
+        calls = stats.get("calls", 0)
+        results.append({
+            "keyword": keyword,
+            "calls": calls,
+            "raw": stats.get("raw", 0),
+            "unique": stats.get("unique", 0),
+            "selected": stats.get("selected", 0),
+            "selected_per_call": round(stats.get("selected", 0) / calls, 2) if calls else 0.0,
+        })
+    results.sort(key=lambda r: (r["selected_per_call"], r["selected"]), reverse=True)
+    return results
@@ -0,0 +1,287 @@
+"""아이콘 캐시 모듈 - 아이콘 검색 결과와 SVG 파일을 디스크에 영구 저장"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+from cache_manager import CACHE_DIR
+
+
+DEFAULT_ICON_CACHE_DIR = os.path.join(CACHE_DIR, "icons")
+DEFAULT_SEARCH_TTL = 7 * 24 * 3600  # 검색 결과 유효 기간 (초)
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024  # SVG 저장소 최대 크기
+
+
+class IconCache:
+    """
+    아이콘 검색 결과와 SVG 본문을 저장하는 영구 캐시입니다.
+
+    - 검색 결과: (제공자, 검색어, 개수) 키로 아이콘 이름 목록을 저장하고 TTL이 지나면 버립니다.
+    - SVG 본문: 내용의 SHA-256 해시를 파일 이름으로 저장하고(같은 내용은 한 번만 저장),
+      URL → 해시 색인과 원본 해시 → 최적화 결과 해시 색인(svg_optimizer)으로 찾습니다.
+      전체 크기가 max_bytes를 넘으면 오래 쓰지 않은 파일부터 지웁니다.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_ICON_CACHE_DIR,
+        search_ttl: float = DEFAULT_SEARCH_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.cache_dir = cache_dir
+        self.blob_dir = os.path.join(cache_dir, "svg")
+        self.db_path = os.path.join(cache_dir, "icons.sqlite3")
+        self.search_ttl = search_ttl
+        self.max_bytes = max_bytes
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _init_db(self) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS searches ("
+                    "provider TEXT NOT NULL, query TEXT NOT NULL, max_results INTEGER NOT NULL, "
+                    "names TEXT NOT NULL, fetched_at REAL NOT NULL, "
+                    "PRIMARY KEY (provider, query, max_results))"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS blobs ("
+                    "hash TEXT PRIMARY KEY, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+                )
+                conn.execute("CREATE TABLE IF NOT EXISTS urls (url TEXT PRIMARY KEY, hash TEXT NOT NULL)")
+                conn.execute("CREATE INDEX IF NOT EXISTS urls_hash ON urls (hash)")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS optimized (source_hash TEXT PRIMARY KEY, hash TEXT NOT NULL)"
+                )
+        except sqlite3.Error as e:
+            print(f"[아이콘 캐시 초기화 오류] {e}")
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], f"{digest}.svg")
+
+    def get_search(self, provider: str, query: str, limit: int) -> Optional[List[str]]:
+        """
+        저장된 아이콘 검색 결과를 반환합니다.
+
+        Args:
+            provider: 검색 제공자 ("iconify", "material" 등)
+            query: 검색어
+            limit: 최대 결과 개수
+
+        Returns:
+            아이콘 이름 리스트. 없거나 TTL이 지났으면 None.
+        """
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT names, fetched_at FROM searches WHERE provider = ? AND query = ? AND max_results = ?",
+                    (provider, query, limit),
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"[아이콘 캐시 읽기 오류] {e}")
+            return None
+        if not row or time.time() - row[1] > self.search_ttl:
+            return None
+        return json.loads(row[0])
+
+    def put_search(self, provider: str, query: str, limit: int, names: List[str]) -> None:
+        """
+        아이콘 검색 결과를 저장합니다.
+
+        Args:
+            provider: 검색 제공자
+            query: 검색어
+            limit: 최대 결과 개수
+            names: 아이콘 이름 리스트
+        """
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO searches (provider, query, max_results, names, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (provider, query, limit, json.dumps(names), time.time()),
+                )
+        except sqlite3.Error as e:
+            print(f"[아이콘 캐시 저장 오류] {e}")
+
+    def _read_blob(self, conn: sqlite3.Connection, digest: str) -> bytes:
+        with open(self._blob_path(digest), "rb") as f:
+            data = f.read()
+        conn.execute("UPDATE blobs SET last_used = ? WHERE hash = ?", (time.time(), digest))
+        return data
+
+    def _write_blob(self, conn: sqlite3.Connection, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        conn.execute(
+            "INSERT OR REPLACE INTO blobs (hash, size, last_used) VALUES (?, ?, ?)",
+            (digest, len(data), time.time()),
+        )
+        return digest
+
+    def get_svg(self, url: str) -> Optional[bytes]:
+        """
+        URL로 저장된 SVG 본문을 반환합니다.
+
+        Args:
+            url: SVG 파일 URL
+
+        Returns:
+            SVG 바이너리 데이터. 없으면 None.
+        """
+        return self._lookup("SELECT hash FROM urls WHERE url = ?", url)
+
+    def put_svg(self, url: str, data: bytes) -> str:
+        """
+        SVG 본문을 내용 해시로 저장하고 URL을 색인에 추가합니다.
+
+        Args:
+            url: SVG 파일 URL
+            data: SVG 바이너리 데이터
+
+        Returns:
+            내용의 SHA-256 해시
+        """
+        return self._store("INSERT OR REPLACE INTO urls (url, hash) VALUES (?, ?)", url, data)
+
+    def get_optimized(self, source_hash: str) -> Optional[bytes]:
+        """
+        원본 SVG 해시로 저장된 최적화 결과를 반환합니다.
+
+        Args:
+            source_hash: 원본 SVG의 SHA-256 해시
+
+        Returns:
+            최적화된 SVG 바이너리 데이터. 없으면 None.
+        """
+        return self._lookup("SELECT hash FROM optimized WHERE source_hash = ?", source_hash)
+
+    def put_optimized(self, source_hash: str, data: bytes) -> str:
+        """
+        최적화된 SVG를 내용 해시로 저장하고 원본 해시와 연결합니다.
+
+        Args:
+            source_hash: 원본 SVG의 SHA-256 해시
+            data: 최적화된 SVG 바이너리 데이터
+
+        Returns:
+            최적화된 내용의 SHA-256 해시
+        """
+        return self._store(
+            "INSERT OR REPLACE INTO optimized (source_hash, hash) VALUES (?, ?)", source_hash, data
+        )
+
+    def _lookup(self, sql: str, key: str) -> Optional[bytes]:
+        """색인(sql)에서 key의 해시를 찾아 SVG 본문을 읽습니다."""
+        row = None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(sql, (key,)).fetchone()
+                if not row:
+                    return None
+                return self._read_blob(conn, row[0])
+        except FileNotFoundError:
+            # 파일이 지워졌으면 색인도 정리
+            self._forget_blob(row[0])
+            return None
+        except (sqlite3.Error, OSError) as e:
+            print(f"[아이콘 캐시 읽기 오류] {key}: {e}")
+            return None
+
+    def _store(self, sql: str, key: str, data: bytes) -> str:
+        """SVG 본문을 저장하고 색인(sql)에 key → 해시를 추가합니다."""
+        digest = hashlib.sha256(data).hexdigest()
+        try:
+            with self._connect() as conn:
+                self._write_blob(conn, data)
+                conn.execute(sql, (key, digest))
+            self._evict()
+        except (sqlite3.Error, OSError) as e:
+            print(f"[아이콘 캐시 저장 오류] {key}: {e}")
+        return digest
+
+    def _forget_blob(self, digest: str) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM blobs WHERE hash = ?", (digest,))
+                conn.execute("DELETE FROM urls WHERE hash = ?", (digest,))
+                conn.execute("DELETE FROM optimized WHERE hash = ?", (digest,))
+        except sqlite3.Error as e:
+            print(f"[아이콘 캐시 정리 오류] {e}")
+
+    def _evict(self) -> None:
+        """전체 크기가 max_bytes를 넘으면 오래 쓰지 않은 SVG부터 지웁니다."""
+        with self._connect() as conn:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            victims = []
+            for digest, size in conn.execute("SELECT hash, size FROM blobs ORDER BY last_used"):
+                if total <= self.max_bytes:
+                    break
+                victims.append(digest)
+                total -= size
+            conn.executemany("DELETE FROM blobs WHERE hash = ?", [(d,) for d in victims])
+            conn.executemany("DELETE FROM urls WHERE hash = ?", [(d,) for d in victims])
+            conn.executemany("DELETE FROM optimized WHERE hash = ?", [(d,) for d in victims])
+        for digest in victims:
+            try:
+                os.remove(self._blob_path(digest))
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        """
+        저장된 검색 결과 수, URL 수, SVG 파일 수와 전체 크기를 반환합니다.
+
+        Returns:
+            {"searches", "urls", "blobs", "bytes"} 딕셔너리
+        """
+        try:
+            with self._connect() as conn:
+                searches = conn.execute("SELECT COUNT(*) FROM searches").fetchone()[0]
+                urls = conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+                blobs, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+        except sqlite3.Error:
+            return {"searches": 0, "urls": 0, "blobs": 0, "bytes": 0}
+        return {"searches": searches, "urls": urls, "blobs": blobs, "bytes": size}
+
+
+_cache: Optional[IconCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_icon_cache() -> IconCache:
+    """
+    프로세스 전체에서 공유하는 IconCache 인스턴스를 반환합니다.
+
+    저장 위치, 검색 결과 TTL(초), 최대 크기(바이트)는 환경 변수
+    ICON_CACHE_DIR, ICON_SEARCH_TTL, ICON_CACHE_MAX_BYTES로 설정합니다.
+
+    Returns:
+        공유 IconCache 인스턴스
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = IconCache(
+                cache_dir=os.getenv("ICON_CACHE_DIR", DEFAULT_ICON_CACHE_DIR),
+                search_ttl=float(os.getenv("ICON_SEARCH_TTL", DEFAULT_SEARCH_TTL)),
+                max_bytes=int(os.getenv("ICON_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+            )
+        return _cache
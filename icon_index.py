@@ -0,0 +1,343 @@
+"""로컬 아이콘 검색 색인 모듈 - Iconify 컬렉션 메타데이터로 만든 역색인을 mmap으로 검색
+
+사용 예:
+    # Iconify API에서 컬렉션 메타데이터를 받아 색인 생성
+    python icon_index.py build --prefix mdi --prefix material-symbols
+
+    # @iconify/json 패키지의 아이콘 세트 파일로 색인 생성 (네트워크 없이)
+    python icon_index.py build --json node_modules/@iconify/json/json/mdi.json
+
+    # 색인 검색
+    python icon_index.py search "business meeting" --limit 5
+
+색인 파일 형식 (리틀 엔디언):
+    헤더: 매직(4바이트) + 아이콘 수, 토큰 수
+    아이콘 오프셋 표 (아이콘 수 + 1) × uint32 → 아이콘 이름 영역("prefix:name" UTF-8)
+    토큰 표 토큰 수 × (문자열 오프셋, 문자열 길이, 포스팅 오프셋, 포스팅 개수) uint32 - 토큰 사전순
+    토큰 문자열 영역, 포스팅 영역 (uint32: 아이콘 번호 << 2 | 필드)
+"""
+import argparse
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+
+
+BASE_DIR = os.path.dirname(__file__)
+DATA_DIR = os.path.join(BASE_DIR, "data")
+DEFAULT_INDEX_PATH = os.path.join(DATA_DIR, "icon_index.bin")
+DEFAULT_PREFIXES = ["mdi", "material-symbols", "tabler", "ph"]
+
+MAGIC = b"ICX1"
+_HEADER = struct.Struct("<4sII")
+_TOKEN_ENTRY = struct.Struct("<IIII")
+_UINT32 = struct.Struct("<I")
+
+# 필드별 가중치: 아이콘 이름 토큰 > 별칭 토큰 > 카테고리 토큰
+FIELD_NAME, FIELD_ALIAS, FIELD_CATEGORY = 0, 1, 2
+FIELD_WEIGHTS = {FIELD_NAME: 4.0, FIELD_ALIAS: 2.0, FIELD_CATEGORY: 1.0}
+PREFIX_MATCH_FACTOR = 0.5  # 토큰 앞부분만 일치할 때 가중치 배율
+MIN_PREFIX_LENGTH = 3  # 이보다 짧은 검색어는 앞부분 일치를 쓰지 않음
+MAX_PREFIX_EXPANSIONS = 64
+
+_TOKEN_SPLIT_RE = re.compile(r"[^a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    아이콘 이름/검색어를 소문자 영숫자 토큰으로 나눕니다.
+
+    Args:
+        text: 아이콘 이름, 카테고리 이름 또는 검색어
+
+    Returns:
+        토큰 리스트 (중복 제거, 순서 유지)
+    """
+    return list(dict.fromkeys(token for token in _TOKEN_SPLIT_RE.split(text.lower()) if token))
+
+
+def _collection_entries(prefix: str, data: Dict) -> Iterator[Tuple[str, List[str], List[str]]]:
+    """
+    컬렉션 메타데이터에서 (아이콘 이름, 별칭 리스트, 카테고리 리스트)를 꺼냅니다.
+
+    Iconify API의 /collection 응답({"uncategorized", "categories", "aliases", "hidden"})과
+    @iconify/json 아이콘 세트({"icons", "aliases": {이름: {"parent"}}, "categories"})를 모두 지원합니다.
+    """
+    categories: Dict[str, List[str]] = {}
+    for category, names in (data.get("categories") or {}).items():
+        for name in names:
+            categories.setdefault(name, []).append(category)
+
+    names = list(data.get("icons") or {})
+    names += [name for name in data.get("uncategorized") or [] if name not in categories]
+    names += list(categories)
+    hidden = set(data.get("hidden") or [])
+    for name, info in (data.get("icons") or {}).items():
+        if isinstance(info, dict) and info.get("hidden"):
+            hidden.add(name)
+
+    aliases: Dict[str, List[str]] = {}
+    for alias, parent in (data.get("aliases") or {}).items():
+        parent = parent.get("parent") if isinstance(parent, dict) else parent
+        if parent:
+            aliases.setdefault(parent, []).append(alias)
+
+    for name in dict.fromkeys(names):
+        if name not in hidden:
+            yield name, aliases.get(name, []), categories.get(name, [])
+
+
+def build_index(collections: Dict[str, Dict], path: str = DEFAULT_INDEX_PATH) -> Tuple[int, int]:
+    """
+    컬렉션 메타데이터로 역색인 파일을 만듭니다.
+
+    Args:
+        collections: {컬렉션 프리픽스: 메타데이터}
+        path: 저장할 색인 파일 경로
+
+    Returns:
+        (아이콘 수, 토큰 수)
+    """
+    icons: List[str] = []
+    postings: Dict[str, List[int]] = {}
+    for prefix, data in collections.items():
+        for name, aliases, categories in _collection_entries(prefix, data):
+            icon_id = len(icons)
+            icons.append(f"{prefix}:{name}")
+            fields = [(FIELD_NAME, tokenize(name))]
+            fields.append((FIELD_ALIAS, [t for alias in aliases for t in tokenize(alias)]))
+            fields.append((FIELD_CATEGORY, [t for category in categories for t in tokenize(category)]))
+            seen = set()
+            for field, tokens in fields:
+                for token in tokens:
+                    if token not in seen:  # 같은 아이콘은 가장 높은 필드로 한 번만
+                        seen.add(token)
+                        postings.setdefault(token, []).append(icon_id << 2 | field)
+
+    name_blob = bytearray()
+    icon_offsets = [0]
+    for icon in icons:
+        name_blob += icon.encode("utf-8")
+        icon_offsets.append(len(name_blob))
+
+    tokens = sorted(postings, key=lambda token: token.encode("utf-8"))
+    token_blob = bytearray()
+    posting_blob = bytearray()
+    entries = []
+    for token in tokens:
+        encoded = token.encode("utf-8")
+        entries.append((len(token_blob), len(encoded), len(posting_blob) // 4, len(postings[token])))
+        token_blob += encoded
+        posting_blob += struct.pack(f"<{len(postings[token])}I", *postings[token])
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(icons), len(tokens)))
+        f.write(struct.pack(f"<{len(icon_offsets)}I", *icon_offsets))
+        f.write(name_blob)
+        for entry in entries:
+            f.write(_TOKEN_ENTRY.pack(*entry))
+        f.write(token_blob)
+        f.write(posting_blob)
+    os.replace(tmp_path, path)
+    return len(icons), len(tokens)
+
+
+class IconIndex:
+    """
+    build_index로 만든 색인 파일을 mmap으로 열어 검색합니다.
+
+    파일 전체를 파이썬 객체로 읽지 않고, 토큰 표를 이진 탐색해 필요한 포스팅만 읽습니다.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.icon_count, self.token_count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"아이콘 색인 파일 형식이 아닙니다: {path}")
+        self._icon_offsets_at = _HEADER.size
+        self._names_at = self._icon_offsets_at + (self.icon_count + 1) * 4
+        names_size = self._icon_offset(self.icon_count)
+        self._entries_at = self._names_at + names_size
+        self._tokens_at = self._entries_at + self.token_count * _TOKEN_ENTRY.size
+        if self.token_count:
+            last = self._entry(self.token_count - 1)
+            self._postings_at = self._tokens_at + last[0] + last[1]
+        else:
+            self._postings_at = self._tokens_at
+
+    def _icon_offset(self, icon_id: int) -> int:
+        return _UINT32.unpack_from(self._mm, self._icon_offsets_at + icon_id * 4)[0]
+
+    def icon_name(self, icon_id: int) -> str:
+        """아이콘 번호를 "prefix:name" 이름으로 바꿉니다."""
+        start, end = self._icon_offset(icon_id), self._icon_offset(icon_id + 1)
+        return self._mm[self._names_at + start:self._names_at + end].decode("utf-8")
+
+    def _entry(self, index: int) -> Tuple[int, int, int, int]:
+        return _TOKEN_ENTRY.unpack_from(self._mm, self._entries_at + index * _TOKEN_ENTRY.size)
+
+    def _token(self, index: int) -> bytes:
+        offset, length, _, _ = self._entry(index)
+        return self._mm[self._tokens_at + offset:self._tokens_at + offset + length]
+
+    def _postings(self, index: int) -> Iterable[int]:
+        _, _, offset, count = self._entry(index)
+        return struct.unpack_from(f"<{count}I", self._mm, self._postings_at + offset * 4)
+
+    def _find(self, token: bytes) -> int:
+        """token 이상인 첫 토큰의 위치를 이진 탐색으로 찾습니다."""
+        return bisect_left(range(self.token_count), token, key=self._token)
+
+    def search(self, query: str, limit: int = 3, prefix: Optional[str] = None) -> List[str]:
+        """
+        검색어와 관련도가 높은 아이콘 이름을 반환합니다.
+
+        검색어 토큰이 아이콘 이름/별칭/카테고리 토큰과 일치하면 필드별 가중치를 더하고,
+        토큰 앞부분만 일치하면 절반을 더합니다. 점수가 같으면 이름이 짧은 아이콘이 앞섭니다.
+
+        Args:
+            query: 검색어 (영어 키워드)
+            limit: 최대 결과 개수
+            prefix: 이 컬렉션의 아이콘만 검색 (예: "material-symbols")
+
+        Returns:
+            "prefix:name" 형식의 아이콘 이름 리스트
+        """
+        scores: Dict[int, float] = {}
+        for token in tokenize(query):
+            encoded = token.encode("utf-8")
+            best: Dict[int, float] = {}
+            index = self._find(encoded)
+            for expansion in range(MAX_PREFIX_EXPANSIONS):
+                if index + expansion >= self.token_count:
+                    break
+                candidate = self._token(index + expansion)
+                if not candidate.startswith(encoded):
+                    break
+                exact = candidate == encoded
+                if not exact and len(encoded) < MIN_PREFIX_LENGTH:
+                    break
+                factor = 1.0 if exact else PREFIX_MATCH_FACTOR
+                for posting in self._postings(index + expansion):
+                    icon_id = posting >> 2
+                    weight = FIELD_WEIGHTS[posting & 3] * factor
+                    if weight > best.get(icon_id, 0.0):
+                        best[icon_id] = weight
+            for icon_id, weight in best.items():
+                scores[icon_id] = scores.get(icon_id, 0.0) + weight
+
+        if prefix:
+            wanted = f"{prefix}:"
+            names = {icon_id: self.icon_name(icon_id) for icon_id in scores}
+            scores = {icon_id: score for icon_id, score in scores.items() if names[icon_id].startswith(wanted)}
+        ranked = sorted(
+            scores,
+            key=lambda icon_id: (-scores[icon_id], self._icon_offset(icon_id + 1) - self._icon_offset(icon_id), icon_id),
+        )
+        return [self.icon_name(icon_id) for icon_id in ranked[:limit]]
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+_index: Optional[IconIndex] = None
+_index_mtime: Optional[float] = None
+_index_lock = threading.Lock()
+
+
+def get_icon_index() -> Optional[IconIndex]:
+    """
+    공유 IconIndex 인스턴스를 반환합니다. 색인 파일이 바뀌면 다시 엽니다.
+
+    색인 경로는 환경 변수 ICON_INDEX_PATH로 설정합니다.
+
+    Returns:
+        IconIndex. 색인 파일이 없거나 읽을 수 없으면 None.
+    """
+    global _index, _index_mtime
+    path = os.getenv("ICON_INDEX_PATH", DEFAULT_INDEX_PATH)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    with _index_lock:
+        if _index is None or _index.path != path or _index_mtime != mtime:
+            try:
+                _index = IconIndex(path)
+                _index_mtime = mtime
+            except (OSError, ValueError, struct.error) as e:
+                print(f"[아이콘 색인 열기 오류] {e}")
+                _index = None
+        return _index
+
+
+def fetch_collection(prefix: str) -> Dict:
+    """
+    Iconify API에서 컬렉션 메타데이터(아이콘 이름, 카테고리, 별칭)를 받습니다.
+
+    Args:
+        prefix: 컬렉션 프리픽스
+
+    Returns:
+        /collection 응답 딕셔너리
+    """
+    from image_prep import ICONIFY_API_BASE
+
+    resp = requests.get(f"{ICONIFY_API_BASE}/collection", params={"prefix": prefix}, timeout=30)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def main():
+    """메인 실행 함수"""
+    import json
+
+    parser = argparse.ArgumentParser(description="로컬 아이콘 검색 색인")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="색인 생성")
+    build.add_argument("--prefix", action="append", help=f"Iconify API에서 받을 컬렉션 (기본값: {', '.join(DEFAULT_PREFIXES)})")
+    build.add_argument("--json", action="append", default=[], help="@iconify/json 아이콘 세트 파일")
+    build.add_argument("--output", default=os.getenv("ICON_INDEX_PATH", DEFAULT_INDEX_PATH))
+    search = sub.add_parser("search", help="색인 검색")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=5)
+    search.add_argument("--prefix")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        collections = {}
+        for path in args.json:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            collections[data["prefix"]] = data
+        for prefix in args.prefix or ([] if args.json else DEFAULT_PREFIXES):
+            print(f"[아이콘 색인] {prefix} 컬렉션 받는 중...")
+            collections[prefix] = fetch_collection(prefix)
+        icons, tokens = build_index(collections, args.output)
+        size = os.path.getsize(args.output)
+        print(f"[아이콘 색인] 아이콘 {icons}개, 토큰 {tokens}개, {size / 1024:.1f}KB → {args.output}")
+    else:
+        index = get_icon_index()
+        if index is None:
+            print("[아이콘 색인] 색인 파일이 없습니다. 먼저 build를 실행하세요.")
+            return
+        started = time.perf_counter()
+        results = index.search(args.query, args.limit, args.prefix)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"[아이콘 색인] {elapsed:.3f}ms")
+        for name in results:
+            print(f"  {name}")
+
+
+if __name__ == "__main__":
+    main()
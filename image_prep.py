@@ -1,17 +1,51 @@
 """카드뉴스 이미지 자료 준비 모듈"""
-import io
 import os
-import zipfile
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
 import requests
 
+from icon_cache import get_icon_cache
+from icon_index import get_icon_index
+from svg_optimizer import optimize_svgs
+from zip_export import icon_entries, iter_zip
 
-ICONIFY_API_BASE = "https://api.iconify.design"
+
+ICONIFY_API_BASE = os.getenv("ICONIFY_API_BASE", "https://api.iconify.design")
+DEFAULT_ICON_PREP_WORKERS = 8  # 카드뉴스 한 벌의 아이콘 검색/다운로드 동시 요청 수
+BULK_ICON_LIMIT = 64  # 컬렉션 일괄 요청 한 번에 담을 아이콘 수 (URL 길이 제한)
+BRAND_PRIMARY = "#6750A4"  # 충콘진 브랜드 컬러 (카드 이미지 프롬프트, card_renderer 공용)
+BRAND_SECONDARY = "#625B71"
+
+
+def _icon_results(names: List[str]) -> List[Dict[str, str]]:
+    """아이콘 이름 리스트를 {"name", "url"} 리스트로 변환합니다. (SVG 다운로드 URL 생성)"""
+    return [{"name": name, "url": f"{ICONIFY_API_BASE}/{name}.svg"} for name in names]
+
+
+def _search_local(query: str, limit: int, prefix: Optional[str] = None) -> Optional[List[Dict[str, str]]]:
+    """
+    로컬 아이콘 색인(icon_index)에서 검색합니다.
+    
+    Returns:
+        아이콘 정보 리스트. 색인이 없거나, 결과가 없고 원격 검색을 써야 하면 None.
+    """
+    index = get_icon_index()
+    remote = os.getenv("ICON_REMOTE_SEARCH", "1") != "0"
+    if index is None:
+        return None if remote else []
+    names = index.search(query, limit, prefix)
+    if not names and remote:
+        return None
+    return _icon_results(names)
 
 
 def search_iconify_icons(query: str, limit: int = 3) -> List[Dict[str, str]]:
     """
-    Iconify API로 벡터 아이콘을 검색합니다.
+    벡터 아이콘을 검색합니다.
+    
+    로컬 아이콘 색인(python icon_index.py build)이 있으면 네트워크 없이 색인에서 찾고,
+    색인이 없거나 결과가 없을 때만 Iconify API로 검색합니다. (ICON_REMOTE_SEARCH=0이면 API 사용 안 함)
+    API 검색 결과는 아이콘 캐시에 저장해 TTL 동안 재사용합니다.
     
     Args:
         query: 검색어 (영어 키워드)
@@ -20,6 +54,14 @@ def search_iconify_icons(query: str, limit: int = 3) -> List[Dict[str, str]]:
     Returns:
         아이콘 정보 리스트. 각 항목은 {"name", "url"} 키를 가집니다.
     """
+    local = _search_local(query, limit)
+    if local is not None:
+        return local
+    
+    cached = get_icon_cache().get_search("iconify", query, limit)
+    if cached is not None:
+        return _icon_results(cached)
+    
     try:
         resp = requests.get(
             f"{ICONIFY_API_BASE}/search",
@@ -33,13 +75,9 @@ def search_iconify_icons(query: str, limit: int = 3) -> List[Dict[str, str]]:
         data = resp.json()
         icons = data.get("icons", [])
         
-        results = []
-        for icon_name in icons[:limit]:
-            # SVG 다운로드 URL 생성
-            svg_url = f"{ICONIFY_API_BASE}/{icon_name}.svg"
-            results.append({"name": icon_name, "url": svg_url})
-        
-        return results
+        names = icons[:limit]
+        get_icon_cache().put_search("iconify", query, limit, names)
+        return _icon_results(names)
     except Exception as e:
         print(f"[Iconify 검색 오류] {e}")
         return []
@@ -47,7 +85,9 @@ def search_iconify_icons(query: str, limit: int = 3) -> List[Dict[str, str]]:
 
 def search_material_icons(query: str, limit: int = 3) -> List[Dict[str, str]]:
     """
-    Material Icons를 Iconify API를 통해 검색합니다.
+    Material Icons(material-symbols 컬렉션)를 검색합니다.
+    
+    search_iconify_icons와 같이 로컬 아이콘 색인을 먼저 쓰고, 필요할 때만 Iconify API로 검색합니다.
     
     Args:
         query: 검색어 (영어 키워드)
@@ -56,6 +96,14 @@ def search_material_icons(query: str, limit: int = 3) -> List[Dict[str, str]]:
     Returns:
         아이콘 정보 리스트. 각 항목은 {"name", "url"} 키를 가집니다.
     """
+    local = _search_local(query, limit, prefix="material-symbols")
+    if local is not None:
+        return local
+    
+    cached = get_icon_cache().get_search("material", query, limit)
+    if cached is not None:
+        return _icon_results(cached)
+    
     try:
         # material-symbols 프리픽스로 검색
         resp = requests.get(
@@ -70,14 +118,10 @@ def search_material_icons(query: str, limit: int = 3) -> List[Dict[str, str]]:
         data = resp.json()
         icons = data.get("icons", [])
         
-        results = []
-        for icon_name in icons[:limit]:
-            # material-symbols 프리픽스가 포함된 경우 그대로 사용
-            if icon_name.startswith("material-symbols:"):
-                svg_url = f"{ICONIFY_API_BASE}/{icon_name}.svg"
-                results.append({"name": icon_name, "url": svg_url})
-        
-        return results
+        # material-symbols 프리픽스가 포함된 경우만 사용
+        names = [name for name in icons[:limit] if name.startswith("material-symbols:")]
+        get_icon_cache().put_search("material", query, limit, names)
+        return _icon_results(names)
     except Exception as e:
         print(f"[Material Icons 검색 오류] {e}")
         return []
@@ -85,7 +129,7 @@ def search_material_icons(query: str, limit: int = 3) -> List[Dict[str, str]]:
 
 def download_svg(url: str, max_retries: int = 2) -> Optional[bytes]:
     """
-    SVG 파일을 다운로드합니다.
+    SVG 파일을 다운로드합니다. 아이콘 캐시에 있으면 네트워크 요청 없이 반환합니다.
     
     Args:
         url: SVG 파일 URL
@@ -96,10 +140,15 @@ def download_svg(url: str, max_retries: int = 2) -> Optional[bytes]:
     """
     import time
     
+    cached = get_icon_cache().get_svg(url)
+    if cached is not None:
+        return cached
+    
     for attempt in range(max_retries):
         try:
             resp = requests.get(url, timeout=10)
             if resp.status_code == 200:
+                get_icon_cache().put_svg(url, resp.content)
                 return resp.content
             elif resp.status_code == 429 and attempt < max_retries - 1:
                 time.sleep(1 * (attempt + 1))
@@ -117,6 +166,208 @@ def download_svg(url: str, max_retries: int = 2) -> Optional[bytes]:
     return None
 
 
+def _split_icon_url(url: str) -> Optional[Tuple[str, str]]:
+    """
+    "{ICONIFY_API_BASE}/{prefix}:{name}.svg" 형식의 URL에서 (컬렉션 프리픽스, 아이콘 이름)을 꺼냅니다.
+    
+    Returns:
+        (prefix, name). Iconify 아이콘 URL이 아니면 None.
+    """
+    base = f"{ICONIFY_API_BASE}/"
+    if not url.startswith(base) or not url.endswith(".svg"):
+        return None
+    prefix, sep, name = url[len(base):-len(".svg")].partition(":")
+    if not sep or not prefix or not name or "/" in prefix:
+        return None
+    return prefix, name
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+def render_iconify_svg(icon_set: Dict, name: str) -> Optional[str]:
+    """
+    Iconify 아이콘 세트 JSON에서 아이콘 하나를 SVG 문서로 만듭니다.
+    
+    별칭(aliases)과 회전/뒤집기 속성은 Iconify API의 SVG 응답과 같은 방식으로 적용합니다.
+    
+    Args:
+        icon_set: /{prefix}.json 응답 ({"icons", "aliases", "width", "height", ...})
+        name: 아이콘 이름 (프리픽스 제외)
+        
+    Returns:
+        SVG 문서 문자열. 세트에 없으면 None.
+    """
+    icons = icon_set.get("icons") or {}
+    aliases = icon_set.get("aliases") or {}
+    
+    # 별칭을 따라가며 속성 병합 (자식 값이 우선, 회전은 더하고 뒤집기는 XOR)
+    props: Dict = {}
+    rotate, h_flip, v_flip = 0, False, False
+    current = name
+    for _ in range(len(aliases) + 1):
+        item = icons.get(current) or aliases.get(current)
+        if not item:
+            return None
+        for key in ("left", "top", "width", "height"):
+            if key in item and key not in props:
+                props[key] = item[key]
+        rotate += item.get("rotate", 0)
+        h_flip ^= bool(item.get("hFlip", False))
+        v_flip ^= bool(item.get("vFlip", False))
+        if current in icons:
+            body = icons[current].get("body", "")
+            break
+        current = item.get("parent", "")
+    else:
+        return None
+    
+    left = props.get("left", icon_set.get("left", 0))
+    top = props.get("top", icon_set.get("top", 0))
+    width = props.get("width", icon_set.get("width", 16))
+    height = props.get("height", icon_set.get("height", 16))
+    
+    transforms = []
+    if h_flip:
+        if v_flip:
+            rotate += 2
+        else:
+            transforms.append(f"translate({_format_number(width + left)} {_format_number(-top)})")
+            transforms.append("scale(-1 1)")
+            left = top = 0
+    elif v_flip:
+        transforms.append(f"translate({_format_number(-left)} {_format_number(height + top)})")
+        transforms.append("scale(1 -1)")
+        left = top = 0
+    
+    rotate %= 4
+    if rotate == 1:
+        center = _format_number(height / 2 + top)
+        transforms.insert(0, f"rotate(90 {center} {center})")
+    elif rotate == 2:
+        transforms.insert(0, f"rotate(180 {_format_number(width / 2 + left)} {_format_number(height / 2 + top)})")
+    elif rotate == 3:
+        center = _format_number(width / 2 + left)
+        transforms.insert(0, f"rotate(-90 {center} {center})")
+    if rotate % 2 == 1:
+        left, top = top, left
+        width, height = height, width
+    
+    if transforms:
+        body = f'<g transform="{" ".join(transforms)}">{body}</g>'
+    xlink = ' xmlns:xlink="http://www.w3.org/1999/xlink"' if "xlink:" in body else ""
+    view_box = " ".join(_format_number(v) for v in (left, top, width, height))
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg"{xlink} width="1em" height="1em" '
+        f'viewBox="{view_box}">{body}</svg>'
+    )
+
+
+def fetch_icon_collection(prefix: str, names: List[str], max_retries: int = 2) -> Dict[str, bytes]:
+    """
+    한 컬렉션의 여러 아이콘을 /{prefix}.json?icons=a,b,c 요청 한 번으로 받아 SVG로 만듭니다.
+    
+    Args:
+        prefix: 컬렉션 프리픽스 (예: "mdi", "material-symbols")
+        names: 아이콘 이름 리스트 (프리픽스 제외)
+        max_retries: 최대 재시도 횟수
+        
+    Returns:
+        {아이콘 이름: SVG 바이너리 데이터}. 세트에 없는 아이콘은 빠집니다.
+    """
+    import time
+    
+    for attempt in range(max_retries):
+        try:
+            resp = requests.get(
+                f"{ICONIFY_API_BASE}/{prefix}.json",
+                params={"icons": ",".join(names)},
+                timeout=10,
+            )
+            if resp.status_code == 200:
+                icon_set = resp.json()
+                if not isinstance(icon_set, dict):
+                    # 컬렉션이 없으면 404 숫자만 반환됨
+                    return {}
+                rendered = {}
+                for name in names:
+                    svg = render_iconify_svg(icon_set, name)
+                    if svg:
+                        rendered[name] = svg.encode("utf-8")
+                return rendered
+            elif resp.status_code == 429 and attempt < max_retries - 1:
+                time.sleep(1 * (attempt + 1))
+                continue
+            print(f"[Iconify 일괄 조회 오류] {prefix}: {resp.status_code}")
+            return {}
+        except Exception as e:
+            print(f"[Iconify 일괄 조회 오류] {prefix}: {e}")
+            if attempt < max_retries - 1:
+                time.sleep(1)
+    
+    return {}
+
+
+def download_svgs(urls: List[str], max_workers: Optional[int] = None) -> Dict[str, Optional[bytes]]:
+    """
+    여러 SVG를 한꺼번에 준비합니다.
+    
+    캐시에 없는 Iconify 아이콘은 컬렉션 프리픽스별로 묶어 fetch_icon_collection으로
+    한 번에 받고, 일괄 조회에서 빠진 아이콘만 download_svg로 하나씩 받습니다.
+    
+    Args:
+        urls: SVG 파일 URL 리스트
+        max_workers: 동시 요청 수 (기본값: 환경 변수 ICON_PREP_WORKERS 또는 8)
+        
+    Returns:
+        {URL: SVG 바이너리 데이터}. 실패한 URL의 값은 None.
+    """
+    if max_workers is None:
+        max_workers = int(os.getenv("ICON_PREP_WORKERS", DEFAULT_ICON_PREP_WORKERS))
+    cache = get_icon_cache()
+    results: Dict[str, Optional[bytes]] = {}
+    groups: Dict[str, Dict[str, str]] = {}  # prefix → {아이콘 이름: URL}
+    singles: List[str] = []
+    for url in dict.fromkeys(urls):
+        cached = cache.get_svg(url)
+        if cached is not None:
+            results[url] = cached
+            continue
+        parsed = _split_icon_url(url)
+        if parsed:
+            groups.setdefault(parsed[0], {})[parsed[1]] = url
+        else:
+            singles.append(url)
+    
+    if not groups and not singles:
+        return results
+    
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="icon-bulk") as executor:
+        bulk_futures = {}
+        for prefix, members in groups.items():
+            names = list(members)
+            for start in range(0, len(names), BULK_ICON_LIMIT):
+                chunk = names[start:start + BULK_ICON_LIMIT]
+                bulk_futures[executor.submit(fetch_icon_collection, prefix, chunk)] = (prefix, chunk)
+        
+        single_futures = {url: executor.submit(download_svg, url) for url in singles}
+        for future in as_completed(bulk_futures):
+            prefix, chunk = bulk_futures[future]
+            rendered = future.result()
+            for name in chunk:
+                url = groups[prefix][name]
+                if name in rendered:
+                    results[url] = rendered[name]
+                    cache.put_svg(url, rendered[name])
+                else:
+                    single_futures[url] = executor.submit(download_svg, url)
+        
+        for url, future in single_futures.items():
+            results[url] = future.result()
+    return results
+
+
 def build_card_image_prompt(card: Dict[str, str]) -> str:
     """
     카드 정보를 바탕으로 AI 이미지 생성 프롬프트를 생성합니다.
@@ -146,7 +397,7 @@ def build_card_image_prompt(card: Dict[str, str]) -> str:
 정사각형(1:1) 비율, SNS용 카드뉴스 스타일.
 
 디자인 스타일:
-- 브랜드 컬러: #6750A4 (Primary), #625B71 (Secondary)
+- 브랜드 컬러: {BRAND_PRIMARY} (Primary), {BRAND_SECONDARY} (Secondary)
 - 일러스트 스타일: 현대적이고 깔끔한 플랫 디자인
 - 여백: 충분한 여백으로 가독성 확보
 - 배경: {bg_color}
@@ -171,6 +422,9 @@ def create_images_zip(
     """
     다운로드한 이미지들을 ZIP 파일로 압축합니다.
     
+    ZIP을 스트리밍으로 만들어 조각을 한 번만 이어 붙입니다. HTTP 응답이나 파일로 바로 보낼 때는
+    zip_export.iter_zip(icon_entries(...))를 사용하세요.
+    
     Args:
         iconify_icons: Iconify 아이콘 리스트. 각 항목은 {"name": ..., "data": ...} 형식.
         material_icons: Material Icons 리스트. 각 항목은 {"name": ..., "data": ...} 형식.
@@ -179,33 +433,97 @@ def create_images_zip(
     Returns:
         ZIP 파일 바이너리 데이터
     """
-    zip_buffer = io.BytesIO()
-    
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-        # Iconify 아이콘 추가
-        for icon in iconify_icons:
-            name = icon.get("name", "unknown")
-            data = icon.get("data")
-            if data:
-                zip_file.writestr(f"iconify/{name}.svg", data)
+    return b"".join(iter_zip(icon_entries(iconify_icons, material_icons)))
+
+
+def _search_query(card: Dict[str, str]) -> str:
+    """
+    카드의 image_key에서 아이콘 검색어를 뽑습니다.
+    
+    Args:
+        card: 카드 정보
         
-        # Material Icons 추가
-        for icon in material_icons:
-            name = icon.get("name", "unknown")
-            data = icon.get("data")
-            if data:
-                # material-symbols:xxx 형식에서 파일명만 추출
-                clean_name = name.replace("material-symbols:", "")
-                zip_file.writestr(f"material-icons/{clean_name}.svg", data)
+    Returns:
+        검색어. 없으면 빈 문자열.
+    """
+    # image_key에서 쉼표로 구분된 키워드 추출
+    # 여러 키워드 중 첫 번째 단어만 사용 (Iconify는 단일 단어 검색에 최적화)
+    image_key = card.get("image_key", "")
+    keywords = [k.strip() for k in image_key.replace(",", " ").split() if k.strip()]
+    return keywords[0] if keywords else ""
+
+
+def prepare_deck_images(cards: List[Dict[str, str]], max_workers: Optional[int] = None) -> List[Dict]:
+    """
+    카드뉴스 전체 카드의 이미지 자료를 한꺼번에 준비합니다.
     
-    zip_buffer.seek(0)
-    return zip_buffer.read()
+    모든 카드의 아이콘 검색을 스레드 풀에서 동시에 실행한 뒤, 검색된 아이콘을
+    download_svgs로 컬렉션별 일괄 요청해 받고 svg_optimizer로 줄입니다.
+    같은 검색어와 같은 SVG URL은 카드 간에 한 번만 요청합니다.
+    
+    Args:
+        cards: 카드 리스트
+        max_workers: 동시 요청 수 (기본값: 환경 변수 ICON_PREP_WORKERS 또는 8)
+        
+    Returns:
+        카드 순서대로 prepare_card_images와 같은 형식의 결과 리스트
+    """
+    if max_workers is None:
+        max_workers = int(os.getenv("ICON_PREP_WORKERS", DEFAULT_ICON_PREP_WORKERS))
+    queries = [_search_query(card) for card in cards]
+    unique_queries = list(dict.fromkeys(q for q in queries if q))
+    
+    searches: Dict[Tuple[str, str], List[Dict[str, str]]] = {}
+    if unique_queries:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="icon-prep") as executor:
+            search_futures = {}
+            for query in unique_queries:
+                search_futures[executor.submit(search_iconify_icons, query, 3)] = ("iconify", query)
+                search_futures[executor.submit(search_material_icons, query, 3)] = ("material", query)
+            for future in as_completed(search_futures):
+                searches[search_futures[future]] = future.result()
+    
+    # 검색된 아이콘 전체를 컬렉션별 일괄 요청으로 받은 뒤 최적화
+    downloads = download_svgs(
+        [icon["url"] for results in searches.values() for icon in results],
+        max_workers=max_workers,
+    )
+    optimized, original_bytes, optimized_bytes = optimize_svgs(downloads.items())
+    if original_bytes:
+        saved = original_bytes - optimized_bytes
+        print(
+            f"[SVG 최적화] {len(optimized)}개 {original_bytes:,} → {optimized_bytes:,}바이트 "
+            f"({saved:,}바이트, {saved / original_bytes:.0%} 절감)"
+        )
+    
+    def _downloaded(icons: List[Dict[str, str]]) -> List[Dict]:
+        items = []
+        for icon in icons:
+            svg_data = optimized.get(icon["url"])
+            if svg_data:
+                items.append({"name": icon["name"], "data": svg_data})
+        return items
+    
+    deck = []
+    for card, query in zip(cards, queries):
+        iconify_results = searches.get(("iconify", query), [])
+        material_results = searches.get(("material", query), [])
+        deck.append({
+            "prompt": build_card_image_prompt(card),
+            "iconify_icons": iconify_results,
+            "material_icons": material_results,
+            "iconify_downloaded": _downloaded(iconify_results),
+            "material_downloaded": _downloaded(material_results),
+        })
+    return deck
 
 
 def prepare_card_images(card: Dict[str, str]) -> Dict:
     """
     카드의 이미지 자료를 준비합니다 (Iconify/Material Icons 검색 + 다운로드 + 프롬프트 생성).
     
+    여러 카드를 준비할 때는 요청을 한꺼번에 처리하는 prepare_deck_images를 사용하세요.
+    
     Args:
         card: 카드 정보
         
@@ -218,54 +536,4 @@ def prepare_card_images(card: Dict[str, str]) -> Dict:
             "material_downloaded": List[Dict],  # 다운로드된 SVG 데이터 포함
         }
     """
-    image_key = card.get("image_key", "")
-    if not image_key:
-        return {
-            "prompt": build_card_image_prompt(card),
-            "iconify_icons": [],
-            "material_icons": [],
-            "iconify_downloaded": [],
-            "material_downloaded": [],
-        }
-    
-    # image_key에서 쉼표로 구분된 키워드 추출
-    # 여러 키워드 중 첫 번째 단어만 사용 (Iconify는 단일 단어 검색에 최적화)
-    keywords = [k.strip() for k in image_key.replace(",", " ").split() if k.strip()]
-    search_query = keywords[0] if keywords else image_key.strip().split()[0] if image_key.strip() else ""
-    
-    if not search_query:
-        return {
-            "prompt": build_card_image_prompt(card),
-            "iconify_icons": [],
-            "material_icons": [],
-            "iconify_downloaded": [],
-            "material_downloaded": [],
-        }
-    
-    # Iconify 아이콘 검색
-    iconify_results = search_iconify_icons(search_query, limit=3)
-    
-    # Material Icons 검색
-    material_results = search_material_icons(search_query, limit=3)
-    
-    # SVG 다운로드
-    iconify_downloaded = []
-    for icon in iconify_results:
-        svg_data = download_svg(icon["url"])
-        if svg_data:
-            iconify_downloaded.append({"name": icon["name"], "data": svg_data})
-    
-    material_downloaded = []
-    for icon in material_results:
-        svg_data = download_svg(icon["url"])
-        if svg_data:
-            material_downloaded.append({"name": icon["name"], "data": svg_data})
-    
-    return {
-        "prompt": build_card_image_prompt(card),
-        "iconify_icons": iconify_results,
-        "material_icons": material_results,
-        "iconify_downloaded": iconify_downloaded,
-        "material_downloaded": material_downloaded,
-    }
-
+    return prepare_deck_images([card])[0]
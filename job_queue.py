@@ -0,0 +1,446 @@
+"""작업 큐 모듈 - Slack 요청을 즉시 응답하고 오래 걸리는 작업은 백그라운드에서 처리
+
+작업은 SQLite 파일에 저장되므로 서버가 재시작되어도 남아 있고, 같은 파일을 쓰는
+여러 프로세스가 작업을 나눠 가져갑니다. 작업자 스레드가 작업을 가져가면 임대(lease)를
+걸어 두고, 프로세스가 죽어 임대가 끝난 작업은 다른 작업자가 다시 가져갑니다.
+실패한 작업은 지수 백오프로 다시 시도하고, 최대 시도 횟수를 넘기면 failed로 남깁니다.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+BASE_DIR = os.path.dirname(__file__)
+DATA_DIR = os.path.join(BASE_DIR, "data")
+DEFAULT_DB_PATH = os.path.join(DATA_DIR, "jobs.sqlite3")
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_DELAY = 5  # 첫 재시도까지 대기 시간 (초), 이후 두 배씩 증가
+DEFAULT_LEASE_SECONDS = 600  # 작업 하나의 최대 실행 시간 (초)
+DEFAULT_POLL_INTERVAL = 1.0  # 초
+DEFAULT_RETENTION = 7 * 24 * 3600  # 끝난 작업 기록 보관 기간 (초)
+PURGE_INTERVAL = 3600  # 작업자가 오래된 기록을 정리하는 간격 (초)
+
+STATUSES = ("queued", "running", "done", "failed")
+
+os.makedirs(DATA_DIR, exist_ok=True)
+
+
+class PermanentJobError(Exception):
+    """다시 시도해도 성공할 수 없는 작업 오류 (재시도 없이 바로 failed 처리)"""
+
+
+class JobQueue:
+    """
+    SQLite 기반 영구 작업 큐입니다.
+
+    작업 종류마다 register()로 처리 함수를 등록하고, enqueue()로 작업을 넣으면
+    start()로 띄운 작업자 스레드가 처리합니다. 처리 함수가 예외를 던지면 재시도하고,
+    마지막 시도까지 실패하면 등록할 때 넘긴 on_failure 함수를 호출합니다.
+    """
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_DB_PATH,
+        workers: int = DEFAULT_WORKERS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        self.db_path = db_path
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self._handlers: Dict[str, Callable[[Dict], Any]] = {}
+        self._failure_handlers: Dict[str, Callable[[Dict, str], Any]] = {}
+        self._threads: List[threading.Thread] = []
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._active = 0
+        self._next_purge = 0.0
+        self._init_db()
+
+    @property
+    def owner(self) -> str:
+        """임대 소유자 (fork된 작업 프로세스마다 다르도록 현재 PID 포함)"""
+        return f"{os.getpid()}-{id(self):x}"
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _init_db(self) -> None:
+        try:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS jobs ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, payload TEXT NOT NULL, "
+                    "status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, max_attempts INTEGER NOT NULL, "
+                    "dedupe_key TEXT, run_after REAL NOT NULL, locked_by TEXT, locked_until REAL, "
+                    "last_error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, run_after)")
+                conn.execute("CREATE INDEX IF NOT EXISTS jobs_dedupe ON jobs (dedupe_key, status)")
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[작업 큐 DB 초기화 오류] {e}")
+
+    def register(
+        self,
+        kind: str,
+        handler: Callable[[Dict], Any],
+        on_failure: Optional[Callable[[Dict, str], Any]] = None,
+    ) -> None:
+        """
+        작업 종류별 처리 함수를 등록합니다.
+
+        Args:
+            kind: 작업 종류 (예: "create_cardnews")
+            handler: payload를 받아 작업을 처리하는 함수. 실패하면 예외를 던짐.
+            on_failure: 마지막 시도까지 실패했을 때 (payload, 오류 메시지)로 호출되는 함수
+        """
+        self._handlers[kind] = handler
+        if on_failure:
+            self._failure_handlers[kind] = on_failure
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: Dict,
+        dedupe_key: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+    ) -> Optional[int]:
+        """
+        작업을 큐에 넣습니다.
+
+        Args:
+            kind: 작업 종류
+            payload: 처리 함수에 넘길 JSON 직렬화 가능한 데이터
+            dedupe_key: 같은 키의 작업이 대기/실행 중이면 새로 넣지 않고 그 작업 ID를 반환
+            max_attempts: 최대 시도 횟수 (기본값: 큐 설정)
+
+        Returns:
+            작업 ID. DB를 쓸 수 없으면 None.
+        """
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                if dedupe_key:
+                    row = conn.execute(
+                        "SELECT id FROM jobs WHERE dedupe_key = ? AND status IN ('queued', 'running')",
+                        (dedupe_key,),
+                    ).fetchone()
+                    if row:
+                        conn.execute("COMMIT")
+                        return row[0]
+                cursor = conn.execute(
+                    "INSERT INTO jobs (kind, payload, status, max_attempts, dedupe_key, run_after, created_at, updated_at) "
+                    "VALUES (?, ?, 'queued', ?, ?, ?, ?, ?)",
+                    (kind, json.dumps(payload, ensure_ascii=False), max_attempts or self.max_attempts,
+                     dedupe_key, now, now, now),
+                )
+                conn.execute("COMMIT")
+                job_id = cursor.lastrowid
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[작업 큐 등록 오류] {kind}: {e}")
+            return None
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id: int) -> Optional[Dict]:
+        """
+        작업 상태를 반환합니다. (payload 제외)
+
+        Args:
+            job_id: 작업 ID
+
+        Returns:
+            {"id", "kind", "status", "attempts", "max_attempts", "last_error", "created_at", "updated_at"}
+            딕셔너리. 없으면 None.
+        """
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT id, kind, status, attempts, max_attempts, last_error, created_at, updated_at "
+                    "FROM jobs WHERE id = ?",
+                    (job_id,),
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[작업 큐 조회 오류] {e}")
+            return None
+        if not row:
+            return None
+        keys = ("id", "kind", "status", "attempts", "max_attempts", "last_error", "created_at", "updated_at")
+        return dict(zip(keys, row))
+
+    def stats(self) -> Dict[str, int]:
+        """
+        상태별 작업 수를 반환합니다.
+
+        Returns:
+            {"queued", "running", "done", "failed"} 딕셔너리
+        """
+        counts = {status: 0 for status in STATUSES}
+        try:
+            conn = self._connect()
+            try:
+                for status, count in conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+                    counts[status] = count
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[작업 큐 조회 오류] {e}")
+        return counts
+
+    def purge(self, older_than: float = DEFAULT_RETENTION) -> int:
+        """
+        끝난(done/failed) 작업 중 older_than초보다 오래된 기록을 지웁니다.
+
+        Returns:
+            지운 작업 수
+        """
+        try:
+            conn = self._connect()
+            try:
+                cursor = conn.execute(
+                    "DELETE FROM jobs WHERE status IN ('done', 'failed') AND updated_at < ?",
+                    (time.time() - older_than,),
+                )
+            finally:
+                conn.close()
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            print(f"[작업 큐 정리 오류] {e}")
+            return 0
+
+    def _claim(self) -> Optional[Dict]:
+        """실행할 작업 하나에 임대를 걸고 가져옵니다. 임대가 끝난 running 작업도 다시 가져옵니다."""
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute(
+                    "SELECT id, kind, payload, attempts, max_attempts FROM jobs "
+                    "WHERE (status = 'queued' AND run_after <= ?) OR (status = 'running' AND locked_until < ?) "
+                    "ORDER BY run_after, id LIMIT 1",
+                    (now, now),
+                ).fetchone()
+                if row:
+                    conn.execute(
+                        "UPDATE jobs SET status = 'running', attempts = attempts + 1, locked_by = ?, "
+                        "locked_until = ?, updated_at = ? WHERE id = ?",
+                        (self.owner, now + self.lease_seconds, now, row[0]),
+                    )
+                conn.execute("COMMIT")
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[작업 큐 가져오기 오류] {e}")
+            return None
+        if not row:
+            return None
+        return {
+            "id": row[0],
+            "kind": row[1],
+            "payload": json.loads(row[2]),
+            "attempts": row[3] + 1,
+            "max_attempts": row[4],
+        }
+
+    def _finish(self, job_id: int, status: str, error: Optional[str] = None, run_after: Optional[float] = None) -> None:
+        try:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, last_error = ?, run_after = COALESCE(?, run_after), "
+                    "locked_by = NULL, locked_until = NULL, updated_at = ? WHERE id = ? AND locked_by = ?",
+                    (status, error, run_after, time.time(), job_id, self.owner),
+                )
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[작업 큐 상태 저장 오류] {job_id}: {e}")
+
+    def run_job(self, job: Dict) -> None:
+        """
+        가져온 작업 하나를 처리하고 결과(done/재시도/failed)를 저장합니다.
+
+        Args:
+            job: _claim()이 반환한 작업
+        """
+        handler = self._handlers.get(job["kind"])
+        try:
+            if handler is None:
+                raise PermanentJobError(f"등록되지 않은 작업 종류: {job['kind']}")
+            handler(job["payload"])
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            retryable = not isinstance(e, PermanentJobError) and job["attempts"] < job["max_attempts"]
+            if retryable:
+                delay = self.retry_delay * (2 ** (job["attempts"] - 1))
+                print(f"[작업 재시도 예정] #{job['id']} {job['kind']} ({job['attempts']}회 실패, {delay:.0f}초 후): {error}")
+                self._finish(job["id"], "queued", error, run_after=time.time() + delay)
+                return
+            print(f"[작업 실패] #{job['id']} {job['kind']}: {error}")
+            self._finish(job["id"], "failed", error)
+            on_failure = self._failure_handlers.get(job["kind"])
+            if on_failure:
+                try:
+                    on_failure(job["payload"], str(e))
+                except Exception as notify_error:
+                    print(f"[작업 실패 알림 오류] #{job['id']}: {notify_error}")
+            return
+        self._finish(job["id"], "done")
+
+    def run_pending(self) -> int:
+        """
+        지금 실행할 수 있는 작업을 현재 스레드에서 모두 처리합니다. (테스트, 단일 실행용)
+
+        Returns:
+            처리한 작업 수
+        """
+        processed = 0
+        while True:
+            job = self._claim()
+            if job is None:
+                return processed
+            self.run_job(job)
+            processed += 1
+
+    def _maybe_purge(self) -> None:
+        """PURGE_INTERVAL마다 한 번 끝난 작업 기록을 정리합니다. (작업자 여럿 중 하나만 실행)"""
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_purge:
+                return
+            self._next_purge = now + PURGE_INTERVAL
+        purged = self.purge()
+        if purged:
+            print(f"[작업 큐 정리] 끝난 작업 기록 {purged}건 삭제")
+
+    def _worker(self) -> None:
+        while not self._stopping.is_set():
+            job = self._claim()
+            if job is None:
+                # 할 일이 없을 때 오래된 기록 정리 (/health의 상태별 집계가 커지지 않도록)
+                self._maybe_purge()
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            with self._lock:
+                self._active += 1
+            try:
+                self.run_job(job)
+            finally:
+                with self._lock:
+                    self._active -= 1
+
+    def start(self) -> None:
+        """작업자 스레드를 띄웁니다. 이미 실행 중이면 아무것도 하지 않습니다."""
+        with self._lock:
+            if self._threads or self.workers <= 0:
+                return
+            self._stopping.clear()
+            for idx in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"job-worker-{idx}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """
+        새 작업을 가져가지 않게 하고, 실행 중인 작업이 끝날 때까지 기다립니다.
+
+        끝나지 않은 작업은 임대가 끝나면 다른 프로세스(또는 재시작한 서버)가 다시 실행합니다.
+
+        Args:
+            timeout: 최대 대기 시간 (초). None이면 끝날 때까지 대기.
+
+        Returns:
+            모든 작업자 스레드가 종료되었으면 True
+        """
+        self._stopping.set()
+        self._wakeup.set()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            threads = list(self._threads)
+        for thread in threads:
+            thread.join(None if deadline is None else max(0, deadline - time.monotonic()))
+        alive = [thread for thread in threads if thread.is_alive()]
+        with self._lock:
+            self._threads = alive
+        return not alive
+
+    def requeue_running(self) -> int:
+        """
+        이 프로세스가 실행 중인 작업을 대기 상태로 되돌립니다. (stop()이 시간 안에 끝나지 않았을 때)
+
+        임대가 끝나기를 기다리지 않고 다른 프로세스가 바로 다시 실행할 수 있게 합니다.
+
+        Returns:
+            되돌린 작업 수
+        """
+        try:
+            conn = self._connect()
+            try:
+                cursor = conn.execute(
+                    "UPDATE jobs SET status = 'queued', run_after = ?, locked_by = NULL, locked_until = NULL, "
+                    "last_error = 'interrupted by shutdown', updated_at = ? WHERE status = 'running' AND locked_by = ?",
+                    (time.time(), time.time(), self.owner),
+                )
+            finally:
+                conn.close()
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            print(f"[작업 큐 상태 저장 오류] {e}")
+            return 0
+
+    @property
+    def active(self) -> int:
+        """지금 처리 중인 작업 수"""
+        with self._lock:
+            return self._active
+
+
+_job_queue: Optional[JobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """
+    프로세스 전체에서 공유하는 JobQueue 인스턴스를 반환합니다.
+
+    DB 경로, 작업자 스레드 수, 최대 시도 횟수, 첫 재시도 대기 시간(초), 작업 임대 시간(초)은
+    환경 변수 JOB_QUEUE_DB, JOB_WORKERS, JOB_MAX_ATTEMPTS, JOB_RETRY_DELAY, JOB_LEASE_SECONDS로 설정합니다.
+
+    Returns:
+        공유 JobQueue 인스턴스
+    """
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue(
+                db_path=os.getenv("JOB_QUEUE_DB", DEFAULT_DB_PATH),
+                workers=int(os.getenv("JOB_WORKERS", DEFAULT_WORKERS)),
+                max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS)),
+                retry_delay=float(os.getenv("JOB_RETRY_DELAY", DEFAULT_RETRY_DELAY)),
+                lease_seconds=float(os.getenv("JOB_LEASE_SECONDS", DEFAULT_LEASE_SECONDS)),
+            )
+        return _job_queue
@@ -0,0 +1,285 @@
+"""부하 테스트 스크립트 - 스텁 서버를 대상으로 크롤링/생성 처리량 측정
+
+사용 예:
+    # 스텁 서버를 프로세스 안에서 띄우고 전체 시나리오 실행
+    python load_test.py --articles 30 --concurrency 4
+
+    # 따로 띄운 스텁 서버(지연/오류 설정 포함)를 대상으로 실행
+    python stub_server.py --port 8900 --latency gemini=lognormal:4:0.7 --rate-limit gemini=0.1
+    python load_test.py --stub-url http://127.0.0.1:8900 --scenario cards
+
+    # Slack App 서버를 개발 서버/gunicorn으로 띄워 HTTP 처리량 비교
+    python load_test.py --scenario slack --slack-server dev --concurrency 16
+    python load_test.py --scenario slack --slack-server gunicorn --concurrency 16
+
+실제 API 키나 캐시를 건드리지 않도록 모든 클라이언트의 기본 URL, API 키,
+캐시/DB 경로를 스텁과 임시 디렉터리로 바꾼 뒤 프로젝트 모듈을 불러옵니다.
+"""
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percentile / 100 * len(ordered)) - 1)]
+
+
+def _report(name: str, elapsed: float, count: int, latencies: List[float]) -> None:
+    """시나리오 결과를 출력합니다."""
+    throughput = count / elapsed if elapsed > 0 else 0.0
+    print(f"\n[{name}] {count}건 / {elapsed:.2f}초 → {throughput:.2f}건/초")
+    if latencies:
+        print(
+            f"  지연 시간 p50 {_percentile(latencies, 50):.2f}초, "
+            f"p95 {_percentile(latencies, 95):.2f}초, p99 {_percentile(latencies, 99):.2f}초, 최대 {max(latencies):.2f}초"
+        )
+
+
+def _configure_environment(stub_url: str, workdir: str) -> None:
+    """프로젝트 모듈을 불러오기 전에 스텁 URL과 임시 경로를 환경 변수로 지정합니다."""
+    os.environ.update({
+        "GEMINI_API_BASE": f"{stub_url}/v1",
+        "NAVER_API_BASE": stub_url,
+        "ICONIFY_API_BASE": f"{stub_url}/iconify",
+        "SLACK_API_BASE": f"{stub_url}/slack/api",
+        "SLACK_WEBHOOK_URL": f"{stub_url}/slack/webhook",
+        "GEMINI_API_KEY": "stub-key",
+        "NAVER_CLIENT_ID": "stub-id",
+        "NAVER_CLIENT_SECRET": "stub-secret",
+        "SLACK_BOT_TOKEN": "xoxb-stub",
+        "CARDNEWS_CACHE_DIR": os.path.join(workdir, "cache"),
+        "SIMILARITY_DB": os.path.join(workdir, "similarity.sqlite3"),
+        "SINGLE_FLIGHT_DB": os.path.join(workdir, "single_flight.sqlite3"),
+        "JOB_QUEUE_DB": os.path.join(workdir, "jobs.sqlite3"),
+        "DAILY_RECOMMENDATIONS_FILE": os.path.join(workdir, "daily_recommendations.json"),
+    })
+    os.makedirs(os.environ["CARDNEWS_CACHE_DIR"], exist_ok=True)
+
+
+def _start_stub_in_process() -> str:
+    """스텁 서버를 빈 포트로 띄우고 기본 URL을 반환합니다."""
+    import logging
+
+    from werkzeug.serving import make_server
+
+    from stub_server import create_app
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, create_app(), threaded=True)
+    threading.Thread(target=server.serve_forever, name="stub-server", daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def run_crawl() -> List[Dict]:
+    """daily_fetch의 크롤링(검색, 중복 제거, 점수 계산, 전체 제목 추출)을 측정합니다."""
+    from daily_fetch import fetch_daily_recommendations
+
+    started = time.monotonic()
+    articles = fetch_daily_recommendations()
+    _report("크롤링", time.monotonic() - started, len(articles), [])
+    return articles
+
+
+def _to_generation_input(articles: List[Dict]) -> List[Dict[str, str]]:
+    from slack_blocks import clean_html_tags
+
+    return [
+        {
+            "id": article.get("link", ""),
+            "title": clean_html_tags(article.get("full_title") or article.get("title", "")),
+            "content": clean_html_tags(article.get("description", "")),
+        }
+        for article in articles
+    ]
+
+
+def run_summaries(articles: List[Dict[str, str]]) -> None:
+    """일괄 요약(캐시/유사 기사 재사용 포함)을 측정합니다."""
+    from generation_manager import get_or_create_summaries
+
+    started = time.monotonic()
+    summaries = get_or_create_summaries(articles)
+    _report("일괄 요약", time.monotonic() - started, len(summaries), [])
+
+
+def _run_concurrently(name: str, items: List, concurrency: int, fn: Callable) -> None:
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def timed(item):
+        started = time.monotonic()
+        fn(item)
+        with lock:
+            latencies.append(time.monotonic() - started)
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(timed, items))
+    _report(name, time.monotonic() - started, len(items), latencies)
+
+
+def run_cards(articles: List[Dict[str, str]], concurrency: int) -> None:
+    """카드뉴스 문구 스트리밍 생성을 동시 사용자 수만큼 병렬로 측정합니다. (첫 카드까지의 시간 포함)"""
+    from generation_manager import get_or_create_script
+
+    first_card: List[float] = []
+    lock = threading.Lock()
+
+    def generate(article: Dict[str, str]) -> None:
+        started = time.monotonic()
+        seen = []
+
+        def on_card(card):
+            if not seen:
+                with lock:
+                    first_card.append(time.monotonic() - started)
+            seen.append(card)
+
+        get_or_create_script(article["id"], article["content"], article["title"], on_card=on_card, force=True)
+
+    _run_concurrently("카드뉴스 문구 생성", articles, concurrency, generate)
+    if first_card:
+        print(f"  첫 카드까지 p50 {_percentile(first_card, 50):.2f}초, p95 {_percentile(first_card, 95):.2f}초")
+
+
+def run_images(concurrency: int) -> None:
+    """카드뉴스 한 벌 단위의 이미지 자료(아이콘 검색/다운로드) 준비를 측정합니다."""
+    from image_prep import prepare_deck_images
+
+    keywords = ["business meeting", "award ceremony", "startup office", "game controller"]
+    decks = [
+        [
+            {"type": "program", "head": f"카드 {idx}", "body": "", "image_key": keywords[(deck + idx) % len(keywords)]}
+            for idx in range(8)
+        ]
+        for deck in range(4)
+    ]
+    _run_concurrently("이미지 자료 준비 (8장 덱)", decks, concurrency, prepare_deck_images)
+
+
+SLACK_SERVER_COMMANDS = {
+    "dev": [sys.executable, "slack_app.py"],
+    "gunicorn": [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:application"],
+}
+
+
+def _start_slack_server(server: str, port: int) -> subprocess.Popen:
+    """Slack App 서버를 하위 프로세스로 띄우고 /health가 응답할 때까지 기다립니다."""
+    import requests
+
+    process = subprocess.Popen(
+        SLACK_SERVER_COMMANDS[server],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env={**os.environ, "PORT": str(port)},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/health", timeout=1).ok:
+                return process
+        except requests.RequestException:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"{server} 서버가 30초 안에 시작되지 않았습니다.")
+
+
+def run_slack(server: str, total: int, concurrency: int, port: int) -> None:
+    """
+    Slack App 서버(HTTP)의 처리량을 측정합니다.
+
+    /cardnews 목록 명령과 요약 보기 버튼 요청을 번갈아 보내고, 버튼 작업은 서버의 작업 큐가
+    스텁 Gemini로 처리합니다.
+    """
+    import requests
+
+    from daily_recommendations import BUTTON_VALUE_PREFIX, load_daily_recommendations, save_daily_recommendations
+    from naver_api import search_naver_news
+
+    save_daily_recommendations(search_naver_news("충남콘텐츠진흥원", display=10))
+    article_ids = [article["id"] for article in load_daily_recommendations()]
+    process = _start_slack_server(server, port)
+    base_url = f"http://127.0.0.1:{port}"
+    session = requests.Session()
+    session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=concurrency))
+
+    def send(idx: int) -> None:
+        if idx % 2 == 0:
+            session.post(f"{base_url}/slack/command", data={"text": "", "channel_id": "C1"}, timeout=30)
+            return
+        article_id = article_ids[idx % len(article_ids)]
+        payload = {
+            "type": "block_actions",
+            "actions": [{"action_id": "view_summary_1", "value": f"{BUTTON_VALUE_PREFIX}{article_id}"}],
+            "channel": {"id": f"C{idx}"},
+            "user": {"id": "U1"},
+        }
+        session.post(f"{base_url}/slack/interactive", data={"payload": json.dumps(payload)}, timeout=30)
+
+    try:
+        _run_concurrently(f"Slack 서버 요청 ({server})", list(range(total)), concurrency, send)
+    finally:
+        process.terminate()
+        process.wait(timeout=60)
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="스텁 서버 대상 부하 테스트")
+    parser.add_argument("--stub-url", help="이미 실행 중인 스텁 서버 URL (없으면 프로세스 안에서 실행)")
+    parser.add_argument("--scenario", choices=["all", "crawl", "summaries", "cards", "images", "slack"], default="all")
+    parser.add_argument("--articles", type=int, default=20, help="생성 시나리오에 사용할 기사 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 사용자 수")
+    parser.add_argument("--slack-server", choices=sorted(SLACK_SERVER_COMMANDS), default="gunicorn", help="slack 시나리오의 서버 실행 방식")
+    parser.add_argument("--slack-requests", type=int, default=400, help="slack 시나리오의 요청 수")
+    parser.add_argument("--slack-port", type=int, default=8910, help="slack 시나리오의 서버 포트")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    workdir = tempfile.mkdtemp(prefix="cardnews-load-")
+    stub_url = (args.stub_url or _start_stub_in_process()).rstrip("/")
+    _configure_environment(stub_url, workdir)
+    print(f"[부하 테스트] 스텁: {stub_url}, 임시 디렉터리: {workdir}")
+
+    import requests
+
+    requests.delete(f"{stub_url}/_stats", timeout=5)
+
+    articles: List[Dict] = []
+    if args.scenario in ("all", "crawl"):
+        articles = run_crawl()
+    if args.scenario in ("all", "summaries", "cards"):
+        if not articles:
+            from naver_api import search_naver_news
+
+            articles = search_naver_news("충남콘텐츠진흥원", display=args.articles)
+        generation_input = _to_generation_input(articles[:args.articles])
+        if args.scenario in ("all", "summaries"):
+            run_summaries(generation_input)
+        if args.scenario in ("all", "cards"):
+            run_cards(generation_input, args.concurrency)
+    if args.scenario in ("all", "images"):
+        run_images(args.concurrency)
+    if args.scenario == "slack":
+        run_slack(args.slack_server, args.slack_requests, args.concurrency, args.slack_port)
+
+    stats = requests.get(f"{stub_url}/_stats", timeout=5).json()
+    print("\n[스텁 호출 수]")
+    for key, value in sorted(stats["counts"].items()):
+        print(f"  {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
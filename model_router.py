@@ -0,0 +1,253 @@
+"""모델 라우팅 모듈 - 모델별 지연 시간/오류율 집계, 폴백 순서, 헤지 요청 판단"""
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+
+DEFAULT_WINDOW = 50  # 모델별로 보관하는 최근 호출 수
+DEFAULT_MIN_SAMPLES = 5  # p95를 신뢰하기 위한 최소 표본 수
+DEFAULT_HEDGE_DELAY = 20.0  # 표본이 부족할 때의 헤지 대기 시간 (초)
+MIN_HEDGE_DELAY = 2.0  # 초
+DEFAULT_MAX_CHAIN = 3  # 폴백 순서에 포함할 최대 모델 수
+DEFAULT_HEDGE_RATIO = 0.2  # 최근 1분 요청 대비 허용하는 헤지 요청 비율
+UNHEALTHY_ERROR_RATE = 0.5  # 이 이상이면 폴백 순서 뒤로 미룸
+MODEL_LIST_TTL = 3600  # 모델 목록 캐시 시간 (초)
+MODEL_LIST_RETRY = 60  # 모델 목록 조회 실패 시 재조회 간격 (초)
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    """
+    값 목록의 백분위수를 계산합니다. (최근접 순위 방식)
+
+    Args:
+        values: 값 리스트 (비어 있으면 안 됨)
+        percentile: 0~100 사이 백분위
+
+    Returns:
+        백분위수 값
+    """
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(percentile / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class ModelStats:
+    """모델 하나의 최근 호출 지연 시간과 성공 여부를 보관합니다."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+
+    def record(self, latency: float, ok: bool) -> None:
+        self.outcomes.append(ok)
+        if ok:
+            self.latencies.append(latency)
+
+    def p50(self) -> Optional[float]:
+        return _percentile(list(self.latencies), 50) if self.latencies else None
+
+    def p95(self) -> Optional[float]:
+        return _percentile(list(self.latencies), 95) if self.latencies else None
+
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+
+class ModelRouter:
+    """
+    모델 폴백 순서와 헤지 요청 시점을 정합니다.
+
+    - 폴백 순서: flash 계열 > pro 계열 > 기타 (최근 오류율이 높은 모델은 뒤로)
+    - 헤지 시점: 현재 모델의 최근 p95 지연 시간을 넘기면 다음 모델로 한 번 더 요청
+
+    지연 시간은 호출 종류(kind)별로 따로 집계합니다.
+    ("generate": HTTP 요청 한 번의 응답 시간, "stream": 첫 조각까지의 시간)
+    """
+
+    def __init__(
+        self,
+        window: int = DEFAULT_WINDOW,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+        default_hedge_delay: float = DEFAULT_HEDGE_DELAY,
+        max_chain: int = DEFAULT_MAX_CHAIN,
+        hedge_ratio: float = DEFAULT_HEDGE_RATIO,
+    ):
+        self.window = window
+        self.min_samples = min_samples
+        self.default_hedge_delay = default_hedge_delay
+        self.max_chain = max(max_chain, 1)
+        self.hedge_ratio = hedge_ratio
+        self._stats: Dict[Tuple[str, str], ModelStats] = {}
+        self._models: List[str] = []
+        self._models_expire_at = 0.0
+        self._requests: Deque[float] = deque()
+        self._hedges: Deque[float] = deque()
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+
+    def _get_stats(self, model: str, kind: str) -> ModelStats:
+        key = (kind, model)
+        if key not in self._stats:
+            self._stats[key] = ModelStats(self.window)
+        return self._stats[key]
+
+    @staticmethod
+    def _base_order(models: List[str]) -> List[str]:
+        """우선순위(flash > pro > 기타)에 따라 모델을 정렬합니다. (같은 등급 안에서는 원래 순서 유지)"""
+        def rank(model: str) -> int:
+            name = model.lower()
+            if "flash" in name:
+                return 0
+            if "pro" in name:
+                return 1
+            return 2
+        return sorted(models, key=rank)
+
+    def chain(self, list_models: Callable[[], List[str]], kind: str = "generate") -> List[str]:
+        """
+        폴백 순서대로 정렬된 모델 목록을 반환합니다. (모델 목록은 캐시해서 재사용)
+
+        Args:
+            list_models: 사용 가능한 모델 목록을 조회하는 함수
+            kind: 호출 종류 (오류율 집계 기준)
+
+        Returns:
+            모델 이름 리스트 (최대 max_chain개). 사용 가능한 모델이 없으면 빈 리스트.
+        """
+        now = time.monotonic()
+        with self._lock:
+            models = self._models
+            expired = now >= self._models_expire_at
+
+        if expired:
+            # 동시에 만료를 본 호출자들은 한 번의 조회 결과를 함께 사용
+            with self._fetch_lock:
+                with self._lock:
+                    refreshed = time.monotonic() < self._models_expire_at
+                if not refreshed:
+                    fetched = list_models()
+                    with self._lock:
+                        if fetched:
+                            self._models = self._base_order(fetched)
+                            self._models_expire_at = time.monotonic() + MODEL_LIST_TTL
+                            print(f"[모델 선택] {', '.join(self._models[:self.max_chain])}")
+                        else:
+                            # 조회 실패 시 이전 목록을 유지하고 잠시 후 다시 조회
+                            self._models_expire_at = time.monotonic() + MODEL_LIST_RETRY
+                with self._lock:
+                    models = self._models
+
+        with self._lock:
+            healthy = []
+            unhealthy = []
+            for model in models:
+                stats = self._stats.get((kind, model))
+                if stats and len(stats.outcomes) >= self.min_samples and stats.error_rate() >= UNHEALTHY_ERROR_RATE:
+                    unhealthy.append(model)
+                else:
+                    healthy.append(model)
+        return (healthy + unhealthy)[:self.max_chain]
+
+    def record(self, model: str, latency: float, ok: bool, kind: str = "generate") -> None:
+        """
+        호출 결과를 기록합니다.
+
+        Args:
+            model: 모델 이름
+            latency: 소요 시간 (초)
+            ok: 성공 여부
+            kind: 호출 종류 ("generate" / "stream")
+        """
+        with self._lock:
+            self._get_stats(model, kind).record(latency, ok)
+
+    def hedge_delay(self, model: str, kind: str = "generate") -> float:
+        """
+        헤지 요청을 보내기 전까지 기다릴 시간을 반환합니다.
+
+        Args:
+            model: 현재 요청 중인 모델
+            kind: 호출 종류
+
+        Returns:
+            대기 시간 (초). 표본이 부족하면 기본값.
+        """
+        with self._lock:
+            stats = self._stats.get((kind, model))
+            if not stats or len(stats.latencies) < self.min_samples:
+                return self.default_hedge_delay
+            return max(MIN_HEDGE_DELAY, stats.p95())
+
+    def _trim_window(self, now: float) -> None:
+        for timestamps in (self._requests, self._hedges):
+            while timestamps and timestamps[0] < now - 60:
+                timestamps.popleft()
+
+    def note_request(self) -> None:
+        """라우팅된 요청 1건을 기록합니다. (헤지 허용량 계산용)"""
+        now = time.monotonic()
+        with self._lock:
+            self._trim_window(now)
+            self._requests.append(now)
+
+    def try_hedge(self) -> bool:
+        """
+        헤지 허용량이 남아 있으면 헤지 1건을 기록하고 True를 반환합니다.
+
+        최근 1분 요청 수의 hedge_ratio 비율(최소 1건)까지만 허용해,
+        전체가 느려졌을 때 헤지 요청이 분당 요청 제한을 다 써버리지 않게 합니다.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._trim_window(now)
+            if len(self._hedges) >= max(1, int(len(self._requests) * self.hedge_ratio)):
+                return False
+            self._hedges.append(now)
+            return True
+
+    def snapshot(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """
+        모델별 집계 현황을 반환합니다.
+
+        Returns:
+            {"<kind>:<모델>": {"calls", "p50", "p95", "error_rate"}} 딕셔너리
+        """
+        with self._lock:
+            return {
+                f"{kind}:{model}": {
+                    "calls": len(stats.outcomes),
+                    "p50": stats.p50(),
+                    "p95": stats.p95(),
+                    "error_rate": stats.error_rate(),
+                }
+                for (kind, model), stats in self._stats.items()
+            }
+
+
+_router: Optional[ModelRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_model_router() -> ModelRouter:
+    """
+    프로세스 전체에서 공유하는 ModelRouter 인스턴스를 반환합니다.
+
+    표본이 부족할 때의 헤지 대기 시간과 폴백 모델 수는 환경 변수
+    GEMINI_HEDGE_DELAY, GEMINI_FALLBACK_MODELS로 설정합니다. (폴백 모델 수 1이면 헤지/폴백 없음)
+
+    Returns:
+        공유 ModelRouter 인스턴스
+    """
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = ModelRouter(
+                default_hedge_delay=float(os.getenv("GEMINI_HEDGE_DELAY", DEFAULT_HEDGE_DELAY)),
+                max_chain=int(os.getenv("GEMINI_FALLBACK_MODELS", DEFAULT_MAX_CHAIN)),
+            )
+        return _router
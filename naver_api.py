@@ -1,15 +1,30 @@
 """네이버 뉴스 Open API 모듈"""
 import os
+import threading
 import time
 from typing import Dict, List
 
 import requests
 
 
-NAVER_NEWS_URL = "https://openapi.naver.com/v1/search/news.json"
+NAVER_API_BASE = os.getenv("NAVER_API_BASE", "https://openapi.naver.com")
+NAVER_NEWS_URL = f"{NAVER_API_BASE}/v1/search/news.json"
 MAX_RETRIES = 3
 RETRY_DELAY = 1  # 초
 
+_request_count = 0  # 재시도를 포함한 API 요청 수 (쿼터 사용량 집계용)
+_request_count_lock = threading.Lock()
+
+
+def get_request_count() -> int:
+    """
+    이 프로세스에서 보낸 네이버 뉴스 API 요청 수를 반환합니다. (재시도 포함)
+    
+    Returns:
+        누적 요청 수
+    """
+    return _request_count
+
 
 def search_naver_news(keyword: str, display: int = 10, sort: str = "date") -> List[Dict]:
     """
@@ -40,9 +55,12 @@ def search_naver_news(keyword: str, display: int = 10, sort: str = "date") -> Li
         "sort": sort,
     }
 
+    global _request_count
     # 재시도 로직
     for attempt in range(MAX_RETRIES):
         try:
+            with _request_count_lock:
+                _request_count += 1
             resp = requests.get(NAVER_NEWS_URL, headers=headers, params=params, timeout=10)
             
             # HTTP 상태 코드 확인 (성공 여부와 상관없이 로그 출력)
@@ -0,0 +1,290 @@
+"""프롬프트 조립 모듈 - 토큰 추정, 본문 축약, 고정 템플릿"""
+import os
+import re
+from typing import Dict, List, Tuple
+
+
+DEFAULT_INPUT_TOKEN_BUDGET = 3000  # 기사 본문(제목 제외)에 허용하는 토큰 수
+
+# 본문 축약 시 문장 점수 계산에 쓰는 키워드 (요약 지침의 핵심 키워드와 동일)
+MAIN_KEYWORDS = ["충남콘텐츠진흥원", "충콘진"]
+OTHER_KEYWORDS = [
+    "천안그린스타트업타운",
+    "김곡미",
+    "충남콘텐츠코리아랩",
+    "충남콘텐츠기업지원센터",
+    "충남글로벌게임센터",
+    "충남음악창작소",
+    "충남 e스포츠",
+    "진흥원",
+]
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?。])\s+|\n+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# 요약 지침 (단독 요약 / 통합 생성 공용)
+SUMMARY_INSTRUCTIONS = (
+    "다음 뉴스 기사를 한국어로 자연스럽게 350~450자 사이로 요약해 주세요.\n\n"
+    "요약 형식:\n"
+    "1. 핵심 키워드(충남콘텐츠진흥원, 충콘진, 충남콘텐츠코리아랩, 충남콘텐츠기업지원센터, 충남글로벌게임센터, 충남음악창작소, 김곡미 등)를 **굵게** 표시하세요.\n"
+    "2. 핵심 키워드와 관련된 내용을 중심으로 요약하세요.\n"
+    "3. 마지막에 '충남콘텐츠진흥원의 관여도' 섹션을 별도로 추가하여, 진흥원이 이 기사에서 어떤 역할을 했는지, 어떤 사업/프로그램과 관련이 있는지 명확히 설명하세요.\n"
+    "4. 중복 표현은 줄이고, 핵심 내용 위주로 정리하세요.\n\n"
+)
+
+# 카드뉴스 지침 1~2단계 (단독 생성 / 통합 생성 공용, 출력 형식은 호출부에서 지정)
+CARDNEWS_INSTRUCTIONS = (
+    "당신은 충남콘텐츠진흥원의 젊고 센스 있는 SNS 홍보 담당자입니다. 아래 뉴스 기사를 읽고, 진흥원의 역할과 성과를 사실에 기반해 카드뉴스 형식으로 정리해 주세요. 독자가 끝까지 읽을 수 있도록 흥미로운 후크와 친근한 말투를 사용하는 것이 핵심입니다.\n\n"
+    "⚠️ 절대 규칙:\n"
+    "- 반드시 **이 기사 내용만** 사용하세요. 기사에 없는 예산, 인원수, 성과, 기관명 등은 절대 만들어내지 마세요.\n"
+    "- '주도했다' 대신 **'지원했다', '참여했다', '협력했다', '추진했다'** 등 사실 기반 동사만 사용하세요.\n"
+    "- **불필요한 설명 제거:** (이하 진흥원), 원장 이름, 기사 출처 등은 제외하고 핵심만 전달하세요.\n\n"
+    "🎯 톤 & 타겟:\n"
+    "- 타겟: 충남콘텐츠진흥원이 무엇을 하는 곳인지 잘 모르는 일반 시민.\n"
+    "- 말투: **친구에게 카톡 하듯 매우 친근하고 캐주얼한 구어체.** (\"~했어요!\", \"~이랍니다.\", \"~는요?\", \"~할 거예요.\")\n"
+    "- 후크(Hook): 초반 카드(1~3번)에 궁금증을 유발하는 질문이나 감탄사를 넣어 시선을 사로잡으세요.\n\n"
+    "--- 1단계) 카드 분할 전략 (분량 엄수)\n"
+    "- 기사의 흐름과 맥락에 따라 **최소 6장, 표준 8장, 최대 10장**으로 구성하세요.\n"
+    "- 기사 내용이 짧더라도 내용을 세밀하게 쪼개어 가독성을 높이고, 정보를 충분히 풀어서 설명하세요.\n"
+    "- **절대로 5장 이하로 끝내지 마세요.**\n\n"
+    "- 구성 가이드:\n"
+    "  - 1번(Cover): 가장 강력한 후크와 핵심 주제\n"
+    "  - 2번(Intro): 기사 배경이나 궁금증 유발 질문\n"
+    "  - 중간(Program/Impact/Result): 사업 내용, 지원 과정, 구체적 변화, 성과의 의미를 단계별로 상세히 나열\n"
+    "  - 마지막(Closing): 홈페이지 방문 유도 및 친절한 마무리\n\n"
+    "--- 2단계) 카드별 문구 작성 규칙\n"
+    "- TYPE: cover / program / impact / result / closing 중 선택\n"
+    "- HEAD: 12~20자 내외. **질문형, 감탄사 등 후크를 반드시 활용하세요.**\n"
+    "- BODY (TYPE=cover 제외):\n"
+    "  - **20~40자 내외의 완결된 문장.** (너무 짧거나 길지 않게 유지)\n"
+    "  - **절대 \"...\"(줄임표)를 사용하지 마세요.** 문장을 명확하게 끝맺으세요.\n"
+    "  - HEAD와 내용이 겹치지 않게 정보를 나누어 담으세요.\n"
+    "- IMAGE_KEY: 영어 키워드 2~4단어. (예: \"business meeting\", \"award ceremony\")\n\n"
+)
+
+
+# --- 고정 템플릿 (import 시 한 번만 조립)
+
+SUMMARY_PROMPT_PREFIX = SUMMARY_INSTRUCTIONS
+
+CARDNEWS_PROMPT_PREFIX = CARDNEWS_INSTRUCTIONS + "--- 3단계) 형식\n"
+CARDNEWS_PROMPT_SUFFIX = (
+    "위 내용을 바탕으로 아래 형식에 맞춰 한 줄씩 출력하세요. (번호는 1번부터 시작)\n\n"
+    "출력 형식:\n"
+    "1. TYPE=cover | HEAD=... | IMAGE_KEY=...\n"
+    "2. TYPE=program | HEAD=... | BODY=... | IMAGE_KEY=...\n"
+    "...\n"
+    "N. TYPE=closing | HEAD=더 자세한 내용이 궁금하다면? | BODY=진흥원 홈페이지(https://ccon.kr/)에서 더 많은 정보를 확인해보세요! | IMAGE_KEY=website visit\n\n"
+    "**중요:** 반드시 최소 6장 이상 생성하고, 마지막 카드는 항상 closing 타입으로 홈페이지를 유도하세요."
+)
+
+COMBINED_PROMPT_PREFIX = (
+    "아래 뉴스 기사로 두 가지 결과물을 한 번에 만들어 주세요.\n\n"
+    "=== 결과물 A) 요약 ===\n"
+    + SUMMARY_INSTRUCTIONS
+    + "=== 결과물 B) 카드뉴스 문구 ===\n"
+    + CARDNEWS_INSTRUCTIONS
+    + "--- 3단계) 형식\n"
+)
+COMBINED_PROMPT_SUFFIX = (
+    "출력은 설명 없이 아래 구조의 JSON 객체 하나만 출력하세요.\n"
+    "{\n"
+    '  "summary": "결과물 A 요약 (마크다운 **굵게** 포함 가능, 줄바꿈은 \\n)",\n'
+    '  "cards": [\n'
+    '    {"slide_number": 1, "type": "cover", "headline": "...", "description": "", "image_keyword": "..."},\n'
+    '    {"slide_number": 2, "type": "program", "headline": "...", "description": "...", "image_keyword": "..."},\n'
+    '    {"slide_number": N, "type": "closing", "headline": "더 자세한 내용이 궁금하다면?", '
+    '"description": "진흥원 홈페이지(https://ccon.kr/)에서 더 많은 정보를 확인해보세요!", "image_keyword": "website visit"}\n'
+    "  ]\n"
+    "}\n\n"
+    "**중요:** cards는 반드시 최소 6장 이상이어야 하고, 마지막 카드는 항상 closing 타입으로 홈페이지를 유도하세요."
+)
+
+BATCH_PROMPT_HEADER = "아래 {count}개의 뉴스 기사를 각각 따로 요약해 주세요.\n"
+BATCH_PROMPT_INTRO = "각 기사마다 다음 지침을 똑같이 적용합니다.\n\n" + SUMMARY_INSTRUCTIONS
+BATCH_PROMPT_OUTPUT = (
+    "\n\n출력은 설명 없이 기사 ID를 키로, 요약을 값으로 하는 JSON 객체 하나만 출력하세요.\n"
+    '예: {"A1": "요약...", "A2": "요약..."}\n'
+)
+BATCH_PROMPT_FOOTER = "**중요:** {keys} 모든 ID에 대해 요약을 빠짐없이 포함하세요."
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    텍스트의 토큰 수를 대략적으로 추정합니다. (한글 1자 ≈ 1토큰, 영문/숫자 4자 ≈ 1토큰)
+    
+    Args:
+        text: 추정할 텍스트
+        
+    Returns:
+        추정 토큰 수
+    """
+    ascii_count = sum(1 for ch in text if ord(ch) < 128)
+    return (len(text) - ascii_count) + ascii_count // 4 + 1
+
+
+# 고정 템플릿의 토큰 수 (호출마다 다시 세지 않도록 미리 계산)
+SUMMARY_PROMPT_TOKENS = estimate_tokens(SUMMARY_PROMPT_PREFIX)
+CARDNEWS_PROMPT_TOKENS = estimate_tokens(CARDNEWS_PROMPT_PREFIX + CARDNEWS_PROMPT_SUFFIX)
+COMBINED_PROMPT_TOKENS = estimate_tokens(COMBINED_PROMPT_PREFIX + COMBINED_PROMPT_SUFFIX)
+BATCH_PROMPT_TOKENS = estimate_tokens(
+    BATCH_PROMPT_HEADER + BATCH_PROMPT_INTRO + BATCH_PROMPT_OUTPUT + BATCH_PROMPT_FOOTER
+)
+ARTICLE_BLOCK_TOKENS = estimate_tokens("[제목]\n\n\n[본문]\n")  # 기사 제목/본문 머리글
+BATCH_ARTICLE_TOKENS = estimate_tokens("### ID: A10\n\n\n, A10")  # 묶음 요약의 기사별 ID 머리글과 ID 목록
+
+
+def get_input_token_budget() -> int:
+    """기사 본문 토큰 예산을 반환합니다. (GEMINI_INPUT_TOKEN_BUDGET 환경 변수로 설정)"""
+    return int(os.getenv("GEMINI_INPUT_TOKEN_BUDGET", DEFAULT_INPUT_TOKEN_BUDGET))
+
+
+def estimate_article_tokens(news_content: str, news_title: str) -> int:
+    """
+    프롬프트에 들어가는 기사 부분(제목 + 예산으로 축약된 본문)의 토큰 수를 추정합니다.
+    
+    고정 템플릿 토큰 수(*_PROMPT_TOKENS)와 더하면 프롬프트 전체의 추정 토큰 수가 됩니다.
+    
+    Args:
+        news_content: 기사 본문
+        news_title: 기사 제목
+        
+    Returns:
+        추정 토큰 수
+    """
+    return (
+        ARTICLE_BLOCK_TOKENS
+        + estimate_tokens(news_title)
+        + min(estimate_tokens(news_content), get_input_token_budget())
+    )
+
+
+def _cut_to_tokens(text: str, budget_tokens: int) -> str:
+    """estimate_tokens와 같은 비율(한글 1자, 영문/숫자 4자 ≈ 1토큰)로 앞부분을 예산만큼 자릅니다."""
+    # 1/4토큰 단위로 셈: 한글 4, 영문/숫자 1 (estimate_tokens의 +1 보정 포함)
+    limit = 4 * (budget_tokens - 1) + 3
+    used = 0
+    for index, ch in enumerate(text):
+        used += 1 if ord(ch) < 128 else 4
+        if used > limit:
+            return text[:index]
+    return text
+
+
+def _score_sentence(sentence: str, position: int) -> float:
+    """
+    문장의 키워드 관련도 점수를 계산합니다. (앞쪽 문장은 리드 문단으로 보고 가산점)
+    
+    Args:
+        sentence: 문장
+        position: 본문 내 문장 순서 (0부터)
+        
+    Returns:
+        점수 (높을수록 우선 포함)
+    """
+    score = 0.0
+    for keyword in MAIN_KEYWORDS:
+        score += 3.0 * sentence.count(keyword)
+    for keyword in OTHER_KEYWORDS:
+        score += 1.0 * sentence.count(keyword)
+    if position < 3:
+        score += 2.0 - position * 0.5
+    return score
+
+
+def trim_to_budget(content: str, budget_tokens: int) -> str:
+    """
+    본문이 토큰 예산을 넘으면 키워드 관련도가 높은 문장만 골라 원래 순서대로 이어 붙입니다.
+    
+    Args:
+        content: 기사 본문
+        budget_tokens: 허용 토큰 수
+        
+    Returns:
+        예산 안에 들어가는 본문 (예산 이내면 원문 그대로)
+    """
+    if not content or estimate_tokens(content) <= budget_tokens:
+        return content
+    
+    sentences = [
+        _WHITESPACE_RE.sub(" ", s).strip()
+        for s in _SENTENCE_SPLIT_RE.split(content)
+    ]
+    sentences = [s for s in sentences if s]
+    
+    ranked = sorted(
+        range(len(sentences)),
+        key=lambda i: (-_score_sentence(sentences[i], i), i),
+    )
+    
+    selected: List[int] = []
+    used = 0
+    for i in ranked:
+        cost = estimate_tokens(sentences[i])
+        if used + cost > budget_tokens:
+            continue
+        selected.append(i)
+        used += cost
+    
+    if not selected:
+        # 한 문장도 들어가지 않으면 앞부분을 예산만큼 자름
+        return _cut_to_tokens(content, budget_tokens)
+    
+    return " ".join(sentences[i] for i in sorted(selected))
+
+
+def _article_block(news_content: str, news_title: str) -> str:
+    content = trim_to_budget(news_content, get_input_token_budget())
+    return f"[제목]\n{news_title}\n\n[본문]\n{content}"
+
+
+def build_summary_prompt(news_content: str, news_title: str) -> str:
+    """단독 요약 프롬프트를 만듭니다."""
+    return SUMMARY_PROMPT_PREFIX + _article_block(news_content, news_title)
+
+
+def build_cardnews_prompt(news_content: str, news_title: str) -> str:
+    """한 줄 형식(TYPE=... | HEAD=...) 카드뉴스 문구 프롬프트를 만듭니다."""
+    return (
+        CARDNEWS_PROMPT_PREFIX
+        + f"기사 원문:\n{_article_block(news_content, news_title)}\n\n"
+        + CARDNEWS_PROMPT_SUFFIX
+    )
+
+
+def build_combined_prompt(news_content: str, news_title: str) -> str:
+    """요약과 카드뉴스 문구(JSON)를 함께 요청하는 프롬프트를 만듭니다."""
+    return (
+        COMBINED_PROMPT_PREFIX
+        + f"기사 원문:\n{_article_block(news_content, news_title)}\n\n"
+        + COMBINED_PROMPT_SUFFIX
+    )
+
+
+def build_batch_prompt(batch: List[Dict[str, str]]) -> Tuple[str, Dict[str, str]]:
+    """
+    기사 묶음 하나를 요약하는 프롬프트를 만듭니다.
+    
+    Args:
+        batch: {"id", "title", "content"} 키를 가진 기사 리스트
+        
+    Returns:
+        (프롬프트, {요청용 짧은 키: 기사 ID}) 튜플
+    """
+    # 기사 ID(URL 등)는 길고 특수문자가 많으므로 요청에는 짧은 키(A1, A2, ...)를 사용
+    key_to_id = {f"A{idx}": article["id"] for idx, article in enumerate(batch, 1)}
+    
+    article_blocks = []
+    for key, article in zip(key_to_id, batch):
+        article_blocks.append(
+            f"### ID: {key}\n{_article_block(article.get('content', ''), article.get('title', ''))}"
+        )
+    
+    prompt = (
+        BATCH_PROMPT_HEADER.format(count=len(batch))
+        + BATCH_PROMPT_INTRO
+        + "\n\n".join(article_blocks)
+        + BATCH_PROMPT_OUTPUT
+        + BATCH_PROMPT_FOOTER.format(keys=", ".join(key_to_id))
+    )
+    return prompt, key_to_id
@@ -0,0 +1,191 @@
+"""추천 기사 화면 데이터 모듈 - Streamlit 앱이 그대로 그리는 기사 행(row)을 만듦
+
+정렬, 최근 기사 필터링(발행일 파싱), 관련도 점수 재계산, 제목 정리처럼 화면을 다시 그릴 때마다
+같은 결과가 나오는 계산을 한곳에 모았습니다. Streamlit에 의존하지 않으므로 app.py는 결과를
+캐시(st.cache_data)하고, 테스트에서는 그대로 호출할 수 있습니다.
+"""
+import re
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+
+SORT_BY_SCORE = "관련도 점수 (내림차순)"
+SORT_BY_NEWEST = "날짜 (최신순)"
+SORT_BY_OLDEST = "날짜 (오래된순)"
+SORT_OPTIONS = [SORT_BY_SCORE, SORT_BY_NEWEST, SORT_BY_OLDEST]
+RECENT_DAYS = 4  # 크롤링 날짜 기준 이 일수 안의 기사만 표시
+
+# 점수 재계산용 검색 키워드 (daily_fetch.SEARCH_KEYWORDS와 같음)
+MAIN_KEYWORDS = ["충남콘텐츠진흥원", "충콘진"]
+OTHER_KEYWORDS = [
+    "천안그린스타트업타운",
+    "김곡미",
+    "충남콘텐츠코리아랩",
+    "충남콘텐츠기업지원센터",
+    "충남글로벌게임센터",
+    "충남음악창작소",
+    "충남 e스포츠",
+]
+
+# "Thu, 27 No"처럼 잘린 형식도 처리
+MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
+    "No": 11, "De": 12,
+}
+WEEKDAYS = ["월", "화", "수", "목", "금", "토", "일"]
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_RFC822_RE = re.compile(r"^[A-Za-z]{3},\s*\d{1,2}\s+[A-Za-z]{2,3}")
+_ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+_TITLE_SUFFIX_RES = [
+    re.compile(r"\s*<\s*[^<]*<\s*[^<]*<\s*[^<]*<\s*기사본문.*$"),  # "< 문화 < 충남 < 전국 < 기사본문"
+    re.compile(r"\s*<\s*[^<]*<\s*[^<]*<\s*[^<]*$"),  # "< 문화 < 충남 < 전국"
+    re.compile(r"\s*<\s*[^<]*<\s*[^<]*$"),  # "< 대전·충청 < 지역"
+    re.compile(r"\s*<\s*[^<]*$"),  # "< 문화"
+]
+
+
+def clean_html_tags(text: str) -> str:
+    """HTML 태그를 제거합니다."""
+    if not text:
+        return ""
+    # <b>, </b>, <strong>, </strong> 등 제거
+    return _TAG_RE.sub("", text).strip()
+
+
+def clean_title_suffix(text: str) -> str:
+    """제목에서 불필요한 접미사(예: '< 문화 < 충남 < 전국 < 기사본문')를 제거합니다."""
+    if not text:
+        return ""
+    for pattern in _TITLE_SUFFIX_RES:
+        text = pattern.sub("", text)
+    return text.strip()
+
+
+def parse_pub_date(pub_date: str) -> Optional[datetime]:
+    """
+    기사 발행일을 날짜로 변환합니다.
+
+    Args:
+        pub_date: "2024-12-24T09:00:00+09:00", "Sun, 30 Nov 2024 ...", "Thu, 27 No", "2024-12-24" 형식
+
+    Returns:
+        발행일 (시각 제외). 알 수 없는 형식이면 None.
+    """
+    if not pub_date:
+        return None
+    try:
+        # ISO 형식을 먼저 확인 ("Tue"/"Thu"의 T를 ISO 구분자로 오인하지 않도록)
+        if _ISO_DATE_RE.match(pub_date):
+            return datetime.strptime(pub_date[:10], "%Y-%m-%d")
+        if _RFC822_RE.match(pub_date):
+            parts = pub_date.split()
+            if len(parts) < 3:
+                return None
+            year = int(parts[3]) if len(parts) >= 4 else datetime.now().year
+            return datetime(year, MONTHS.get(parts[2], 11), int(parts[1].rstrip(",")))
+    except ValueError:
+        return None
+    return None
+
+
+def format_date_display(dt: Optional[datetime]) -> str:
+    """날짜를 "25.12.24.(수)" 형식으로 반환합니다. 없으면 빈 문자열."""
+    if dt is None:
+        return ""
+    return f"{dt.strftime('%y.%m.%d')}.({WEEKDAYS[dt.weekday()]})"
+
+
+def recalculate_score(article: Dict, published: Optional[datetime], today: date) -> float:
+    """
+    관련도 점수를 10점 만점으로 다시 계산합니다. (daily_fetch.calculate_relevance_score와 같은 기준)
+
+    Args:
+        article: 기사 정보
+        published: parse_pub_date()로 구한 발행일
+        today: 기준 날짜 (최근 기사 보너스 계산용)
+
+    Returns:
+        관련도 점수 (0.0 ~ 10.0)
+    """
+    title = article.get("title", "").lower()
+    description = article.get("description", "").lower()
+
+    # 제목 매칭 (최대 5점)
+    title_score = sum(2.5 for keyword in MAIN_KEYWORDS if keyword.lower() in title)
+    title_score += sum(0.3 for keyword in OTHER_KEYWORDS if keyword.lower() in title)
+    score = min(title_score, 5.0)
+
+    # 설명 매칭 (최대 3점)
+    desc_score = sum(1.5 for keyword in MAIN_KEYWORDS if keyword.lower() in description)
+    desc_score += sum(0.2 for keyword in OTHER_KEYWORDS if keyword.lower() in description)
+    score += min(desc_score, 3.0)
+
+    # 최근 기사 보너스 (최대 2점)
+    if published is not None:
+        days_diff = (today - published.date()).days
+        if days_diff <= RECENT_DAYS:
+            score += 2.0 - (days_diff * 0.375)
+
+    return min(score, 10.0)
+
+
+def _sorted(articles: List[Dict], sort_by: str) -> List[Dict]:
+    if sort_by == SORT_BY_SCORE:
+        return sorted(articles, key=lambda x: x.get("relevance_score", 0), reverse=True)
+    if sort_by == SORT_BY_NEWEST:
+        return sorted(articles, key=lambda x: x.get("pubDate", ""), reverse=True)
+    if sort_by == SORT_BY_OLDEST:
+        return sorted(articles, key=lambda x: x.get("pubDate", ""))
+    return list(articles)
+
+
+def build_article_rows(
+    articles: List[Dict],
+    sort_by: str,
+    today: date,
+    recent_days: int = RECENT_DAYS,
+) -> List[Dict]:
+    """
+    추천 기사 목록 화면에 그릴 행을 만듭니다.
+
+    sort_by로 정렬한 뒤 발행일이 today 기준 recent_days일 안인 기사만 남기고, 관련도 점수를
+    다시 계산하며, 제목/설명/날짜를 표시 형식으로 정리합니다. 입력 기사는 바꾸지 않습니다.
+
+    Args:
+        articles: 추천 기사 리스트
+        sort_by: SORT_OPTIONS 중 하나
+        today: 기준 날짜
+        recent_days: 표시할 최근 일수
+
+    Returns:
+        {"article", "article_id", "title", "description", "link", "pub_date",
+        "score", "date_display", "score_display"} 딕셔너리 리스트
+    """
+    rows = []
+    for article in _sorted(articles, sort_by):
+        pub_date = article.get("pubDate", "")
+        published = parse_pub_date(pub_date)
+        # 발행일을 알 수 없거나 오래된 기사는 제외
+        if published is None or (today - published.date()).days > recent_days:
+            continue
+
+        # 점수 재계산 (이전 점수 체계(100점 만점)로 저장된 데이터도 10점 만점으로)
+        score = recalculate_score(article, published, today)
+        # 전체 제목이 있으면 사용하고, 제목에서 불필요한 접미사 제거
+        title = clean_title_suffix(clean_html_tags(article.get("full_title") or article.get("title", "")))
+        link = article.get("link", "")
+        date_display = format_date_display(published)
+        rows.append({
+            "article": dict(article, relevance_score=score),
+            "article_id": link or title,
+            "title": title,
+            "description": clean_html_tags(article.get("description", "")),
+            "link": link,
+            "pub_date": pub_date,
+            "score": score,
+            "date_display": date_display,
+            "score_display": f"{score:.1f}/10점" if score > 0 else "-",
+        })
+    return rows
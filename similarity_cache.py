@@ -0,0 +1,284 @@
+"""유사 기사 재사용 모듈 - MinHash 서명으로 거의 같은 기사의 요약/카드뉴스 문구 재사용"""
+import hashlib
+import os
+import random
+import re
+import sqlite3
+import struct
+import threading
+import time
+from typing import List, Optional, Sequence, Tuple
+
+
+BASE_DIR = os.path.dirname(__file__)
+DATA_DIR = os.path.join(BASE_DIR, "data")
+DEFAULT_DB_PATH = os.path.join(DATA_DIR, "similarity.sqlite3")
+DEFAULT_THRESHOLD = 0.8  # 추정 자카드 유사도가 이 이상이면 같은 기사로 간주
+NUM_PERM = 64  # MinHash 서명 길이
+NUM_BANDS = 16  # LSH 밴드 수 (밴드당 4행, 후보 유사도 기준 약 0.5)
+SHINGLE_SIZE = 4  # 문자 단위 shingle 길이
+MIN_SHINGLES = 20  # 이보다 짧은 글은 비교하지 않음 (짧은 스니펫 오탐 방지)
+SEED = 20240101  # 서명은 DB에 저장되므로 해시 파라미터가 바뀌면 안 됨
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 64) - 1
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+_rng = random.Random(SEED)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+
+os.makedirs(DATA_DIR, exist_ok=True)
+
+
+def _shingles(title: str, content: str) -> set:
+    """
+    제목과 본문을 정규화(소문자, 공백/문장부호 제거)한 뒤 문자 shingle 집합을 만듭니다.
+
+    Args:
+        title: 기사 제목
+        content: 기사 본문
+
+    Returns:
+        shingle 문자열 집합
+    """
+    text = _NON_WORD_RE.sub("", f"{title} {content}".lower())
+    if len(text) < SHINGLE_SIZE:
+        return set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def compute_signature(title: str, content: str) -> Optional[List[int]]:
+    """
+    기사의 MinHash 서명을 계산합니다.
+
+    Args:
+        title: 기사 제목
+        content: 기사 본문
+
+    Returns:
+        NUM_PERM 길이의 정수 리스트. 글이 너무 짧으면 None.
+    """
+    shingles = _shingles(title, content)
+    if len(shingles) < MIN_SHINGLES:
+        return None
+
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+        for s in shingles
+    ]
+    return [
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def estimate_similarity(sig_a: Sequence[int], sig_b: Sequence[int]) -> float:
+    """
+    두 MinHash 서명으로 자카드 유사도를 추정합니다.
+
+    Args:
+        sig_a: 서명 A
+        sig_b: 서명 B
+
+    Returns:
+        0~1 사이 추정 유사도
+    """
+    if not sig_a or len(sig_a) != len(sig_b):
+        return 0.0
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+def _pack(signature: Sequence[int]) -> bytes:
+    return struct.pack(f">{len(signature)}Q", *signature)
+
+
+def _unpack(blob: bytes) -> List[int]:
+    return list(struct.unpack(f">{len(blob) // 8}Q", blob))
+
+
+def _band_keys(signature: Sequence[int]) -> List[Tuple[int, bytes]]:
+    """서명을 밴드로 나누고 밴드별 버킷 키를 만듭니다."""
+    rows = len(signature) // NUM_BANDS
+    return [
+        (band, hashlib.blake2b(_pack(signature[band * rows:(band + 1) * rows]), digest_size=8).digest())
+        for band in range(NUM_BANDS)
+    ]
+
+
+class SimilarityIndex:
+    """
+    요약한 기사의 MinHash 서명을 SQLite에 저장하고, 거의 같은 기사를 찾아 줍니다.
+
+    LSH 밴드 버킷으로 후보를 좁힌 뒤 서명 전체로 유사도를 추정하므로,
+    임베딩 API 없이 오프라인에서 동작합니다.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, threshold: float = DEFAULT_THRESHOLD):
+        self.db_path = db_path
+        self.threshold = threshold
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _init_db(self) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS signatures ("
+                    "article_id TEXT PRIMARY KEY, signature BLOB NOT NULL, created_at REAL NOT NULL)"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS bands ("
+                    "band INTEGER NOT NULL, bucket BLOB NOT NULL, article_id TEXT NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS bands_bucket ON bands (band, bucket)")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS reuses ("
+                    "article_id TEXT PRIMARY KEY, source_id TEXT NOT NULL, similarity REAL NOT NULL)"
+                )
+        except sqlite3.Error as e:
+            print(f"[유사도 인덱스 초기화 오류] {e}")
+
+    def add(self, article_id: str, title: str, content: str, signature: Optional[List[int]] = None) -> None:
+        """
+        기사의 서명을 인덱스에 추가합니다. (이미 있으면 갱신)
+
+        Args:
+            article_id: 기사 ID 또는 URL
+            title: 기사 제목
+            content: 기사 본문
+            signature: 미리 계산한 서명 (없으면 계산)
+        """
+        signature = signature or compute_signature(title, content)
+        if not signature:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO signatures (article_id, signature, created_at) VALUES (?, ?, ?)",
+                    (article_id, _pack(signature), time.time()),
+                )
+                conn.execute("DELETE FROM bands WHERE article_id = ?", (article_id,))
+                conn.executemany(
+                    "INSERT INTO bands (band, bucket, article_id) VALUES (?, ?, ?)",
+                    [(band, bucket, article_id) for band, bucket in _band_keys(signature)],
+                )
+        except sqlite3.Error as e:
+            print(f"[유사도 인덱스 저장 오류] {e}")
+
+    def find_similar(
+        self,
+        title: str,
+        content: str,
+        exclude_id: Optional[str] = None,
+        signature: Optional[List[int]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        인덱스에서 임계값 이상으로 비슷한 기사를 찾습니다.
+
+        Args:
+            title: 기사 제목
+            content: 기사 본문
+            exclude_id: 결과에서 제외할 기사 ID (자기 자신)
+            signature: 미리 계산한 서명 (없으면 계산)
+
+        Returns:
+            (기사 ID, 추정 유사도) 리스트. 유사도가 높은 순으로 정렬.
+        """
+        signature = signature or compute_signature(title, content)
+        if not signature:
+            return []
+
+        keys = _band_keys(signature)
+        try:
+            with self._connect() as conn:
+                candidates = set()
+                for band, bucket in keys:
+                    rows = conn.execute(
+                        "SELECT article_id FROM bands WHERE band = ? AND bucket = ?", (band, bucket)
+                    ).fetchall()
+                    candidates.update(row[0] for row in rows)
+                candidates.discard(exclude_id)
+
+                matches = []
+                for candidate in candidates:
+                    row = conn.execute(
+                        "SELECT signature FROM signatures WHERE article_id = ?", (candidate,)
+                    ).fetchone()
+                    if not row:
+                        continue
+                    similarity = estimate_similarity(signature, _unpack(row[0]))
+                    if similarity >= self.threshold:
+                        matches.append((candidate, similarity))
+        except sqlite3.Error as e:
+            print(f"[유사도 인덱스 조회 오류] {e}")
+            return []
+
+        return sorted(matches, key=lambda match: match[1], reverse=True)
+
+    def record_reuse(self, article_id: str, source_id: str, similarity: float) -> None:
+        """
+        기사가 다른 기사의 결과를 재사용했음을 기록합니다.
+
+        Args:
+            article_id: 결과를 재사용한 기사 ID
+            source_id: 원본 기사 ID
+            similarity: 추정 유사도
+        """
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO reuses (article_id, source_id, similarity) VALUES (?, ?, ?)",
+                    (article_id, source_id, similarity),
+                )
+        except sqlite3.Error as e:
+            print(f"[유사도 인덱스 저장 오류] {e}")
+
+    def get_reuse_source(self, article_id: str) -> Optional[Tuple[str, float]]:
+        """
+        기사가 재사용한 원본 기사를 반환합니다.
+
+        Args:
+            article_id: 기사 ID 또는 URL
+
+        Returns:
+            (원본 기사 ID, 추정 유사도). 재사용하지 않았으면 None.
+        """
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT source_id, similarity FROM reuses WHERE article_id = ?", (article_id,)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        return (row[0], row[1]) if row else None
+
+
+_index: Optional[SimilarityIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_similarity_index() -> SimilarityIndex:
+    """
+    프로세스 전체에서 공유하는 SimilarityIndex 인스턴스를 반환합니다.
+
+    저장 경로와 임계값은 환경 변수 SIMILARITY_DB, SIMILARITY_THRESHOLD로 설정합니다.
+    (임계값을 1보다 크게 주면 재사용하지 않음)
+
+    Returns:
+        공유 SimilarityIndex 인스턴스
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SimilarityIndex(
+                db_path=os.getenv("SIMILARITY_DB", DEFAULT_DB_PATH),
+                threshold=float(os.getenv("SIMILARITY_THRESHOLD", DEFAULT_THRESHOLD)),
+            )
+        return _index
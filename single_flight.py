@@ -0,0 +1,214 @@
+"""단일 실행(single-flight) 모듈 - 같은 기사의 동시 생성 요청 병합"""
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+
+BASE_DIR = os.path.dirname(__file__)
+DATA_DIR = os.path.join(BASE_DIR, "data")
+DEFAULT_DB_PATH = os.path.join(DATA_DIR, "single_flight.sqlite3")
+DEFAULT_LEASE_SECONDS = 90  # 리더가 살아 있는 동안 주기적으로 연장
+DEFAULT_POLL_INTERVAL = 0.5  # 초
+DEFAULT_WAIT_TIMEOUT = 300  # 초
+
+os.makedirs(DATA_DIR, exist_ok=True)
+
+
+class SingleFlight:
+    """
+    같은 키의 생성 작업을 한 번만 실행하고, 동시에 들어온 요청은 그 결과를 기다리게 합니다.
+
+    - 같은 프로세스: 첫 호출자가 생성하고, 나머지는 같은 Future를 기다립니다.
+    - 다른 프로세스: 공유 SQLite 파일의 임대(lease) 행으로 리더를 정하고,
+      나머지는 임대가 풀리거나 load_cached()가 값을 돌려줄 때까지 폴링합니다.
+    """
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_DB_PATH,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        wait_timeout: float = DEFAULT_WAIT_TIMEOUT,
+    ):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.wait_timeout = wait_timeout
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._flights: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _init_db(self) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS leases ("
+                    "key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+        except sqlite3.Error as e:
+            print(f"[single-flight DB 초기화 오류] {e}")
+
+    def _try_acquire_lease(self, key: str) -> bool:
+        """
+        임대를 얻으면 True를 반환합니다. DB를 쓸 수 없으면 프로세스 내 병합만 적용합니다.
+        """
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("DELETE FROM leases WHERE key = ? AND expires_at < ?", (key, now))
+                conn.execute(
+                    "INSERT OR IGNORE INTO leases (key, owner, expires_at) VALUES (?, ?, ?)",
+                    (key, self.owner, now + self.lease_seconds),
+                )
+                row = conn.execute("SELECT owner FROM leases WHERE key = ?", (key,)).fetchone()
+                conn.execute("COMMIT")
+            finally:
+                conn.close()
+            return row is not None and row[0] == self.owner
+        except sqlite3.Error as e:
+            print(f"[single-flight 임대 오류] {e}")
+            return True
+
+    def _lease_active(self, key: str) -> bool:
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT 1 FROM leases WHERE key = ? AND expires_at >= ?", (key, time.time())
+                ).fetchone()
+            finally:
+                conn.close()
+            return row is not None
+        except sqlite3.Error:
+            return False
+
+    def _renew_lease(self, key: str) -> None:
+        try:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "UPDATE leases SET expires_at = ? WHERE key = ? AND owner = ?",
+                    (time.time() + self.lease_seconds, key, self.owner),
+                )
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[single-flight 임대 연장 오류] {e}")
+
+    def _release_lease(self, key: str) -> None:
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, self.owner))
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[single-flight 임대 해제 오류] {e}")
+
+    def _run_as_leader(self, key: str, fn: Callable[[], Any]) -> Any:
+        """임대를 주기적으로 연장하면서 fn을 실행합니다."""
+        stop = threading.Event()
+
+        def renew() -> None:
+            while not stop.wait(self.lease_seconds / 3):
+                self._renew_lease(key)
+
+        renewer = threading.Thread(target=renew, name=f"lease-{key[:20]}", daemon=True)
+        renewer.start()
+        try:
+            return fn()
+        finally:
+            stop.set()
+            self._release_lease(key)
+
+    def _wait_for_other_process(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        load_cached: Optional[Callable[[], Any]],
+    ) -> Any:
+        """다른 프로세스가 생성 중이면 결과(캐시)를 기다리고, 임대가 풀리면 직접 생성합니다."""
+        deadline = time.time() + self.wait_timeout
+        while time.time() < deadline:
+            if load_cached:
+                cached = load_cached()
+                if cached:
+                    return cached
+            if self._try_acquire_lease(key):
+                # 직전에 리더가 끝났을 수 있으므로 한 번 더 캐시 확인
+                if load_cached:
+                    cached = load_cached()
+                    if cached:
+                        self._release_lease(key)
+                        return cached
+                return self._run_as_leader(key, fn)
+            time.sleep(self.poll_interval)
+
+        print(f"[single-flight 대기 시간 초과] {key} - 직접 생성합니다.")
+        return fn()
+
+    def do(self, key: str, fn: Callable[[], Any], load_cached: Optional[Callable[[], Any]] = None) -> Any:
+        """
+        key에 대한 생성 작업을 한 번만 실행합니다.
+
+        Args:
+            key: 작업 키 (예: "summary:<기사 ID>")
+            fn: 실제 생성 함수 (결과를 캐시에 저장하는 것까지 책임짐)
+            load_cached: 캐시된 결과를 읽는 함수 (다른 프로세스의 결과를 받을 때 사용)
+
+        Returns:
+            fn의 결과 또는 다른 호출자가 만든 결과
+        """
+        with self._lock:
+            future = self._flights.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._flights[key] = future
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = self._wait_for_other_process(key, fn, load_cached)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+
+
+_single_flight: Optional[SingleFlight] = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """
+    프로세스 전체에서 공유하는 SingleFlight 인스턴스를 반환합니다.
+
+    여러 프로세스/서버가 같은 임대 저장소를 쓰려면 SINGLE_FLIGHT_DB 환경 변수로
+    공유 경로를 지정합니다.
+
+    Returns:
+        공유 SingleFlight 인스턴스
+    """
+    global _single_flight
+    with _single_flight_lock:
+        if _single_flight is None:
+            _single_flight = SingleFlight(db_path=os.getenv("SINGLE_FLIGHT_DB", DEFAULT_DB_PATH))
+        return _single_flight
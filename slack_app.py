@@ -4,17 +4,23 @@ import json
 import hashlib
 import hmac
 import time
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from typing import Dict, Optional
-import requests
 
-from cache_manager import get_cached_summary, get_cached_script
-from daily_recommendations import load_daily_recommendations
-from gemini_api import generate_cardnews_with_gemini, summarize_with_gemini
+from cache_manager import get_cached_script
+from daily_recommendations import BUTTON_VALUE_PREFIX, get_recommendations_store
+from generation_manager import get_or_create_summary, get_or_create_script
 from card_parser import parse_card_script
-from image_prep import prepare_card_images, create_images_zip
+from image_prep import prepare_deck_images, create_images_zip
+from job_queue import PermanentJobError, get_job_queue
+from slack_blocks import build_deck_blocks, deck_blocks, list_blocks
+from slack_dispatcher import get_slack_dispatcher
+from zip_export import daily_export_entries, iter_zip
 
 app = Flask(__name__)
+jobs = get_job_queue()
+recommendations = get_recommendations_store()
+slack = get_slack_dispatcher()
 
 # 환경 변수
 SLACK_SIGNING_SECRET = os.getenv("SLACK_SIGNING_SECRET")
@@ -25,7 +31,7 @@ SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL")
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint for Render"""
-    return jsonify({"status": "ok", "service": "slack_app"}), 200
+    return jsonify({"status": "ok", "service": "slack_app", "jobs": jobs.stats()}), 200
 
 
 def verify_slack_request(request):
@@ -64,212 +70,225 @@ def handle_interactive():
         action = actions[0]
         action_id = action.get('action_id', '')
         
-        # 카드뉴스 생성 버튼 클릭
-        if action_id.startswith('create_cardnews_'):
-            article_idx = int(action_id.split('_')[-1]) - 1
-            articles = load_daily_recommendations()
+        if action_id.startswith(('create_cardnews_', 'view_summary_')):
+            article = _resolve_article(action)
+            if article is None:
+                return jsonify({
+                    "response_type": "ephemeral",
+                    "text": "❌ 기사를 찾을 수 없습니다. 추천 기사 목록이 갱신되었을 수 있습니다."
+                }), 200
             
-            if article_idx < len(articles):
-                article = articles[article_idx]
+            # 카드뉴스 생성 버튼 클릭
+            if action_id.startswith('create_cardnews_'):
                 return handle_create_cardnews(payload, article)
-        
-        # 요약 보기 버튼 클릭
-        elif action_id.startswith('view_summary_'):
-            article_idx = int(action_id.split('_')[-1]) - 1
-            articles = load_daily_recommendations()
             
-            if article_idx < len(articles):
-                article = articles[article_idx]
-                return handle_view_summary(payload, article)
+            # 요약 보기 버튼 클릭
+            return handle_view_summary(payload, article)
     
     return jsonify({"response_type": "ephemeral", "text": "처리 완료"}), 200
 
 
+def _resolve_article(action: Dict) -> Optional[Dict]:
+    """
+    버튼이 가리키는 기사를 찾습니다.
+    
+    새 버튼은 value에 고정 ID("id:<ID>")를 담아 다시 크롤링해도 같은 기사를 가리킵니다.
+    예전 버튼(value 또는 action_id 끝의 순번)은 현재 목록의 순번으로 찾습니다.
+    
+    Args:
+        action: Slack block_actions의 액션
+        
+    Returns:
+        기사 정보. 없으면 None.
+    """
+    value = action.get('value') or ''
+    if value.startswith(BUTTON_VALUE_PREFIX):
+        return recommendations.get(value[len(BUTTON_VALUE_PREFIX):])
+    
+    position = value if value.isdigit() else action.get('action_id', '').split('_')[-1]
+    if not position.isdigit():
+        return None
+    articles = recommendations.articles()
+    article_idx = int(position) - 1
+    return articles[article_idx] if 0 <= article_idx < len(articles) else None
+
+
+def _placeholder_key(response_url: str) -> tuple:
+    return ("placeholder", response_url)
+
+
+def _post_placeholder(response_url: Optional[str], text: str) -> None:
+    """
+    response_url로 "처리 중" 안내를 예약합니다. 결과가 먼저 나오면 _post_response()가 취소합니다.
+    """
+    if response_url:
+        slack.submit_url(
+            response_url,
+            {"response_type": "ephemeral", "text": text, "replace_original": False},
+            key=_placeholder_key(response_url),
+            delay=slack.placeholder_delay,
+        )
+
+
+def _post_response(response_url: Optional[str], message: Dict) -> None:
+    """response_url로 메시지를 보냅니다. 아직 보내지 않은 "처리 중" 안내는 취소합니다."""
+    if not response_url:
+        return
+    slack.cancel(_placeholder_key(response_url))
+    slack.post_url(response_url, message)
+
+
+def _job_payload(payload: Dict, article: Dict) -> Dict:
+    """Slack 요청과 기사에서 작업 처리에 필요한 값만 골라 냅니다."""
+    return {
+        "channel_id": payload.get('channel', {}).get('id'),
+        "user_id": payload.get('user', {}).get('id'),
+        "response_url": payload.get('response_url'),
+        "article": {
+            "title": article.get('title', ''),
+            "description": article.get('description', ''),
+            "link": article.get('link', ''),
+        },
+    }
+
+
+def _enqueue(kind: str, payload: Dict, article: Dict) -> Dict:
+    """작업을 큐에 넣고 Slack에 바로 응답합니다. (Slack은 3초 안에 응답을 받아야 함)"""
+    job_payload = _job_payload(payload, article)
+    article_id = job_payload["article"]["link"] or job_payload["article"]["title"]
+    job_id = jobs.enqueue(kind, job_payload, dedupe_key=f"{kind}:{job_payload['channel_id']}:{article_id}")
+    if job_id is None:
+        return jsonify({
+            "response_type": "ephemeral",
+            "text": "❌ 작업을 등록하지 못했습니다. 잠시 후 다시 시도해주세요."
+        }), 200
+    jobs.start()
+    return jsonify({
+        "response_type": "ephemeral",
+        "text": f"요청을 접수했습니다. (작업 #{job_id}, 대기 {jobs.stats()['queued']}건)",
+        "replace_original": False
+    }), 200
+
+
 def handle_create_cardnews(payload: Dict, article: Dict) -> Dict:
-    """카드뉴스 생성 처리"""
-    channel_id = payload.get('channel', {}).get('id')
-    user_id = payload.get('user', {}).get('id')
+    """카드뉴스 생성 요청 처리 (작업 큐에 넣고 즉시 응답)"""
+    return _enqueue("create_cardnews", payload, article)
+
+
+def run_create_cardnews(job: Dict) -> None:
+    """
+    카드뉴스 생성 작업을 처리합니다. (작업자 스레드에서 실행)
+    
+    결과는 Bot Token이 있으면 채널 메시지로, 없으면 response_url로 보냅니다.
+    생성에 실패하면 예외를 던져 작업 큐가 다시 시도하게 합니다.
     
+    Args:
+        job: _job_payload()로 만든 작업 데이터
+    """
+    channel_id = job.get("channel_id")
+    response_url = job.get("response_url")
+    article = job["article"]
     title = article.get('title', '')
     description = article.get('description', '')
     link = article.get('link', '')
     article_id = link or title
     
-    # 즉시 응답 (사용자에게 진행 중 메시지)
-    response_url = payload.get('response_url')
-    if response_url:
-        requests.post(response_url, json={
-            "response_type": "ephemeral",
-            "text": "카드뉴스 생성 중... 잠시만 기다려주세요.",
-            "replace_original": False
-        })
+    # 진행 메시지: Bot Token이 있으면 채널 메시지 하나를 진행 상황 → 결과로 갱신하고,
+    # 없으면 response_url로 "생성 중" 안내만 보냄. 둘 다 잠시 늦게 올려 그 전에 끝나면 결과만 보냄.
+    message = slack.message(channel_id) if SLACK_BOT_TOKEN and channel_id else None
+    if message is None:
+        _post_placeholder(response_url, "카드뉴스 생성 중... 잠시만 기다려주세요.")
     
-    # 카드뉴스 생성
-    try:
-        # 캐시 확인
-        script = get_cached_script(article_id)
-        if not script:
-            script = generate_cardnews_with_gemini(description, title)
-            if not script:
-                return jsonify({
-                    "response_type": "ephemeral",
-                    "text": "❌ 카드뉴스 생성에 실패했습니다."
-                }), 200
-        
-        # 파싱
-        cards = parse_card_script(script)
-        if not cards:
-            return jsonify({
-                "response_type": "ephemeral",
-                "text": "❌ 카드뉴스 형식을 파싱할 수 없습니다."
-            }), 200
-        
-        # 이미지 준비
-        images_data = []
-        for card in cards:
-            img_data = prepare_card_images(card)
-            images_data.append(img_data)
-        
-        # 결과를 슬랙에 전송 (Bot Token 사용)
-        blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": f"📝 카드뉴스 생성 완료: {title[:50]}",
-                },
-            },
-            {
-                "type": "divider",
-            },
-        ]
-        
-        # 각 카드 정보 표시 (최대 10개)
-        for card_idx, card in enumerate(cards[:10], 1):
-            card_type = card.get('type', '')
-            head = card.get('head', '')
-            body = card.get('body', '')
-            image_key = card.get('image_key', '')
-            
-            card_text = f"*카드 {card_idx} ({card_type})*\n"
-            if head:
-                card_text += f"*HEAD:* {head}\n"
-            if body:
-                card_text += f"*BODY:* {body}\n"
-            if image_key:
-                card_text += f"*IMAGE_KEY:* {image_key}"
-            
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": card_text,
-                },
+    # 캐시 확인
+    script = get_cached_script(article_id)
+    if not script:
+        streamed_cards = []
+        if message:
+            message.progress({
+                "blocks": build_deck_blocks(title, link, [], in_progress=True),
+                "text": "카드뉴스 생성 중...",
             })
-            
-            if card_idx < min(len(cards), 10):
-                blocks.append({"type": "divider"})
-        
-        if len(cards) > 10:
-            blocks.append({
-                "type": "context",
-                "elements": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*총 {len(cards)}개 카드 중 10개만 표시. 전체는 Streamlit 앱에서 확인하세요.*",
-                    },
-                ],
-            })
-        
-        # Streamlit 앱 링크 버튼
-        streamlit_url = os.getenv("STREAMLIT_APP_URL", "https://cardnews1-hd646zyxsbzawjaibtjgar.streamlit.app")
-        import urllib.parse
-        streamlit_url_with_params = f"{streamlit_url}?article_url={urllib.parse.quote(link)}" if link else streamlit_url
         
-        blocks.append({
-            "type": "actions",
-            "elements": [
-                {
-                    "type": "button",
-                    "text": {
-                        "type": "plain_text",
-                        "text": "🔗 Streamlit 앱에서 전체 보기",
-                    },
-                    "url": streamlit_url_with_params,
-                },
-            ],
-        })
-        
-        # Bot Token으로 슬랙에 메시지 전송
-        channel_id = payload.get('channel', {}).get('id')
-        if SLACK_BOT_TOKEN and channel_id:
-            try:
-                requests.post(
-                    "https://slack.com/api/chat.postMessage",
-                    headers={
-                        "Authorization": f"Bearer {SLACK_BOT_TOKEN}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "channel": channel_id,
-                        "blocks": blocks,
-                        "text": f"✅ 카드뉴스 생성 완료! ({len(cards)}개 카드)",
-                    },
-                    timeout=10
-                )
-            except Exception as e:
-                print(f"[슬랙 메시지 전송 오류] {e}")
+        def on_card(card: Dict) -> None:
+            streamed_cards.append(card)
+            if message:
+                message.progress({
+                    "blocks": build_deck_blocks(title, link, streamed_cards, in_progress=True),
+                    "text": f"카드뉴스 생성 중... ({len(streamed_cards)}장 완성)",
+                })
         
-        return jsonify({
+        script = get_or_create_script(article_id, description, title, on_card=on_card)
+        if not script:
+            if message:
+                # 재시도하면 새 진행 메시지를 띄우므로 이번 진행 메시지는 지움
+                message.discard()
+            raise RuntimeError("카드뉴스 문구 생성 실패")
+    
+    # 파싱
+    cards = parse_card_script(script)
+    if not cards:
+        if message:
+            message.discard()
+        raise PermanentJobError("카드뉴스 형식을 파싱할 수 없습니다.")
+    
+    # 이미지 준비 (모든 카드의 아이콘 검색/다운로드를 동시에 실행)
+    images_data = prepare_deck_images(cards)
+    
+    # 결과를 슬랙에 전송 (같은 문구로 만든 결과 블록이 저장되어 있으면 그대로 사용)
+    blocks = deck_blocks(article_id, script, title, link, cards)
+    final_message = {
+        "blocks": blocks,
+        "text": f"✅ 카드뉴스 생성 완료! ({len(cards)}개 카드)",
+    }
+    
+    # Bot Token으로 슬랙에 메시지 전송 (진행 메시지가 있으면 그 메시지를 결과로 교체)
+    if message:
+        sent = message.finish(final_message)
+        if not sent or not sent.get("ok"):
+            raise RuntimeError(f"슬랙 메시지 전송 실패: {(sent or {}).get('error', 'no response')}")
+    else:
+        _post_response(response_url, {
             "response_type": "in_channel",
-            "text": f"✅ 카드뉴스 생성 완료! ({len(cards)}개 카드)",
-            "blocks": blocks
-        }), 200
-        
-    except Exception as e:
-        import traceback
-        error_msg = str(e)
-        print(f"[카드뉴스 생성 오류] {error_msg}")
-        print(traceback.format_exc())
-        
-        return jsonify({
-            "response_type": "ephemeral",
-            "text": f"❌ 오류 발생: {error_msg}"
-        }), 200
+            "text": final_message["text"],
+            "blocks": blocks,
+            "replace_original": False
+        })
+
+
+def notify_cardnews_failure(job: Dict, error: str) -> None:
+    """카드뉴스 생성 작업이 마지막 시도까지 실패했을 때 사용자에게 알립니다."""
+    text = f"❌ 카드뉴스 생성에 실패했습니다: {error}"
+    if job.get("response_url"):
+        _post_response(job["response_url"], {"response_type": "ephemeral", "text": text, "replace_original": False})
+    elif job.get("channel_id"):
+        slack.submit("chat.postMessage", {"channel": job["channel_id"], "text": text})
 
 
 def handle_view_summary(payload: Dict, article: Dict) -> Dict:
-    """요약 보기 처리"""
+    """요약 보기 요청 처리 (작업 큐에 넣고 즉시 응답)"""
+    return _enqueue("view_summary", payload, article)
+
+
+def run_view_summary(job: Dict) -> None:
+    """
+    요약 보기 작업을 처리합니다. (작업자 스레드에서 실행)
+    
+    Args:
+        job: _job_payload()로 만든 작업 데이터
+    """
+    response_url = job.get("response_url")
+    article = job["article"]
     title = article.get('title', '')
     description = article.get('description', '')
     link = article.get('link', '')
     article_id = link or title
     
-    # 즉시 응답
-    response_url = payload.get('response_url')
-    if response_url:
-        requests.post(response_url, json={
-            "response_type": "ephemeral",
-            "text": "요약을 가져오는 중...",
-            "replace_original": False
-        })
+    _post_placeholder(response_url, "요약을 가져오는 중...")
     
-    # 캐시에서 요약 가져오기
-    summary = get_cached_summary(article_id)
+    # 캐시에서 요약 가져오기 (없으면 생성, 동시 요청은 한 번의 생성으로 병합)
+    summary = get_or_create_summary(article_id, description, title)
     if not summary:
-        # 요약 생성
-        summary = summarize_with_gemini(description, title)
-        if not summary:
-            if response_url:
-                requests.post(response_url, json={
-                    "response_type": "ephemeral",
-                    "text": "❌ 요약 생성에 실패했습니다.",
-                    "replace_original": True
-                })
-            return jsonify({
-                "response_type": "ephemeral",
-                "text": "❌ 요약 생성에 실패했습니다."
-            }), 200
+        raise RuntimeError("요약 생성 실패")
     
     # HTML 태그 제거
     import re
@@ -298,17 +317,24 @@ def handle_view_summary(payload: Dict, article: Dict) -> Dict:
         },
     ]
     
-    if response_url:
-        requests.post(response_url, json={
-            "response_type": "ephemeral",
-            "blocks": blocks,
-            "replace_original": True
-        })
-    
-    return jsonify({
+    _post_response(response_url, {
         "response_type": "ephemeral",
-        "blocks": blocks
-    }), 200
+        "blocks": blocks,
+        "replace_original": True
+    })
+
+
+def notify_summary_failure(job: Dict, error: str) -> None:
+    """요약 작업이 마지막 시도까지 실패했을 때 사용자에게 알립니다."""
+    _post_response(job.get("response_url"), {
+        "response_type": "ephemeral",
+        "text": "❌ 요약 생성에 실패했습니다.",
+        "replace_original": True
+    })
+
+
+jobs.register("create_cardnews", run_create_cardnews, on_failure=notify_cardnews_failure)
+jobs.register("view_summary", run_view_summary, on_failure=notify_summary_failure)
 
 
 @app.route('/slack/command', methods=['POST'])
@@ -323,7 +349,7 @@ def handle_command():
     
     # /cardnews 1 → 첫 번째 기사
     # /cardnews → 전체 목록
-    articles = load_daily_recommendations()
+    articles = recommendations.articles()
     
     if not articles:
         return jsonify({
@@ -339,7 +365,7 @@ def handle_command():
             return handle_create_cardnews({
                 'channel': {'id': channel_id},
                 'user': {'id': user_id},
-                'response_url': None
+                'response_url': request.form.get('response_url')
             }, article)
         else:
             return jsonify({
@@ -347,60 +373,43 @@ def handle_command():
                 "text": f"❌ {idx + 1}번 기사가 없습니다. (총 {len(articles)}개)"
             }), 200
     else:
-        # 전체 목록 표시
-        blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": "📰 추천 기사 목록",
-                },
-            },
-            {
-                "type": "divider",
-            },
-        ]
-        
-        for idx, article in enumerate(articles[:10], 1):  # 최대 10개
-            title = article.get('title', '')
-            score = article.get('relevance_score', 0)
-            
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*{idx}. {title[:80]}*\n관련도: {score:.1f}/10점",
-                },
-                "accessory": {
-                    "type": "button",
-                    "text": {
-                        "type": "plain_text",
-                        "text": "생성",
-                    },
-                    "value": str(idx),
-                    "action_id": f"create_cardnews_{idx}",
-                },
-            })
-            
-            if idx < min(len(articles), 10):
-                blocks.append({"type": "divider"})
-        
-        blocks.append({
-            "type": "context",
-            "elements": [
-                {
-                    "type": "mrkdwn",
-                    "text": f"사용법: `/cardnews 1` (1번 기사 생성) 또는 버튼 클릭",
-                },
-            ],
-        })
-        
+        # 전체 목록 표시 (크롤링할 때 만들어 둔 블록을 그대로 사용)
         return jsonify({
             "response_type": "ephemeral",
-            "blocks": blocks
+            "blocks": list_blocks(articles)
         }), 200
 
 
+@app.route('/export/daily.zip', methods=['GET'])
+def export_daily_zip():
+    """
+    오늘의 추천 기사 카드뉴스 자료(요약, 문구, 이미지 프롬프트, SVG)를 ZIP으로 스트리밍합니다.
+    
+    EXPORT_TOKEN 환경 변수가 설정된 경우에만 열리며, ?token= 값이 일치해야 합니다.
+    """
+    export_token = os.getenv("EXPORT_TOKEN")
+    if not export_token or not hmac.compare_digest(request.args.get("token", ""), export_token):
+        return jsonify({"error": "forbidden"}), 403
+    
+    articles = recommendations.articles()
+    include_icons = request.args.get("icons", "1") != "0"
+    date_str = time.strftime("%Y-%m-%d")
+    return Response(
+        stream_with_context(iter_zip(daily_export_entries(articles, include_icons=include_icons))),
+        mimetype="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="cardnews_{date_str}.zip"'},
+    )
+
+
+@app.route('/jobs/<int:job_id>', methods=['GET'])
+def job_status(job_id: int):
+    """작업 상태 조회 (작업 ID는 요청 접수 응답에 표시됨)"""
+    job = jobs.get(job_id)
+    if not job:
+        return jsonify({"error": "not found"}), 404
+    return jsonify(job), 200
+
+
 @app.route('/health', methods=['GET'])
 def health():
     """헬스 체크"""
@@ -409,5 +418,6 @@ def health():
 
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 5000))
+    jobs.start()  # 재시작 전에 남은 작업부터 처리
     app.run(host='0.0.0.0', port=port, debug=False)
 
@@ -0,0 +1,504 @@
+"""Slack Block Kit 블록 모듈 - 메시지 블록을 미리 만들어 두고 그대로 보냄
+
+- 기사 블록: 크롤링할 때 일일 알림용/목록용 블록을 만들어 daily_recommendations.json의
+  각 기사("slack_blocks")에 함께 저장합니다.
+- 카드뉴스 블록: 덱을 만든 뒤 결과 블록을 data/slack_blocks.sqlite3에 기사별로 저장합니다.
+
+저장된 블록에는 만들 때 사용한 값(제목, 설명, 점수, 요약, 순번, 관련 환경 변수 등)의
+지문(fingerprint)이 붙어 있어, 값이 바뀌었으면 저장된 블록을 버리고 다시 만듭니다.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import urllib.parse
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from daily_recommendations import BUTTON_VALUE_PREFIX, DATA_DIR, article_stable_id
+
+
+BLOCKS_VERSION = 1  # 블록 모양을 바꾸면 올려서 저장된 블록을 모두 다시 만듦
+DIGEST_SIZE = 5  # 일일 알림에 보내는 기사 수
+LIST_SIZE = 10  # /cardnews 목록에 보이는 기사 수
+MAX_DECK_CARDS = 10  # 카드뉴스 결과에 보이는 카드 수
+DEFAULT_STREAMLIT_URL = "https://cardnews1-hd646zyxsbzawjaibtjgar.streamlit.app"
+DEFAULT_DECK_DB = os.path.join(DATA_DIR, "slack_blocks.sqlite3")
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_SPACE_RE = re.compile(r'\s+')
+_WEEKDAYS = ["월", "화", "수", "목", "금", "토", "일"]
+
+
+def clean_html_tags(text: str) -> str:
+    """HTML 태그를 제거하고 텍스트만 반환합니다."""
+    if not text:
+        return ""
+    # HTML 태그 제거
+    text = _TAG_RE.sub('', text)
+    # HTML 엔티티 디코딩
+    text = text.replace('&quot;', '"').replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
+    text = text.replace('&nbsp;', ' ').replace('&#39;', "'").replace('&apos;', "'")
+    # 연속된 공백 정리
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+def format_date(pub_date: str) -> str:
+    """날짜를 한국어 형식으로 변환합니다. (예: "2025.12.30 (화)")"""
+    if not pub_date:
+        return "날짜 정보 없음"
+    try:
+        # ISO 형식(예: "2025-12-30T10:30:00+09:00")은 날짜 부분만 사용
+        dt = datetime.strptime(pub_date.split('T')[0], "%Y-%m-%d")
+    except ValueError:
+        return pub_date
+    return f"{dt.strftime('%Y.%m.%d')} ({_WEEKDAYS[dt.weekday()]})"
+
+
+def _streamlit_url(link: str) -> str:
+    base_url = os.getenv("STREAMLIT_APP_URL", DEFAULT_STREAMLIT_URL)
+    return f"{base_url}?article_url={urllib.parse.quote(link)}" if link else base_url
+
+
+def fingerprint(*values) -> str:
+    """블록을 만드는 데 쓴 값들의 지문을 반환합니다. 값이 하나라도 바뀌면 지문도 바뀝니다."""
+    raw = json.dumps([BLOCKS_VERSION, *values], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _digest_fingerprint(article: Dict, idx: int, summary: Optional[str]) -> str:
+    return fingerprint(
+        "digest", idx, article.get("id"), article.get("title"), article.get("description"),
+        article.get("link"), article.get("relevance_score"), article.get("pubDate"), summary,
+        bool(os.getenv("SLACK_APP_URL")), os.getenv("STREAMLIT_APP_URL"),
+    )
+
+
+def _list_fingerprint(article: Dict, idx: int) -> str:
+    return fingerprint("list", idx, article.get("id"), article.get("title"), article.get("relevance_score"))
+
+
+def build_digest_item(article: Dict, idx: int, summary: Optional[str] = None) -> List[Dict]:
+    """
+    일일 알림 메시지에서 기사 하나에 해당하는 블록을 만듭니다.
+
+    Args:
+        article: 기사 정보
+        idx: 알림 안의 순번 (1부터)
+        summary: 캐시된 요약 (없으면 None)
+
+    Returns:
+        Block Kit 블록 리스트 (구분선 제외)
+    """
+    title = clean_html_tags(article.get("title", ""))
+    description = clean_html_tags(article.get("description", ""))
+    link = article.get("link", "")
+    score = article.get("relevance_score", 0)
+
+    blocks = [
+        # 기사 제목 (제목만 강조)
+        {"type": "section", "text": {"type": "mrkdwn", "text": f"*{idx}. {title}*"}},
+        # 메타 정보 (날짜, 관련도 점수)
+        {
+            "type": "context",
+            "elements": [
+                {
+                    "type": "mrkdwn",
+                    "text": f"📅 {format_date(article.get('pubDate', ''))}  |  📊 관련도: {score:.1f}/10점",
+                },
+            ],
+        },
+    ]
+
+    # 기사 설명 (간략)
+    if description:
+        desc_short = description[:150] + "..." if len(description) > 150 else description
+        blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": desc_short}})
+
+    # 요약이 있으면 표시 (너무 길면 잘라내기)
+    if summary:
+        summary_short = summary[:200] + "..." if len(summary) > 200 else summary
+        blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": f"*📄 요약:*\n{summary_short}"}})
+
+    buttons = []
+    if link:
+        buttons.append({
+            "type": "button",
+            "text": {"type": "plain_text", "text": "🔗 기사 보기"},
+            "url": link,
+            "action_id": f"view_article_{idx}",
+        })
+
+    if os.getenv("SLACK_APP_URL"):
+        # Interactive 버튼 (Slack App 서버로 요청)
+        value = f"{BUTTON_VALUE_PREFIX}{article_stable_id(article)}"
+        buttons.append({
+            "type": "button",
+            "text": {"type": "plain_text", "text": "📄 요약 보기"},
+            "action_id": f"view_summary_{idx}",
+            "value": value,
+        })
+        buttons.append({
+            "type": "button",
+            "text": {"type": "plain_text", "text": "📝 카드뉴스 생성"},
+            "action_id": f"create_cardnews_{idx}",
+            "value": value,
+        })
+    else:
+        # 일반 URL 버튼 (Streamlit 앱 링크)
+        buttons.append({
+            "type": "button",
+            "text": {"type": "plain_text", "text": "📝 카드뉴스 생성"},
+            "url": _streamlit_url(link),
+            "action_id": f"create_cardnews_{idx}",
+        })
+
+    blocks.append({"type": "actions", "elements": buttons})
+    return blocks
+
+
+def build_list_item(article: Dict, idx: int) -> List[Dict]:
+    """
+    /cardnews 목록에서 기사 하나에 해당하는 블록을 만듭니다.
+
+    Args:
+        article: 기사 정보
+        idx: 목록 안의 순번 (1부터)
+
+    Returns:
+        Block Kit 블록 리스트 (구분선 제외)
+    """
+    title = article.get('title', '')
+    score = article.get('relevance_score', 0)
+    return [{
+        "type": "section",
+        "text": {
+            "type": "mrkdwn",
+            "text": f"*{idx}. {title[:80]}*\n관련도: {score:.1f}/10점",
+        },
+        "accessory": {
+            "type": "button",
+            "text": {"type": "plain_text", "text": "생성"},
+            "value": f"{BUTTON_VALUE_PREFIX}{article_stable_id(article)}",
+            "action_id": f"create_cardnews_{idx}",
+        },
+    }]
+
+
+def build_deck_blocks(title: str, link: str, cards: List[Dict], in_progress: bool = False) -> List[Dict]:
+    """
+    카드뉴스 결과 Block Kit 블록을 만듭니다.
+
+    Args:
+        title: 기사 제목
+        link: 기사 링크
+        cards: 카드 리스트
+        in_progress: 생성 중인 경우 True (완성된 카드까지만 표시)
+
+    Returns:
+        Block Kit 블록 리스트
+    """
+    header_text = f"⏳ 카드뉴스 생성 중 ({len(cards)}장 완성): {title[:50]}" if in_progress else f"📝 카드뉴스 생성 완료: {title[:50]}"
+    blocks = [
+        {"type": "header", "text": {"type": "plain_text", "text": header_text}},
+        {"type": "divider"},
+    ]
+
+    shown = cards[:MAX_DECK_CARDS]
+    for card_idx, card in enumerate(shown, 1):
+        card_text = f"*카드 {card_idx} ({card.get('type', '')})*\n"
+        if card.get('head'):
+            card_text += f"*HEAD:* {card['head']}\n"
+        if card.get('body'):
+            card_text += f"*BODY:* {card['body']}\n"
+        if card.get('image_key'):
+            card_text += f"*IMAGE_KEY:* {card['image_key']}"
+        blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": card_text}})
+        if card_idx < len(shown):
+            blocks.append({"type": "divider"})
+
+    if in_progress:
+        return blocks
+
+    if len(cards) > MAX_DECK_CARDS:
+        blocks.append({
+            "type": "context",
+            "elements": [
+                {
+                    "type": "mrkdwn",
+                    "text": f"*총 {len(cards)}개 카드 중 {MAX_DECK_CARDS}개만 표시. 전체는 Streamlit 앱에서 확인하세요.*",
+                },
+            ],
+        })
+
+    # Streamlit 앱 링크 버튼
+    blocks.append({
+        "type": "actions",
+        "elements": [
+            {
+                "type": "button",
+                "text": {"type": "plain_text", "text": "🔗 Streamlit 앱에서 전체 보기"},
+                "url": _streamlit_url(link),
+            },
+        ],
+    })
+    return blocks
+
+
+def _stored(article: Dict, kind: str, expected: str) -> Optional[List[Dict]]:
+    entry = (article.get("slack_blocks") or {}).get(kind)
+    if entry and entry.get("fingerprint") == expected:
+        return entry.get("blocks")
+    return None
+
+
+def _no_summary(article_id: str) -> Optional[str]:
+    return None
+
+
+def render_article_blocks(
+    articles: List[Dict],
+    summary_lookup: Callable[[str], Optional[str]] = _no_summary,
+) -> int:
+    """
+    기사마다 일일 알림용/목록용 블록을 만들어 article["slack_blocks"]에 붙입니다.
+
+    크롤링 후(요약 미리 생성까지 끝난 뒤) 저장하기 전에 호출합니다.
+    지문이 같은 블록이 이미 있으면 다시 만들지 않습니다.
+
+    Args:
+        articles: 기사 리스트 (관련도 순, slack_blocks가 추가됨)
+        summary_lookup: 기사 ID(링크 또는 제목)로 캐시된 요약을 찾는 함수
+
+    Returns:
+        새로 만든 블록 개수
+    """
+    built = 0
+    for idx, article in enumerate(articles, 1):
+        article["id"] = article_stable_id(article)
+        entries = dict(article.get("slack_blocks") or {})
+
+        if idx <= DIGEST_SIZE:
+            summary = summary_lookup(article.get("link", "") or clean_html_tags(article.get("title", "")))
+            expected = _digest_fingerprint(article, idx, summary)
+            if _stored(article, "digest", expected) is None:
+                entries["digest"] = {"fingerprint": expected, "blocks": build_digest_item(article, idx, summary)}
+                built += 1
+        else:
+            entries.pop("digest", None)
+
+        if idx <= LIST_SIZE:
+            expected = _list_fingerprint(article, idx)
+            if _stored(article, "list_item", expected) is None:
+                entries["list_item"] = {"fingerprint": expected, "blocks": build_list_item(article, idx)}
+                built += 1
+        else:
+            entries.pop("list_item", None)
+
+        if entries:
+            article["slack_blocks"] = entries
+        else:
+            article.pop("slack_blocks", None)
+    return built
+
+
+def digest_blocks(
+    articles: List[Dict],
+    summary_lookup: Callable[[str], Optional[str]] = _no_summary,
+) -> List[Dict]:
+    """
+    일일 추천 기사 알림 블록을 반환합니다. 저장된 기사 블록을 쓰고, 없거나 지문이 다르면 새로 만듭니다.
+
+    Args:
+        articles: 기사 리스트 (상위 DIGEST_SIZE개만 사용)
+        summary_lookup: 기사 ID로 캐시된 요약을 찾는 함수
+
+    Returns:
+        Block Kit 블록 리스트
+    """
+    top = articles[:DIGEST_SIZE]
+    blocks = [
+        {"type": "header", "text": {"type": "plain_text", "text": "📰 오늘의 추천 기사"}},
+        {"type": "divider"},
+    ]
+    for idx, article in enumerate(top, 1):
+        summary = summary_lookup(article.get("link", "") or clean_html_tags(article.get("title", "")))
+        item = _stored(article, "digest", _digest_fingerprint(article, idx, summary))
+        blocks.extend(item if item is not None else build_digest_item(article, idx, summary))
+        if idx < len(top):
+            blocks.append({"type": "divider"})
+    return blocks
+
+
+_list_lock = threading.Lock()
+_list_memo: tuple = (None, None)
+
+
+def list_blocks(articles: List[Dict]) -> List[Dict]:
+    """
+    /cardnews 목록 블록을 반환합니다.
+
+    기사 블록은 저장된 것을 쓰고(지문이 다르면 새로 만듦), 같은 기사 리스트 객체에 대해서는
+    완성된 목록을 기억해 두었다가 그대로 반환합니다. RecommendationsStore는 파일이 바뀔 때만
+    새 리스트를 만들므로, 파일이 그대로인 동안에는 조회만 합니다.
+
+    Args:
+        articles: 기사 리스트 (상위 LIST_SIZE개만 사용)
+
+    Returns:
+        Block Kit 블록 리스트 (읽기 전용으로 사용)
+    """
+    global _list_memo
+    with _list_lock:
+        if _list_memo[0] is articles:
+            return _list_memo[1]
+
+    top = articles[:LIST_SIZE]
+    blocks = [
+        {"type": "header", "text": {"type": "plain_text", "text": "📰 추천 기사 목록"}},
+        {"type": "divider"},
+    ]
+    for idx, article in enumerate(top, 1):
+        item = _stored(article, "list_item", _list_fingerprint(article, idx))
+        blocks.extend(item if item is not None else build_list_item(article, idx))
+        if idx < len(top):
+            blocks.append({"type": "divider"})
+    blocks.append({
+        "type": "context",
+        "elements": [
+            {
+                "type": "mrkdwn",
+                "text": "사용법: `/cardnews 1` (1번 기사 생성) 또는 버튼 클릭",
+            },
+        ],
+    })
+
+    with _list_lock:
+        _list_memo = (articles, blocks)
+    return blocks
+
+
+class DeckBlockStore:
+    """
+    카드뉴스 결과 블록을 기사별로 저장하는 영구 저장소입니다.
+
+    지문은 카드 문구(스크립트), 제목, 링크, STREAMLIT_APP_URL로 만들며, 문구가 다시 생성되는 등
+    값이 바뀌면 저장된 블록을 쓰지 않습니다. 같은 프로세스에서는 메모리에서 바로 찾습니다.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DECK_DB):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._memory: Dict[str, tuple] = {}
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS decks ("
+                    "article_id TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, "
+                    "blocks TEXT NOT NULL, updated_at REAL NOT NULL)"
+                )
+        except sqlite3.Error as e:
+            print(f"[Slack 블록 저장소 초기화 오류] {e}")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def get(self, article_id: str, expected: str) -> Optional[List[Dict]]:
+        """
+        저장된 카드뉴스 블록을 반환합니다.
+
+        Args:
+            article_id: 기사 ID (링크 또는 제목)
+            expected: 현재 값으로 만든 지문
+
+        Returns:
+            Block Kit 블록 리스트. 없거나 지문이 다르면 None.
+        """
+        with self._lock:
+            cached = self._memory.get(article_id)
+        if cached and cached[0] == expected:
+            return cached[1]
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT fingerprint, blocks FROM decks WHERE article_id = ?", (article_id,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"[Slack 블록 읽기 오류] {e}")
+            return None
+        if not row or row[0] != expected:
+            return None
+        blocks = json.loads(row[1])
+        with self._lock:
+            self._memory[article_id] = (expected, blocks)
+        return blocks
+
+    def put(self, article_id: str, expected: str, blocks: List[Dict]) -> None:
+        """
+        카드뉴스 블록을 저장합니다. 같은 기사의 예전 블록은 교체됩니다.
+
+        Args:
+            article_id: 기사 ID (링크 또는 제목)
+            expected: 블록을 만든 값의 지문
+            blocks: Block Kit 블록 리스트
+        """
+        with self._lock:
+            self._memory[article_id] = (expected, blocks)
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO decks (article_id, fingerprint, blocks, updated_at) VALUES (?, ?, ?, ?)",
+                    (article_id, expected, json.dumps(blocks, ensure_ascii=False), time.time()),
+                )
+        except sqlite3.Error as e:
+            print(f"[Slack 블록 저장 오류] {e}")
+
+
+_deck_store: Optional[DeckBlockStore] = None
+_deck_store_lock = threading.Lock()
+
+
+def get_deck_block_store() -> DeckBlockStore:
+    """
+    프로세스 전체에서 공유하는 DeckBlockStore 인스턴스를 반환합니다.
+
+    저장 위치는 환경 변수 SLACK_BLOCKS_DB로 설정합니다.
+
+    Returns:
+        공유 DeckBlockStore 인스턴스
+    """
+    global _deck_store
+    with _deck_store_lock:
+        if _deck_store is None:
+            _deck_store = DeckBlockStore(os.getenv("SLACK_BLOCKS_DB", DEFAULT_DECK_DB))
+        return _deck_store
+
+
+def deck_blocks(article_id: str, script: str, title: str, link: str, cards: List[Dict]) -> List[Dict]:
+    """
+    카드뉴스 결과 블록을 반환합니다. 같은 문구로 만든 블록이 저장되어 있으면 그대로 쓰고,
+    없으면 만들어 저장합니다.
+
+    Args:
+        article_id: 기사 ID (링크 또는 제목)
+        script: 카드 문구 (cards의 원본)
+        title: 기사 제목
+        link: 기사 링크
+        cards: script를 파싱한 카드 리스트
+
+    Returns:
+        Block Kit 블록 리스트
+    """
+    store = get_deck_block_store()
+    expected = fingerprint("deck", script, title, link, os.getenv("STREAMLIT_APP_URL"))
+    blocks = store.get(article_id, expected)
+    if blocks is None:
+        blocks = build_deck_blocks(title, link, cards)
+        store.put(article_id, expected, blocks)
+    return blocks
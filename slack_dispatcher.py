@@ -0,0 +1,508 @@
+"""Slack 전송 모듈 - 속도 제한(등급별), 429 Retry-After, 재시도 큐, 메시지 갱신 병합
+
+- Web API 메서드는 Slack 등급(tier)별 분당 허용량을, chat.postMessage와 웹훅/response_url은
+  대상(채널/URL)별 초당 1건을 기준으로 속도를 제한합니다.
+- 429 응답은 Retry-After만큼 해당 대상의 전송을 멈추고, 5xx/연결 오류는 지수 백오프로 다시 보냅니다.
+- submit()으로 넣은 전송은 백그라운드 스레드가 처리하므로 호출한 쪽은 기다리지 않습니다.
+  같은 메시지의 chat.update가 밀려 있으면 마지막 내용 하나로 합칩니다.
+- SlackMessage는 "생성 중" 임시 메시지를 잠시 늦게 올려, 그 전에 결과가 나오면 결과만 보내고
+  이미 올렸으면 같은 메시지를 결과로 교체합니다.
+"""
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import requests
+
+from gemini_client import TokenBucket, _parse_retry_after
+
+
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_TIMEOUT = 10  # 초
+DEFAULT_PLACEHOLDER_DELAY = 1.5  # "생성 중" 메시지를 올리기 전 대기 시간 (초)
+BACKOFF_BASE = 1  # 초
+BACKOFF_MAX = 30  # 초
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Slack Web API 등급별 분당 허용량 (https://api.slack.com/apis/rate-limits)
+TIER_LIMITS = {1: 1, 2: 20, 3: 50, 4: 100}
+METHOD_TIERS = {
+    "chat.update": 3,
+    "chat.delete": 3,
+    "chat.getPermalink": 4,
+    "conversations.history": 3,
+    "conversations.info": 3,
+    "users.info": 4,
+}
+DEFAULT_TIER = 3
+# chat.postMessage, 웹훅, response_url: 대상(채널/URL)마다 초당 1건, 짧은 순간 3건까지
+PER_TARGET_LIMIT = 60
+PER_TARGET_BURST = 3
+
+
+class SlackError(Exception):
+    """재시도 후에도 Slack 전송에 실패한 경우"""
+
+
+class _Delivery:
+    """전송 한 건 (Web API 메서드 또는 웹훅/response_url)"""
+
+    def __init__(self, method: Optional[str], url: Optional[str], body: Dict, key: Optional[Hashable] = None):
+        self.method = method
+        self.url = url
+        self.body = body
+        self.key = key
+        self.attempts = 0
+        self.cancelled = False
+        self.reserved = False  # 이번 시도의 허용량을 이미 예약했는지
+
+    @property
+    def label(self) -> str:
+        return self.method or "response_url"
+
+
+class SlackDispatcher:
+    """
+    Slack Web API, 웹훅, response_url 전송을 속도 제한과 재시도로 감싸는 전송기입니다.
+
+    call()/post_url()은 결과를 기다리는 동기 전송이고(작업 스레드용),
+    submit()/submit_url()은 백그라운드 재시도 큐에 넣고 바로 돌아옵니다.
+    """
+
+    def __init__(
+        self,
+        api_base: str = "https://slack.com/api",
+        token: Optional[str] = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        timeout: float = DEFAULT_TIMEOUT,
+        placeholder_delay: float = DEFAULT_PLACEHOLDER_DELAY,
+    ):
+        self.api_base = api_base.rstrip("/")
+        self.token = token
+        self.max_attempts = max(max_attempts, 1)
+        self.timeout = timeout
+        self.placeholder_delay = placeholder_delay
+        self.session = requests.Session()
+        self._buckets: Dict[Hashable, TokenBucket] = {}
+        self._paused_until: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+        self._queue: List[Tuple[float, int, _Delivery]] = []
+        self._pending: Dict[Hashable, _Delivery] = {}
+        self._sequence = itertools.count()
+        self._wakeup = threading.Condition(self._lock)
+        self._inflight = 0
+        self._sending: Dict[Hashable, int] = {}  # 지금 보내는 중인 key
+        self._thread: Optional[threading.Thread] = None
+
+    # 속도 제한
+
+    def _limit_key(self, delivery: _Delivery) -> Hashable:
+        if delivery.url:
+            return ("url", delivery.url)
+        if delivery.method == "chat.postMessage":
+            return (delivery.method, delivery.body.get("channel"))
+        return delivery.method
+
+    def _reserve(self, delivery: _Delivery) -> float:
+        """전송 허용량을 예약하고 대기 시간(초)을 반환합니다. 이미 예약했으면 0."""
+        if delivery.reserved:
+            return 0.0
+        key = self._limit_key(delivery)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if isinstance(key, tuple):
+                    bucket = TokenBucket(PER_TARGET_LIMIT, burst=PER_TARGET_BURST)
+                else:
+                    bucket = TokenBucket(TIER_LIMITS[METHOD_TIERS.get(delivery.method, DEFAULT_TIER)])
+                self._buckets[key] = bucket
+            paused = self._paused_until.get(key, 0.0) - time.monotonic()
+            if paused > 0:
+                return paused
+            delivery.reserved = True
+            return bucket.reserve(1)
+
+    def _pause(self, delivery: _Delivery, seconds: float) -> None:
+        key = self._limit_key(delivery)
+        with self._lock:
+            self._paused_until[key] = max(self._paused_until.get(key, 0.0), time.monotonic() + seconds)
+
+    # 전송
+
+    def _attempt(self, delivery: _Delivery) -> Tuple[bool, Optional[Dict], Optional[float]]:
+        """
+        한 번 전송합니다.
+
+        Returns:
+            (완료 여부, 응답, 다시 시도하기 전 대기 시간). 재시도할 수 없는 실패는 완료로 봅니다.
+        """
+        delivery.attempts += 1
+        delivery.reserved = False
+        try:
+            if delivery.url:
+                resp = self.session.post(delivery.url, json=delivery.body, timeout=self.timeout)
+            else:
+                if not self.token:
+                    return True, None, None
+                resp = self.session.post(
+                    f"{self.api_base}/{delivery.method}",
+                    headers={"Authorization": f"Bearer {self.token}", "Content-Type": "application/json"},
+                    json=delivery.body,
+                    timeout=self.timeout,
+                )
+        except requests.RequestException as e:
+            print(f"[슬랙 전송 오류] {delivery.label} ({delivery.attempts}회): {e}")
+            return False, None, None
+
+        if resp.status_code in RETRYABLE_STATUS_CODES:
+            retry_after = _parse_retry_after(resp) if resp.status_code == 429 else None
+            if retry_after is not None:
+                self._pause(delivery, retry_after)
+            print(f"[슬랙 전송 재시도] {delivery.label} {resp.status_code} ({delivery.attempts}회)")
+            return False, None, retry_after
+
+        if delivery.url:
+            if not resp.ok:
+                print(f"[슬랙 전송 실패] {delivery.label} {resp.status_code}: {resp.text[:200]}")
+            return True, {"ok": resp.ok}, None
+        try:
+            data = resp.json()
+        except ValueError:
+            data = {"ok": False, "error": f"HTTP {resp.status_code}"}
+        if not data.get("ok") and data.get("error") == "ratelimited":
+            return False, None, None
+        if not data.get("ok"):
+            print(f"[슬랙 API 오류] {delivery.method}: {data.get('error')}")
+        return True, data, None
+
+    def _backoff(self, delivery: _Delivery, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            return retry_after
+        return min(BACKOFF_MAX, BACKOFF_BASE * (2 ** (delivery.attempts - 1))) + random.uniform(0, 0.5)
+
+    def _send(self, delivery: _Delivery) -> Optional[Dict]:
+        """속도 제한을 지키며 성공하거나 시도 횟수를 다 쓸 때까지 전송합니다. (현재 스레드에서 대기)"""
+        while True:
+            wait = self._reserve(delivery)
+            while wait > 0:
+                time.sleep(wait)
+                wait = self._reserve(delivery)
+            done, data, retry_after = self._attempt(delivery)
+            if done:
+                return data
+            if delivery.attempts >= self.max_attempts:
+                raise SlackError(f"{delivery.label} 전송 실패 ({delivery.attempts}회 시도)")
+            time.sleep(self._backoff(delivery, retry_after))
+
+    def call(self, method: str, body: Dict) -> Optional[Dict]:
+        """
+        Web API 메서드를 호출하고 응답을 기다립니다.
+
+        Args:
+            method: API 메서드 (예: "chat.postMessage")
+            body: 요청 본문
+
+        Returns:
+            응답 JSON. Bot Token이 없으면 None.
+
+        Raises:
+            SlackError: 재시도 후에도 429/5xx/연결 오류가 계속된 경우
+        """
+        return self._send(_Delivery(method, None, body))
+
+    def post_url(self, url: str, message: Dict) -> bool:
+        """
+        웹훅이나 response_url로 메시지를 보내고 결과를 기다립니다.
+
+        Args:
+            url: 웹훅 URL 또는 response_url
+            message: 메시지 본문
+
+        Returns:
+            전송 성공 여부
+        """
+        try:
+            data = self._send(_Delivery(None, url, message))
+        except SlackError as e:
+            print(f"[슬랙 전송 실패] {e}")
+            return False
+        return bool(data and data.get("ok"))
+
+    # 백그라운드 재시도 큐
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="slack-dispatcher", daemon=True)
+            self._thread.start()
+
+    def _push(self, delivery: _Delivery, due: float) -> None:
+        heapq.heappush(self._queue, (due, next(self._sequence), delivery))
+        self._wakeup.notify()
+
+    def _enqueue(self, delivery: _Delivery, delay: float) -> None:
+        with self._lock:
+            if delivery.key is not None:
+                pending = self._pending.get(delivery.key)
+                if pending is not None and not pending.cancelled:
+                    # 아직 보내지 않은 같은 메시지 갱신은 마지막 내용으로 교체
+                    pending.body = delivery.body
+                    return
+                self._pending[delivery.key] = delivery
+            self._ensure_thread()
+            self._push(delivery, time.monotonic() + delay)
+
+    def submit(self, method: str, body: Dict, key: Optional[Hashable] = None, delay: float = 0.0) -> None:
+        """
+        Web API 호출을 재시도 큐에 넣고 바로 돌아옵니다.
+
+        Args:
+            method: API 메서드
+            body: 요청 본문
+            key: 같은 key로 아직 보내지 않은 호출이 있으면 본문만 교체 (예: 같은 메시지의 chat.update)
+            delay: 보내기 전 대기 시간 (초)
+        """
+        self._enqueue(_Delivery(method, None, body, key), delay)
+
+    def submit_url(self, url: str, message: Dict, key: Optional[Hashable] = None, delay: float = 0.0) -> None:
+        """
+        웹훅/response_url 전송을 재시도 큐에 넣고 바로 돌아옵니다.
+
+        Args:
+            url: 웹훅 URL 또는 response_url
+            message: 메시지 본문
+            key: 취소하거나 병합할 때 쓰는 키
+            delay: 보내기 전 대기 시간 (초)
+        """
+        self._enqueue(_Delivery(None, url, message, key), delay)
+
+    def cancel(self, key: Hashable) -> bool:
+        """
+        아직 보내지 않은 전송을 취소합니다. 같은 key를 보내는 중이면 끝날 때까지 기다리므로,
+        취소한 뒤에 보내는 메시지가 늦게 도착한 이전 전송에 덮어써지지 않습니다.
+
+        Args:
+            key: submit()/submit_url()에 넘긴 키
+
+        Returns:
+            취소했으면 True, 이미 보냈거나 없으면 False
+        """
+        with self._lock:
+            delivery = self._pending.pop(key, None)
+            if delivery is not None:
+                delivery.cancelled = True
+            while self._sending.get(key):
+                self._wakeup.wait(0.1)
+            return delivery is not None
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._queue or self._queue[0][0] > time.monotonic():
+                    timeout = self._queue[0][0] - time.monotonic() if self._queue else None
+                    self._wakeup.wait(timeout)
+                _, _, delivery = heapq.heappop(self._queue)
+                if delivery.cancelled:
+                    continue
+                self._inflight += 1
+            try:
+                self._process(delivery)
+            finally:
+                with self._lock:
+                    self._inflight -= 1
+                    self._wakeup.notify_all()
+
+    def _process(self, delivery: _Delivery) -> None:
+        wait = self._reserve(delivery)
+        if wait > 0:
+            with self._lock:
+                self._push(delivery, time.monotonic() + wait)
+            return
+        with self._lock:
+            if delivery.cancelled:
+                return
+            if delivery.key is not None:
+                if self._pending.get(delivery.key) is delivery:
+                    # 보내기 시작한 뒤의 갱신은 새 전송으로 넣음
+                    del self._pending[delivery.key]
+                self._sending[delivery.key] = self._sending.get(delivery.key, 0) + 1
+        try:
+            self._deliver_or_requeue(delivery)
+        finally:
+            if delivery.key is not None:
+                with self._lock:
+                    self._sending[delivery.key] -= 1
+                    if not self._sending[delivery.key]:
+                        del self._sending[delivery.key]
+                    self._wakeup.notify_all()
+
+    def _deliver_or_requeue(self, delivery: _Delivery) -> None:
+        done, _, retry_after = self._attempt(delivery)
+        if done:
+            return
+        if delivery.attempts >= self.max_attempts:
+            print(f"[슬랙 전송 포기] {delivery.label} ({delivery.attempts}회 시도)")
+            return
+        with self._lock:
+            if delivery.cancelled:
+                return
+            if delivery.key is not None:
+                if self._pending.get(delivery.key) is not None:
+                    return  # 더 새로운 내용이 이미 대기 중
+                self._pending[delivery.key] = delivery
+            self._push(delivery, time.monotonic() + self._backoff(delivery, retry_after))
+
+    def flush(self, timeout: float) -> bool:
+        """
+        재시도 큐가 빌 때까지 기다립니다. (서버 종료 시)
+
+        Args:
+            timeout: 최대 대기 시간 (초)
+
+        Returns:
+            큐가 비었으면 True
+        """
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while any(not d.cancelled for _, _, d in self._queue) or self._inflight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._wakeup.wait(min(remaining, 0.1))
+        return True
+
+    def message(self, channel: str) -> "SlackMessage":
+        """
+        진행 표시와 최종 결과를 한 메시지로 합치는 SlackMessage를 만듭니다.
+
+        Args:
+            channel: 채널 ID
+
+        Returns:
+            SlackMessage 인스턴스
+        """
+        return SlackMessage(self, channel, self.placeholder_delay)
+
+
+class SlackMessage:
+    """
+    채널 메시지 하나의 "생성 중" 표시와 최종 결과를 관리합니다.
+
+    progress()는 첫 호출 후 placeholder_delay초가 지나야 메시지를 올리고, 그 뒤의 진행 상황은
+    밀린 chat.update를 합쳐 보냅니다. finish()는 아직 올리지 않았으면 결과를 새 메시지로,
+    올렸으면 같은 메시지를 결과로 교체합니다.
+    """
+
+    def __init__(self, dispatcher: SlackDispatcher, channel: str, placeholder_delay: float):
+        self.dispatcher = dispatcher
+        self.channel = channel
+        self.placeholder_delay = placeholder_delay
+        self.ts: Optional[str] = None
+        self._latest: Optional[Dict] = None
+        self._timer: Optional[threading.Timer] = None
+        self._finished = False
+        self._lock = threading.Lock()
+
+    @property
+    def _update_key(self) -> Tuple[str, str, Optional[str]]:
+        return ("chat.update", self.channel, self.ts)
+
+    def progress(self, message: Dict) -> None:
+        """
+        진행 상황을 표시합니다. (기다리지 않음)
+
+        Args:
+            message: text/blocks를 담은 메시지 본문
+        """
+        with self._lock:
+            if self._finished:
+                return
+            if self.ts:
+                self.dispatcher.submit(
+                    "chat.update", {**message, "channel": self.channel, "ts": self.ts}, key=self._update_key
+                )
+                return
+            self._latest = message
+            if self._timer is None:
+                self._timer = threading.Timer(self.placeholder_delay, self._post_placeholder)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _post_placeholder(self) -> None:
+        with self._lock:
+            if self._finished or self._latest is None:
+                return
+            try:
+                posted = self.dispatcher.call("chat.postMessage", {**self._latest, "channel": self.channel})
+            except SlackError as e:
+                print(f"[슬랙 진행 메시지 오류] {e}")
+                return
+            if posted and posted.get("ok"):
+                self.ts = posted.get("ts")
+
+    def finish(self, message: Dict) -> Optional[Dict]:
+        """
+        최종 결과를 보냅니다. (보낼 때까지 기다림)
+
+        Args:
+            message: text/blocks를 담은 메시지 본문
+
+        Returns:
+            Slack 응답 JSON
+
+        Raises:
+            SlackError: 재시도 후에도 전송에 실패한 경우
+        """
+        self._stop_placeholder()
+        with self._lock:
+            if self.ts:
+                self.dispatcher.cancel(self._update_key)
+                return self.dispatcher.call("chat.update", {**message, "channel": self.channel, "ts": self.ts})
+            return self.dispatcher.call("chat.postMessage", {**message, "channel": self.channel})
+
+    def discard(self) -> None:
+        """진행 메시지를 지웁니다. (작업을 다시 시도할 때 새 메시지를 올리도록)"""
+        self._stop_placeholder()
+        with self._lock:
+            if self.ts:
+                self.dispatcher.cancel(self._update_key)
+                self.dispatcher.submit("chat.delete", {"channel": self.channel, "ts": self.ts})
+                self.ts = None
+
+    def _stop_placeholder(self) -> None:
+        with self._lock:
+            self._finished = True
+            timer = self._timer
+        if timer is not None:
+            timer.cancel()
+
+
+_dispatcher: Optional[SlackDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_slack_dispatcher() -> SlackDispatcher:
+    """
+    프로세스 전체에서 공유하는 SlackDispatcher 인스턴스를 반환합니다.
+
+    API 기본 URL, Bot Token, 최대 시도 횟수, 요청 시간 제한(초), "생성 중" 메시지 지연(초)은
+    환경 변수 SLACK_API_BASE, SLACK_BOT_TOKEN, SLACK_MAX_ATTEMPTS, SLACK_TIMEOUT,
+    SLACK_PLACEHOLDER_DELAY로 설정합니다.
+
+    Returns:
+        공유 SlackDispatcher 인스턴스
+    """
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = SlackDispatcher(
+                api_base=os.getenv("SLACK_API_BASE", "https://slack.com/api"),
+                token=os.getenv("SLACK_BOT_TOKEN"),
+                max_attempts=int(os.getenv("SLACK_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS)),
+                timeout=float(os.getenv("SLACK_TIMEOUT", DEFAULT_TIMEOUT)),
+                placeholder_delay=float(os.getenv("SLACK_PLACEHOLDER_DELAY", DEFAULT_PLACEHOLDER_DELAY)),
+            )
+        return _dispatcher
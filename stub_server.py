@@ -0,0 +1,469 @@
+"""외부 API 스텁 서버 - Naver/Gemini/Iconify/Slack 엔드포인트를 로컬에서 흉내내는 부하 테스트용 서버
+
+사용 예:
+    python stub_server.py --port 8900 --latency gemini=lognormal:2.0:0.5 --error-rate gemini=0.02 --rate-limit gemini=0.05
+
+클라이언트는 아래 환경 변수로 스텁을 가리키게 합니다. (load_test.py가 자동으로 설정)
+    GEMINI_API_BASE=http://127.0.0.1:8900/v1
+    NAVER_API_BASE=http://127.0.0.1:8900
+    ICONIFY_API_BASE=http://127.0.0.1:8900/iconify
+    SLACK_API_BASE=http://127.0.0.1:8900/slack/api
+    SLACK_WEBHOOK_URL=http://127.0.0.1:8900/slack/webhook
+
+서비스별 설정은 STUB_<SERVICE>_LATENCY, STUB_<SERVICE>_ERROR_RATE, STUB_<SERVICE>_RATE_LIMIT
+환경 변수로도 줄 수 있습니다. (SERVICE: NAVER, GEMINI, ICONIFY, SLACK, ARTICLE)
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from flask import Flask, Response, jsonify, request
+
+
+SERVICES = ["naver", "gemini", "iconify", "slack", "article"]
+
+# 서비스별 기본 지연 시간 분포 (실제 서비스에서 관찰되는 대략적인 수준)
+DEFAULT_LATENCY = {
+    "naver": "lognormal:0.15:0.4",
+    "gemini": "lognormal:3.0:0.5",
+    "iconify": "lognormal:0.1:0.4",
+    "slack": "lognormal:0.2:0.3",
+    "article": "lognormal:0.3:0.6",
+}
+STREAM_CHUNK_DELAY = 0.3  # 스트리밍 조각 사이 간격 (초)
+RETRY_AFTER_SECONDS = 2
+
+STUB_MODELS = ["models/gemini-1.5-flash", "models/gemini-1.5-pro"]
+NEWS_TOTAL = 1000
+IMAGE_KEYWORDS = ["business meeting", "award ceremony", "startup office", "game controller", "music studio"]
+
+
+class ServiceProfile:
+    """
+    서비스 하나의 지연 시간 분포와 오류/429 주입 비율입니다.
+
+    지연 시간 분포 형식:
+        fixed:<초>
+        uniform:<최소>:<최대>
+        lognormal:<중앙값>:<시그마>
+    """
+
+    def __init__(self, latency: str, error_rate: float = 0.0, rate_limit: float = 0.0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self._kind, self._params = self._parse(latency)
+
+    @staticmethod
+    def _parse(spec: str) -> Tuple[str, List[float]]:
+        kind, _, rest = spec.partition(":")
+        params = [float(p) for p in rest.split(":") if p]
+        expected = {"fixed": 1, "uniform": 2, "lognormal": 2}
+        if kind not in expected or len(params) != expected[kind]:
+            raise ValueError(f"지연 시간 분포 형식 오류: {spec}")
+        return kind, params
+
+    def sample_latency(self) -> float:
+        if self._kind == "fixed":
+            return self._params[0]
+        if self._kind == "uniform":
+            return random.uniform(*self._params)
+        median, sigma = self._params
+        return random.lognormvariate(0, sigma) * median
+
+    def to_dict(self) -> Dict:
+        return {"latency": self.latency, "error_rate": self.error_rate, "rate_limit": self.rate_limit}
+
+
+def load_profiles(overrides: Optional[Dict[str, Dict[str, str]]] = None) -> Dict[str, ServiceProfile]:
+    """
+    환경 변수와 명령줄 값으로 서비스별 프로필을 만듭니다.
+
+    Args:
+        overrides: {서비스: {"latency", "error_rate", "rate_limit"}} (명령줄 값, 환경 변수보다 우선)
+
+    Returns:
+        {서비스: ServiceProfile}
+    """
+    overrides = overrides or {}
+    profiles = {}
+    for service in SERVICES:
+        prefix = f"STUB_{service.upper()}_"
+        values = overrides.get(service, {})
+        profiles[service] = ServiceProfile(
+            latency=values.get("latency") or os.getenv(prefix + "LATENCY", DEFAULT_LATENCY[service]),
+            error_rate=float(values.get("error_rate") or os.getenv(prefix + "ERROR_RATE", 0)),
+            rate_limit=float(values.get("rate_limit") or os.getenv(prefix + "RATE_LIMIT", 0)),
+        )
+    return profiles
+
+
+# --- 응답 본문 생성
+
+
+def _rng_for(*parts) -> random.Random:
+    """요청 값으로 결정되는 난수 생성기 (같은 요청에는 같은 응답)"""
+    seed = hashlib.sha256("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return random.Random(int(seed[:16], 16))
+
+
+def _news_items(base_url: str, query: str, start: int, display: int) -> List[Dict]:
+    """검색어와 페이지 위치로 결정되는 가짜 뉴스 기사 목록을 만듭니다."""
+    items = []
+    now = datetime.now()
+    for rank in range(start, min(start + display, NEWS_TOTAL + 1)):
+        rng = _rng_for(query, rank)
+        # 같은 보도자료가 여러 매체에 실리는 경우를 흉내내기 위해 원문 번호를 겹치게 함
+        story = rng.randrange(max(1, NEWS_TOTAL // 4))
+        published = now - timedelta(hours=rng.randrange(0, 24 * 5))
+        items.append({
+            "title": f"<b>{query}</b>, 지역 콘텐츠 기업 지원 사업 {story}차 성과 공유",
+            "originallink": f"{base_url}/articles/{story}?outlet={rng.randrange(20)}",
+            "link": f"{base_url}/articles/{story}?outlet={rng.randrange(20)}&rank={rank}",
+            "description": (
+                f"<b>{query}</b>은 지역 콘텐츠 기업 {rng.randrange(5, 50)}곳을 대상으로 "
+                f"{story}차 지원 사업 성과 공유회를 열었다고 밝혔다. 참여 기업은 투자 유치와 "
+                "해외 진출 상담 기회를 얻었다."
+            ),
+            "pubDate": published.strftime("%a, %d %b %Y %H:%M:%S +0900"),
+        })
+    return items
+
+
+def _card_lines(title: str) -> List[str]:
+    lines = [f"1. TYPE=cover | HEAD={title[:18]} 소식! | IMAGE_KEY={IMAGE_KEYWORDS[0]}"]
+    for number in range(2, 8):
+        keyword = IMAGE_KEYWORDS[number % len(IMAGE_KEYWORDS)]
+        lines.append(
+            f"{number}. TYPE=program | HEAD={number}번째 이야기는요? | "
+            f"BODY=진흥원이 지역 기업의 성장을 함께 지원했어요. | IMAGE_KEY={keyword}"
+        )
+    lines.append(
+        "8. TYPE=closing | HEAD=더 자세한 내용이 궁금하다면? | "
+        "BODY=진흥원 홈페이지(https://ccon.kr/)에서 더 많은 정보를 확인해보세요! | IMAGE_KEY=website visit"
+    )
+    return lines
+
+
+def _prompt_title(prompt: str) -> str:
+    match = re.search(r"\[제목\]\n(.*)", prompt)
+    return match.group(1).strip() if match else "기사"
+
+
+def _gemini_text(prompt: str) -> str:
+    """프롬프트 종류(요약/카드/통합/일괄)에 맞는 가짜 생성 결과를 만듭니다."""
+    title = _prompt_title(prompt)
+    summary = (
+        f"**충남콘텐츠진흥원**은 '{title}' 관련 사업을 지원했습니다. "
+        "지역 콘텐츠 기업의 성장과 해외 진출을 돕는 프로그램이 소개되었습니다.\n\n"
+        "**충남콘텐츠진흥원의 관여도**: 사업 운영과 기업 지원을 맡았습니다."
+    )
+    batch_ids = re.findall(r"^### ID: (A\d+)$", prompt, re.MULTILINE)
+    if batch_ids:
+        return json.dumps({key: summary for key in batch_ids}, ensure_ascii=False)
+    if '"cards"' in prompt:
+        cards = []
+        for line in _card_lines(title):
+            fields = dict(part.strip().split("=", 1) for part in line.split(". ", 1)[1].split(" | "))
+            cards.append({
+                "slide_number": len(cards) + 1,
+                "type": fields.get("TYPE", ""),
+                "headline": fields.get("HEAD", ""),
+                "description": fields.get("BODY", ""),
+                "image_keyword": fields.get("IMAGE_KEY", ""),
+            })
+        return "```json\n" + json.dumps({"summary": summary, "cards": cards}, ensure_ascii=False) + "\n```"
+    if "TYPE=cover" in prompt:
+        return "\n".join(_card_lines(title))
+    return summary
+
+
+def _usage(prompt: str, text: str) -> Dict[str, int]:
+    prompt_tokens = len(prompt) // 2
+    output_tokens = len(text) // 2
+    return {
+        "promptTokenCount": prompt_tokens,
+        "candidatesTokenCount": output_tokens,
+        "totalTokenCount": prompt_tokens + output_tokens,
+    }
+
+
+# /iconify/collection 응답용 아이콘 이름 (카테고리 → 단어)
+ICON_VOCABULARY = {
+    "Business": ["briefcase", "handshake", "meeting", "office-building", "chart-line", "presentation"],
+    "Awards": ["trophy", "medal", "award", "star-circle", "certificate"],
+    "Culture": ["movie", "music", "palette", "theater", "book-open", "camera"],
+    "Technology": ["gamepad", "laptop", "robot", "rocket-launch", "lightbulb", "cloud-upload"],
+    "People": ["account-group", "school", "human-greeting", "map-marker"],
+}
+
+
+def _icon_body(name: str) -> str:
+    color = "#" + hashlib.md5(name.encode("utf-8")).hexdigest()[:6]
+    return f'<circle cx="12" cy="12" r="10" fill="{color}"/>'
+
+
+def _svg(name: str) -> str:
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24">\n'
+        f'  <!-- {name} -->\n'
+        f"  {_icon_body(name)}\n"
+        "</svg>\n"
+    )
+
+
+# --- Flask 앱
+
+
+def create_app(profiles: Optional[Dict[str, ServiceProfile]] = None) -> Flask:
+    """
+    스텁 Flask 앱을 만듭니다.
+
+    Args:
+        profiles: 서비스별 프로필 (없으면 환경 변수/기본값)
+
+    Returns:
+        Flask 앱
+    """
+    app = Flask(__name__)
+    app.config["PROFILES"] = profiles or load_profiles()
+    stats: Counter = Counter()
+    stats_lock = threading.Lock()
+
+    def count(key: str) -> None:
+        with stats_lock:
+            stats[key] += 1
+
+    def inject(service: str, rate_limited_body: Optional[Dict] = None) -> Optional[Response]:
+        """지연 시간을 적용하고, 설정된 비율로 429/500 응답을 돌려줍니다."""
+        profile: ServiceProfile = app.config["PROFILES"][service]
+        count(f"{service}.requests")
+        time.sleep(max(0.0, profile.sample_latency()))
+
+        roll = random.random()
+        if roll < profile.rate_limit:
+            count(f"{service}.429")
+            resp = jsonify(rate_limited_body or {"error": "rate limited"})
+            resp.status_code = 429
+            resp.headers["Retry-After"] = str(RETRY_AFTER_SECONDS)
+            return resp
+        if roll < profile.rate_limit + profile.error_rate:
+            count(f"{service}.500")
+            resp = jsonify({"error": "injected server error"})
+            resp.status_code = 500
+            return resp
+        return None
+
+    @app.route("/_stats", methods=["GET"])
+    def get_stats():
+        with stats_lock:
+            counts = dict(stats)
+        return jsonify({
+            "counts": counts,
+            "profiles": {name: p.to_dict() for name, p in app.config["PROFILES"].items()},
+        })
+
+    @app.route("/_stats", methods=["DELETE"])
+    def reset_stats():
+        with stats_lock:
+            stats.clear()
+        return jsonify({"ok": True})
+
+    # Naver 뉴스 검색
+    @app.route("/v1/search/news.json", methods=["GET"])
+    def naver_news():
+        injected = inject("naver", {"errorMessage": "Rate limit exceeded", "errorCode": "012"})
+        if injected:
+            return injected
+        query = request.args.get("query", "")
+        display = max(1, min(int(request.args.get("display", 10)), 100))
+        start = max(1, min(int(request.args.get("start", 1)), NEWS_TOTAL))
+        items = _news_items(request.host_url.rstrip("/"), query, start, display)
+        return jsonify({
+            "lastBuildDate": datetime.now().strftime("%a, %d %b %Y %H:%M:%S +0900"),
+            "total": NEWS_TOTAL,
+            "start": start,
+            "display": len(items),
+            "items": items,
+        })
+
+    # 기사 원문 페이지 (title_extractor용)
+    @app.route("/articles/<int:story>", methods=["GET"])
+    def article_page(story: int):
+        injected = inject("article")
+        if injected:
+            return injected
+        outlet = request.args.get("outlet", "0")
+        html = (
+            "<html><head>"
+            f"<title>지역 콘텐츠 기업 지원 사업 {story}차 성과 공유 | 스텁일보{outlet}</title>"
+            f'<meta property="og:title" content="지역 콘텐츠 기업 지원 사업 {story}차 성과 공유">'
+            "</head><body><p>스텁 기사 본문</p></body></html>"
+        )
+        return Response(html, mimetype="text/html")
+
+    # Gemini
+    @app.route("/v1/models", methods=["GET"])
+    def gemini_models():
+        injected = inject("gemini")
+        if injected:
+            return injected
+        return jsonify({
+            "models": [
+                {"name": name, "supportedGenerationMethods": ["generateContent", "streamGenerateContent"]}
+                for name in STUB_MODELS
+            ]
+        })
+
+    @app.route("/v1/models/<path:target>", methods=["POST"])
+    def gemini_generate(target: str):
+        model, _, method = target.partition(":")
+        rate_limited_body = {
+            "error": {
+                "code": 429,
+                "status": "RESOURCE_EXHAUSTED",
+                "details": [{"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": f"{RETRY_AFTER_SECONDS}s"}],
+            }
+        }
+        injected = inject("gemini", rate_limited_body)
+        if injected:
+            return injected
+        if f"models/{model}" not in STUB_MODELS or method not in ("generateContent", "streamGenerateContent"):
+            return jsonify({"error": {"code": 404, "message": f"{target} not found"}}), 404
+
+        body = request.get_json(silent=True) or {}
+        parts = body.get("contents", [{}])[0].get("parts", [{}])
+        prompt = parts[0].get("text", "") if parts else ""
+        text = _gemini_text(prompt)
+
+        if method == "generateContent":
+            return jsonify({
+                "candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "finishReason": "STOP"}],
+                "usageMetadata": _usage(prompt, text),
+                "modelVersion": model,
+            })
+
+        chunks = [line + "\n" for line in text.split("\n")]
+
+        def stream():
+            for idx, chunk in enumerate(chunks):
+                data: Dict = {"candidates": [{"content": {"parts": [{"text": chunk}], "role": "model"}}]}
+                if idx == len(chunks) - 1:
+                    data["candidates"][0]["finishReason"] = "STOP"
+                    data["usageMetadata"] = _usage(prompt, text)
+                yield f"data: {json.dumps(data, ensure_ascii=False)}\r\n\r\n"
+                time.sleep(STREAM_CHUNK_DELAY)
+
+        return Response(stream(), mimetype="text/event-stream")
+
+    # Iconify
+    @app.route("/iconify/search", methods=["GET"])
+    def iconify_search():
+        injected = inject("iconify")
+        if injected:
+            return injected
+        query = request.args.get("query", "")
+        limit = max(1, min(int(request.args.get("limit", 64)), 999))
+        prefix, _, keyword = query.rpartition(":")
+        slug = re.sub(r"[^a-z0-9]+", "-", keyword.lower()).strip("-") or "icon"
+        icons = [f"{prefix or 'mdi'}:{slug}-{idx}" for idx in range(limit)]
+        return jsonify({"icons": icons, "total": len(icons), "limit": limit, "start": 0})
+
+    @app.route("/iconify/collection", methods=["GET"])
+    def iconify_collection_info():
+        injected = inject("iconify")
+        if injected:
+            return injected
+        prefix = request.args.get("prefix", "mdi")
+        categories = {
+            category: [f"{word}-{suffix}" for word in words for suffix in ("outline", "variant")] + list(words)
+            for category, words in ICON_VOCABULARY.items()
+        }
+        return jsonify({"prefix": prefix, "total": sum(len(n) for n in categories.values()), "categories": categories})
+
+    @app.route("/iconify/<prefix>.json", methods=["GET"])
+    def iconify_collection(prefix: str):
+        injected = inject("iconify")
+        if injected:
+            return injected
+        names = [name for name in request.args.get("icons", "").split(",") if name]
+        icons = {name: {"body": _icon_body(f"{prefix}:{name}")} for name in names}
+        return jsonify({"prefix": prefix, "icons": icons, "width": 24, "height": 24})
+
+    @app.route("/iconify/<path:name>.svg", methods=["GET"])
+    def iconify_svg(name: str):
+        injected = inject("iconify")
+        if injected:
+            return injected
+        return Response(_svg(name), mimetype="image/svg+xml")
+
+    # Slack
+    @app.route("/slack/api/<method>", methods=["POST"])
+    def slack_api(method: str):
+        injected = inject("slack", {"ok": False, "error": "ratelimited"})
+        if injected:
+            return injected
+        body = request.get_json(silent=True) or {}
+        count(f"slack.{method}")
+        return jsonify({
+            "ok": True,
+            "channel": body.get("channel", "C0STUB"),
+            "ts": body.get("ts") or f"{time.time():.6f}",
+        })
+
+    @app.route("/slack/webhook", methods=["POST"])
+    @app.route("/slack/response/<token>", methods=["POST"])
+    def slack_webhook(token: str = ""):
+        injected = inject("slack")
+        if injected:
+            return injected
+        return Response("ok", mimetype="text/plain")
+
+    return app
+
+
+def _parse_service_values(values: List[str], option: str) -> Dict[str, str]:
+    parsed = {}
+    for value in values or []:
+        service, sep, setting = value.partition("=")
+        if not sep or service not in SERVICES:
+            raise SystemExit(f"{option} 형식 오류: {value} (예: gemini=0.05, 서비스: {', '.join(SERVICES)})")
+        parsed[service] = setting
+    return parsed
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="Naver/Gemini/Iconify/Slack 스텁 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("STUB_PORT", 8900)))
+    parser.add_argument("--latency", action="append", help="서비스별 지연 시간 분포 (예: gemini=lognormal:2.0:0.5)")
+    parser.add_argument("--error-rate", action="append", help="서비스별 500 응답 비율 (예: gemini=0.02)")
+    parser.add_argument("--rate-limit", action="append", help="서비스별 429 응답 비율 (예: slack=0.1)")
+    args = parser.parse_args()
+
+    overrides: Dict[str, Dict[str, str]] = {service: {} for service in SERVICES}
+    for key, values, option in (
+        ("latency", args.latency, "--latency"),
+        ("error_rate", args.error_rate, "--error-rate"),
+        ("rate_limit", args.rate_limit, "--rate-limit"),
+    ):
+        for service, setting in _parse_service_values(values, option).items():
+            overrides[service][key] = setting
+
+    app = create_app(load_profiles(overrides))
+    for name, profile in app.config["PROFILES"].items():
+        print(f"[스텁 설정] {name}: {profile.to_dict()}")
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""SVG 최적화 모듈 - 다운로드한 아이콘 SVG를 의미 변화 없이 줄임
+
+- 주석, <metadata>, 편집기 전용 속성, 기본값과 같은 속성 제거
+- 참조되지 않는 id와 <defs> 항목 제거, 속성 없는 <g> 풀기
+- 좌표/크기 숫자의 소수점 자릿수 줄이기, path 데이터와 공백 압축
+
+결과는 원본 해시 기준으로 아이콘 캐시에 저장해 같은 아이콘은 한 번만 최적화합니다.
+"""
+import hashlib
+import os
+import re
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from icon_cache import IconCache, get_icon_cache
+
+
+SVG_NS = "http://www.w3.org/2000/svg"
+XLINK_NS = "http://www.w3.org/1999/xlink"
+DEFAULT_PRECISION = 3  # 소수점 아래 자릿수
+
+ET.register_namespace("", SVG_NS)
+ET.register_namespace("xlink", XLINK_NS)
+
+# 기본값과 같아서 지워도 되는 표현 속성
+DEFAULT_ATTRIBUTES = {
+    "opacity": "1",
+    "fill-opacity": "1",
+    "stroke-opacity": "1",
+    "fill-rule": "nonzero",
+    "clip-rule": "nonzero",
+    "stroke": "none",
+    "stroke-width": "1",
+    "stroke-linecap": "butt",
+    "stroke-linejoin": "miter",
+    "stroke-miterlimit": "4",
+    "stroke-dasharray": "none",
+    "stroke-dashoffset": "0",
+    "visibility": "visible",
+    "display": "inline",
+}
+# 렌더링에 영향이 없는 속성
+USELESS_ATTRIBUTES = {"version", "baseProfile", "enable-background", "{http://www.w3.org/XML/1998/namespace}space"}
+EDITOR_NAMESPACES = (
+    "http://www.inkscape.org/namespaces/inkscape",
+    "http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd",
+    "http://ns.adobe.com/",
+    "http://www.bohemiancoding.com/sketch/ns",
+)
+# 숫자(와 구분자)만 담는 속성 - 숫자 자릿수를 줄임
+NUMERIC_ATTRIBUTES = {
+    "x", "y", "x1", "y1", "x2", "y2", "cx", "cy", "r", "rx", "ry", "fx", "fy",
+    "width", "height", "stroke-width", "offset", "points", "viewBox", "transform",
+    "gradientTransform", "patternTransform",
+}
+TEXT_ELEMENTS = {"text", "tspan", "style", "script", "title", "desc"}
+
+_NUMBER_RE = re.compile(r"-?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?")
+_PATH_TOKEN_RE = re.compile(r"[A-DF-Za-df-z]|-?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?")
+_REFERENCE_RE = re.compile(r"url\(\s*['\"]?#([^)'\"\s]+)|^#(.+)$")
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+def _format_number(text: str, precision: int) -> str:
+    value = round(float(text), precision)
+    formatted = f"{value:.{precision}f}".rstrip("0").rstrip(".") if precision > 0 else str(int(value))
+    if formatted in ("-0", ""):
+        formatted = "0"
+    if formatted.startswith("0."):
+        formatted = formatted[1:]
+    elif formatted.startswith("-0."):
+        formatted = "-" + formatted[2:]
+    return formatted
+
+
+def _round_numbers(value: str, precision: int) -> str:
+    return _NUMBER_RE.sub(lambda m: _format_number(m.group(), precision), value)
+
+
+def _compact_path(d: str, precision: int) -> str:
+    """path 데이터의 숫자를 줄이고 불필요한 공백/구분자를 뺍니다."""
+    if re.search(r"[aA]", d):
+        # 호(arc) 플래그는 붙여 쓸 수 있어 토큰 경계가 모호하므로 숫자만 줄임
+        return re.sub(r"\s+", " ", _round_numbers(d, precision)).strip()
+    parts: List[str] = []
+    previous = ""
+    for token in _PATH_TOKEN_RE.findall(d):
+        if token[0].isalpha():
+            parts.append(token)
+        else:
+            token = _format_number(token, precision)
+            needs_separator = previous and not previous[0].isalpha() and not (
+                token.startswith("-") or (token.startswith(".") and ("." in previous or "e" in previous.lower()))
+            )
+            if needs_separator:
+                parts.append(" ")
+            parts.append(token)
+        previous = token
+    return "".join(parts)
+
+
+def _collect_references(root: ET.Element) -> set:
+    references = set()
+    for element in root.iter():
+        for value in element.attrib.values():
+            for match in _REFERENCE_RE.finditer(value.strip()):
+                references.add(match.group(1) or match.group(2))
+        if _local(element.tag) == "style" and element.text:
+            references.update(re.findall(r"#([\w-]+)", element.text))
+    return references
+
+
+def _clean_attributes(element: ET.Element, references: set, precision: int, inherited: frozenset) -> None:
+    for name in list(element.attrib):
+        value = element.attrib[name].strip()
+        local = _local(name)
+        namespace = name[1:].split("}", 1)[0] if name.startswith("{") else ""
+        if (
+            name in USELESS_ATTRIBUTES
+            or namespace.startswith(EDITOR_NAMESPACES)
+            # 조상이 같은 속성을 바꿨으면 기본값이라도 상속을 끊는 의미가 있으므로 유지
+            or (DEFAULT_ATTRIBUTES.get(name) == value and name not in inherited)
+            or (name == "id" and value not in references)
+        ):
+            del element.attrib[name]
+        elif name == "d":
+            element.attrib[name] = _compact_path(value, precision)
+        elif local in NUMERIC_ATTRIBUTES and name == local:
+            element.attrib[name] = re.sub(r"\s+", " ", _round_numbers(value, precision))
+        else:
+            element.attrib[name] = value
+
+
+def _simplify(parent: ET.Element, references: set, precision: int, inherited: frozenset) -> None:
+    inherited = inherited | {name for name in parent.attrib if name in DEFAULT_ATTRIBUTES}
+    index = 0
+    while index < len(parent):
+        child = parent[index]
+        local = _local(child.tag)
+        namespace = child.tag[1:].split("}", 1)[0] if child.tag.startswith("{") else ""
+        if local == "metadata" or namespace.startswith(EDITOR_NAMESPACES):
+            parent.remove(child)
+            continue
+        if local == "defs":
+            for item in list(child):
+                if item.get("id") not in references:
+                    child.remove(item)
+        _clean_attributes(child, references, precision, inherited)
+        _simplify(child, references, precision, inherited)
+        if local not in TEXT_ELEMENTS:
+            if child.text and not child.text.strip():
+                child.text = None
+            if child.tail and not child.tail.strip():
+                child.tail = None
+        if local in ("defs", "g") and len(child) == 0 and not (child.text or "").strip():
+            parent.remove(child)
+            continue
+        if local == "g" and not child.attrib:
+            # 속성 없는 그룹은 자식을 부모로 올림
+            parent.remove(child)
+            for offset, grandchild in enumerate(list(child)):
+                parent.insert(index + offset, grandchild)
+            continue
+        index += 1
+
+
+def optimize_svg(data: bytes, precision: int = DEFAULT_PRECISION) -> bytes:
+    """
+    SVG 문서를 줄입니다. 파싱할 수 없거나 더 작아지지 않으면 원본을 반환합니다.
+
+    Args:
+        data: SVG 바이너리 데이터
+        precision: 숫자의 소수점 아래 자릿수
+
+    Returns:
+        최적화된 SVG 바이너리 데이터
+    """
+    try:
+        root = ET.fromstring(data)
+    except ET.ParseError:
+        return data
+    if _local(root.tag) != "svg":
+        return data
+
+    references = _collect_references(root)
+    _clean_attributes(root, references, precision, frozenset())
+    _simplify(root, references, precision, frozenset())
+    if root.text and not root.text.strip():
+        root.text = None
+
+    # 속성 값 안의 ">"는 &gt;로 이스케이프되므로 " />"는 빈 요소의 끝에만 나옴
+    optimized = ET.tostring(root, encoding="unicode").replace(" />", "/>").encode("utf-8")
+    return optimized if len(optimized) < len(data) else data
+
+
+def optimize_svg_cached(
+    data: bytes,
+    cache: Optional[IconCache] = None,
+    precision: int = DEFAULT_PRECISION,
+) -> bytes:
+    """
+    원본 해시로 캐시를 먼저 확인하고, 없을 때만 optimize_svg를 실행해 저장합니다.
+
+    Args:
+        data: SVG 바이너리 데이터
+        cache: 아이콘 캐시 (기본값: 공유 캐시)
+        precision: 숫자의 소수점 아래 자릿수
+
+    Returns:
+        최적화된 SVG 바이너리 데이터
+    """
+    cache = cache or get_icon_cache()
+    source_hash = f"{hashlib.sha256(data).hexdigest()}:p{precision}"
+    cached = cache.get_optimized(source_hash)
+    if cached is not None:
+        return cached
+    optimized = optimize_svg(data, precision)
+    cache.put_optimized(source_hash, optimized)
+    return optimized
+
+
+def optimize_svgs(svgs: Iterable[Tuple[str, Optional[bytes]]]) -> Tuple[Dict[str, bytes], int, int]:
+    """
+    여러 SVG를 최적화하고 절감량을 계산합니다.
+
+    SVG_OPTIMIZE=0이면 최적화하지 않고, SVG_PRECISION으로 소수점 자릿수를 정합니다.
+
+    Args:
+        svgs: (키, SVG 데이터) 튜플의 이터러블. 데이터가 None이면 건너뜁니다.
+
+    Returns:
+        ({키: 최적화된 SVG 데이터}, 원본 바이트 합계, 최적화 후 바이트 합계)
+    """
+    enabled = os.getenv("SVG_OPTIMIZE", "1") != "0"
+    precision = int(os.getenv("SVG_PRECISION", DEFAULT_PRECISION))
+    results: Dict[str, bytes] = {}
+    before = after = 0
+    for key, data in svgs:
+        if not data:
+            continue
+        optimized = optimize_svg_cached(data, precision=precision) if enabled else data
+        results[key] = optimized
+        before += len(data)
+        after += len(optimized)
+    return results, before, after
@@ -1,7 +1,7 @@
 """카드뉴스 파서 테스트"""
 import unittest
 
-from card_parser import parse_card_script
+from card_parser import Card, CardParser, parse_card_script
 
 
 class TestCardParser(unittest.TestCase):
@@ -20,6 +20,21 @@ class TestCardParser(unittest.TestCase):
         self.assertEqual(cards[1]["type"], "program")
         self.assertEqual(cards[1]["body"], "프로그램 본문")
     
+    def test_parse_json_script(self):
+        """JSON 배열 형식 파싱 테스트 (type 포함)"""
+        script = """[
+  {"slide_number": 1, "type": "cover", "headline": "표지 제목", "description": "", "image_keyword": "award ceremony"},
+  {"slide_number": 2, "headline": "본문 제목", "description": "본문 내용", "image_keyword": "business meeting"}
+]"""
+        
+        cards = parse_card_script(script)
+        
+        self.assertEqual(len(cards), 2)
+        self.assertEqual(cards[0]["type"], "cover")
+        self.assertEqual(cards[0]["image_key"], "award ceremony")
+        self.assertEqual(cards[1]["type"], "")
+        self.assertEqual(cards[1]["body"], "본문 내용")
+    
     def test_parse_empty_script(self):
         """빈 스크립트 파싱 테스트"""
         cards = parse_card_script("")
@@ -30,6 +45,70 @@ class TestCardParser(unittest.TestCase):
         script = "이것은 유효하지 않은 형식입니다."
         cards = parse_card_script(script)
         self.assertEqual(len(cards), 0)
+    
+    def test_parse_fenced_json_script(self):
+        """마크다운 코드 블록으로 감싼 JSON 파싱 테스트"""
+        script = '```json\n[{"type": "cover", "headline": "표지", "image_keyword": "award"}]\n```'
+        
+        cards = parse_card_script(script)
+        
+        self.assertEqual(cards, [Card(type="cover", head="표지", image_key="award")])
+    
+    def test_card_record_access(self):
+        """Card가 기존 딕셔너리 방식 접근을 지원하는지 테스트"""
+        card = Card(type="program", head="제목", body="본문")
+        
+        self.assertEqual(card["head"], "제목")
+        self.assertEqual(card.get("image_key", ""), "")
+        self.assertIsNone(card.get("unknown"))
+        self.assertEqual(card.to_dict(), {"type": "program", "head": "제목", "body": "본문", "image_key": ""})
+        with self.assertRaises(AttributeError):
+            card.extra = "x"  # __slots__ 레코드
+
+
+class TestStreamingCardParser(unittest.TestCase):
+    """스트리밍 카드 파서 테스트 클래스"""
+    
+    def _feed_all(self, chunks):
+        """조각을 차례로 넣고 (조각 번호, 카드) 리스트를 반환합니다."""
+        parser = CardParser()
+        emitted = []
+        for chunk_idx, chunk in enumerate(chunks):
+            emitted.extend((chunk_idx, card) for card in parser.feed(chunk))
+        emitted.extend((len(chunks), card) for card in parser.close())
+        return emitted
+    
+    def test_text_cards_emitted_per_line(self):
+        """텍스트 형식은 줄이 끝나는 즉시 카드를 내보내는지 테스트"""
+        chunks = [
+            "1. TYPE=cover | HEAD=표지",
+            " | IMAGE_KEY=award\n2. TYPE=program | HE",
+            "AD=본문 제목 | BODY=본문 | IMAGE_KEY=meeting",
+        ]
+        emitted = self._feed_all(chunks)
+        
+        self.assertEqual([chunk_idx for chunk_idx, _ in emitted], [1, 3])
+        self.assertEqual(emitted[0][1]["head"], "표지")
+        self.assertEqual(emitted[1][1]["body"], "본문")
+    
+    def test_json_cards_emitted_per_object(self):
+        """JSON 형식은 카드 객체가 닫히는 즉시 카드를 내보내는지 테스트"""
+        script = (
+            '[{"type": "cover", "headline": "괄호 } 포함 \\"제목\\"", "image_keyword": "award"},'
+            ' {"headline": "둘째", "description": "본문"}]'
+        )
+        chunks = [script[i:i + 7] for i in range(0, len(script), 7)]
+        emitted = self._feed_all(chunks)
+        
+        self.assertEqual([card for _, card in emitted], parse_card_script(script))
+        self.assertLess(emitted[0][0], emitted[1][0])
+    
+    def test_fenced_json_stream(self):
+        """코드 블록으로 시작하는 JSON 스트림도 객체 단위로 내보내는지 테스트"""
+        chunks = ["``", "`json\n[{\"headline\": \"첫째\"},", " {\"headline\": \"둘째\"}]\n```"]
+        emitted = self._feed_all(chunks)
+        
+        self.assertEqual([(idx, card.head) for idx, card in emitted], [(1, "첫째"), (2, "둘째")])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,74 @@
+"""카드 PNG 렌더링 테스트"""
+import unittest
+
+import card_renderer
+from card_parser import Card
+from card_renderer import render_deck, render_decks, wrap_text
+
+
+def _measure(text):
+    """글자당 10픽셀로 계산하는 측정 함수"""
+    return len(text) * 10
+
+
+class TestWrapText(unittest.TestCase):
+    """줄바꿈 테스트 클래스 (Pillow 불필요)"""
+    
+    def test_wrap_words(self):
+        """단어 단위 줄바꿈 테스트"""
+        lines = wrap_text("충남 콘텐츠 진흥원 지원 사업 성과", 120, _measure, 5)
+        
+        self.assertEqual(lines, ["충남 콘텐츠 진흥원", "지원 사업 성과"])
+        self.assertTrue(all(_measure(line) <= 120 for line in lines))
+    
+    def test_wrap_long_word(self):
+        """공백 없는 긴 한글은 글자 단위로 나눔"""
+        lines = wrap_text("가나다라마바사아자차카타", 50, _measure, 5)
+        
+        self.assertEqual(lines, ["가나다라마", "바사아자차", "카타"])
+    
+    def test_wrap_newlines_and_ellipsis(self):
+        """줄바꿈 유지와 최대 줄 수 초과 시 말줄임 테스트"""
+        lines = wrap_text("첫째 줄\n둘째 줄\n셋째 줄", 100, _measure, 2)
+        
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0], "첫째 줄")
+        self.assertTrue(lines[1].endswith("…"))
+        self.assertLessEqual(_measure(lines[1]), 100)
+
+
+@unittest.skipUnless(card_renderer.is_available(), "Pillow가 설치되어 있지 않음")
+class TestCardRenderer(unittest.TestCase):
+    """카드 렌더링 테스트 클래스"""
+    
+    CARDS = [
+        Card(type="cover", head="2026 충남 콘텐츠 지원사업 성과 공유회", body=""),
+        Card(type="program", head="지원 프로그램", body="도내 기업 30개사를 대상으로 제작비와 멘토링을 지원했습니다."),
+        Card(type="closing", head="함께해 주셔서 감사합니다", body="내년에도 이어집니다."),
+    ]
+    
+    def test_render_deck(self):
+        """카드마다 1080x1080 PNG를 만드는지 테스트"""
+        from io import BytesIO
+        from PIL import Image
+        
+        pngs = render_deck(self.CARDS)
+        
+        self.assertEqual(len(pngs), 3)
+        for png in pngs:
+            self.assertTrue(png.startswith(b"\x89PNG"))
+            self.assertEqual(Image.open(BytesIO(png)).size, (card_renderer.CARD_SIZE, card_renderer.CARD_SIZE))
+        # 제목/본문이 실제로 그려졌는지 (빈 카드와 달라야 함)
+        self.assertNotEqual(pngs[1], render_deck([Card(type="program")])[0])
+    
+    def test_render_decks_matches_serial(self):
+        """프로세스 풀 렌더링 결과가 순서와 내용 모두 단일 프로세스와 같은지 테스트"""
+        decks = [(self.CARDS, None), (self.CARDS[1:], None)]
+        
+        parallel = render_decks(decks, max_workers=2)
+        
+        self.assertEqual(parallel, [render_deck(cards) for cards, _ in decks])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+"""크롤링 지표 수집 모듈 테스트"""
+import unittest
+
+from crawl_metrics import CrawlMetrics
+
+
+class TestCrawlMetrics(unittest.TestCase):
+    """크롤링 지표 테스트 클래스"""
+
+    def test_keyword_attribution(self):
+        """중복 기사는 먼저 찾은 키워드에 세고, 단계별로 남은 수를 키워드별로 세는지 테스트"""
+        metrics = CrawlMetrics()
+        first = [{"link": "a"}, {"link": "b"}, {"link": "c"}]
+        second = [{"link": "c"}, {"link": "d"}]
+        metrics.record_search("충콘진", first, calls=2)
+        metrics.record_search("김곡미", second, calls=3)
+
+        unique = first + second[1:]
+        metrics.record_unique(unique)
+        metrics.record_selected([first[0], second[1]])
+
+        result = metrics.to_dict()
+        self.assertEqual((result["raw"], result["unique"], result["dedup_dropped"], result["selected"]), (5, 4, 1, 2))
+        self.assertEqual(result["keywords"]["충콘진"], {"raw": 3, "unique": 3, "selected": 1, "calls": 2})
+        self.assertEqual(result["keywords"]["김곡미"], {"raw": 2, "unique": 1, "selected": 1, "calls": 3})
+        self.assertEqual(result["api_calls"], {"naver": 5})
+
+    def test_stage_timing(self):
+        """같은 단계는 여러 번 실행해도 소요 시간이 합산되는지 테스트"""
+        metrics = CrawlMetrics()
+        for _ in range(2):
+            with metrics.stage("titles"):
+                pass
+        with self.assertRaises(ValueError):
+            with metrics.stage("save"):
+                raise ValueError("저장 실패")
+        metrics.add_api_calls("gemini", 0)
+
+        result = metrics.to_dict()
+        self.assertEqual(set(result["stages"]), {"titles", "save"})
+        self.assertEqual(result["api_calls"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
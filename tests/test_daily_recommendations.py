@@ -0,0 +1,131 @@
+"""일일 추천 기사 저장소 테스트"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import daily_recommendations
+from daily_recommendations import RecommendationsStore, article_stable_id
+
+
+ARTICLES = [
+    {"title": "첫 번째 기사", "link": "https://example.com/1", "description": "설명 1"},
+    {"title": "두 번째 기사", "link": "https://example.com/2", "description": "설명 2"},
+]
+
+
+class TestRecommendationsStore(unittest.TestCase):
+    """추천 기사 저장소 테스트 클래스"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "daily_recommendations.json")
+        self.patcher = patch.object(daily_recommendations, "DAILY_RECOMMENDATIONS_FILE", self.path)
+        self.patcher.start()
+        self.store = RecommendationsStore(self.path, check_interval=0)
+    
+    def tearDown(self):
+        self.patcher.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_stable_id(self):
+        """같은 링크는 같은 ID, 다른 링크는 다른 ID인지 테스트"""
+        same = article_stable_id({"title": "제목만 바뀜", "link": "https://example.com/1"})
+        
+        self.assertEqual(article_stable_id(ARTICLES[0]), same)
+        self.assertNotEqual(article_stable_id(ARTICLES[0]), article_stable_id(ARTICLES[1]))
+        self.assertEqual(article_stable_id({"id": "fixed", "link": "x"}), "fixed")
+    
+    def test_save_assigns_ids(self):
+        """저장할 때 기사마다 고정 ID와 버전이 기록되는지 테스트"""
+        daily_recommendations.save_daily_recommendations([dict(a) for a in ARTICLES])
+        
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        self.assertTrue(data["version"])
+        self.assertEqual([a["id"] for a in data["articles"]], [article_stable_id(a) for a in ARTICLES])
+        self.assertFalse([name for name in os.listdir(self.temp_dir) if name.endswith(".tmp")])
+    
+    def test_get_by_id_survives_recrawl(self):
+        """다시 크롤링해 순서가 바뀌어도 ID로 같은 기사를 찾는지 테스트"""
+        daily_recommendations.save_daily_recommendations([dict(a) for a in ARTICLES])
+        second_id = article_stable_id(ARTICLES[1])
+        self.assertEqual(self.store.get(second_id)["title"], "두 번째 기사")
+        
+        new_article = {"title": "새 기사", "link": "https://example.com/3"}
+        daily_recommendations.save_daily_recommendations([new_article, dict(ARTICLES[1])])
+        
+        self.assertEqual(self.store.get(second_id)["title"], "두 번째 기사")
+        self.assertIsNone(self.store.get(article_stable_id(ARTICLES[0])))
+        self.assertEqual(self.store.articles()[0]["title"], "새 기사")
+    
+    def test_reload_only_when_changed(self):
+        """파일이 바뀌지 않으면 다시 읽지 않는지 테스트"""
+        daily_recommendations.save_daily_recommendations([dict(a) for a in ARTICLES])
+        self.store.articles()
+        
+        with patch("builtins.open", side_effect=AssertionError("파일을 다시 읽음")):
+            self.assertEqual(len(self.store.articles()), 2)
+            self.store.get(article_stable_id(ARTICLES[0]))
+    
+    def test_signature_changes_on_save(self):
+        """다시 저장하면 시그니처가 바뀌는지 테스트 (화면 캐시 키)"""
+        self.assertEqual(self.store.signature(), ())
+        daily_recommendations.save_daily_recommendations([dict(a) for a in ARTICLES])
+        first = self.store.signature()
+        self.assertEqual(self.store.signature(), first)
+    
+        daily_recommendations.save_daily_recommendations([dict(ARTICLES[0])])
+        self.assertNotEqual(self.store.signature(), first)
+    
+    def test_legacy_file_without_ids(self):
+        """id가 없는 예전 파일도 ID로 찾을 수 있는지 테스트"""
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"date": "2026-01-01", "articles": ARTICLES}, f, ensure_ascii=False)
+        
+        self.assertEqual(self.store.get(article_stable_id(ARTICLES[0]))["link"], "https://example.com/1")
+        self.assertEqual(self.store.date(), "2026-01-01")
+        self.assertIsNone(self.store.version())
+    
+    def test_missing_file(self):
+        """파일이 없으면 빈 목록을 반환하는지 테스트"""
+        self.assertEqual(self.store.articles(), [])
+        self.assertIsNone(self.store.get("anything"))
+
+
+class TestSlackArticleLookup(unittest.TestCase):
+    """Slack 버튼의 기사 찾기 테스트"""
+    
+    def setUp(self):
+        import slack_app
+        self.slack_app = slack_app
+        articles = [dict(a, id=article_stable_id(a)) for a in ARTICLES]
+        self.patcher = patch.object(slack_app.recommendations, "articles", return_value=articles)
+        self.patcher.start()
+        self.id_patcher = patch.object(
+            slack_app.recommendations, "get", side_effect={a["id"]: a for a in articles}.get
+        )
+        self.id_patcher.start()
+    
+    def tearDown(self):
+        self.patcher.stop()
+        self.id_patcher.stop()
+    
+    def test_stable_id_button(self):
+        """고정 ID를 담은 버튼은 ID로 찾는지 테스트"""
+        action = {"action_id": "create_cardnews_1", "value": f"id:{article_stable_id(ARTICLES[1])}"}
+        
+        self.assertEqual(self.slack_app._resolve_article(action)["title"], "두 번째 기사")
+        self.assertIsNone(self.slack_app._resolve_article({"action_id": "create_cardnews_1", "value": "id:gone"}))
+    
+    def test_legacy_index_button(self):
+        """예전 순번 버튼도 현재 목록의 순번으로 찾는지 테스트"""
+        self.assertEqual(self.slack_app._resolve_article({"action_id": "create_cardnews_2", "value": "2"})["title"], "두 번째 기사")
+        self.assertEqual(self.slack_app._resolve_article({"action_id": "view_summary_1"})["title"], "첫 번째 기사")
+        self.assertIsNone(self.slack_app._resolve_article({"action_id": "view_summary_9", "value": "9"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+"""Gemini API 모듈 테스트"""
+import json
+import unittest
+from unittest.mock import patch
+
+from gemini_api import _pack_batches, summarize_batch_with_gemini
+from prompt_builder import build_batch_prompt, estimate_tokens
+
+
+class TestBatchSummarize(unittest.TestCase):
+    """일괄 요약 테스트 클래스"""
+    
+    def setUp(self):
+        """테스트 전 설정"""
+        self.articles = [
+            {"id": f"https://news.example.com/{idx}", "title": f"제목 {idx}", "content": "본문 " * 50}
+            for idx in range(1, 6)
+        ]
+    
+    def test_pack_batches_respects_limits(self):
+        """토큰 예산과 최대 기사 수에 맞춰 묶는지 테스트"""
+        batches = _pack_batches(self.articles, token_budget=100000, max_articles=2)
+        self.assertEqual([len(b) for b in batches], [2, 2, 1])
+        
+        batches = _pack_batches(self.articles, token_budget=1, max_articles=10)
+        self.assertEqual(len(batches), 5)
+    
+    @patch("gemini_api._generate_contents")
+    def test_missing_ids_fall_back_to_single_calls(self, mock_generate):
+        """응답에 빠진 기사는 개별 요약으로 보완하는지 테스트"""
+        mock_generate.side_effect = [
+            ["```json\n" + json.dumps({"A1": "요약 1", "A2": "요약 2"}) + "\n```"],
+            ["개별 요약"],
+        ]
+        
+        result = summarize_batch_with_gemini(self.articles[:3], token_budget=100000, max_articles=10)
+        
+        self.assertEqual(mock_generate.call_count, 2)
+        self.assertEqual(len(mock_generate.call_args_list[0].args[0]), 1)
+        self.assertEqual(len(mock_generate.call_args_list[1].args[0]), 1)
+        self.assertEqual(result[self.articles[0]["id"]], "요약 1")
+        self.assertEqual(result[self.articles[1]["id"]], "요약 2")
+        self.assertEqual(result[self.articles[2]["id"]], "개별 요약")
+        # 입력 토큰은 고정 템플릿 토큰으로 추정 (프롬프트 전체를 다시 세지 않음)
+        batch_prompt, _ = build_batch_prompt(self.articles[:3])
+        batch_tokens = mock_generate.call_args_list[0].args[1][0]
+        self.assertAlmostEqual(batch_tokens, estimate_tokens(batch_prompt), delta=20)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""Gemini 비동기 클라이언트 테스트"""
+import asyncio
+import os
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from gemini_client import AsyncGeminiClient, TokenBucket, _parse_retry_after
+from model_router import ModelRouter
+
+
+def _response(status_code, body=None, headers=None, text=""):
+    """테스트용 HTTP 응답 객체를 만듭니다."""
+    resp = MagicMock()
+    resp.status_code = status_code
+    resp.headers = headers or {}
+    resp.text = text
+    resp.json.return_value = body or {}
+    return resp
+
+
+class TestRateLimiting(unittest.TestCase):
+    """토큰 버킷 및 Retry-After 파싱 테스트 클래스"""
+    
+    def test_token_bucket_reserve(self):
+        """용량을 넘는 예약은 대기 시간을 반환하는지 테스트"""
+        bucket = TokenBucket(60)  # 초당 1개 충전
+        self.assertEqual(bucket.reserve(60), 0.0)
+        self.assertAlmostEqual(bucket.reserve(2), 2.0, places=1)
+    
+    def test_parse_retry_after(self):
+        """Retry-After 헤더와 retryDelay 본문 파싱 테스트"""
+        self.assertEqual(_parse_retry_after(_response(429, headers={"Retry-After": "7"})), 7.0)
+        body = '{"error": {"details": [{"retryDelay": "17s"}]}}'
+        self.assertEqual(_parse_retry_after(_response(429, text=body)), 17.0)
+        self.assertIsNone(_parse_retry_after(_response(429)))
+
+
+class TestAsyncGeminiClient(unittest.TestCase):
+    """비동기 클라이언트 재시도 테스트 클래스"""
+    
+    @patch.dict(os.environ, {"GEMINI_API_KEY": "test-key"})
+    @patch("gemini_client.asyncio.sleep")
+    def test_retries_after_429(self, mock_sleep):
+        """429 응답 후 Retry-After만큼 대기하고 재시도하는지 테스트"""
+        async def no_sleep(seconds):
+            return None
+        mock_sleep.side_effect = no_sleep
+        
+        client = AsyncGeminiClient("http://stub", max_retries=3)
+        ok_body = {"candidates": [{"content": {"parts": [{"text": "ok"}]}}]}
+        client._session.post = MagicMock(side_effect=[
+            _response(429, headers={"Retry-After": "3"}),
+            _response(200, body=ok_body),
+        ])
+        
+        result = client.generate_sync("models/test", {"contents": []})
+        
+        self.assertEqual(result, ok_body)
+        self.assertEqual(client._session.post.call_count, 2)
+        self.assertIn(3.0, [call.args[0] for call in mock_sleep.call_args_list])
+        # 429는 실패로, 재시도 대기는 지연 시간에 넣지 않고 기록
+        stats = client.router.snapshot()["generate:models/test"]
+        self.assertEqual((stats["calls"], stats["error_rate"]), (2, 0.5))
+        self.assertLess(stats["p95"], 1.0)
+    
+    @patch.dict(os.environ, {"GEMINI_API_KEY": "test-key"})
+    @patch("gemini_client.asyncio.sleep")
+    def test_non_json_body_is_retried(self, mock_sleep):
+        """JSON이 아닌 200 응답은 예외 대신 재시도 후 None을 반환하는지 테스트"""
+        async def no_sleep(seconds):
+            return None
+        mock_sleep.side_effect = no_sleep
+        
+        client = AsyncGeminiClient("http://stub", max_retries=2)
+        html_page = _response(200, text="<html>Bad Gateway</html>")
+        html_page.json.side_effect = ValueError("Expecting value")
+        client._session.post = MagicMock(return_value=html_page)
+        
+        self.assertIsNone(client.generate_sync("models/test", {"contents": []}))
+        self.assertEqual(client._session.post.call_count, 2)
+
+
+class TestHedging(unittest.TestCase):
+    """헤지 요청 및 모델 폴백 테스트 클래스"""
+    
+    def setUp(self):
+        """테스트 전 설정"""
+        self.router = ModelRouter(default_hedge_delay=0.05)
+        self.client = AsyncGeminiClient("http://stub", router=self.router)
+    
+    def test_slow_primary_is_hedged(self):
+        """첫 모델이 느리면 다음 모델 응답을 사용하는지 테스트"""
+        async def fake_generate(model_name, payload, timeout, estimated_tokens):
+            await asyncio.sleep(2 if model_name == "models/slow" else 0.01)
+            return {"model": model_name}
+        self.client._generate = fake_generate
+        
+        started = time.monotonic()
+        result = self.client.generate_sync(["models/slow", "models/fast"], {"contents": []})
+        
+        self.assertEqual(result, {"model": "models/fast"})
+        self.assertLess(time.monotonic() - started, 1)
+    
+    def test_failed_primary_falls_back(self):
+        """첫 모델이 실패하면 다음 모델로 넘어가는지 테스트"""
+        async def fake_post(url, api_key, payload, timeout):
+            if "models/broken" in url:
+                return _response(400, text="bad request")
+            return _response(200, body={"model": url})
+        self.client._post = fake_post
+        
+        with patch.dict(os.environ, {"GEMINI_API_KEY": "test-key"}):
+            result = self.client.generate_sync(["models/broken", "models/ok"], {"contents": []})
+        
+        self.assertEqual(result, {"model": "http://stub/models/ok:generateContent"})
+        self.assertEqual(self.router.snapshot()["generate:models/broken"]["error_rate"], 1.0)
+    
+    def test_stream_uses_first_responding_model(self):
+        """스트리밍에서 첫 조각을 먼저 보낸 모델의 스트림을 사용하는지 테스트"""
+        def fake_stream(model_name, payload, timeout, estimated_tokens, on_usage=None):
+            if model_name == "models/slow":
+                time.sleep(2)
+            yield f"{model_name}-1"
+            yield f"{model_name}-2"
+        self.client._stream_model = fake_stream
+        
+        chunks = list(self.client.stream_sync(["models/slow", "models/fast"], {"contents": []}))
+        
+        self.assertEqual(chunks, ["models/fast-1", "models/fast-2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""생성 관리 모듈 테스트"""
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import generation_manager
+from single_flight import SingleFlight
+
+
+class TestGetOrCreateScript(unittest.TestCase):
+    """카드뉴스 문구 생성 병합 테스트 클래스"""
+
+    def setUp(self):
+        """테스트 전 설정"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        flight = SingleFlight(db_path=os.path.join(self.tmpdir.name, "leases.sqlite3"))
+        self.patchers = [
+            patch.object(generation_manager, "get_single_flight", return_value=flight),
+            patch.object(generation_manager, "get_cached_script", return_value=None),
+            patch.object(generation_manager, "save_cached_script"),
+            patch.object(generation_manager, "get_similarity_index", return_value=MagicMock()),
+            patch.object(generation_manager, "parse_card_script", return_value=[]),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        """테스트 후 정리"""
+        for patcher in self.patchers:
+            patcher.stop()
+        self.tmpdir.cleanup()
+
+    def test_force_does_not_join_running_generation(self):
+        """새로 생성(force)은 진행 중인 일반 생성 결과를 받지 않고 직접 생성하는지 테스트"""
+        def slow_reuse(*args, **kwargs):
+            time.sleep(0.3)
+            return ("source", "재사용 문구", 0.95)
+
+        results = {}
+        with patch.object(generation_manager, "_find_reusable", side_effect=slow_reuse), \
+                patch.object(generation_manager, "stream_cardnews_with_gemini", return_value="새 문구"):
+            normal = threading.Thread(
+                target=lambda: results.update(normal=generation_manager.get_or_create_script("a", "본문", "제목"))
+            )
+            normal.start()
+            time.sleep(0.1)
+            results["force"] = generation_manager.get_or_create_script("a", "본문", "제목", force=True)
+            normal.join()
+
+        self.assertEqual(results, {"normal": "재사용 문구", "force": "새 문구"})
+
+
+if __name__ == "__main__":
+    unittest.main()
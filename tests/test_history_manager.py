@@ -0,0 +1,182 @@
+"""크롤링 기록 관리 모듈 테스트"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import history_manager
+
+
+class TestHistoryManager(unittest.TestCase):
+    """JSON Lines 기록 파일 테스트 클래스"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.temp_dir, "history.jsonl")
+        self.legacy_path = os.path.join(self.temp_dir, "history.json")
+        self.rollup_path = os.path.join(self.temp_dir, "crawl_rollups.json")
+        self.patchers = [
+            patch.object(history_manager, "HISTORY_LOG", self.log_path),
+            patch.object(history_manager, "HISTORY_FILE", self.legacy_path),
+            patch.object(history_manager, "ROLLUP_FILE", self.rollup_path),
+            patch.object(history_manager, "TAIL_BLOCK_SIZE", 64),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _lines(self, path=None):
+        with open(path or self.log_path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def test_append_only(self):
+        """기록마다 한 줄씩 덧붙이고 종류별로 최신순 조회되는지 테스트"""
+        for i in range(5):
+            history_manager.add_crawl_history(f"키워드 {i}", i)
+        history_manager.add_deployment_history("배포한 기사")
+
+        self.assertEqual(len(self._lines()), 6)
+        crawls = history_manager.get_crawl_history(limit=3)
+        self.assertEqual([c["keyword"] for c in crawls], ["키워드 4", "키워드 3", "키워드 2"])
+        self.assertNotIn("type", crawls[0])
+        self.assertEqual(history_manager.get_deployment_history()[0]["article_title"], "배포한 기사")
+
+    def test_tail_reads_only_the_end(self):
+        """최근 기록만 필요하면 파일 앞부분은 읽지 않는지 테스트"""
+        for i in range(200):
+            history_manager.add_crawl_history(f"키워드 {i}", i)
+
+        reads = []
+        real_open = open
+
+        def tracking_open(*args, **kwargs):
+            f = real_open(*args, **kwargs)
+            real_read = f.read
+            f.read = lambda size=-1: reads.append(size) or real_read(size)
+            return f
+
+        with patch("builtins.open", tracking_open):
+            self.assertEqual(history_manager.get_crawl_history(limit=1)[0]["keyword"], "키워드 199")
+        self.assertLess(sum(reads), os.path.getsize(self.log_path) // 10)
+
+    def test_torn_line_skipped(self):
+        """쓰다 끊긴 줄은 건너뛰고 다음 기록은 새 줄에 쓰는지 테스트"""
+        history_manager.add_crawl_history("첫 번째", 1)
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write('{"type": "crawl", "keyw')
+        history_manager.add_crawl_history("두 번째", 2)
+
+        self.assertEqual([c["keyword"] for c in history_manager.get_crawl_history()], ["두 번째", "첫 번째"])
+
+    def test_compaction_rotates_old_records(self):
+        """크기를 넘으면 최근 기록만 남기고 나머지는 이전 파일로 옮기는지 테스트"""
+        with patch.object(history_manager, "MAX_BYTES", 2000), patch.object(history_manager, "KEEP_PER_TYPE", 5):
+            history_manager.add_deployment_history("배포")
+            for i in range(40):
+                history_manager.add_crawl_history(f"키워드 {i}", i)
+
+            self.assertLessEqual(os.path.getsize(self.log_path), 2000)
+            self.assertTrue(os.path.exists(f"{self.log_path}.1"))
+            # 현재 파일에 모자란 기록은 이전 파일에서 이어서 읽음
+            crawls = history_manager.get_crawl_history(limit=12)
+            self.assertEqual([c["keyword"] for c in crawls], [f"키워드 {i}" for i in range(39, 27, -1)])
+            self.assertEqual(history_manager.get_deployment_history()[0]["article_title"], "배포")
+
+    def test_compaction_keeps_backup_count(self):
+        """이전 파일은 HISTORY_BACKUPS개까지만 남는지 테스트"""
+        with patch.object(history_manager, "BACKUPS", 2), patch.object(history_manager, "KEEP_PER_TYPE", 1):
+            for round_index in range(4):
+                history_manager.add_crawl_history(f"키워드 {round_index}a", 0)
+                history_manager.add_crawl_history(f"키워드 {round_index}b", 0)
+                self.assertGreater(history_manager.compact_history(), 0)
+
+        self.assertTrue(os.path.exists(f"{self.log_path}.2"))
+        self.assertFalse(os.path.exists(f"{self.log_path}.3"))
+        # 현재 파일 1개 + 이전 파일 2개(각 2개)만 남고 가장 오래된 기록은 버려짐
+        self.assertEqual(
+            [c["keyword"] for c in history_manager.get_crawl_history()],
+            ["키워드 3b", "키워드 3a", "키워드 2b", "키워드 2a", "키워드 1b"],
+        )
+
+    def test_legacy_migration(self):
+        """예전 history.json의 crawls/deployments를 한 번만 옮기는지 테스트"""
+        legacy = {
+            "crawls": [{"date": "2025-01-01", "keyword": "예전", "article_count": 3, "timestamp": "2025-01-01T09:00:00"}],
+            "deployments": [{"date": "2025-01-02", "article_title": "예전 배포", "timestamp": "2025-01-02T10:00:00"}],
+        }
+        with open(self.legacy_path, "w", encoding="utf-8") as f:
+            json.dump(legacy, f, ensure_ascii=False)
+
+        self.assertEqual(history_manager.get_crawl_history(), legacy["crawls"])
+        self.assertEqual(history_manager.get_deployment_history(), legacy["deployments"])
+        self.assertFalse(os.path.exists(self.legacy_path))
+
+        # 저장소에서 예전 파일이 다시 받아져도 중복으로 옮기지 않음
+        with open(self.legacy_path, "w", encoding="utf-8") as f:
+            json.dump(legacy, f, ensure_ascii=False)
+        history_manager.add_crawl_history("새 기록", 1)
+        self.assertEqual([c["keyword"] for c in history_manager.get_crawl_history()], ["새 기록", "예전"])
+
+
+    def test_daily_rollups(self):
+        """크롤링 지표가 날짜별로 합산되고 키워드별 효율이 계산되는지 테스트"""
+        metrics = {
+            "raw": 120, "unique": 40, "dedup_dropped": 80, "selected": 30,
+            "stages": {"search": 2.5, "dedupe": 0.25},
+            "api_calls": {"naver": 4},
+            "keywords": {
+                "충콘진": {"raw": 100, "unique": 35, "selected": 28, "calls": 2},
+                "김곡미": {"raw": 20, "unique": 5, "selected": 2, "calls": 2},
+            },
+        }
+        history_manager.add_crawl_history("일일 자동 크롤링", 30, metrics=metrics)
+        history_manager.add_crawl_history("일일 자동 크롤링", 30, metrics=metrics)
+
+        days = history_manager.get_daily_rollups(7)
+        self.assertEqual(len(days), 1)
+        self.assertEqual(days[0]["crawls"], 2)
+        self.assertEqual(days[0]["dedup_dropped"], 160)
+        self.assertEqual(days[0]["stages"]["search"], 5.0)
+        self.assertEqual(days[0]["api_calls"]["naver"], 8)
+        self.assertEqual(days[0]["last_crawl"], history_manager.get_last_crawl_time())
+
+        totals = history_manager.get_keyword_totals(7)
+        self.assertEqual([row["keyword"] for row in totals], ["충콘진", "김곡미"])
+        self.assertEqual(totals[0]["selected_per_call"], 14.0)
+        self.assertEqual(history_manager.get_crawl_history()[0]["metrics"]["raw"], 120)
+
+    def test_rollups_read_without_history_log(self):
+        """마지막 크롤링 시각과 추세는 기록 파일을 읽지 않고 합계 파일에서 읽는지 테스트"""
+        for i in range(50):
+            history_manager.add_crawl_history("일일 자동 크롤링", i)
+
+        real_open = open
+
+        def guarded_open(path, *args, **kwargs):
+            if str(path).startswith(self.log_path):
+                raise AssertionError("기록 파일을 읽음")
+            return real_open(path, *args, **kwargs)
+
+        with patch.object(history_manager, "_rollup_memo", (None, None)), patch("builtins.open", guarded_open):
+            self.assertTrue(history_manager.get_last_crawl_time())
+            self.assertEqual(history_manager.get_daily_rollups(30)[0]["articles"], sum(range(50)))
+
+    def test_rollups_rebuilt_from_log(self):
+        """합계 파일이 없으면 기록 파일에서 다시 만드는지 테스트"""
+        history_manager.add_crawl_history("일일 자동 크롤링", 3, metrics={"raw": 10, "unique": 4})
+        history_manager.add_deployment_history("배포")
+        os.remove(self.rollup_path)
+
+        days = history_manager.get_daily_rollups(1)
+        self.assertEqual((days[0]["crawls"], days[0]["raw"], days[0]["unique"]), (1, 10, 4))
+        self.assertTrue(os.path.exists(self.rollup_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""아이콘 캐시 테스트"""
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import image_prep
+from icon_cache import IconCache
+
+
+class TestIconCache(unittest.TestCase):
+    """아이콘 검색 결과/SVG 캐시 테스트 클래스"""
+    
+    def setUp(self):
+        """테스트 전 설정"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = IconCache(cache_dir=self.temp_dir, search_ttl=60, max_bytes=1000)
+    
+    def tearDown(self):
+        """테스트 후 정리"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_search_ttl(self):
+        """검색 결과가 TTL 동안만 유효한지 테스트"""
+        self.cache.put_search("iconify", "award", 3, ["mdi:trophy", "mdi:medal"])
+        
+        self.assertEqual(self.cache.get_search("iconify", "award", 3), ["mdi:trophy", "mdi:medal"])
+        self.assertIsNone(self.cache.get_search("iconify", "award", 5))
+        self.assertIsNone(self.cache.get_search("material", "award", 3))
+        
+        with patch("icon_cache.time.time", return_value=time.time() + 120):
+            self.assertIsNone(self.cache.get_search("iconify", "award", 3))
+    
+    def test_svg_content_addressed(self):
+        """같은 내용의 SVG는 URL이 달라도 파일 하나로 저장되는지 테스트"""
+        svg = b"<svg>trophy</svg>"
+        digest_a = self.cache.put_svg("http://stub/a.svg", svg)
+        digest_b = self.cache.put_svg("http://stub/b.svg", svg)
+        
+        self.assertEqual(digest_a, digest_b)
+        self.assertEqual(self.cache.get_svg("http://stub/b.svg"), svg)
+        self.assertIsNone(self.cache.get_svg("http://stub/c.svg"))
+        self.assertEqual(self.cache.stats()["blobs"], 1)
+        self.assertEqual(self.cache.stats()["urls"], 2)
+    
+    def test_eviction_removes_least_recently_used(self):
+        """최대 크기를 넘으면 오래 쓰지 않은 SVG부터 지우는지 테스트"""
+        for name in ["a", "b", "c"]:
+            self.cache.put_svg(f"http://stub/{name}.svg", name.encode("utf-8") * 400)
+            time.sleep(0.01)
+        
+        stats = self.cache.stats()
+        self.assertLessEqual(stats["bytes"], 1000)
+        self.assertIsNone(self.cache.get_svg("http://stub/a.svg"))
+        self.assertEqual(self.cache.get_svg("http://stub/c.svg"), b"c" * 400)
+    
+    def test_repeat_deck_without_network(self):
+        """같은 카드뉴스를 다시 준비할 때 네트워크 요청이 없는지 테스트"""
+        def fake_get(url, params=None, timeout=None):
+            resp = MagicMock(status_code=200, content=f"<svg>{url}</svg>".encode("utf-8"))
+            if params:  # 검색 요청
+                resp.json.return_value = {"icons": [f"material-symbols:{params['query'].split(':')[-1]}", "mdi:star"]}
+            return resp
+        
+        cards = [{"type": "cover", "head": "표지", "image_key": "award"}]
+        self.cache.max_bytes = 10 ** 6
+        with patch("image_prep.get_icon_cache", return_value=self.cache), \
+                patch("svg_optimizer.get_icon_cache", return_value=self.cache), \
+                patch("image_prep.requests.get", side_effect=fake_get) as mock_get:
+            first = image_prep.prepare_deck_images(cards)
+            calls = mock_get.call_count
+            second = image_prep.prepare_deck_images(cards)
+        
+        self.assertGreater(calls, 0)
+        self.assertEqual(mock_get.call_count, calls)
+        self.assertEqual(first, second)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""로컬 아이콘 색인 테스트"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import image_prep
+from icon_index import IconIndex, build_index, tokenize
+
+
+COLLECTIONS = {
+    # Iconify API /collection 응답 형식
+    "mdi": {
+        "prefix": "mdi",
+        "categories": {
+            "Account / User": ["account-group", "account-tie"],
+            "Sport": ["trophy", "trophy-outline", "medal"],
+        },
+        "uncategorized": ["handshake", "office-building-outline"],
+        "aliases": {"award": "trophy"},
+        "hidden": ["trophy-broken"],
+    },
+    # @iconify/json 아이콘 세트 형식
+    "material-symbols": {
+        "prefix": "material-symbols",
+        "icons": {"trophy": {"body": ""}, "groups": {"body": ""}, "handshake-outline": {"body": ""}},
+        "aliases": {"award-star": {"parent": "trophy"}},
+    },
+}
+
+
+class TestIconIndex(unittest.TestCase):
+    """아이콘 역색인 생성/검색 테스트 클래스"""
+    
+    def setUp(self):
+        """테스트 전 설정"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "icon_index.bin")
+        self.icon_count, _ = build_index(COLLECTIONS, self.path)
+        self.index = IconIndex(self.path)
+    
+    def tearDown(self):
+        """테스트 후 정리"""
+        self.index.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_tokenize(self):
+        """이름/검색어를 소문자 토큰으로 나누는지 테스트"""
+        self.assertEqual(tokenize("Account / User"), ["account", "user"])
+        self.assertEqual(tokenize("business-meeting meeting"), ["business", "meeting"])
+    
+    def test_ranking(self):
+        """이름 일치 > 별칭 일치, 같은 점수는 짧은 이름 우선인지 테스트"""
+        self.assertEqual(self.icon_count, 10)  # 숨김 아이콘 제외
+        self.assertEqual(self.index.search("trophy", limit=3), ["mdi:trophy", "mdi:trophy-outline", "material-symbols:trophy"])
+        self.assertEqual(self.index.search("award", limit=2), ["mdi:trophy", "material-symbols:trophy"])
+        self.assertEqual(self.index.search("sport")[0], "mdi:medal")
+    
+    def test_prefix_and_partial_match(self):
+        """컬렉션 제한과 토큰 앞부분 일치 검색 테스트"""
+        self.assertEqual(self.index.search("hand", limit=5, prefix="material-symbols"), ["material-symbols:handshake-outline"])
+        self.assertEqual(self.index.search("office building")[0], "mdi:office-building-outline")
+        self.assertEqual(self.index.search("zz"), [])
+    
+    def test_image_prep_uses_local_index(self):
+        """색인이 있으면 네트워크 없이 아이콘을 검색하는지 테스트"""
+        env = {"ICON_INDEX_PATH": self.path, "ICON_REMOTE_SEARCH": "0"}
+        with patch.dict(os.environ, env), patch("image_prep.requests.get") as mock_get:
+            iconify = image_prep.search_iconify_icons("medal", limit=1)
+            material = image_prep.search_material_icons("groups", limit=3)
+            missing = image_prep.search_iconify_icons("unknownword")
+        
+        mock_get.assert_not_called()
+        self.assertEqual([icon["name"] for icon in iconify], ["mdi:medal"])
+        self.assertEqual([icon["name"] for icon in material], ["material-symbols:groups"])
+        self.assertEqual(missing, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+"""이미지 자료 준비 모듈 테스트"""
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import image_prep
+from icon_cache import IconCache
+from image_prep import prepare_card_images, prepare_deck_images, render_iconify_svg
+
+
+def _fake_search(prefix):
+    """검색어마다 아이콘 2개를 돌려주는 가짜 검색 함수를 만듭니다."""
+    def search(query, limit=3):
+        time.sleep(0.05)
+        return [
+            {"name": f"{prefix}:{query}-{i}", "url": f"http://stub/{prefix}/{query}-{i}.svg"}
+            for i in range(2)
+        ]
+    return search
+
+
+class TestPrepareDeckImages(unittest.TestCase):
+    """카드뉴스 한 벌 이미지 자료 준비 테스트 클래스"""
+    
+    def setUp(self):
+        """테스트 전 설정"""
+        self.downloaded = []
+        self.lock = threading.Lock()
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, True)
+        
+        def fake_download(url, max_retries=2):
+            time.sleep(0.05)
+            with self.lock:
+                self.downloaded.append(url)
+            return f"<svg>{url}</svg>".encode("utf-8")
+        
+        patchers = [
+            patch("image_prep.search_iconify_icons", side_effect=_fake_search("iconify")),
+            patch("image_prep.search_material_icons", side_effect=_fake_search("material-symbols")),
+            patch("image_prep.download_svg", side_effect=fake_download),
+            patch("image_prep.get_icon_cache", return_value=IconCache(cache_dir=self.temp_dir)),
+            patch.dict("os.environ", {"SVG_OPTIMIZE": "0"}),
+        ]
+        self.mock_iconify, self.mock_material = [p.start() for p in patchers][:2]
+        for p in patchers:
+            self.addCleanup(p.stop)
+    
+    def test_results_in_card_order_with_dedup(self):
+        """같은 검색어/URL은 한 번만 요청하고 결과는 카드 순서대로 반환하는지 테스트"""
+        cards = [
+            {"type": "cover", "head": "표지", "image_key": "award trophy"},
+            {"type": "program", "head": "본문", "image_key": "meeting"},
+            {"type": "program", "head": "본문2", "image_key": "award, ceremony"},
+            {"type": "closing", "head": "마무리", "image_key": ""},
+        ]
+        
+        deck = prepare_deck_images(cards)
+        
+        self.assertEqual(len(deck), 4)
+        self.assertEqual(self.mock_iconify.call_count, 2)  # award, meeting
+        self.assertEqual(len(self.downloaded), len(set(self.downloaded)))
+        self.assertEqual(len(self.downloaded), 8)
+        self.assertEqual([icon["name"] for icon in deck[1]["iconify_icons"]], ["iconify:meeting-0", "iconify:meeting-1"])
+        self.assertEqual(deck[0]["iconify_downloaded"], deck[2]["iconify_downloaded"])
+        self.assertEqual(deck[3]["material_downloaded"], [])
+        self.assertIn("마무리", deck[3]["prompt"])
+    
+    def test_requests_run_concurrently(self):
+        """카드 수와 관계없이 검색 한 번 + 다운로드 한 번 정도의 시간에 끝나는지 테스트"""
+        cards = [{"type": "program", "head": f"카드 {i}", "image_key": f"keyword{i}"} for i in range(8)]
+        
+        started = time.monotonic()
+        deck = prepare_deck_images(cards, max_workers=64)
+        elapsed = time.monotonic() - started
+        
+        self.assertEqual(len(deck), 8)
+        self.assertLess(elapsed, 0.5)  # 순차 실행이면 8 * (2 + 4) * 0.05 = 2.4초
+    
+    def test_single_card(self):
+        """prepare_card_images가 기존 결과 형식을 유지하는지 테스트"""
+        result = prepare_card_images({"type": "cover", "head": "표지", "image_key": "award"})
+        
+        self.assertEqual(
+            set(result),
+            {"prompt", "iconify_icons", "material_icons", "iconify_downloaded", "material_downloaded"},
+        )
+        self.assertEqual(len(result["material_downloaded"]), 2)
+
+
+
+class TestBulkIconFetch(unittest.TestCase):
+    """컬렉션 일괄 조회 테스트 클래스"""
+    
+    ICON_SET = {
+        "prefix": "mdi",
+        "width": 24,
+        "height": 24,
+        "icons": {
+            "trophy": {"body": '<path d="M1 1h2"/>'},
+            "wide": {"body": '<path d="M2 2h4"/>', "width": 32},
+        },
+        "aliases": {
+            "trophy-flipped": {"parent": "trophy", "hFlip": True},
+            "trophy-rotated": {"parent": "trophy-flipped", "rotate": 1, "hFlip": True},
+        },
+    }
+    
+    def setUp(self):
+        """테스트 전 설정"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, True)
+        self.cache = IconCache(cache_dir=self.temp_dir)
+    
+    def test_render_icon(self):
+        """아이콘 본문과 크기로 SVG 문서를 만드는지 테스트"""
+        self.assertEqual(
+            render_iconify_svg(self.ICON_SET, "trophy"),
+            '<svg xmlns="http://www.w3.org/2000/svg" width="1em" height="1em" viewBox="0 0 24 24"><path d="M1 1h2"/></svg>',
+        )
+        self.assertIn('viewBox="0 0 32 24"', render_iconify_svg(self.ICON_SET, "wide"))
+        self.assertIsNone(render_iconify_svg(self.ICON_SET, "missing"))
+    
+    def test_render_alias_transforms(self):
+        """별칭의 뒤집기/회전 속성을 적용하는지 테스트"""
+        flipped = render_iconify_svg(self.ICON_SET, "trophy-flipped")
+        self.assertIn('<g transform="translate(24 0) scale(-1 1)">', flipped)
+        
+        rotated = render_iconify_svg(self.ICON_SET, "trophy-rotated")  # 뒤집기 두 번은 상쇄
+        self.assertIn('<g transform="rotate(90 12 12)">', rotated)
+    
+    def test_one_request_per_collection(self):
+        """컬렉션별로 한 번만 요청하고, 세트에 없는 아이콘만 개별 다운로드하는지 테스트"""
+        base = image_prep.ICONIFY_API_BASE
+        urls = [f"{base}/mdi:trophy.svg", f"{base}/mdi:wide.svg", f"{base}/mdi:gone.svg", f"{base}/mdi:trophy.svg"]
+        
+        def fake_get(url, params=None, timeout=None):
+            resp = MagicMock(status_code=200, content=b"<svg>single</svg>")
+            resp.json.return_value = self.ICON_SET
+            return resp
+        
+        with patch("image_prep.get_icon_cache", return_value=self.cache), \
+                patch("image_prep.requests.get", side_effect=fake_get) as mock_get:
+            results = image_prep.download_svgs(urls)
+            self.assertEqual(image_prep.download_svgs(urls), results)  # 두 번째는 캐시에서
+        
+        requested = [call.args[0] for call in mock_get.call_args_list]
+        self.assertEqual(requested, [f"{base}/mdi.json", f"{base}/mdi:gone.svg"])
+        self.assertEqual(mock_get.call_args_list[0].kwargs["params"], {"icons": "trophy,wide,gone"})
+        self.assertTrue(results[urls[0]].startswith(b"<svg"))
+        self.assertEqual(results[urls[2]], b"<svg>single</svg>")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+"""작업 큐 테스트"""
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from job_queue import JobQueue, PermanentJobError
+
+
+class TestJobQueue(unittest.TestCase):
+    """작업 큐 테스트 클래스"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.queue = JobQueue(
+            db_path=os.path.join(self.temp_dir, "jobs.sqlite3"),
+            workers=2,
+            retry_delay=0,
+            poll_interval=0.05,
+        )
+    
+    def tearDown(self):
+        self.queue.stop(timeout=5)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_enqueue_and_run(self):
+        """등록한 작업이 처리되고 done이 되는지 테스트"""
+        handled = []
+        self.queue.register("echo", handled.append)
+        
+        job_id = self.queue.enqueue("echo", {"text": "안녕"})
+        
+        self.assertEqual(self.queue.get(job_id)["status"], "queued")
+        self.assertEqual(self.queue.run_pending(), 1)
+        self.assertEqual(handled, [{"text": "안녕"}])
+        self.assertEqual(self.queue.get(job_id)["status"], "done")
+        self.assertEqual(self.queue.stats()["done"], 1)
+    
+    def test_retry_then_fail(self):
+        """최대 시도 횟수까지 재시도하고 실패 알림을 호출하는지 테스트"""
+        failures = []
+        
+        def flaky(payload):
+            raise RuntimeError("일시적 오류")
+        
+        self.queue.register("flaky", flaky, on_failure=lambda payload, error: failures.append(error))
+        job_id = self.queue.enqueue("flaky", {}, max_attempts=3)
+        
+        self.assertEqual(self.queue.run_pending(), 3)
+        job = self.queue.get(job_id)
+        self.assertEqual(job["status"], "failed")
+        self.assertEqual(job["attempts"], 3)
+        self.assertIn("일시적 오류", job["last_error"])
+        self.assertEqual(failures, ["일시적 오류"])
+    
+    def test_retry_succeeds(self):
+        """재시도에서 성공하면 done이 되는지 테스트"""
+        calls = []
+        
+        def second_time(payload):
+            calls.append(payload)
+            if len(calls) == 1:
+                raise RuntimeError("첫 시도 실패")
+        
+        self.queue.register("second", second_time)
+        job_id = self.queue.enqueue("second", {})
+        
+        self.queue.run_pending()
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(self.queue.get(job_id)["status"], "done")
+    
+    def test_permanent_error_not_retried(self):
+        """PermanentJobError는 재시도하지 않는지 테스트"""
+        self.queue.register("broken", lambda payload: (_ for _ in ()).throw(PermanentJobError("형식 오류")))
+        job_id = self.queue.enqueue("broken", {})
+        
+        self.assertEqual(self.queue.run_pending(), 1)
+        self.assertEqual(self.queue.get(job_id)["status"], "failed")
+        self.assertEqual(self.queue.get(job_id)["attempts"], 1)
+    
+    def test_retry_backoff(self):
+        """재시도 대기 시간 전에는 작업을 다시 가져가지 않는지 테스트"""
+        self.queue.retry_delay = 60
+        self.queue.register("flaky", lambda payload: 1 / 0)
+        job_id = self.queue.enqueue("flaky", {})
+        
+        self.assertEqual(self.queue.run_pending(), 1)
+        self.assertEqual(self.queue.get(job_id)["status"], "queued")
+        self.assertEqual(self.queue.run_pending(), 0)
+    
+    def test_dedupe(self):
+        """같은 키의 작업이 대기 중이면 새로 넣지 않는지 테스트"""
+        self.queue.register("echo", lambda payload: None)
+        first = self.queue.enqueue("echo", {}, dedupe_key="article-1")
+        second = self.queue.enqueue("echo", {}, dedupe_key="article-1")
+        
+        self.assertEqual(first, second)
+        self.queue.run_pending()
+        third = self.queue.enqueue("echo", {}, dedupe_key="article-1")
+        self.assertNotEqual(first, third)
+    
+    def test_expired_lease_reclaimed(self):
+        """작업 중 프로세스가 죽어 임대가 끝난 작업을 다른 큐가 다시 처리하는지 테스트"""
+        self.queue.lease_seconds = -1  # 가져가자마자 임대가 끝난 것으로 처리
+        self.queue.enqueue("echo", {"n": 1})
+        self.assertIsNotNone(self.queue._claim())  # 처리하지 못하고 죽은 상황
+        
+        other = JobQueue(db_path=self.queue.db_path, retry_delay=0)
+        handled = []
+        other.register("echo", handled.append)
+        
+        self.assertEqual(other.run_pending(), 1)
+        self.assertEqual(handled, [{"n": 1}])
+    
+    def test_requeue_running(self):
+        """종료 중 끝나지 않은 작업을 대기 상태로 되돌리는지 테스트"""
+        job_id = self.queue.enqueue("echo", {})
+        self.queue._claim()
+        
+        self.assertEqual(self.queue.requeue_running(), 1)
+        job = self.queue.get(job_id)
+        self.assertEqual(job["status"], "queued")
+        self.assertEqual(job["last_error"], "interrupted by shutdown")
+    
+    def test_worker_threads(self):
+        """작업자 스레드가 작업을 처리하고 stop으로 종료되는지 테스트"""
+        handled = []
+        self.queue.register("echo", lambda payload: handled.append(payload["n"]))
+        self.queue.start()
+        for n in range(5):
+            self.queue.enqueue("echo", {"n": n})
+        
+        deadline = time.time() + 5
+        while self.queue.stats()["done"] < 5 and time.time() < deadline:
+            time.sleep(0.05)
+        
+        self.assertEqual(sorted(handled), list(range(5)))
+        self.assertTrue(self.queue.stop(timeout=5))
+    
+    def test_idle_worker_purges_old_jobs(self):
+        """작업자가 쉬는 동안 보관 기간이 지난 끝난 작업 기록을 정리하는지 테스트"""
+        self.queue.register("echo", lambda payload: None)
+        old_id = self.queue.enqueue("echo", {"n": 1})
+        self.queue.run_pending()
+        conn = self.queue._connect()
+        conn.execute("UPDATE jobs SET updated_at = 0 WHERE id = ?", (old_id,))
+        conn.close()
+        
+        self.queue.start()
+        deadline = time.time() + 5
+        while self.queue.get(old_id) is not None and time.time() < deadline:
+            time.sleep(0.05)
+        
+        self.assertIsNone(self.queue.get(old_id))
+        # 정리는 PURGE_INTERVAL에 한 번만 (작업자 여럿이 매번 DELETE하지 않음)
+        with patch.object(self.queue, "purge") as purge:
+            time.sleep(0.2)
+        purge.assert_not_called()
+
+
+class TestSlackInteractiveQueue(unittest.TestCase):
+    """Slack 버튼 요청이 작업 큐로 넘어가는지 테스트"""
+    
+    def setUp(self):
+        import slack_app
+        self.slack_app = slack_app
+        self.temp_dir = tempfile.mkdtemp()
+        self.queue = JobQueue(db_path=os.path.join(self.temp_dir, "jobs.sqlite3"), workers=0)
+        self.queue._handlers = dict(slack_app.jobs._handlers)
+        self.queue._failure_handlers = dict(slack_app.jobs._failure_handlers)
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_interactive_acknowledges_immediately(self):
+        """카드뉴스 생성 버튼은 생성 없이 바로 응답하고 작업만 등록하는지 테스트"""
+        article = {"title": "테스트 기사", "description": "설명", "link": "https://example.com/1"}
+        payload = {
+            "type": "block_actions",
+            "actions": [{"action_id": "create_cardnews_1"}],
+            "channel": {"id": "C1"},
+            "user": {"id": "U1"},
+            "response_url": "https://hooks.slack.test/response",
+        }
+        with patch.object(self.slack_app, "jobs", self.queue), \
+                patch.object(self.slack_app, "SLACK_SIGNING_SECRET", None), \
+                patch.object(self.slack_app.recommendations, "articles", return_value=[article]), \
+                patch.object(self.slack_app, "get_or_create_script") as create_script:
+            client = self.slack_app.app.test_client()
+            resp = client.post("/slack/interactive", data={"payload": json.dumps(payload)})
+        
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("작업 #1", resp.get_json()["text"])
+        create_script.assert_not_called()
+        self.assertEqual(self.queue.stats()["queued"], 1)
+        job = self.queue._claim()
+        self.assertEqual(job["kind"], "create_cardnews")
+        self.assertEqual(job["payload"]["article"]["link"], "https://example.com/1")
+        self.assertEqual(job["payload"]["response_url"], "https://hooks.slack.test/response")
+
+
+if __name__ == "__main__":
+    unittest.main()
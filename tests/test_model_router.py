@@ -0,0 +1,81 @@
+"""모델 라우팅 모듈 테스트"""
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from model_router import ModelRouter, _percentile
+
+
+class TestModelRouter(unittest.TestCase):
+    """모델 라우터 테스트 클래스"""
+    
+    def setUp(self):
+        """테스트 전 설정"""
+        self.router = ModelRouter(min_samples=3, default_hedge_delay=20.0, max_chain=3)
+        self.list_models = MagicMock(return_value=[
+            "models/gemini-pro",
+            "models/gemini-flash",
+            "models/other",
+        ])
+    
+    def test_percentile(self):
+        """최근접 순위 방식 백분위수 테스트"""
+        values = [float(i) for i in range(1, 101)]
+        self.assertEqual(_percentile(values, 50), 50.0)
+        self.assertEqual(_percentile(values, 95), 95.0)
+        self.assertEqual(_percentile([3.0], 95), 3.0)
+    
+    def test_chain_order_and_model_list_cache(self):
+        """flash > pro > 기타 순서와 모델 목록 캐시 테스트"""
+        chain = self.router.chain(self.list_models)
+        self.router.chain(self.list_models)
+        
+        self.assertEqual(chain, ["models/gemini-flash", "models/gemini-pro", "models/other"])
+        self.assertEqual(self.list_models.call_count, 1)
+    
+    def test_concurrent_callers_share_model_list_fetch(self):
+        """콜드 스타트에 동시에 호출해도 모델 목록은 한 번만 조회하는지 테스트"""
+        def slow_list_models():
+            time.sleep(0.2)
+            return ["models/gemini-flash"]
+        list_models = MagicMock(side_effect=slow_list_models)
+        
+        chains = []
+        threads = [
+            threading.Thread(target=lambda: chains.append(self.router.chain(list_models)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(list_models.call_count, 1)
+        self.assertEqual(chains, [["models/gemini-flash"]] * 5)
+    
+    def test_unhealthy_model_is_demoted(self):
+        """오류율이 높은 모델을 폴백 순서 뒤로 미루는지 테스트"""
+        for _ in range(3):
+            self.router.record("models/gemini-flash", 1.0, False)
+        
+        chain = self.router.chain(self.list_models)
+        
+        self.assertEqual(chain[-1], "models/gemini-flash")
+    
+    def test_hedge_delay_uses_p95(self):
+        """표본이 쌓이면 p95를 헤지 대기 시간으로 쓰는지 테스트"""
+        self.assertEqual(self.router.hedge_delay("models/gemini-flash"), 20.0)
+        for latency in (3.0, 4.0, 9.0):
+            self.router.record("models/gemini-flash", latency, True)
+        self.assertEqual(self.router.hedge_delay("models/gemini-flash"), 9.0)
+    
+    def test_hedge_budget(self):
+        """최근 요청 수 대비 헤지 허용량 제한 테스트"""
+        self.router.note_request()
+        self.assertTrue(self.router.try_hedge())
+        self.assertFalse(self.router.try_hedge())
+
+
+if __name__ == "__main__":
+    unittest.main()
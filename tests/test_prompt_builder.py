@@ -0,0 +1,74 @@
+"""프롬프트 조립 모듈 테스트"""
+import os
+import unittest
+from unittest.mock import patch
+
+from prompt_builder import (
+    SUMMARY_INSTRUCTIONS,
+    SUMMARY_PROMPT_TOKENS,
+    build_summary_prompt,
+    estimate_article_tokens,
+    estimate_tokens,
+    trim_to_budget,
+)
+
+
+class TestPromptBuilder(unittest.TestCase):
+    """프롬프트 조립 테스트 클래스"""
+    
+    def setUp(self):
+        """테스트 전 설정"""
+        self.long_content = (
+            "오늘 천안에서 지역 행사가 열렸다. "
+            + "행사와 직접 관련 없는 일반 안내가 이어졌다. " * 200
+            + "충남콘텐츠진흥원은 이번 행사에서 참여 기업을 지원했다."
+        )
+    
+    def test_short_content_is_unchanged(self):
+        """예산 이내의 본문은 그대로 유지하는지 테스트"""
+        content = "짧은 본문입니다. 두 번째 문장입니다."
+        self.assertEqual(trim_to_budget(content, 1000), content)
+    
+    def test_trim_keeps_keyword_sentences_in_order(self):
+        """예산을 넘으면 키워드 문장을 우선 남기고 원래 순서를 유지하는지 테스트"""
+        result = trim_to_budget(self.long_content, 80)
+        
+        self.assertLessEqual(estimate_tokens(result), 80)
+        self.assertIn("충남콘텐츠진흥원은 이번 행사에서 참여 기업을 지원했다.", result)
+        self.assertTrue(result.startswith("오늘 천안에서 지역 행사가 열렸다."))
+    
+    def test_trim_without_sentence_breaks(self):
+        """문장 구분이 없는 본문은 글자 수가 아니라 토큰 예산만큼 자르는지 테스트"""
+        korean = "가" * 500
+        english = "a" * 2000
+        
+        self.assertLessEqual(estimate_tokens(trim_to_budget(korean, 100)), 100)
+        self.assertGreater(len(trim_to_budget(english, 100)), 100)
+        self.assertLessEqual(estimate_tokens(trim_to_budget(english, 100)), 100)
+    
+    def test_template_tokens_match_prompt(self):
+        """고정 템플릿 토큰 + 기사 토큰이 프롬프트 전체 추정치와 거의 같은지 테스트"""
+        content = "충남콘텐츠진흥원은 이번 행사에서 참여 기업을 지원했다. " * 10
+        prompt = build_summary_prompt(content, "제목")
+        estimated = SUMMARY_PROMPT_TOKENS + estimate_article_tokens(content, "제목")
+        
+        self.assertAlmostEqual(estimated, estimate_tokens(prompt), delta=5)
+        # 예산을 넘는 본문은 예산만큼으로 계산 (축약된 프롬프트보다 작지 않음)
+        long_prompt = build_summary_prompt(self.long_content, "제목")
+        self.assertGreaterEqual(
+            SUMMARY_PROMPT_TOKENS + estimate_article_tokens(self.long_content, "제목") + 5,
+            estimate_tokens(long_prompt),
+        )
+    
+    @patch.dict(os.environ, {"GEMINI_INPUT_TOKEN_BUDGET": "80"})
+    def test_prompt_uses_input_budget(self):
+        """프롬프트 조립 시 환경 변수의 입력 토큰 예산을 적용하는지 테스트"""
+        prompt = build_summary_prompt(self.long_content, "제목")
+        
+        self.assertTrue(prompt.startswith(SUMMARY_INSTRUCTIONS))
+        self.assertLess(len(prompt), len(SUMMARY_INSTRUCTIONS) + len(self.long_content))
+        self.assertIn("[제목]\n제목\n\n[본문]\n", prompt)
+
+
+if __name__ == "__main__":
+    unittest.main()
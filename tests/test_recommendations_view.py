@@ -0,0 +1,95 @@
+"""추천 기사 화면 데이터 모듈 테스트"""
+import unittest
+from datetime import date, datetime
+
+from recommendations_view import (
+    SORT_BY_NEWEST,
+    SORT_BY_OLDEST,
+    SORT_BY_SCORE,
+    build_article_rows,
+    clean_title_suffix,
+    format_date_display,
+    parse_pub_date,
+)
+
+
+TODAY = date(2025, 12, 26)
+ARTICLES = [
+    {
+        "title": "<b>충콘진</b> 새 사업 < 문화 < 충남 < 전국",
+        "link": "https://example.com/1",
+        "description": "충남콘텐츠진흥원 발표",
+        "pubDate": "Wed, 24 Dec 2025 09:00:00 +0900",
+        "relevance_score": 3.0,
+    },
+    {
+        "title": "김곡미 인터뷰",
+        "link": "https://example.com/2",
+        "description": "설명",
+        "pubDate": "2025-12-26T10:00:00+09:00",
+        "relevance_score": 80.0,
+    },
+    {
+        "title": "오래된 기사",
+        "link": "https://example.com/3",
+        "pubDate": "2025-12-01",
+        "relevance_score": 9.0,
+    },
+    {"title": "날짜 없는 기사", "link": "https://example.com/4", "relevance_score": 9.5},
+]
+
+
+class TestRecommendationsView(unittest.TestCase):
+    """추천 기사 화면 행 생성 테스트 클래스"""
+
+    def test_parse_pub_date(self):
+        """여러 발행일 형식을 같은 날짜로 읽는지 테스트"""
+        expected = datetime(2025, 11, 27)
+        self.assertEqual(parse_pub_date("2025-11-27T09:00:00+09:00"), expected)
+        self.assertEqual(parse_pub_date("Thu, 27 Nov 2025 09:00:00 +0900"), expected)
+        self.assertEqual(parse_pub_date("2025-11-27"), expected)
+        self.assertEqual(parse_pub_date("Thu, 27 No").month, 11)
+        self.assertIsNone(parse_pub_date("어제"))
+        self.assertIsNone(parse_pub_date(""))
+
+    def test_format(self):
+        """날짜와 제목을 표시 형식으로 바꾸는지 테스트"""
+        self.assertEqual(format_date_display(datetime(2025, 12, 24)), "25.12.24.(수)")
+        self.assertEqual(format_date_display(None), "")
+        self.assertEqual(clean_title_suffix("제목 < 대전·충청 < 지역"), "제목")
+
+    def test_rows_filtered_and_rescored(self):
+        """최근 기사만 남기고 점수를 10점 만점으로 다시 계산하는지 테스트"""
+        rows = build_article_rows(ARTICLES, SORT_BY_SCORE, TODAY)
+
+        self.assertEqual([row["link"] for row in rows], ["https://example.com/2", "https://example.com/1"])
+        first, second = rows
+        self.assertAlmostEqual(first["score"], 2.3)  # 제목 0.3 + 당일 보너스 2.0
+        self.assertEqual(second["score"], 5.25)  # 제목 2.5 + 설명 1.5 + 2일 전 보너스 1.25
+        self.assertEqual(second["title"], "충콘진 새 사업")
+        self.assertEqual(second["date_display"], "25.12.24.(수)")
+        self.assertEqual(second["score_display"], "5.2/10점")
+        self.assertEqual(second["article"]["relevance_score"], 5.25)
+        self.assertEqual(second["article_id"], "https://example.com/1")
+
+    def test_rows_do_not_modify_articles(self):
+        """입력 기사 리스트와 기사를 바꾸지 않는지 테스트 (캐시된 원본 보호)"""
+        before = [dict(article) for article in ARTICLES]
+        build_article_rows(ARTICLES, SORT_BY_SCORE, TODAY)
+        self.assertEqual(ARTICLES, before)
+
+    def test_sort_by_date(self):
+        """날짜순 정렬 테스트"""
+        articles = [
+            {"title": "a", "link": "a", "pubDate": "2025-12-24"},
+            {"title": "b", "link": "b", "pubDate": "2025-12-26"},
+            {"title": "c", "link": "c", "pubDate": "2025-12-25"},
+        ]
+        newest = build_article_rows(articles, SORT_BY_NEWEST, TODAY)
+        oldest = build_article_rows(articles, SORT_BY_OLDEST, TODAY)
+        self.assertEqual([row["link"] for row in newest], ["b", "c", "a"])
+        self.assertEqual([row["link"] for row in oldest], ["a", "c", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+"""유사 기사 재사용 모듈 테스트"""
+import os
+import tempfile
+import unittest
+
+from similarity_cache import SimilarityIndex, compute_signature, estimate_similarity
+
+
+PRESS_RELEASE = (
+    "충남콘텐츠진흥원은 천안그린스타트업타운에서 지역 콘텐츠 기업 20곳을 대상으로 "
+    "해외 진출 지원 설명회를 열었다고 밝혔다. 이번 설명회에서는 수출 바우처와 "
+    "해외 전시회 참가 지원 사업이 소개됐으며, 참여 기업들은 현지 바이어 상담 기회도 얻었다."
+)
+
+
+class TestSimilarityIndex(unittest.TestCase):
+    """유사 기사 인덱스 테스트 클래스"""
+    
+    def setUp(self):
+        """테스트 전 설정"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.index = SimilarityIndex(db_path=os.path.join(self.tmpdir.name, "similarity.sqlite3"))
+    
+    def tearDown(self):
+        """테스트 후 정리"""
+        self.tmpdir.cleanup()
+    
+    def test_signature_similarity(self):
+        """재게재 기사는 높고, 다른 기사는 낮은 유사도를 내는지 테스트"""
+        original = compute_signature("충남콘텐츠진흥원, 해외 진출 설명회", PRESS_RELEASE)
+        republished = compute_signature("충남콘텐츠진흥원 해외진출 설명회 개최", PRESS_RELEASE + " (사진=진흥원)")
+        unrelated = compute_signature("충남음악창작소 공연", "충남음악창작소가 지역 인디 뮤지션의 합동 공연을 개최한다. " * 3)
+        
+        self.assertGreaterEqual(estimate_similarity(original, republished), 0.8)
+        self.assertLess(estimate_similarity(original, unrelated), 0.3)
+        self.assertIsNone(compute_signature("짧은 제목", ""))
+    
+    def test_find_similar_and_reuse_record(self):
+        """인덱스에서 재게재 기사를 찾고 재사용 기록을 남기는지 테스트"""
+        self.index.add("https://a.example.com/1", "충남콘텐츠진흥원, 해외 진출 설명회", PRESS_RELEASE)
+        
+        matches = self.index.find_similar("충남콘텐츠진흥원 해외진출 설명회 개최", PRESS_RELEASE)
+        self.assertEqual(matches[0][0], "https://a.example.com/1")
+        self.assertEqual(self.index.find_similar("다른 기사", "충남음악창작소 공연 소식입니다. " * 5), [])
+        
+        self.index.record_reuse("https://b.example.com/2", "https://a.example.com/1", matches[0][1])
+        self.assertEqual(self.index.get_reuse_source("https://b.example.com/2")[0], "https://a.example.com/1")
+        self.assertIsNone(self.index.get_reuse_source("https://a.example.com/1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""단일 실행(single-flight) 모듈 테스트"""
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    """동시 생성 요청 병합 테스트 클래스"""
+    
+    def setUp(self):
+        """테스트 전 설정"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "leases.sqlite3")
+    
+    def tearDown(self):
+        """테스트 후 정리"""
+        self.tmpdir.cleanup()
+    
+    def test_concurrent_callers_share_one_call(self):
+        """같은 프로세스의 동시 호출은 한 번만 실행되는지 테스트"""
+        flight = SingleFlight(db_path=self.db_path)
+        calls = []
+        
+        def generate():
+            calls.append(1)
+            time.sleep(0.2)
+            return "요약"
+        
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do("summary:a", generate)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["요약"] * 5)
+    
+    def test_other_process_waits_for_lease_holder(self):
+        """다른 프로세스(별도 인스턴스)는 임대 보유자의 캐시 결과를 기다리는지 테스트"""
+        leader = SingleFlight(db_path=self.db_path)
+        follower = SingleFlight(db_path=self.db_path, poll_interval=0.05)
+        cache = {}
+        follower_calls = []
+        
+        def slow_generate():
+            time.sleep(0.3)
+            cache["value"] = "리더 결과"
+            return cache["value"]
+        
+        leader_thread = threading.Thread(target=lambda: leader.do("script:a", slow_generate))
+        leader_thread.start()
+        time.sleep(0.1)
+        
+        result = follower.do(
+            "script:a",
+            lambda: follower_calls.append(1) or "중복 결과",
+            load_cached=lambda: cache.get("value"),
+        )
+        leader_thread.join()
+        
+        self.assertEqual(result, "리더 결과")
+        self.assertEqual(follower_calls, [])
+    
+    def test_lease_released_after_failure(self):
+        """생성 실패 후 임대가 해제되어 다음 호출이 실행되는지 테스트"""
+        flight = SingleFlight(db_path=self.db_path)
+        
+        def fail():
+            raise RuntimeError("실패")
+        
+        with self.assertRaises(RuntimeError):
+            flight.do("summary:b", fail)
+        self.assertEqual(flight.do("summary:b", lambda: "성공"), "성공")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""Slack 블록 캐시 테스트"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import slack_blocks
+from slack_blocks import DeckBlockStore, digest_blocks, list_blocks, render_article_blocks
+
+
+ARTICLES = [
+    {
+        "title": "<b>충남콘텐츠진흥원</b> &quot;행사&quot;",
+        "link": "https://example.com/1",
+        "description": "설명 1",
+        "relevance_score": 8.5,
+        "pubDate": "2026-01-05T10:00:00+09:00",
+    },
+    {
+        "title": "두 번째 기사",
+        "link": "https://example.com/2",
+        "description": "",
+        "relevance_score": 6.0,
+        "pubDate": "",
+    },
+]
+
+
+class TestArticleBlocks(unittest.TestCase):
+    """기사 블록 미리 만들기 테스트 클래스"""
+
+    def setUp(self):
+        self.articles = [dict(a) for a in ARTICLES]
+        self.env = patch.dict(os.environ, {"SLACK_APP_URL": "https://slack-app.test"})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+
+    def test_formatting(self):
+        """HTML 태그/엔티티 제거와 날짜 형식 테스트"""
+        self.assertEqual(slack_blocks.clean_html_tags(ARTICLES[0]["title"]), '충남콘텐츠진흥원 "행사"')
+        self.assertEqual(slack_blocks.format_date(ARTICLES[0]["pubDate"]), "2026.01.05 (월)")
+        self.assertEqual(slack_blocks.format_date(""), "날짜 정보 없음")
+        self.assertEqual(slack_blocks.format_date("어제"), "어제")
+
+    def test_stored_blocks_served_without_rebuilding(self):
+        """저장된 블록이 있으면 다시 만들지 않고 그대로 쓰는지 테스트"""
+        summaries = {"https://example.com/1": "요약 1"}.get
+        expected = digest_blocks(self.articles, summaries)
+        self.assertEqual(render_article_blocks(self.articles, summaries), 4)
+
+        with patch.object(slack_blocks, "build_digest_item", side_effect=AssertionError("다시 만듦")), \
+                patch.object(slack_blocks, "build_list_item", side_effect=AssertionError("다시 만듦")):
+            self.assertEqual(digest_blocks(self.articles, summaries), expected)
+            self.assertIn("8.5/10점", list_blocks(self.articles)[2]["text"]["text"])
+            self.assertEqual(render_article_blocks(self.articles, summaries), 0)
+
+    def test_changed_record_invalidates(self):
+        """기사 값이나 요약이 바뀌면 저장된 블록 대신 새로 만드는지 테스트"""
+        render_article_blocks(self.articles)
+        self.articles[0]["relevance_score"] = 9.5
+
+        self.assertIn("9.5/10점", str(digest_blocks(self.articles)))
+        self.assertIn("요약 2", str(digest_blocks(self.articles, {"https://example.com/2": "요약 2"}.get)))
+        with patch.dict(os.environ, {"SLACK_APP_URL": ""}):
+            self.assertNotIn("view_summary_1", str(digest_blocks(self.articles)))
+        self.assertEqual(render_article_blocks(self.articles), 2)
+
+    def test_list_memoized_per_article_list(self):
+        """같은 기사 리스트 객체에는 만들어 둔 목록을 그대로 반환하는지 테스트"""
+        first = list_blocks(self.articles)
+
+        self.assertIs(list_blocks(self.articles), first)
+        self.assertIsNot(list_blocks([dict(a) for a in self.articles]), first)
+        self.assertEqual(first[-1]["type"], "context")
+
+    def test_only_top_articles_rendered(self):
+        """알림/목록에 보이지 않는 순번의 블록은 저장하지 않는지 테스트"""
+        articles = [dict(ARTICLES[1], link=f"https://example.com/{i}") for i in range(12)]
+        render_article_blocks(articles)
+
+        self.assertIn("digest", articles[4]["slack_blocks"])
+        self.assertNotIn("digest", articles[5]["slack_blocks"])
+        self.assertNotIn("slack_blocks", articles[10])
+
+
+class TestDeckBlockStore(unittest.TestCase):
+    """카드뉴스 블록 저장소 테스트 클래스"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "slack_blocks.sqlite3")
+        self.store = DeckBlockStore(self.db_path)
+        self.patcher = patch.object(slack_blocks, "_deck_store", self.store)
+        self.patcher.start()
+        self.cards = [{"type": "title", "head": "제목", "body": "본문"}]
+
+    def tearDown(self):
+        self.patcher.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_persisted_across_instances(self):
+        """저장한 블록을 다른 프로세스(새 인스턴스)에서도 지문으로 찾는지 테스트"""
+        blocks = slack_blocks.deck_blocks("https://example.com/1", "스크립트", "제목", "https://example.com/1", self.cards)
+        expected = slack_blocks.fingerprint("deck", "스크립트", "제목", "https://example.com/1", os.getenv("STREAMLIT_APP_URL"))
+
+        self.assertEqual(DeckBlockStore(self.db_path).get("https://example.com/1", expected), blocks)
+        self.assertIsNone(DeckBlockStore(self.db_path).get("https://example.com/1", "other"))
+
+    def test_new_script_rebuilds(self):
+        """문구가 다시 생성되면 저장된 블록 대신 새로 만드는지 테스트"""
+        slack_blocks.deck_blocks("a", "스크립트 1", "제목", "", self.cards)
+        with patch.object(slack_blocks, "build_deck_blocks", side_effect=AssertionError("다시 만듦")):
+            slack_blocks.deck_blocks("a", "스크립트 1", "제목", "", self.cards)
+
+        new_cards = self.cards + [{"type": "content", "head": "두 번째"}]
+        blocks = slack_blocks.deck_blocks("a", "스크립트 2", "제목", "", new_cards)
+        self.assertIn("카드 2", str(blocks))
+
+
+if __name__ == "__main__":
+    unittest.main()
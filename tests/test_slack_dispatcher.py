@@ -0,0 +1,146 @@
+"""Slack 전송기 테스트"""
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import slack_dispatcher
+from slack_dispatcher import SlackDispatcher, SlackError
+
+
+def _response(status_code, body=None, headers=None, text=""):
+    """테스트용 HTTP 응답 객체를 만듭니다."""
+    resp = MagicMock()
+    resp.status_code = status_code
+    resp.ok = status_code < 400
+    resp.headers = headers or {}
+    resp.text = text
+    resp.json.return_value = body or {}
+    return resp
+
+
+class TestSlackDispatcher(unittest.TestCase):
+    """Slack 전송기 테스트 클래스"""
+    
+    def setUp(self):
+        self.dispatcher = SlackDispatcher(api_base="http://slack.test/api", token="xoxb-test", max_attempts=3)
+        self.dispatcher.session = MagicMock()
+        self.posts = self.dispatcher.session.post
+        self.sleep_patcher = patch.object(slack_dispatcher, "BACKOFF_BASE", 0.01)
+        self.sleep_patcher.start()
+    
+    def tearDown(self):
+        self.sleep_patcher.stop()
+    
+    def test_retry_after_429(self):
+        """429 응답은 Retry-After만큼 멈춘 뒤 다시 보내는지 테스트"""
+        self.posts.side_effect = [
+            _response(429, {"ok": False, "error": "ratelimited"}, headers={"Retry-After": "0"}),
+            _response(200, {"ok": True, "ts": "1.0"}),
+        ]
+        
+        result = self.dispatcher.call("chat.update", {"channel": "C1", "ts": "1.0", "text": "hi"})
+        
+        self.assertEqual(result["ts"], "1.0")
+        self.assertEqual(self.posts.call_count, 2)
+        self.assertEqual(self.posts.call_args.kwargs["timeout"], self.dispatcher.timeout)
+    
+    def test_gives_up_after_max_attempts(self):
+        """5xx가 계속되면 최대 시도 후 SlackError를 던지는지 테스트"""
+        self.posts.return_value = _response(503)
+        
+        with self.assertRaises(SlackError):
+            self.dispatcher.call("chat.postMessage", {"channel": "C1", "text": "hi"})
+        self.assertEqual(self.posts.call_count, 3)
+        self.assertFalse(self.dispatcher.post_url("http://hooks.test/1", {"text": "hi"}))
+    
+    def test_no_token(self):
+        """Bot Token이 없으면 Web API를 호출하지 않는지 테스트"""
+        self.dispatcher.token = None
+        
+        self.assertIsNone(self.dispatcher.call("chat.postMessage", {"channel": "C1"}))
+        self.posts.assert_not_called()
+    
+    def test_per_channel_rate_limit(self):
+        """chat.postMessage는 채널별로 짧은 순간 3건 뒤부터 대기하는지 테스트"""
+        deliveries = [slack_dispatcher._Delivery("chat.postMessage", None, {"channel": "C1"}) for _ in range(4)]
+        waits = [self.dispatcher._reserve(delivery) for delivery in deliveries]
+        other = self.dispatcher._reserve(slack_dispatcher._Delivery("chat.postMessage", None, {"channel": "C2"}))
+        
+        self.assertEqual(waits[:3], [0.0, 0.0, 0.0])
+        self.assertGreater(waits[3], 0.5)
+        self.assertEqual(other, 0.0)
+    
+    def test_submit_coalesces_updates(self):
+        """밀려 있는 같은 메시지의 chat.update는 마지막 내용 하나만 보내는지 테스트"""
+        self.posts.return_value = _response(200, {"ok": True})
+        for n in range(5):
+            self.dispatcher.submit("chat.update", {"channel": "C1", "ts": "1.0", "text": f"{n}"}, key="msg", delay=0.1)
+        
+        self.assertTrue(self.dispatcher.flush(timeout=5))
+        self.assertEqual(self.posts.call_count, 1)
+        self.assertEqual(self.posts.call_args.kwargs["json"]["text"], "4")
+    
+    def test_cancel_before_send(self):
+        """아직 보내지 않은 전송은 취소되는지 테스트"""
+        self.dispatcher.submit_url("http://hooks.test/1", {"text": "생성 중"}, key="placeholder", delay=0.2)
+        
+        self.assertTrue(self.dispatcher.cancel("placeholder"))
+        self.assertTrue(self.dispatcher.flush(timeout=5))
+        self.posts.assert_not_called()
+    
+    def test_background_retry(self):
+        """백그라운드 전송도 실패하면 다시 시도하는지 테스트"""
+        self.posts.side_effect = [_response(500), _response(200)]
+        self.dispatcher.submit_url("http://hooks.test/1", {"text": "결과"})
+        
+        self.assertTrue(self.dispatcher.flush(timeout=5))
+        self.assertEqual(self.posts.call_count, 2)
+
+
+class TestSlackMessage(unittest.TestCase):
+    """진행 메시지/결과 병합 테스트 클래스"""
+    
+    def setUp(self):
+        self.dispatcher = SlackDispatcher(api_base="http://slack.test/api", token="xoxb-test")
+        self.dispatcher.session = MagicMock()
+        self.dispatcher.session.post.side_effect = lambda url, **kwargs: _response(
+            200, {"ok": True, "ts": kwargs["json"].get("ts", "100.0")}
+        )
+    
+    def _methods(self):
+        return [call.args[0].rsplit("/", 1)[-1] for call in self.dispatcher.session.post.call_args_list]
+    
+    def test_fast_result_skips_placeholder(self):
+        """지연 시간 전에 결과가 나오면 진행 메시지 없이 결과만 보내는지 테스트"""
+        message = self.dispatcher.message("C1")
+        message.placeholder_delay = 5
+        message.progress({"text": "생성 중..."})
+        
+        message.finish({"text": "완료"})
+        
+        self.assertEqual(self._methods(), ["chat.postMessage"])
+        self.assertEqual(self.dispatcher.session.post.call_args.kwargs["json"]["text"], "완료")
+    
+    def test_slow_result_updates_placeholder(self):
+        """진행 메시지를 올린 뒤에는 같은 메시지를 결과로 교체하는지 테스트"""
+        message = self.dispatcher.message("C1")
+        message.placeholder_delay = 0
+        message.progress({"text": "생성 중..."})
+        deadline = time.time() + 5
+        while message.ts is None and time.time() < deadline:
+            time.sleep(0.01)
+        
+        message.progress({"text": "1장 완성"})
+        message.finish({"text": "완료"})
+        self.dispatcher.flush(timeout=5)
+        
+        methods = self._methods()
+        self.assertEqual(methods[0], "chat.postMessage")
+        self.assertEqual(methods[-1], "chat.update")
+        self.assertEqual(methods.count("chat.postMessage"), 1)
+        final = self.dispatcher.session.post.call_args_list[-1].kwargs["json"]
+        self.assertEqual((final["ts"], final["text"]), ("100.0", "완료"))
+
+
+if __name__ == "__main__":
+    unittest.main()
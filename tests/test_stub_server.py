@@ -0,0 +1,61 @@
+"""외부 API 스텁 서버 테스트"""
+import unittest
+
+from card_parser import parse_card_script
+from image_prep import render_iconify_svg
+from stub_server import SERVICES, ServiceProfile, create_app
+
+
+def _profiles(**overrides):
+    """지연 없는 테스트용 프로필을 만듭니다."""
+    profiles = {service: ServiceProfile("fixed:0") for service in SERVICES}
+    profiles.update(overrides)
+    return profiles
+
+
+class TestStubServer(unittest.TestCase):
+    """스텁 엔드포인트 테스트 클래스"""
+    
+    def test_naver_paging(self):
+        """start/display에 맞춰 기사를 반환하는지 테스트"""
+        client = create_app(_profiles()).test_client()
+        
+        data = client.get("/v1/search/news.json?query=충콘진&display=5&start=11").get_json()
+        
+        self.assertEqual(data["start"], 11)
+        self.assertEqual(len(data["items"]), 5)
+        self.assertIn("<b>충콘진</b>", data["items"][0]["title"])
+    
+    def test_gemini_card_response_is_parseable(self):
+        """카드뉴스 프롬프트에 파싱 가능한 문구를 돌려주는지 테스트"""
+        client = create_app(_profiles()).test_client()
+        payload = {"contents": [{"parts": [{"text": "... TYPE=cover ...\n[제목]\n테스트 기사\n"}]}]}
+        
+        data = client.post("/v1/models/gemini-1.5-flash:generateContent", json=payload).get_json()
+        text = data["candidates"][0]["content"]["parts"][0]["text"]
+        
+        self.assertGreaterEqual(len(parse_card_script(text)), 6)
+        self.assertIn("totalTokenCount", data["usageMetadata"])
+    
+    def test_iconify_collection(self):
+        """컬렉션 일괄 조회가 요청한 아이콘 본문을 모두 돌려주는지 테스트"""
+        client = create_app(_profiles()).test_client()
+        
+        icon_set = client.get("/iconify/mdi.json?icons=award-0,award-1").get_json()
+        
+        self.assertEqual(set(icon_set["icons"]), {"award-0", "award-1"})
+        self.assertIn("<circle", render_iconify_svg(icon_set, "award-1"))
+    
+    def test_rate_limit_injection(self):
+        """429 주입 시 Retry-After 헤더를 붙이는지 테스트"""
+        client = create_app(_profiles(slack=ServiceProfile("fixed:0", rate_limit=1.0))).test_client()
+        
+        resp = client.post("/slack/api/chat.postMessage", json={"channel": "C1"})
+        
+        self.assertEqual(resp.status_code, 429)
+        self.assertEqual(resp.headers["Retry-After"], "2")
+        self.assertEqual(client.get("/_stats").get_json()["counts"]["slack.429"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
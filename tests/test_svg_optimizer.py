@@ -0,0 +1,71 @@
+"""SVG 최적화 테스트"""
+import shutil
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from unittest.mock import patch
+
+from icon_cache import IconCache
+from svg_optimizer import optimize_svg, optimize_svg_cached, optimize_svgs
+
+
+SAMPLE_SVG = b"""<?xml version="1.0" encoding="UTF-8"?>
+<!-- Generator: editor -->
+<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" version="1.1" viewBox="0 0 24.000 24.000">
+  <metadata>stuff</metadata>
+  <defs>
+    <linearGradient id="used"><stop offset="0" stop-color="#fff"/></linearGradient>
+    <linearGradient id="unused"><stop offset="1"/></linearGradient>
+  </defs>
+  <g>
+    <path id="p1" fill="url(#used)" fill-opacity="1" d="M 12.00000 2.50000 L 0.123456 -3.5 C 1.5 .5 .5 .5 12 12 Z"/>
+  </g>
+  <g fill="none" stroke="currentColor" stroke-width="2">
+    <circle cx="12.0001" cy="12" r="10" stroke-width="1" opacity="1"/>
+    <path d="M3 3a9 9 0 0 1 18 0"/>
+  </g>
+</svg>
+"""
+
+
+class TestSvgOptimizer(unittest.TestCase):
+    """SVG 최적화 테스트 클래스"""
+    
+    def test_optimize_svg(self):
+        """불필요한 요소/속성 제거와 숫자/path 압축 테스트"""
+        optimized = optimize_svg(SAMPLE_SVG).decode("utf-8")
+        
+        self.assertTrue(optimized.startswith('<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24">'))
+        for removed in ("metadata", "unused", "version", "fill-opacity", 'id="p1"', "Generator", "xmlns:xlink"):
+            self.assertNotIn(removed, optimized)
+        self.assertIn('id="used"', optimized)
+        self.assertIn('d="M12 2.5L.123-3.5C1.5.5.5.5 12 12Z"', optimized)
+        self.assertIn('d="M3 3a9 9 0 0 1 18 0"', optimized)  # 호(arc)는 토큰 유지
+        # 조상이 stroke-width를 바꿨으므로 기본값이라도 유지
+        self.assertIn('<circle cx="12" cy="12" r="10" stroke-width="1"/>', optimized)
+        ET.fromstring(optimized)
+    
+    def test_invalid_or_minimal_svg_is_unchanged(self):
+        """파싱할 수 없거나 더 줄지 않으면 원본을 반환하는지 테스트"""
+        self.assertEqual(optimize_svg(b"<svg"), b"<svg")
+        minimal = b'<svg xmlns="http://www.w3.org/2000/svg"/>'
+        self.assertEqual(optimize_svg(minimal), minimal)
+    
+    def test_cached_by_input_hash(self):
+        """같은 입력은 한 번만 최적화하고 절감량을 합산하는지 테스트"""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, True)
+        cache = IconCache(cache_dir=temp_dir)
+        
+        with patch("svg_optimizer.optimize_svg", wraps=optimize_svg) as mock_optimize, \
+                patch("svg_optimizer.get_icon_cache", return_value=cache):
+            first = optimize_svg_cached(SAMPLE_SVG)
+            results, before, after = optimize_svgs([("a", SAMPLE_SVG), ("b", None)])
+        
+        self.assertEqual(mock_optimize.call_count, 1)
+        self.assertEqual(results, {"a": first})
+        self.assertEqual((before, after), (len(SAMPLE_SVG), len(first)))
+
+
+if __name__ == "__main__":
+    unittest.main()
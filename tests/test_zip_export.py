@@ -0,0 +1,76 @@
+"""ZIP 내보내기 테스트"""
+import io
+import os
+import unittest
+import zipfile
+from unittest.mock import patch
+
+from image_prep import create_images_zip
+from zip_export import daily_export_entries, iter_zip, write_zip
+
+
+class TestZipExport(unittest.TestCase):
+    """스트리밍 ZIP 작성 테스트 클래스"""
+    
+    def test_iter_zip_streams_valid_archive(self):
+        """조각을 이어 붙이면 올바른 ZIP이 되고, 압축 형식별로 저장 방식을 고르는지 테스트"""
+        big = (b"x" * 1000 for _ in range(500))  # 조각 이터러블 항목
+        entries = [("a.txt", "안녕하세요"), ("photo.png", b"\x89PNG" + b"0" * 5000), ("big.svg", big)]
+        
+        chunks = list(iter_zip(entries, chunk_size=1024))
+        
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) <= 1024 for chunk in chunks[:-1]))
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zip_file:
+            self.assertEqual(zip_file.read("a.txt").decode("utf-8"), "안녕하세요")
+            self.assertEqual(zip_file.getinfo("photo.png").compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(zip_file.getinfo("big.svg").compress_type, zipfile.ZIP_DEFLATED)
+            self.assertEqual(len(zip_file.read("big.svg")), 500000)
+    
+    def test_write_zip_spools_to_disk(self):
+        """spool_max를 넘으면 디스크 임시 파일로 넘어가는지 테스트"""
+        spooled = write_zip([("data.png", os.urandom(4096))], spool_max=1024)
+        try:
+            self.assertTrue(spooled._rolled)
+            with zipfile.ZipFile(spooled) as zip_file:
+                self.assertEqual(zip_file.namelist(), ["data.png"])
+        finally:
+            spooled.close()
+    
+    def test_create_images_zip_layout(self):
+        """create_images_zip이 기존 폴더 구조를 유지하는지 테스트"""
+        data = create_images_zip(
+            [{"name": "mdi:trophy", "data": b"<svg/>"}],
+            [{"name": "material-symbols:award", "data": b"<svg/>"}, {"name": "empty", "data": None}],
+        )
+        
+        with zipfile.ZipFile(io.BytesIO(data)) as zip_file:
+            self.assertEqual(zip_file.namelist(), ["iconify/mdi:trophy.svg", "material-icons/award.svg"])
+    
+    def test_daily_export_entries(self):
+        """추천 기사별 폴더에 요약/문구/프롬프트/아이콘을 담는지 테스트"""
+        articles = [
+            {"title": "첫 기사 / 테스트", "link": "http://a"},
+            {"title": "문구 없는 기사", "link": "http://b"},
+        ]
+        script = "1. TYPE=cover | HEAD=표지 | IMAGE_KEY=award"
+        deck = [{"prompt": "p", "iconify_downloaded": [{"name": "mdi:trophy", "data": b"<svg/>"}], "material_downloaded": []}]
+        
+        with patch("zip_export.get_cached_summary", side_effect=lambda aid: "요약" if aid == "http://a" else None), \
+                patch("zip_export.get_cached_script", side_effect=lambda aid: script if aid == "http://a" else None), \
+                patch("image_prep.prepare_deck_images", return_value=deck):
+            names = [name for name, _ in daily_export_entries(articles)]
+        
+        self.assertEqual(names, [
+            "01_첫_기사_테스트/article.txt",
+            "01_첫_기사_테스트/summary.txt",
+            "01_첫_기사_테스트/card_script.txt",
+            "01_첫_기사_테스트/image_prompts.txt",
+            "01_첫_기사_테스트/card_01/iconify/mdi:trophy.svg",
+            "02_문구_없는_기사/article.txt",
+            "index.tsv",
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""WSGI 진입점 - 운영 환경에서 gunicorn으로 Slack App 서버 실행
+
+사용 예:
+    gunicorn -c gunicorn.conf.py wsgi:application
+
+gunicorn.conf.py가 앱을 마스터 프로세스에서 미리 불러오고(preload), fork 전에
+warm_shared_state()로 공유 상태를 채운 뒤, 작업 프로세스마다 warm_worker()로
+작업자 스레드와 HTTP 연결을 준비합니다.
+"""
+import os
+import time
+
+from daily_recommendations import get_recommendations_store
+from gemini_api import GEMINI_API_BASE, _get_model_chain
+from gemini_client import get_gemini_client
+from slack_app import app, jobs, slack
+
+
+application = app
+
+
+def warm_shared_state() -> None:
+    """
+    fork 전에 작업 프로세스들이 복사해 쓸 상태를 채웁니다.
+
+    - 추천 기사 목록과 ID 색인
+    - 모델 목록 (모델 라우터에 캐시)
+
+    스레드나 열린 연결은 fork 후에 복사되면 안 되므로 여기서 만들지 않습니다.
+    """
+    articles = get_recommendations_store().articles()
+    models = _get_model_chain() if os.getenv("GEMINI_API_KEY") else []
+    print(f"[서버 준비] 추천 기사 {len(articles)}건, 모델 {len(models)}개 로드")
+
+
+def warm_worker() -> None:
+    """
+    fork된 작업 프로세스에서 작업 큐 스레드와 Gemini 클라이언트(HTTP 연결 풀)를 준비합니다.
+    """
+    get_gemini_client(GEMINI_API_BASE)
+    jobs.start()
+
+
+def drain_jobs(timeout: float) -> None:
+    """
+    작업 프로세스가 종료될 때 실행 중인 작업과 밀려 있는 Slack 전송이 끝나기를 기다립니다.
+
+    timeout 안에 끝나지 않은 작업은 대기 상태로 되돌려 다른 프로세스가 바로 다시 실행하게 합니다.
+
+    Args:
+        timeout: 최대 대기 시간 (초)
+    """
+    deadline = time.monotonic() + timeout
+    active = jobs.active
+    if jobs.stop(timeout=timeout):
+        if active:
+            print(f"[서버 종료] 실행 중이던 작업 {active}건 완료")
+    else:
+        requeued = jobs.requeue_running()
+        print(f"[서버 종료] {timeout:.0f}초 안에 끝나지 않은 작업 {requeued}건을 대기열로 되돌림")
+    # 밀려 있는 Slack 진행 메시지 갱신도 남은 시간 안에 보냄
+    if not slack.flush(max(1.0, deadline - time.monotonic())):
+        print("[서버 종료] 보내지 못한 Slack 메시지가 남아 있습니다.")
@@ -0,0 +1,221 @@
+"""ZIP 내보내기 모듈 - 카드뉴스 자료를 메모리에 통째로 올리지 않고 스트리밍으로 압축
+
+사용 예:
+    # 오늘의 추천 기사 전체(요약, 카드뉴스 문구, 이미지 프롬프트, SVG)를 파일로 내보내기
+    python zip_export.py -o cardnews_daily.zip
+
+ZIP 항목은 (압축 파일 안 경로, 내용) 튜플의 이터러블로 넘깁니다. 내용은 bytes, str,
+또는 bytes 조각의 이터러블이며, 항목을 하나씩 압축해 내보내므로 최대 메모리는
+항목 하나와 출력 조각 하나 크기로 제한됩니다.
+"""
+import argparse
+import os
+import re
+import zipfile
+from tempfile import SpooledTemporaryFile
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+from cache_manager import get_cached_script, get_cached_summary
+from card_parser import parse_card_script
+
+
+CHUNK_SIZE = 64 * 1024  # 스트리밍 응답 조각 크기
+SPOOL_MAX_BYTES = 8 * 1024 * 1024  # 이보다 큰 ZIP은 임시 파일(디스크)로 넘김
+# 이미 압축된 형식은 다시 압축하지 않고 저장(store)만 함
+STORED_SUFFIXES = frozenset({".png", ".jpg", ".jpeg", ".gif", ".webp", ".zip", ".gz", ".woff2", ".mp4"})
+
+ZipContent = Union[bytes, str, Iterable[bytes]]
+ZipEntry = Tuple[str, ZipContent]
+
+_UNSAFE_NAME_RE = re.compile(r'[\\/:*?"<>|\s]+')
+
+
+class _ChunkSink:
+    """ZipFile이 쓰는 바이트를 모아 두었다가 조각으로 꺼내 주는 쓰기 전용 스트림입니다. (seek 불가)"""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _compress_type(arcname: str) -> int:
+    suffix = os.path.splitext(arcname)[1].lower()
+    return zipfile.ZIP_STORED if suffix in STORED_SUFFIXES else zipfile.ZIP_DEFLATED
+
+
+def _write_entry(zip_file: zipfile.ZipFile, arcname: str, content: ZipContent) -> None:
+    info = zipfile.ZipInfo(arcname, date_time=(1980, 1, 1, 0, 0, 0))
+    info.compress_type = _compress_type(arcname)
+    info.external_attr = 0o644 << 16
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    if isinstance(content, (bytes, bytearray)):
+        zip_file.writestr(info, content)
+        return
+    with zip_file.open(info, "w", force_zip64=True) as f:
+        for chunk in content:
+            f.write(chunk)
+
+
+def iter_zip(entries: Iterable[ZipEntry], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    ZIP 파일을 만들면서 바이트 조각을 차례로 내보냅니다. (HTTP 스트리밍 응답용)
+
+    Args:
+        entries: (압축 파일 안 경로, 내용) 튜플의 이터러블
+        chunk_size: 이 크기 이상 모이면 조각을 내보냄
+
+    Yields:
+        ZIP 파일 바이트 조각
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w") as zip_file:
+        for arcname, content in entries:
+            _write_entry(zip_file, arcname, content)
+            data = sink.drain()
+            for start in range(0, len(data), chunk_size):
+                yield data[start:start + chunk_size]
+    tail = sink.drain()
+    if tail:
+        yield tail
+
+
+def write_zip(entries: Iterable[ZipEntry], spool_max: int = SPOOL_MAX_BYTES) -> SpooledTemporaryFile:
+    """
+    ZIP 파일을 임시 파일에 씁니다. spool_max보다 작으면 메모리에, 크면 디스크에 둡니다.
+
+    Args:
+        entries: (압축 파일 안 경로, 내용) 튜플의 이터러블
+        spool_max: 메모리에 둘 최대 크기
+
+    Returns:
+        처음 위치로 되감은 임시 파일 객체 (사용 후 close 필요)
+    """
+    spooled = SpooledTemporaryFile(max_size=spool_max, mode="w+b")
+    for chunk in iter_zip(entries):
+        spooled.write(chunk)
+    spooled.seek(0)
+    return spooled
+
+
+def icon_entries(
+    iconify_icons: List[Dict],
+    material_icons: List[Dict],
+    root: str = "",
+) -> Iterator[ZipEntry]:
+    """
+    다운로드한 아이콘을 ZIP 항목으로 만듭니다. (iconify/, material-icons/ 폴더)
+
+    Args:
+        iconify_icons: Iconify 아이콘 리스트. 각 항목은 {"name": ..., "data": ...} 형식.
+        material_icons: Material Icons 리스트. 각 항목은 {"name": ..., "data": ...} 형식.
+        root: 항목 경로 앞에 붙일 폴더
+
+    Yields:
+        (압축 파일 안 경로, SVG 데이터)
+    """
+    seen = set()
+    for folder, icons in (("iconify", iconify_icons), ("material-icons", material_icons)):
+        for icon in icons:
+            name = icon.get("name", "unknown")
+            data = icon.get("data")
+            if folder == "material-icons":
+                # material-symbols:xxx 형식에서 파일명만 추출
+                name = name.replace("material-symbols:", "")
+            arcname = f"{root}{folder}/{name}.svg"
+            if data and arcname not in seen:
+                seen.add(arcname)
+                yield arcname, data
+
+
+def _folder_name(index: int, title: str) -> str:
+    return f"{index:02d}_{_UNSAFE_NAME_RE.sub('_', title).strip('_')[:40] or 'article'}"
+
+
+def daily_export_entries(articles: List[Dict], include_icons: bool = True) -> Iterator[ZipEntry]:
+    """
+    추천 기사 전체의 카드뉴스 자료를 ZIP 항목으로 만듭니다.
+
+    기사 하나씩 캐시된 요약과 카드뉴스 문구를 읽고, 카드별 이미지 프롬프트와 아이콘을
+    준비해 내보냅니다. 항목을 지연 생성하므로 한 번에 기사 한 건의 자료만 메모리에 둡니다.
+    아직 요약/문구가 생성되지 않은 기사는 제목과 링크만 담습니다.
+
+    Args:
+        articles: 기사 리스트 (title, link 포함)
+        include_icons: 아이콘 SVG 포함 여부
+
+    Yields:
+        (압축 파일 안 경로, 내용)
+    """
+    from image_prep import build_card_image_prompt, prepare_deck_images
+
+    index_lines = []
+    for idx, article in enumerate(articles, 1):
+        title = article.get("title", "")
+        link = article.get("link", "")
+        article_id = link or title
+        root = f"{_folder_name(idx, title)}/"
+        index_lines.append(f"{root}\t{title}\t{link}")
+
+        yield f"{root}article.txt", f"{title}\n{link}\n"
+        summary = get_cached_summary(article_id)
+        if summary:
+            yield f"{root}summary.txt", summary
+        script = get_cached_script(article_id)
+        if not script:
+            continue
+        yield f"{root}card_script.txt", script
+
+        cards = parse_card_script(script)
+        if not cards:
+            continue
+        deck_images = prepare_deck_images(cards) if include_icons else []
+        prompts = [
+            f"### 카드 {card_idx}\n{build_card_image_prompt(card)}\n"
+            for card_idx, card in enumerate(cards, 1)
+        ]
+        yield f"{root}image_prompts.txt", "\n".join(prompts)
+
+        for card_idx, images in enumerate(deck_images, 1):
+            yield from icon_entries(
+                images["iconify_downloaded"],
+                images["material_downloaded"],
+                root=f"{root}card_{card_idx:02d}/",
+            )
+
+    yield "index.tsv", "\n".join(index_lines) + "\n"
+
+
+def main():
+    """메인 실행 함수"""
+    from daily_recommendations import get_daily_recommendations_date, load_daily_recommendations
+
+    parser = argparse.ArgumentParser(description="오늘의 추천 기사 카드뉴스 자료 ZIP 내보내기")
+    parser.add_argument("-o", "--output", help="저장할 ZIP 파일 경로 (기본값: cardnews_<날짜>.zip)")
+    parser.add_argument("--no-icons", action="store_true", help="아이콘 SVG 제외")
+    args = parser.parse_args()
+
+    articles = load_daily_recommendations()
+    if not articles:
+        print("[ZIP 내보내기] 추천 기사가 없습니다.")
+        return
+    output = args.output or f"cardnews_{get_daily_recommendations_date() or 'daily'}.zip"
+    with open(output, "wb") as f:
+        for chunk in iter_zip(daily_export_entries(articles, include_icons=not args.no_icons)):
+            f.write(chunk)
+    print(f"[ZIP 내보내기] 기사 {len(articles)}건, {os.path.getsize(output) / 1024:.1f}KB → {output}")
+
+
+if __name__ == "__main__":
+    main()